@@ -0,0 +1,41 @@
+"""llm_response_cache
+
+Revision ID: 4c1f0d2b8e6a
+Revises: 775a47e3b696
+Create Date: 2026-10-18 11:02:17.504931
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from app.core.migration_guards import guarded_add_column, guarded_create_index, guarded_create_table, guarded_drop_column, guarded_drop_index, guarded_drop_table
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1f0d2b8e6a"
+down_revision: str | Sequence[str] | None = "775a47e3b696"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  guarded_create_table(
+    "llm_response_cache",
+    sa.Column("cache_key", sa.String(length=64), nullable=False),
+    sa.Column("model", sa.String(), nullable=False),
+    sa.Column("content", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint("cache_key"),
+  )
+  guarded_create_index("ix_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"], unique=False)
+  guarded_add_column("llm_call_audit", sa.Column("cache_status", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  guarded_drop_column("llm_call_audit", "cache_status")
+  guarded_drop_index("ix_llm_response_cache_expires_at", table_name="llm_response_cache")
+  guarded_drop_table("llm_response_cache")
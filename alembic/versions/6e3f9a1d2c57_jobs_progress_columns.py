@@ -0,0 +1,55 @@
+"""jobs_progress_columns
+
+Revision ID: 6e3f9a1d2c57
+Revises: 9b7e2c4d6a18
+Create Date: 2026-10-18 16:05:12.730418
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from app.core.migration_guards import guarded_add_column, guarded_drop_column
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "6e3f9a1d2c57"
+down_revision: str | Sequence[str] | None = "9b7e2c4d6a18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_COLUMNS = (
+  ("phase", sa.String()),
+  ("subphase", sa.String()),
+  ("progress", sa.Float()),
+  ("total_steps", sa.Integer()),
+  ("completed_steps", sa.Integer()),
+  ("expected_sections", sa.Integer()),
+  ("completed_sections", sa.Integer()),
+  ("completed_section_indexes", postgresql.JSONB(astext_type=sa.Text())),
+  ("current_section_index", sa.Integer()),
+  ("current_section_status", sa.String()),
+  ("current_section_retry_count", sa.Integer()),
+  ("current_section_title", sa.String()),
+  ("retry_count", sa.Integer()),
+  ("max_retries", sa.Integer()),
+  ("retry_sections", postgresql.JSONB(astext_type=sa.Text())),
+  ("retry_agents", postgresql.JSONB(astext_type=sa.Text())),
+  ("retry_parent_job_id", sa.String()),
+  ("artifacts_json", postgresql.JSONB(astext_type=sa.Text())),
+  ("validation_json", postgresql.JSONB(astext_type=sa.Text())),
+  ("cost_json", postgresql.JSONB(astext_type=sa.Text())),
+)
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  # Nullable columns without defaults are catalog-only changes, so the jobs table is not rewritten.
+  for name, column_type in _COLUMNS:
+    guarded_add_column("jobs", sa.Column(name, column_type, nullable=True))
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  for name, _column_type in reversed(_COLUMNS):
+    guarded_drop_column("jobs", name)
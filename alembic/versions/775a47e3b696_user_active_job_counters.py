@@ -0,0 +1,56 @@
+"""user_active_job_counters
+
+Revision ID: 775a47e3b696
+Revises: 939e5e69b348
+Create Date: 2026-10-18 09:12:44.118203
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from app.core.migration_guards import guarded_create_table, guarded_drop_table
+
+# revision identifiers, used by Alembic.
+revision: str = "775a47e3b696"
+down_revision: str | Sequence[str] | None = "939e5e69b348"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  guarded_create_table(
+    "user_active_job_counters",
+    sa.Column("user_id", sa.String(), nullable=False),
+    sa.Column("feature", sa.String(), nullable=False),
+    sa.Column("active_count", sa.Integer(), server_default="0", nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    sa.CheckConstraint("active_count >= 0", name="ck_user_active_job_counters_non_negative"),
+    sa.PrimaryKeyConstraint("user_id", "feature"),
+  )
+  # Seed counters from currently active jobs so enforcement is correct immediately after deploy.
+  op.execute(
+    """
+    INSERT INTO user_active_job_counters (user_id, feature, active_count)
+    SELECT user_id, feature, count(*)
+    FROM (
+      SELECT user_id,
+        CASE
+          WHEN target_agent IS NULL OR target_agent IN ('lesson', 'planner') THEN 'lesson'
+          WHEN target_agent IN ('research', 'writing', 'tutor') THEN target_agent
+        END AS feature
+      FROM jobs
+      WHERE user_id IS NOT NULL AND status IN ('queued', 'running')
+    ) AS active_jobs
+    WHERE feature IS NOT NULL
+    GROUP BY user_id, feature
+    ON CONFLICT (user_id, feature) DO UPDATE SET active_count = EXCLUDED.active_count
+    """
+  )
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  guarded_drop_table("user_active_job_counters")
@@ -0,0 +1,28 @@
+"""jobs_queued_partial_index
+
+Revision ID: 9b7e2c4d6a18
+Revises: 4c1f0d2b8e6a
+Create Date: 2026-10-18 14:20:41.118203
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from app.core.migration_guards import guarded_create_index, guarded_drop_index
+
+# revision identifiers, used by Alembic.
+revision: str = "9b7e2c4d6a18"
+down_revision: str | Sequence[str] | None = "4c1f0d2b8e6a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  guarded_create_index("ix_jobs_queued_created_at", "jobs", ["created_at"], unique=False, postgresql_where=sa.text("status = 'queued'"))
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  guarded_drop_index("ix_jobs_queued_created_at", table_name="jobs")
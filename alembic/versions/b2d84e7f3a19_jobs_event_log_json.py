@@ -0,0 +1,29 @@
+"""jobs_event_log_json
+
+Revision ID: b2d84e7f3a19
+Revises: 6e3f9a1d2c57
+Create Date: 2026-10-18 18:42:09.215337
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from app.core.migration_guards import guarded_add_column, guarded_drop_column
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d84e7f3a19"
+down_revision: str | Sequence[str] | None = "6e3f9a1d2c57"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  guarded_add_column("jobs", sa.Column("event_log_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  guarded_drop_column("jobs", "event_log_json")
@@ -0,0 +1,25 @@
+"""maintenance_trigger_permissions
+
+Revision ID: c1d7723ac5f9
+Revises: f3b6e0a92d14
+Create Date: 2026-10-18 23:04:17.512309
+
+"""
+
+from collections.abc import Sequence
+
+# revision identifiers, used by Alembic.
+revision: str = "c1d7723ac5f9"
+down_revision: str | Sequence[str] | None = "f3b6e0a92d14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  # empty: allow
+  # No schema change; scripts/seeds/c1d7723ac5f9.py seeds the admin:maintenance_* permissions for the scheduled maintenance triggers.
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
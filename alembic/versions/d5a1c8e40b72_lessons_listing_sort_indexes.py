@@ -0,0 +1,37 @@
+"""lessons_listing_sort_indexes
+
+Revision ID: d5a1c8e40b72
+Revises: b2d84e7f3a19
+Create Date: 2026-10-18 20:05:37.402916
+
+"""
+
+from collections.abc import Sequence
+
+from app.core.migration_guards import guarded_create_index, guarded_drop_index
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a1c8e40b72"
+down_revision: str | Sequence[str] | None = "b2d84e7f3a19"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_SORT_INDEXES = {
+  "ix_lessons_user_archived_created_at": ["user_id", "is_archived", "created_at", "lesson_id"],
+  "ix_lessons_user_archived_lesson_id": ["user_id", "is_archived", "lesson_id"],
+  "ix_lessons_user_archived_topic": ["user_id", "is_archived", "topic", "lesson_id"],
+  "ix_lessons_user_archived_title": ["user_id", "is_archived", "title", "lesson_id"],
+  "ix_lessons_user_archived_status": ["user_id", "is_archived", "status", "lesson_id"],
+}
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  for index_name, columns in _SORT_INDEXES.items():
+    guarded_create_index(index_name, "lessons", columns, unique=False)
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  for index_name in reversed(_SORT_INDEXES):
+    guarded_drop_index(index_name, table_name="lessons")
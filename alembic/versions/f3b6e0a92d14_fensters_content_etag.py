@@ -0,0 +1,31 @@
+"""fensters_content_etag
+
+Revision ID: f3b6e0a92d14
+Revises: d5a1c8e40b72
+Create Date: 2026-10-18 21:12:48.630574
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from app.core.migration_guards import guarded_add_column, guarded_drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b6e0a92d14"
+down_revision: str | Sequence[str] | None = "d5a1c8e40b72"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+  """Upgrade schema."""
+  guarded_add_column("fensters", sa.Column("content_etag", sa.String(), nullable=True))
+  # Backfill with the same value app.utils.etags.strong_etag produces: the first 32 hex chars of sha256, quoted.
+  op.execute("UPDATE fensters SET content_etag = '\"' || left(encode(sha256(content), 'hex'), 32) || '\"' WHERE content IS NOT NULL AND content_etag IS NULL")
+
+
+def downgrade() -> None:
+  """Downgrade schema."""
+  guarded_drop_column("fensters", "content_etag")
@@ -7,7 +7,7 @@ import uuid
 from typing import Any
 
 from app.ai.agents.base import BaseAgent
-from app.ai.agents.prompts import _load_prompt
+from app.ai.agents.prompts import load_prompt_template
 from app.ai.pipeline.contracts import JobContext
 from app.core.database import get_session_factory
 from app.schema.quotas import QuotaPeriod
@@ -16,6 +16,7 @@ from app.services.runtime_config import resolve_effective_runtime_config
 from app.services.users import get_user_by_id, get_user_subscription_tier
 
 logger = logging.getLogger(__name__)
+_PROMPT_PLACEHOLDERS = frozenset({"concept_context", "target_audience", "technical_constraints"})
 
 
 class FensterBuilderAgent(BaseAgent[dict[str, Any], str]):
@@ -64,15 +65,12 @@ class FensterBuilderAgent(BaseAgent[dict[str, Any], str]):
         await reserve_quota(session, user_id=reservation_user_id, metric_key="fenster.widget.generate", period=QuotaPeriod.MONTH, quantity=1, limit=reservation_limit, job_id=str(ctx.job_id), metadata=reserve_metadata)
       reservation_active = True
       # Load the prompt template for widget generation.
-      prompt_template = _load_prompt("fenster_builder.md")
+      prompt_template = load_prompt_template("fenster_builder.md", _PROMPT_PLACEHOLDERS)
       # Serialize technical constraints to keep the prompt stable.
       constraints = input_data.get("technical_constraints")
       constraints_str = str(constraints) if constraints else "None"
       # Replace prompt tokens with request values.
-      tokens = {"{{concept_context}}": input_data.get("concept_context", ""), "{{target_audience}}": input_data.get("target_audience", ""), "{{technical_constraints}}": constraints_str}
-      prompt_text = prompt_template
-      for k, v in tokens.items():
-        prompt_text = prompt_text.replace(k, v)
+      prompt_text = prompt_template.render({"concept_context": input_data.get("concept_context", ""), "target_audience": input_data.get("target_audience", ""), "technical_constraints": constraints_str})
       # Generate widget HTML from the model.
       response = await self._model.generate(prompt_text)
       self._record_usage(agent=self.name, purpose="build_widget", call_index="1/1", usage=response.usage)
@@ -8,7 +8,7 @@ from typing import Any
 from PIL import Image
 
 from app.ai.agents.base import BaseAgent
-from app.ai.agents.prompts import _load_prompt
+from app.ai.agents.prompts import load_prompt_template
 from app.ai.pipeline.contracts import JobContext
 from app.core.database import get_session_factory
 from app.schema.quotas import QuotaPeriod
@@ -18,6 +18,7 @@ from app.services.users import get_user_by_id, get_user_subscription_tier
 from app.telemetry.context import llm_call_context
 
 logger = logging.getLogger(__name__)
+_FALLBACK_PROMPT_PLACEHOLDERS = frozenset({"TOPIC", "SECTION_TITLE", "FOCUS_LINE"})
 _ILLUSTRATION_STYLE_REQUIREMENTS = (
   "Output requirements: vector-style illustration only, clean flat shapes, crisp edges, professional educational tone, factual classroom-safe content, no logos, no watermarks, no photorealism, and avoid text-heavy layouts."
 )
@@ -125,11 +126,8 @@ def _resolve_illustration_metadata(*, section_data: dict[str, Any], topic: str,
   # Build deterministic fallback metadata when builder output is missing/invalid.
   fallback_caption = f"{section_title} visual summary"
   focus_line = markdown_text[:700] if markdown_text else f"Illustrate the key concept of {section_title}."
-  fallback_template = _load_prompt("illustration_fallback.md")
-  fallback_prompt = fallback_template
-  fallback_prompt = fallback_prompt.replace("{{TOPIC}}", topic)
-  fallback_prompt = fallback_prompt.replace("{{SECTION_TITLE}}", section_title)
-  fallback_prompt = fallback_prompt.replace("{{FOCUS_LINE}}", focus_line)
+  fallback_template = load_prompt_template("illustration_fallback.md", _FALLBACK_PROMPT_PLACEHOLDERS)
+  fallback_prompt = fallback_template.render({"TOPIC": topic, "SECTION_TITLE": section_title, "FOCUS_LINE": focus_line})
   fallback_keywords = _build_keywords(topic=topic, section_title=section_title, markdown_text=markdown_text)
   return fallback_caption, _enforce_illustration_prompt_style(fallback_prompt), fallback_keywords
 
@@ -8,13 +8,14 @@ from typing import Any, cast
 from pydantic import ValidationError
 
 from app.ai.agents.base import BaseAgent
-from app.ai.agents.prompts import _load_prompt
+from app.ai.agents.prompts import load_prompt_template
 from app.ai.errors import is_output_error
 from app.ai.pipeline.contracts import JobContext
 from app.schema.outcomes import OutcomesAgentInput, OutcomesAgentResponse
 from app.telemetry.context import llm_call_context
 
 logger = logging.getLogger(__name__)
+_PROMPT_PLACEHOLDERS = frozenset({"TOPIC", "DETAILS", "LEARNER_LEVEL", "TEACHING_STYLE", "DEPTH", "PRIMARY_LANGUAGE", "SECONDARY_LANGUAGE", "MAX_OUTCOMES"})
 
 
 def _normalize_optional_text(value: str | None) -> str:
@@ -26,21 +27,23 @@ def _normalize_optional_text(value: str | None) -> str:
 
 def _render_prompt(input_data: OutcomesAgentInput) -> str:
   """Render the outcomes prompt with concrete request inputs."""
-  template = _load_prompt("outcomes_agent_improved.md")
+  template = load_prompt_template("outcomes_agent_improved.md", _PROMPT_PLACEHOLDERS)
   teaching_style = ", ".join(input_data.teaching_style) if input_data.teaching_style else "-"
   learner_level = _normalize_optional_text(input_data.learner_level)
   secondary_language = _normalize_optional_text(input_data.secondary_language)
 
-  rendered = template
-  rendered = rendered.replace("{{TOPIC}}", _normalize_optional_text(input_data.topic))
-  rendered = rendered.replace("{{DETAILS}}", _normalize_optional_text(input_data.details))
-  rendered = rendered.replace("{{LEARNER_LEVEL}}", learner_level)
-  rendered = rendered.replace("{{TEACHING_STYLE}}", teaching_style)
-  rendered = rendered.replace("{{DEPTH}}", _normalize_optional_text(input_data.depth))
-  rendered = rendered.replace("{{PRIMARY_LANGUAGE}}", _normalize_optional_text(input_data.lesson_language))
-  rendered = rendered.replace("{{SECONDARY_LANGUAGE}}", secondary_language)
-  rendered = rendered.replace("{{MAX_OUTCOMES}}", str(int(input_data.max_outcomes)))
-  return rendered
+  return template.render(
+    {
+      "TOPIC": _normalize_optional_text(input_data.topic),
+      "DETAILS": _normalize_optional_text(input_data.details),
+      "LEARNER_LEVEL": learner_level,
+      "TEACHING_STYLE": teaching_style,
+      "DEPTH": _normalize_optional_text(input_data.depth),
+      "PRIMARY_LANGUAGE": _normalize_optional_text(input_data.lesson_language),
+      "SECONDARY_LANGUAGE": secondary_language,
+      "MAX_OUTCOMES": str(int(input_data.max_outcomes)),
+    }
+  )
 
 
 class OutcomesAgent(BaseAgent[OutcomesAgentInput, OutcomesAgentResponse]):
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import json
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
@@ -10,13 +13,42 @@ from typing import Any
 from app.ai.pipeline.contracts import GenerationRequest, PlanSection, SectionDraft
 from app.schema.service import DEFAULT_WIDGETS_PATH
 from app.schema.widget_models import SECTION_TITLE_MAX_CHARS, SECTION_TITLE_MIN_CHARS, SUBSECTION_TITLE_MAX_CHARS, SUBSECTION_TITLE_MIN_CHARS, SUBSECTIONS_PER_SECTION_MAX, SUBSECTIONS_PER_SECTION_MIN
-from app.schema.widgets_loader import load_widget_registry
+from app.schema.widgets_loader import WidgetRegistry, get_widget_registry
 
 JsonDict = dict[str, Any]
 Errors = list[str]
 Req = GenerationRequest
 Section = SectionDraft
 
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{([A-Za-z0-9_]+)\}\}")
+
+PLANNER_PLACEHOLDERS = frozenset({"TOPIC", "DETAILS", "OUTCOMES", "LEARNER_LEVEL", "DEPTH", "SUPPORTED_WIDGETS", "TEACHING_STYLE_ADDENDUM", "PRIMARY_LANGUAGE", "SECTION_COUNT", "SUBSECTIONS_PER_SECTION_RULE", "TITLE_CONSTRAINTS_RULE"})
+SECTION_BUILDER_TOKENS = frozenset({"PLANNER_SECTION_JSON", "STYLE", "LEARNER_LEVEL", "DEPTH", "BLUEPRINT"})
+REPAIR_TOKENS = frozenset({"FAILED_ITEMS_JSON", "ERRORS"})
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+  """Prompt text pre-split into static segments around placeholder slots."""
+
+  name: str
+  segments: tuple[str, ...]
+  slots: tuple[str, ...]
+  placeholders: frozenset[str]
+
+  def render(self, values: Mapping[str, str]) -> str:
+    """Fill every slot with its value in a single join over the precompiled segments."""
+    if values.keys() != self.placeholders:
+      missing = sorted(self.placeholders - values.keys())
+      unknown = sorted(values.keys() - self.placeholders)
+      raise ValueError(f"Prompt '{self.name}' render values do not match placeholders (missing={missing}, unknown={unknown}).")
+
+    parts = [self.segments[0]]
+    for slot, segment in zip(self.slots, self.segments[1:], strict=True):
+      parts.append(values[slot])
+      parts.append(segment)
+    return "".join(parts)
+
 
 def _stringify_constraints(constraints: dict[str, Any] | None) -> str:
   """Serialize constraints to keep prompts deterministic and explicit."""
@@ -42,29 +74,15 @@ def _format_outcomes(outcomes: list[str] | None) -> str:
   return "\n".join(f"- {item}" for item in outcomes)
 
 
-def _replace_placeholders(template: str, values: dict[str, str]) -> str:
-  """Substitute {{PLACEHOLDER}} markers so planner prompts carry actual context."""
-  rendered = template
-  for key, value in values.items():
-    rendered = rendered.replace(f"{{{{{key}}}}}", value)
-
-  return rendered
-
-
-def _replace_tokens(template: str, values: dict[str, str]) -> str:
-  """Replace bare tokens used by gatherer/structurer prompt templates."""
-  rendered = template
-  for key, value in values.items():
-    rendered = rendered.replace(key, value)
-
-  return rendered
+def _supported_widgets() -> list[str]:
+  """List supported widget identifiers from the registry to constrain planners."""
+  return list(_supported_widgets_for(get_widget_registry(DEFAULT_WIDGETS_PATH)))
 
 
 @lru_cache(maxsize=1)
-def _supported_widgets() -> list[str]:
-  """List supported widget identifiers from the registry to constrain planners."""
-  registry = load_widget_registry(DEFAULT_WIDGETS_PATH)
-  return registry.available_types()
+def _supported_widgets_for(registry: WidgetRegistry) -> tuple[str, ...]:
+  """Cache the widget list per registry instance so a development reload rebuilds it."""
+  return tuple(registry.available_types())
 
 
 def _build_prompt_widgets(widgets: list[str] | None) -> list[str]:
@@ -120,7 +138,7 @@ def _serialize_plan_section(plan_section: PlanSection | None) -> str:
 
 def render_planner_prompt(request: Req) -> str:
   """Render the planner prompt for lesson planning with concrete substitutions."""
-  prompt_template = _load_prompt(_resolve_planner_prompt_name(request.blueprint))
+  prompt_template = load_prompt_template(_resolve_planner_prompt_name(request.blueprint), PLANNER_PLACEHOLDERS)
   primary_language = request.lesson_language or "English"
 
   if request.widgets:
@@ -146,13 +164,12 @@ def render_planner_prompt(request: Req) -> str:
     "SUBSECTIONS_PER_SECTION_RULE": f"{SUBSECTIONS_PER_SECTION_MIN}-{SUBSECTIONS_PER_SECTION_MAX} subsections per section",
     "TITLE_CONSTRAINTS_RULE": (f"Section titles must be {SECTION_TITLE_MIN_CHARS}-{SECTION_TITLE_MAX_CHARS} chars; subsection titles must be {SUBSECTION_TITLE_MIN_CHARS}-{SUBSECTION_TITLE_MAX_CHARS} chars."),
   }
-  rendered_prompt = _replace_placeholders(prompt_template, replacements)
-  return rendered_prompt
+  return prompt_template.render(replacements)
 
 
 def render_section_builder_prompt(request: Req, section: PlanSection, _schema_version: str) -> str:
   """Render the section builder prompt with planner and schema context."""
-  prompt_template = _load_prompt("section_builder.md")
+  prompt_template = load_prompt_template("section_builder.md", SECTION_BUILDER_TOKENS, bare_tokens=True)
   plan_json = _serialize_plan_section(section)
 
   # Enforce explicit blueprints so prompt content stays aligned with the plan.
@@ -160,17 +177,14 @@ def render_section_builder_prompt(request: Req, section: PlanSection, _schema_ve
     raise ValueError("Blueprint is required to render section builder prompts.")
 
   replacements = {"PLANNER_SECTION_JSON": plan_json, "STYLE": _teaching_style_addendum(request.teaching_style), "LEARNER_LEVEL": request.learner_level or "Unspecified", "DEPTH": request.depth, "BLUEPRINT": request.blueprint}
-
-  rendered_template = _replace_tokens(prompt_template, replacements)
-  return rendered_template
+  return prompt_template.render(replacements)
 
 
 def render_repair_prompt(_request: Req, _section: Section, repair_targets: list[dict[str, Any]], errors: Errors) -> str:
   """Render the repair prompt for invalid JSON."""
-  prompt_template = _load_prompt("repair.md")
+  prompt_template = load_prompt_template("repair.md", REPAIR_TOKENS, bare_tokens=True)
   # Keep repair prompts focused on failing items and relevant widget shapes.
-  rendered_template = _replace_tokens(prompt_template, {"FAILED_ITEMS_JSON": json.dumps(repair_targets, indent=2, ensure_ascii=True), "ERRORS": "\n".join(f"- {error}" for error in errors)})
-  return rendered_template
+  return prompt_template.render({"FAILED_ITEMS_JSON": json.dumps(repair_targets, indent=2, ensure_ascii=True), "ERRORS": "\n".join(f"- {error}" for error in errors)})
 
 
 def format_schema_block(schema: dict[str, Any], *, label: str) -> str:
@@ -217,3 +231,35 @@ def _load_prompt(name: str) -> str:
     return path.read_text(encoding="utf-8").strip()
   except (FileNotFoundError, PermissionError, UnicodeDecodeError) as exc:
     raise RuntimeError(f"Failed to load prompt '{name}': {exc}") from exc
+
+
+@lru_cache(maxsize=64)
+def load_prompt_template(name: str, placeholders: frozenset[str], *, bare_tokens: bool = False) -> PromptTemplate:
+  """Load a prompt once and split it into static segments and placeholder slots.
+
+  How/Why:
+    - Templates use {{KEY}} markers unless bare_tokens is set, in which case the KEY text itself is the marker.
+    - A template whose markers differ from the renderer's placeholders fails here, before any LLM call is built.
+    - Values are substituted in one pass, so text inside a value is never rewritten by a later placeholder.
+  """
+  text = _load_prompt(name)
+  if bare_tokens:
+    # Longest tokens first so a token that prefixes another never splits it.
+    pattern = re.compile("|".join(re.escape(token) for token in sorted(placeholders, key=len, reverse=True)))
+    matches = [(match.start(), match.end(), match.group(0)) for match in pattern.finditer(text)]
+  else:
+    matches = [(match.start(), match.end(), match.group(1)) for match in _PLACEHOLDER_PATTERN.finditer(text)]
+
+  slots = tuple(slot for _, _, slot in matches)
+  unknown = sorted(set(slots) - placeholders)
+  missing = sorted(placeholders - set(slots))
+  if unknown or missing:
+    raise RuntimeError(f"Prompt '{name}' placeholders do not match its renderer (missing={missing}, unknown={unknown}).")
+
+  segments: list[str] = []
+  cursor = 0
+  for start, end, _ in matches:
+    segments.append(text[cursor:start])
+    cursor = end
+  segments.append(text[cursor:])
+  return PromptTemplate(name=name, segments=tuple(segments), slots=slots, placeholders=placeholders)
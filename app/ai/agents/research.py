@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import ipaddress
 import logging
 import socket
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 from urllib.parse import urlparse
@@ -20,15 +22,33 @@ from app.services.runtime_config import get_research_model, get_research_router_
 
 logger = logging.getLogger(__name__)
 
+_CRAWL_CONCURRENCY = 5
+_CRAWL_TIMEOUT_SECONDS = 20.0
+
+HostResolver = Callable[[str], Awaitable[list[str]]]
+ContentFetcher = Callable[[str], Awaitable[dict[str, Any] | None]]
+
+
+async def resolve_host(hostname: str) -> list[str]:
+  """Resolve a hostname to its IP addresses on the event loop's resolver instead of a blocking threadpool call."""
+  infos = await asyncio.get_running_loop().getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+  return list(dict.fromkeys(str(info[4][0]) for info in infos))
+
 
 class ResearchAgent:
   """Agent responsible for research tasks: discovery and synthesis."""
 
-  def __init__(self) -> None:
+  def __init__(self, *, resolver: HostResolver | None = None, fetcher: ContentFetcher | None = None, crawl_concurrency: int = _CRAWL_CONCURRENCY, crawl_timeout_seconds: float = _CRAWL_TIMEOUT_SECONDS) -> None:
     settings = get_settings()
     self.gemini_provider = GeminiProvider(api_key=settings.gemini_api_key)
     self.tavily_provider = TavilyProvider()
     self.search_max_results = settings.research_search_max_results
+    # Resolver and fetcher are injectable so crawling can be exercised without DNS or Tavily.
+    self._resolver = resolver or resolve_host
+    self._fetcher = fetcher or self._fetch_content_tavily
+    self._crawl_concurrency = crawl_concurrency
+    self._crawl_timeout_seconds = crawl_timeout_seconds
+    self._host_checks: dict[str, asyncio.Future[bool]] = {}
 
   async def discover(self, query: str, user_id: str, context: str | None = None, runtime_config: dict[str, Any] | None = None) -> ResearchDiscoveryResponse:
     """
@@ -176,28 +196,33 @@ Query: {query}"""
       return "General"
 
   async def _crawl_urls(self, urls: list[str]) -> list[dict[str, Any]]:
-    crawled_data = []
+    """Check and fetch every URL concurrently, returning the pages that succeeded in input order.
 
-    # Fallback to Tavily specifically requested to avoid heavy crawl4ai dependencies
-    try:
-      for url in urls:
-        if not await self._is_safe_url(url):
-          logger.warning(f"Skipping unsafe URL: {url}")
-          continue
+    How/Why:
+      - Research latency is bounded by the slowest page instead of the sum of all of them.
+      - Each URL gets its own timeout covering the safety check and the fetch; failures and timeouts are dropped so the
+        synthesis still runs on whatever sources did come back.
+    """
+    slots = asyncio.Semaphore(self._crawl_concurrency)
 
+    async def _bounded(url: str) -> dict[str, Any] | None:
+      async with slots:
         try:
-          fallback_data = await self._fetch_content_tavily(url)
-          if fallback_data:
-            crawled_data.append(fallback_data)
+          return await asyncio.wait_for(self._crawl_one(url), timeout=self._crawl_timeout_seconds)
+        except TimeoutError:
+          logger.warning(f"Crawl timed out after {self._crawl_timeout_seconds:.0f}s for {url}")
         except Exception as e:
           logger.error(f"Individual crawl failed for {url}: {e}")
-          # functionality continues for other URLs
-    except Exception as e:
-      logger.error(f"Critical crawling phase failed: {e}")
-      # Proceed if we have any data, otherwise this might result in empty context later
-      pass
+      return None
+
+    results = await asyncio.gather(*(_bounded(url) for url in urls))
+    return [result for result in results if result]
 
-    return crawled_data
+  async def _crawl_one(self, url: str) -> dict[str, Any] | None:
+    if not await self._is_safe_url(url):
+      logger.warning(f"Skipping unsafe URL: {url}")
+      return None
+    return await self._fetcher(url)
 
   async def _fetch_content_tavily(self, url: str) -> dict[str, Any] | None:
     """Fetch content for a URL using Tavily as a fallback."""
@@ -223,32 +248,33 @@ Query: {query}"""
 
   async def _is_safe_url(self, url: str) -> bool:
     """Check if a URL is safe to crawl (no private/internal IPs)."""
-    return await run_in_threadpool(self._validate_url_sync, url)
-
-  def _validate_url_sync(self, url: str) -> bool:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+      return False
+    hostname = parsed.hostname.lower()
+    # Share one lookup per hostname so URLs on the same site resolve once, even when checked concurrently.
+    lookup = self._host_checks.get(hostname)
+    if lookup is None:
+      lookup = asyncio.ensure_future(self._is_public_host(hostname))
+      self._host_checks[hostname] = lookup
+    return await asyncio.shield(lookup)
+
+  async def _is_public_host(self, hostname: str) -> bool:
+    """Resolve a hostname and require every address to be public."""
     try:
-      parsed = urlparse(url)
-      if parsed.scheme not in ("http", "https"):
-        return False
-
-      hostname = parsed.hostname
-      if not hostname:
-        return False
-
-      # Resolve hostname to IP
+      addresses = await self._resolver(hostname)
+    except (OSError, UnicodeError):
+      return False
+    if not addresses:
+      return False
+    for address in addresses:
       try:
-        ip = socket.gethostbyname(hostname)
-      except socket.gaierror:
+        ip_obj = ipaddress.ip_address(address)
+      except ValueError:
         return False
-
-      # Check for private IP
-      ip_obj = ipaddress.ip_address(ip)
-      if ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_link_local:
+      if ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_link_local or ip_obj.is_reserved or ip_obj.is_multicast or ip_obj.is_unspecified:
         return False
-
-      return True
-    except Exception:
-      return False
+    return True
 
   def _log_to_firestore(self, user_id: str, data: dict[str, Any]) -> None:
     """Logs the research activity to Firestore."""
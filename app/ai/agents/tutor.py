@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import uuid
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.ai.agents.base import BaseAgent
-from app.ai.agents.prompts import _load_prompt
+from app.ai.agents.prompts import load_prompt_template
 from app.ai.pipeline.contracts import JobContext
 from app.core.database import get_session_factory
 from app.schema.quotas import QuotaPeriod
@@ -17,6 +22,7 @@ from app.services.users import get_user_by_id, get_user_subscription_tier
 from app.telemetry.context import llm_call_context
 
 logger = logging.getLogger(__name__)
+_SCRIPT_PROMPT_PLACEHOLDERS = frozenset({"TOPIC", "SUBSECTION_TITLE", "LEARNING_POINTS", "SUBSECTION_CONTENT"})
 
 
 class TutorAgent(BaseAgent[dict[str, Any], list[int]]):
@@ -33,7 +39,6 @@ class TutorAgent(BaseAgent[dict[str, Any], list[int]]):
     learning_points = input_data.get("learning_data_points", [])
 
     subsections = section_data.get("subsections", [])
-    audio_ids = []
     reservation_limit = 0
     reservation_active = False
     reservation_user_id: uuid.UUID | None = None
@@ -72,34 +77,21 @@ class TutorAgent(BaseAgent[dict[str, Any], list[int]]):
         reserve_metadata = {"job_id": str(ctx.job_id), "section_index": int(section_index)}
         await reserve_quota(session, user_id=reservation_user_id, metric_key="tutor.generate", period=QuotaPeriod.MONTH, quantity=1, limit=reservation_limit, job_id=str(ctx.job_id), section_index=int(section_index), metadata=reserve_metadata)
       reservation_active = True
-      # Generate scripts and audio outside DB transactions to avoid holding locks during LLM calls.
-      generated_segments: list[tuple[int, str, bytes]] = []
-      for idx, subsection in enumerate(subsections):
-        subsection_title = subsection.get("subsection") or subsection.get("section") or f"Subsection {idx + 1}"
-        script_prompt = self._build_script_prompt(topic, learning_points, subsection_title, subsection)
-        purpose = f"tutor_script_{section_index}_{idx}"
-        call_index = f"{section_index}/{idx}"
-        with llm_call_context(agent=self.name, lesson_topic=topic, job_id=ctx.job_id, purpose=purpose, call_index=call_index):
-          response = await self._model.generate(script_prompt)
-          self._record_usage(agent=self.name, purpose=purpose, call_index=call_index, usage=response.usage)
-        script = response.content.strip()
-        try:
-          audio_bytes = await self._model.generate_speech(script)
-        except NotImplementedError:
-          logger.warning("Model %s does not support speech generation.", self._model.name)
-          continue
-        except Exception as exc:
-          logger.error("Failed to generate speech for %s: %s", purpose, exc)
-          continue
-        generated_segments.append((idx, script, audio_bytes))
-      # Persist audio rows in a short-lived transaction after generation completes.
+      # Subsection rows already stored for this job are checkpoints, so a retry only generates what is missing.
       async with session_factory() as session:
-        for idx, script, audio_bytes in generated_segments:
+        completed = await self._load_completed_segments(session, job_id=ctx.job_id, section_index=int(section_index))
+
+      async def _persist(idx: int, script: str, audio_bytes: bytes) -> int:
+        # Persist each subsection in its own short transaction as soon as its audio is ready.
+        async with session_factory() as session:
           audio_entry = Tutor(creator_id=str(raw_user_id), job_id=ctx.job_id, section_number=section_index, subsection_index=idx + 1, text_content=script, audio_data=audio_bytes, status="completed", is_archived=False)
           session.add(audio_entry)
           await session.flush()
-          audio_ids.append(audio_entry.id)
-        await session.commit()
+          audio_id = int(audio_entry.id)
+          await session.commit()
+          return audio_id
+
+      audio_ids = await self._generate_segments(subsections, topic=topic, learning_points=learning_points, section_index=section_index, ctx=ctx, completed=completed, concurrency=settings.tutor_subsection_concurrency, persist=_persist)
 
       # Commit the reservation once audio generation is complete.
       async with session_factory() as session:
@@ -122,14 +114,57 @@ class TutorAgent(BaseAgent[dict[str, Any], list[int]]):
           logger.error("Tutor failed to release tutor quota reservation.", exc_info=True)
       raise
 
+  async def _generate_segments(
+    self, subsections: list[dict[str, Any]], *, topic: str, learning_points: list[str], section_index: int, ctx: JobContext, completed: dict[int, int], concurrency: int, persist: Callable[[int, str, bytes], Awaitable[int]]
+  ) -> list[int]:
+    """Generate and persist audio for every subsection missing from completed, returning ids in subsection order.
+
+    How/Why:
+      - Script and speech calls each have their own semaphore, so speech for one subsection overlaps scripts for the next ones.
+      - Every subsection runs to completion even when another fails; finished rows stay persisted and the first error is raised after.
+    """
+    script_slots = asyncio.Semaphore(concurrency)
+    speech_slots = asyncio.Semaphore(concurrency)
+
+    async def _segment(idx: int, subsection: dict[str, Any]) -> int | None:
+      existing_id = completed.get(idx + 1)
+      if existing_id is not None:
+        return existing_id
+      subsection_title = subsection.get("subsection") or subsection.get("section") or f"Subsection {idx + 1}"
+      script_prompt = self._build_script_prompt(topic, learning_points, subsection_title, subsection)
+      purpose = f"tutor_script_{section_index}_{idx}"
+      call_index = f"{section_index}/{idx}"
+      async with script_slots:
+        with llm_call_context(agent=self.name, lesson_topic=topic, job_id=ctx.job_id, purpose=purpose, call_index=call_index):
+          response = await self._model.generate(script_prompt)
+          self._record_usage(agent=self.name, purpose=purpose, call_index=call_index, usage=response.usage)
+      script = response.content.strip()
+      try:
+        async with speech_slots:
+          audio_bytes = await self._model.generate_speech(script)
+      except NotImplementedError:
+        logger.warning("Model %s does not support speech generation.", self._model.name)
+        return None
+      except Exception as exc:
+        logger.error("Failed to generate speech for %s: %s", purpose, exc)
+        return None
+      return await persist(idx, script, audio_bytes)
+
+    results = await asyncio.gather(*(_segment(idx, subsection) for idx, subsection in enumerate(subsections)), return_exceptions=True)
+    for result in results:
+      if isinstance(result, BaseException):
+        raise result
+    return [result for result in results if isinstance(result, int)]
+
+  async def _load_completed_segments(self, session: AsyncSession, *, job_id: str, section_index: int) -> dict[int, int]:
+    """Return {subsection_index: tutor_id} for subsections this job already stored."""
+    stmt = select(Tutor.subsection_index, Tutor.id).where(Tutor.job_id == job_id, Tutor.section_number == section_index, Tutor.status == "completed", Tutor.is_archived.is_(False))
+    rows = (await session.execute(stmt)).all()
+    return {int(subsection_index): int(tutor_id) for subsection_index, tutor_id in rows}
+
   def _build_script_prompt(self, topic: str, points: list[str], sub_title: str, subsection: dict[str, Any]) -> str:
     """Construct a prompt for generating a subsection coaching script."""
     points_str = "\n".join(f"- {p}" for p in points) or "- (none provided)"
     content_str = json.dumps(subsection, indent=2, default=str)
-    prompt_template = _load_prompt("tutor_script.md")
-    rendered = prompt_template
-    rendered = rendered.replace("{{TOPIC}}", str(topic))
-    rendered = rendered.replace("{{SUBSECTION_TITLE}}", str(sub_title))
-    rendered = rendered.replace("{{LEARNING_POINTS}}", points_str)
-    rendered = rendered.replace("{{SUBSECTION_CONTENT}}", content_str)
-    return rendered
+    prompt_template = load_prompt_template("tutor_script.md", _SCRIPT_PROMPT_PLACEHOLDERS)
+    return prompt_template.render({"TOPIC": str(topic), "SUBSECTION_TITLE": str(sub_title), "LEARNING_POINTS": points_str, "SUBSECTION_CONTENT": content_str})
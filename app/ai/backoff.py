@@ -1,31 +1,166 @@
-"""Retry logic with specific backoff strategy."""
+"""Retry policy for provider calls: error classification, jittered backoff, deadlines and hedging."""
 
 from __future__ import annotations
 
 import asyncio
 import logging
 import random
-from typing import TypeVar
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Any
+
+import httpx
+
+from app.config import get_settings
 
-T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
+# Hard quota exhaustion will not clear within a call's budget, so it fails fast like any fatal error.
+_QUOTA_MARKERS = ("Resource Exhausted", "Quota Exceeded")
+_RATE_LIMIT_MARKERS = ("429", "too many requests")
+# Message markers only matter for errors without a status code, such as wrapped transport failures.
+_TRANSIENT_MARKERS = ("internal error", "unavailable", "deadline exceeded", "timed out", "timeout", "connection reset", "connection aborted", "server disconnected")
+_RETRYABLE_STATUS_CODES = frozenset({408, 500, 502, 503, 504})
+
+
+class ErrorClass(Enum):
+  """How a failed provider call should be handled."""
 
-async def retry_with_backoff(func, *args, **kwargs) -> T:
+  RATE_LIMITED = "rate_limited"
+  TRANSIENT = "transient"
+  FATAL = "fatal"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+  """Retry configuration for a single logical provider call.
+
+  deadline_seconds, when set, bounds the whole call, including backoff sleeps; each attempt gets the remaining budget as its timeout.
+  It defaults to None because structured and image generations can legitimately run for minutes, and a cut-off call counts as a breaker failure.
+  hedge_after_seconds starts one duplicate request when the first has not answered in time, for prompts up to hedge_max_prompt_chars.
   """
-  Execute a function with retries only for explicit 429 rate-limit errors.
+
+  max_attempts: int = 4
+  base_delay_seconds: float = 0.5
+  max_delay_seconds: float = 8.0
+  deadline_seconds: float | None = None
+  hedge_after_seconds: float | None = None
+  hedge_max_prompt_chars: int = 4000
+
+  def backoff_delay(self, attempt: int, rng: random.Random | None = None) -> float:
+    """Full-jitter exponential backoff: uniform over [0, min(max, base * 2**attempt)]."""
+    ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2**attempt))
+    return (rng or random).uniform(0.0, ceiling)
+
+  def allows_hedge(self, prompt: Any) -> bool:
+    """Return True when hedging is enabled and the prompt is short enough for a duplicate to be cheap."""
+    return self.hedge_after_seconds is not None and isinstance(prompt, str) and len(prompt) <= self.hedge_max_prompt_chars
+
+
+def classify_error(exc: BaseException) -> ErrorClass:
+  """Classify a provider exception by status code, transport type, then message markers."""
+  message = str(exc)
+  if any(marker in message for marker in _QUOTA_MARKERS):
+    return ErrorClass.FATAL
+
+  # SDK errors (google-genai APIError, httpx.HTTPStatusError) expose the HTTP status.
+  status_code = getattr(exc, "code", None)
+  if not isinstance(status_code, int):
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+  if isinstance(status_code, int):
+    if status_code == 429:
+      return ErrorClass.RATE_LIMITED
+    if status_code in _RETRYABLE_STATUS_CODES:
+      return ErrorClass.TRANSIENT
+    if 400 <= status_code < 500:
+      return ErrorClass.FATAL
+
+  if isinstance(exc, (TimeoutError, ConnectionError, httpx.TimeoutException, httpx.TransportError)):
+    return ErrorClass.TRANSIENT
+
+  lowered = message.lower()
+  if any(marker in lowered for marker in _RATE_LIMIT_MARKERS):
+    return ErrorClass.RATE_LIMITED
+  if any(marker in lowered for marker in _TRANSIENT_MARKERS):
+    return ErrorClass.TRANSIENT
+  return ErrorClass.FATAL
+
+
+async def _hedged[T](call: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+  """Run call, starting one duplicate if it is still pending after hedge_after; the first success wins."""
+  tasks = {asyncio.ensure_future(call())}
+  try:
+    done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+    if not done:
+      logger.info("Provider call exceeded %.2fs; sending a hedged request.", hedge_after)
+      tasks.add(asyncio.ensure_future(call()))
+
+    pending = set(tasks)
+    errors: list[BaseException] = []
+    while pending:
+      done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+      for task in done:
+        error = task.exception()
+        if error is None:
+          return task.result()
+        errors.append(error)
+    raise errors[-1]
+  finally:
+    # Cancel the loser, and both requests when the caller's deadline cancels us.
+    for task in tasks:
+      if not task.done():
+        task.cancel()
+
+
+async def call_with_retry[T](
+  func: Callable[..., Awaitable[T]], *args: Any, policy: RetryPolicy, hedge: bool = False, sleep: Callable[[float], Awaitable[None]] = asyncio.sleep, clock: Callable[[], float] = time.monotonic, rng: random.Random | None = None, **kwargs: Any
+) -> T:
+  """Call func under policy, retrying rate-limited and transient failures until attempts or the deadline run out.
+
+  How/Why:
+    - Provider hiccups (timeouts, 5xx, resets) are retried here in well under a second instead of failing the whole job.
+    - Backoff sleeps never run past the deadline; the last error is raised as soon as the budget cannot cover another attempt.
   """
-  max_retries = 3
-  base_delay = 1.0
-  for attempt in range(max_retries):
+
+  def _call() -> Awaitable[T]:
+    return func(*args, **kwargs)
+
+  started = clock()
+  attempt = 0
+  while True:
+    remaining = None if policy.deadline_seconds is None else policy.deadline_seconds - (clock() - started)
+    if remaining is not None and remaining <= 0:
+      raise TimeoutError(f"Provider call exceeded its {policy.deadline_seconds:.1f}s deadline.")
+
     try:
-      return await func(*args, **kwargs)
-    except Exception as e:
-      error_msg = str(e)
-      is_rate_limit = "429" in error_msg or "Too Many Requests" in error_msg
-      if not is_rate_limit:
+      call: Awaitable[T] = _hedged(_call, policy.hedge_after_seconds) if hedge and policy.hedge_after_seconds is not None else _call()
+      if remaining is None:
+        return await call
+      return await asyncio.wait_for(call, timeout=remaining)
+    except Exception as exc:
+      error_class = classify_error(exc)
+      attempt += 1
+      if error_class is ErrorClass.FATAL or attempt >= policy.max_attempts:
+        raise
+
+      delay = policy.backoff_delay(attempt - 1, rng)
+      if policy.deadline_seconds is not None and (clock() - started) + delay >= policy.deadline_seconds:
         raise
-      delay = (base_delay * (2**attempt)) + random.uniform(0.0, 0.5)
-      logger.warning(f"429 retry attempt {attempt + 1}/{max_retries}. Retrying in {delay:.2f}s. Error: {error_msg}")
-      await asyncio.sleep(delay)
-  return await func(*args, **kwargs)
+      logger.warning("Provider call failed (%s, attempt %d/%d); retrying in %.2fs: %s", error_class.value, attempt, policy.max_attempts, delay, exc)
+      await sleep(delay)
+
+
+@lru_cache(maxsize=1)
+def default_retry_policy() -> RetryPolicy:
+  """Build the process-wide provider retry policy from settings."""
+  settings = get_settings()
+  return RetryPolicy(max_attempts=settings.llm_retry_max_attempts, deadline_seconds=settings.llm_retry_deadline_seconds, hedge_after_seconds=settings.llm_hedge_after_seconds)
+
+
+async def retry_with_backoff(func, *args, **kwargs) -> Any:
+  """Execute a function under the default retry policy."""
+  return await call_with_retry(func, *args, policy=default_retry_policy(), **kwargs)
@@ -0,0 +1,173 @@
+"""Per-candidate circuit breakers and failover counters for model routing."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+
+_DEFAULT_WINDOW_SIZE = 20
+
+
+class CircuitState(Enum):
+  """Health state of a single provider/model candidate."""
+
+  CLOSED = "closed"
+  OPEN = "open"
+  HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+  """Thresholds that decide when a candidate is considered unhealthy.
+
+  A circuit opens once at least min_calls outcomes are in the rolling window and either the failure rate or
+  the rate of calls slower than slow_call_seconds reaches error_rate. After cooldown_seconds one probe call is let through.
+  """
+
+  error_rate: float = 0.5
+  min_calls: int = 5
+  slow_call_seconds: float = 60.0
+  cooldown_seconds: float = 30.0
+  window_size: int = _DEFAULT_WINDOW_SIZE
+
+
+class CircuitBreaker:
+  """Rolling-window breaker for one candidate; callers ask allow_request() before calling and record the outcome after."""
+
+  def __init__(self, policy: BreakerPolicy, *, clock: Callable[[], float] = time.monotonic) -> None:
+    self._policy = policy
+    self._clock = clock
+    # Each outcome is (failed, slow).
+    self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=policy.window_size)
+    self._state = CircuitState.CLOSED
+    self._opened_at = 0.0
+    self._probe_in_flight = False
+    self.times_opened = 0
+
+  @property
+  def state(self) -> CircuitState:
+    """Return the current state, moving OPEN to HALF_OPEN once the cooldown has elapsed."""
+    if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._policy.cooldown_seconds:
+      self._state = CircuitState.HALF_OPEN
+      self._probe_in_flight = False
+    return self._state
+
+  def allow_request(self) -> bool:
+    """Return True when a call may be sent; a half-open circuit admits a single probe at a time."""
+    state = self.state
+    if state is CircuitState.CLOSED:
+      return True
+    if state is CircuitState.HALF_OPEN and not self._probe_in_flight:
+      self._probe_in_flight = True
+      return True
+    return False
+
+  def record_success(self, latency_seconds: float) -> None:
+    """Record a completed call; a successful probe closes the circuit unless it was itself too slow."""
+    slow = latency_seconds >= self._policy.slow_call_seconds
+    if self._state is CircuitState.HALF_OPEN:
+      if slow:
+        self._trip()
+        return
+      self._outcomes.clear()
+      self._state = CircuitState.CLOSED
+      self._probe_in_flight = False
+    self._outcomes.append((False, slow))
+    self._evaluate()
+
+  def record_failure(self) -> None:
+    """Record a provider failure; a failed probe re-opens the circuit immediately."""
+    if self._state is CircuitState.HALF_OPEN:
+      self._trip()
+      return
+    self._outcomes.append((True, False))
+    self._evaluate()
+
+  def release(self) -> None:
+    """Forget an admitted call that ended without an outcome, such as a cancelled probe."""
+    self._probe_in_flight = False
+
+  def snapshot(self) -> dict[str, Any]:
+    """Return state and window counts for metrics."""
+    failures = sum(1 for failed, _ in self._outcomes if failed)
+    slow_calls = sum(1 for _, slow in self._outcomes if slow)
+    return {"state": self.state.value, "window_calls": len(self._outcomes), "window_failures": failures, "window_slow_calls": slow_calls, "times_opened": self.times_opened}
+
+  def _evaluate(self) -> None:
+    """Open the circuit when the failure or slow-call rate over the window reaches the threshold."""
+    total = len(self._outcomes)
+    if self._state is not CircuitState.CLOSED or total < self._policy.min_calls:
+      return
+    failures = sum(1 for failed, _ in self._outcomes if failed)
+    slow_calls = sum(1 for _, slow in self._outcomes if slow)
+    if failures / total >= self._policy.error_rate or slow_calls / total >= self._policy.error_rate:
+      self._trip()
+
+  def _trip(self) -> None:
+    self._state = CircuitState.OPEN
+    self._opened_at = self._clock()
+    self._probe_in_flight = False
+    self._outcomes.clear()
+    self.times_opened += 1
+
+
+@dataclass
+class FailoverStats:
+  """Process-wide routing counters, keyed by "provider/model" candidate."""
+
+  calls: dict[str, int] = field(default_factory=dict)
+  failures: dict[str, int] = field(default_factory=dict)
+  skipped_open: dict[str, int] = field(default_factory=dict)
+  failovers: int = 0
+  exhausted: int = 0
+
+  def increment(self, counter: dict[str, int], candidate: str) -> None:
+    counter[candidate] = counter.get(candidate, 0) + 1
+
+
+class CircuitBreakerRegistry:
+  """Shared breakers so every model client in the process sees the same candidate health."""
+
+  def __init__(self, policy: BreakerPolicy, *, clock: Callable[[], float] = time.monotonic) -> None:
+    self._policy = policy
+    self._clock = clock
+    self._breakers: dict[str, CircuitBreaker] = {}
+    self.stats = FailoverStats()
+
+  def breaker_for(self, candidate: str) -> CircuitBreaker:
+    breaker = self._breakers.get(candidate)
+    if breaker is None:
+      breaker = CircuitBreaker(self._policy, clock=self._clock)
+      self._breakers[candidate] = breaker
+    return breaker
+
+  def snapshot(self) -> dict[str, Any]:
+    """Return breaker states and failover counters for the admin metrics endpoint."""
+    stats = self.stats
+    candidates = sorted(set(self._breakers) | set(stats.calls))
+    return {
+      "failovers": stats.failovers,
+      "exhausted": stats.exhausted,
+      "candidates": {candidate: {**self.breaker_for(candidate).snapshot(), "calls": stats.calls.get(candidate, 0), "failures": stats.failures.get(candidate, 0), "skipped_open": stats.skipped_open.get(candidate, 0)} for candidate in candidates},
+    }
+
+
+@lru_cache(maxsize=1)
+def get_breaker_registry() -> CircuitBreakerRegistry:
+  """Build the process-wide registry from settings."""
+  settings = get_settings()
+  policy = BreakerPolicy(
+    error_rate=settings.llm_breaker_error_rate,
+    min_calls=settings.llm_breaker_min_calls,
+    slow_call_seconds=settings.llm_breaker_slow_call_seconds,
+    cooldown_seconds=settings.llm_breaker_cooldown_seconds,
+    window_size=max(_DEFAULT_WINDOW_SIZE, settings.llm_breaker_min_calls),
+  )
+  return CircuitBreakerRegistry(policy)
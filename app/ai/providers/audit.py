@@ -32,7 +32,11 @@ class AuditModel(AIModel):
     """Generate image bytes while capturing an audit trail."""
     return cast(bytes, await self._capture(prompt=prompt, schema=None, call_mode="generate_image"))
 
-  async def _capture(self, *, prompt: str, schema: dict[str, Any] | None, call_mode: str | None = None) -> ModelResponse | bytes:
+  async def generate_speech(self, text: str, voice: str | None = None) -> bytes:
+    """Generate speech audio while capturing an audit trail."""
+    return cast(bytes, await self._capture(prompt=text, schema=None, call_mode="generate_speech", voice=voice))
+
+  async def _capture(self, *, prompt: str, schema: dict[str, Any] | None, call_mode: str | None = None, voice: str | None = None) -> ModelResponse | bytes:
     """Call the underlying model while capturing audit metadata."""
     started_at = utc_now()
     start_time = time.monotonic()
@@ -46,10 +50,13 @@ class AuditModel(AIModel):
     # Capture timing and usage even when the provider raises.
 
     try:
-      # Reset usage before each call so image calls do not leak prior usage metadata.
+      # Reset usage and cache status before each call so values from a prior call never leak into this row.
       self._model.last_usage = None
+      self._model.last_cache_status = None
       if request_type == "generate_image":
         response = await self._model.generate_image(prompt)
+      elif request_type == "generate_speech":
+        response = await self._model.generate_speech(prompt, voice)
       elif schema is None:
         response = await self._model.generate(prompt)
 
@@ -70,7 +77,8 @@ class AuditModel(AIModel):
       else:
         content = getattr(response, "content", None) if response is not None else response
       response_payload = serialize_response(content)
-      await finalize_llm_call(call_id=call_id, response_payload=response_payload, usage=usage, duration_ms=duration_ms, error=error)
+      cache_status = getattr(self._model, "last_cache_status", None)
+      await finalize_llm_call(call_id=call_id, response_payload=response_payload, usage=usage, duration_ms=duration_ms, error=error, cache_status=cache_status)
 
 
 def _resolve_usage(*, response: Any, model: AIModel) -> dict[str, int] | None:
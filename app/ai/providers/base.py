@@ -7,10 +7,13 @@ import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
 from app.utils.env import default_env_path, load_env_file
 
+if TYPE_CHECKING:
+  from app.ai.response_cache import ResponseCache
+
 _ENV_LOADED = False
 
 
@@ -68,6 +71,9 @@ class AIModel(ABC):
   name: str
   supports_structured_output: bool = False
   last_usage: dict[str, int] | None = None
+  # Opt-in structured response cache; last_cache_status reports "hit"/"miss" for the audit wrapper.
+  response_cache: ResponseCache | None = None
+  last_cache_status: str | None = None
 
   @abstractmethod
   async def generate(self, prompt: str) -> ModelResponse:
@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
 import base64
 import json
 import logging
 import os
-import random
 import warnings
 from typing import Any, Final
 
@@ -19,16 +17,19 @@ with warnings.catch_warnings():
   from google import genai
   from google.genai import types
 
+from app.ai.backoff import RetryPolicy, call_with_retry, default_retry_policy
 from app.ai.json_parser import parse_json_with_fallback
 from app.ai.providers.base import AIModel, ModelResponse, Provider, SimpleModelResponse, StructuredModelResponse
+from app.ai.response_cache import structured_cache_key
 
 
 class GeminiModel(AIModel):
   """Gemini model client with structured output support using google-genai SDK."""
 
-  def __init__(self, name: str, api_key: str | None = None) -> None:
+  def __init__(self, name: str, api_key: str | None = None, *, retry_policy: RetryPolicy | None = None) -> None:
     self.name: str = name
     self.supports_structured_output = True
+    self._retry_policy = retry_policy or default_retry_policy()
 
     # Configure Gemini API
     api_key = api_key or os.getenv("GEMINI_API_KEY")
@@ -49,7 +50,7 @@ class GeminiModel(AIModel):
       return response
 
     # Use the async client to avoid blocking the asyncio event loop.
-    response = await _with_backoff(self._client.aio.models.generate_content, model=self.name, contents=prompt)
+    response = await call_with_retry(self._client.aio.models.generate_content, policy=self._retry_policy, hedge=self._retry_policy.allows_hedge(prompt), model=self.name, contents=prompt)
 
     # Extract usage IMMEDIATELY after API call, before any processing that might fail.
     usage = None
@@ -77,8 +78,23 @@ class GeminiModel(AIModel):
       logger.info("Gemini dummy structured response:\n%s", dummy)
       return response
 
+    # Serve identical requests (retries, checkpoint resumes, regenerations) from the cache when the agent opted in.
+    self.last_cache_status = None
+    cache_key: str | None = None
+    if self.response_cache is not None:
+      cache_key = structured_cache_key(model=self.name, prompt=prompt, schema=schema, generation_config={"response_mime_type": "application/json"})
+      cached = await self.response_cache.get(cache_key)
+      if cached is not None:
+        self.last_usage = None
+        self.last_cache_status = "hit"
+        logger.info("Gemini structured response served from cache (%s).", cache_key[:12])
+        return StructuredModelResponse(content=cached, usage=None)
+      self.last_cache_status = "miss"
+
     # Send raw JSON Schema through `response_json_schema` to bypass strict OpenAPI-only validation.
-    response = await _with_backoff(self._client.aio.models.generate_content, model=self.name, contents=prompt, config={"response_mime_type": "application/json", "response_json_schema": schema})
+    response = await call_with_retry(
+      self._client.aio.models.generate_content, policy=self._retry_policy, hedge=self._retry_policy.allows_hedge(prompt), model=self.name, contents=prompt, config={"response_mime_type": "application/json", "response_json_schema": schema}
+    )
 
     # Extract usage IMMEDIATELY after API call, before any processing that might fail.
     usage = None
@@ -99,10 +115,14 @@ class GeminiModel(AIModel):
       parsed = parse_json_with_fallback(cleaned)
       if not isinstance(parsed, dict):
         raise ValueError(f"Gemini structured output must be a JSON object, got {type(parsed).__name__}.")
-      return StructuredModelResponse(content=parsed, usage=usage)
     except (json.JSONDecodeError, TypeError, ValueError) as e:
       raise RuntimeError(f"Gemini returned invalid JSON: {e}") from e
 
+    # Only parsed objects are cached so a malformed response is never replayed.
+    if self.response_cache is not None and cache_key is not None:
+      await self.response_cache.set(cache_key, model=self.name, content=parsed)
+    return StructuredModelResponse(content=parsed, usage=usage)
+
   async def upload_file(self, file_content: bytes, mime_type: str, display_name: str | None = None) -> Any:
     """Upload a file to the Gemini File API."""
     try:
@@ -171,7 +191,8 @@ class GeminiModel(AIModel):
     logger = logging.getLogger("app.ai.providers.gemini")
 
     try:
-      response = await _with_backoff(self._client.aio.models.generate_content, model=self.name, contents=prompt)
+      # Image generation is slow and billed per image, so it is retried but never hedged.
+      response = await call_with_retry(self._client.aio.models.generate_content, policy=self._retry_policy, model=self.name, contents=prompt)
       self.last_usage = _extract_usage_from_response(response)
       image_bytes = _extract_image_bytes_from_response(response)
       if image_bytes is None:
@@ -212,36 +233,6 @@ class GeminiProvider(Provider):
     return GeminiModel(model_name, api_key=self._api_key)
 
 
-async def _with_backoff(func, *args, **kwargs):
-  retries = 3
-  base_delay = 1
-  for i in range(retries):
-    try:
-      return await func(*args, **kwargs)
-    except Exception as e:
-      error_msg = str(e)
-      # Fail fast on hard quota limits
-      if "Resource Exhausted" in error_msg or "Quota Exceeded" in error_msg:
-        raise
-
-      # Retry common transient conditions that occur on provider edges.
-      if _is_transient_error(error_msg):
-        if i == retries - 1:
-          raise
-        delay = base_delay * (2**i) + random.uniform(0, 1)
-        await asyncio.sleep(delay)
-      else:
-        raise
-  return await func(*args, **kwargs)
-
-
-def _is_transient_error(error_msg: str) -> bool:
-  """Detect transient provider failures that should be retried with backoff."""
-  lowered = error_msg.lower()
-  transient_markers = ("429", "too many requests")
-  return any(marker in lowered for marker in transient_markers)
-
-
 def _extract_text_from_response(response: Any) -> str:
   """Extract text payload from Gemini SDK response variants."""
   text = getattr(response, "text", None)
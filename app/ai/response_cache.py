@@ -0,0 +1,148 @@
+"""Content-addressed cache for structured LLM responses."""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Protocol
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import get_settings
+from app.core.database import get_session_factory
+from app.schema.llm_response_cache import LlmResponseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheBackend(Protocol):
+  """Storage contract for cached structured responses."""
+
+  async def get(self, key: str) -> dict[str, Any] | None:
+    """Return the cached content for a key, or None when missing or expired."""
+    ...
+
+  async def set(self, key: str, *, model: str, content: dict[str, Any], ttl_seconds: int) -> None:
+    """Store content under a key until the TTL elapses."""
+    ...
+
+
+class InMemoryResponseCache:
+  """Process-local LRU backend; entries are stored encoded so callers never share mutable dicts."""
+
+  def __init__(self, *, max_entries: int) -> None:
+    self._max_entries = max_entries
+    self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+  async def get(self, key: str) -> dict[str, Any] | None:
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    expires_at, encoded = entry
+    if time.monotonic() >= expires_at:
+      del self._entries[key]
+      return None
+    self._entries.move_to_end(key)
+    return json.loads(encoded)
+
+  async def set(self, key: str, *, model: str, content: dict[str, Any], ttl_seconds: int) -> None:
+    self._entries[key] = (time.monotonic() + ttl_seconds, json.dumps(content, ensure_ascii=True))
+    self._entries.move_to_end(key)
+    while len(self._entries) > self._max_entries:
+      self._entries.popitem(last=False)
+
+
+class PostgresResponseCache:
+  """Shared backend so every worker instance can replay responses generated by another."""
+
+  async def get(self, key: str) -> dict[str, Any] | None:
+    session_factory = get_session_factory()
+    if session_factory is None:
+      return None
+    async with session_factory() as session:
+      stmt = select(LlmResponseCacheEntry.content).where(LlmResponseCacheEntry.cache_key == key, LlmResponseCacheEntry.expires_at > func.now())
+      content = (await session.execute(stmt)).scalar_one_or_none()
+    return dict(content) if isinstance(content, dict) else None
+
+  async def set(self, key: str, *, model: str, content: dict[str, Any], ttl_seconds: int) -> None:
+    session_factory = get_session_factory()
+    if session_factory is None:
+      return
+    expires_at = datetime.datetime.now(tz=datetime.UTC) + datetime.timedelta(seconds=ttl_seconds)
+    stmt = insert(LlmResponseCacheEntry).values(cache_key=key, model=model, content=content, expires_at=expires_at)
+    stmt = stmt.on_conflict_do_update(index_elements=[LlmResponseCacheEntry.cache_key], set_={"content": content, "created_at": func.now(), "expires_at": expires_at})
+    async with session_factory() as session:
+      await session.execute(stmt)
+      await session.commit()
+
+
+@dataclass
+class ResponseCacheStats:
+  """Process-wide hit/miss counters; per-call outcomes are also written to the LLM audit."""
+
+  hits: int = 0
+  misses: int = 0
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+class ResponseCache:
+  """Apply the TTL and counters around a backend, and keep backend failures from failing model calls."""
+
+  def __init__(self, backend: ResponseCacheBackend, *, ttl_seconds: int) -> None:
+    self._backend = backend
+    self._ttl_seconds = ttl_seconds
+
+  async def get(self, key: str) -> dict[str, Any] | None:
+    try:
+      content = await self._backend.get(key)
+    except Exception as exc:  # noqa: BLE001 - a cache outage should only cost a model call
+      logger.warning("LLM response cache lookup failed: %s", exc)
+      content = None
+    if content is None:
+      response_cache_stats.misses += 1
+    else:
+      response_cache_stats.hits += 1
+    return content
+
+  async def set(self, key: str, *, model: str, content: dict[str, Any]) -> None:
+    try:
+      await self._backend.set(key, model=model, content=content, ttl_seconds=self._ttl_seconds)
+    except Exception as exc:  # noqa: BLE001 - a cache outage should only cost a model call
+      logger.warning("LLM response cache store failed: %s", exc)
+
+
+def structured_cache_key(*, model: str, prompt: str, schema: Any, generation_config: dict[str, Any]) -> str:
+  """Hash everything that determines a structured response so identical requests share one entry."""
+  prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+  schema_hash = hashlib.sha256(json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+  config_json = json.dumps(generation_config, sort_keys=True, separators=(",", ":"), default=str)
+  return hashlib.sha256(f"{model}\n{prompt_hash}\n{schema_hash}\n{config_json}".encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+  """Build the configured cache once per process so the in-memory LRU is shared by every model client."""
+  settings = get_settings()
+  backend: ResponseCacheBackend
+  if settings.llm_response_cache_backend == "postgres":
+    backend = PostgresResponseCache()
+  else:
+    backend = InMemoryResponseCache(max_entries=settings.llm_response_cache_max_entries)
+  return ResponseCache(backend, ttl_seconds=settings.llm_response_cache_ttl_seconds)
+
+
+def response_cache_for_agent(runtime_config: dict[str, Any], agent: str) -> ResponseCache | None:
+  """Return the shared cache when runtime config opts the agent in, otherwise None."""
+  enabled_agents = runtime_config.get("ai.response_cache.agents") or []
+  if not isinstance(enabled_agents, list) or agent.lower() not in enabled_agents:
+    return None
+  return get_response_cache()
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
+from app.ai.backoff import ErrorClass, classify_error
+from app.ai.circuit_breaker import CircuitBreakerRegistry, get_breaker_registry
 from app.ai.errors import is_provider_error
 from app.ai.providers.audit import instrument_model
 from app.ai.providers.base import AIModel, ModelResponse, Provider, StructuredModelResponse
 from app.schema.lesson_catalog import _GATHERER_MODELS, _OUTCOMES_MODELS, _PLANNER_MODELS, _REPAIRER_MODELS, _STRUCTURER_MODELS
+from app.services.model_routing import split_provider_model
 
 if TYPE_CHECKING:
-  pass
+  from app.ai.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
 
 
 class ProviderMode(str, Enum):
@@ -36,16 +44,35 @@ def get_provider_for_mode(mode: str | ProviderMode) -> Provider:
   raise ValueError(f"Unsupported provider mode '{mode}'.")
 
 
-def get_model_for_mode(mode: str | ProviderMode, model: str | None = None, *, agent: str | None = None) -> AIModel:
-  """Return a model client for the given mode and model name."""
+def get_model_for_mode(mode: str | ProviderMode, model: str | None = None, *, agent: str | None = None, response_cache: ResponseCache | None = None, fallbacks: Sequence[str] | None = None) -> AIModel:
+  """Return a model client for the given mode and model name.
+
+  Pass response_cache (see app.ai.response_cache.response_cache_for_agent) to let structured calls replay cached responses.
+  Pass fallbacks (see model_fallbacks_for_agent) to fail over to other "provider/model" candidates when this one is unhealthy.
+  """
   provider = get_provider_for_mode(mode)
   provider_name = getattr(provider, "name", mode.value if isinstance(mode, ProviderMode) else str(mode))
   model_sequence = _build_model_sequence(provider=provider, model=model, agent=agent)
-  return FallbackModel(provider=provider, provider_name=provider_name, model_sequence=model_sequence)
+  candidates = [ModelCandidate(provider_name=provider_name, model=name) for name in model_sequence]
+  for raw_value in fallbacks or ():
+    fallback_provider, fallback_model = split_provider_model(raw_value, provider_name)
+    candidate = ModelCandidate(provider_name=fallback_provider, model=fallback_model)
+    if candidate not in candidates:
+      candidates.append(candidate)
+  return FallbackModel(provider=provider, provider_name=provider_name, candidates=candidates, response_cache=response_cache)
+
+
+def model_fallbacks_for_agent(runtime_config: dict[str, Any], agent: str) -> list[str]:
+  """Return the ordered "provider/model" failover candidates configured for an agent, or an empty list."""
+  failover = runtime_config.get("ai.model_failover") or {}
+  if not isinstance(failover, dict):
+    return []
+  candidates = failover.get(agent.lower()) or []
+  return [str(item) for item in candidates if isinstance(item, str) and item.strip()]
 
 
 def _build_model_sequence(provider: Provider, model: str | None, agent: str | None) -> list[str]:
-  """Build a list containing *only* the target model to disable automatic fallbacks."""
+  """Build a list containing *only* the target model; failover candidates come from runtime config instead."""
   # User request: "there should be only one call for planner and one for section"
   # We strictly respect the requested model or the provider default.
 
@@ -86,65 +113,149 @@ def _rotate_models(models: list[str], start: str | None) -> list[str]:
 _AGENT_MODEL_ORDER: dict[str, list[str]] = {"gatherer": _GATHERER_MODELS, "gatherer_structurer": _GATHERER_MODELS, "planner": _PLANNER_MODELS, "structurer": _STRUCTURER_MODELS, "repairer": _REPAIRER_MODELS, "outcomes": _OUTCOMES_MODELS}
 
 
-class FallbackModel(AIModel):
-  """Model wrapper that retries with fallback models on provider errors."""
+@dataclass(frozen=True)
+class ModelCandidate:
+  """One provider/model pair in a failover sequence."""
+
+  provider_name: str
+  model: str | None
+
+  @property
+  def key(self) -> str:
+    return f"{self.provider_name}/{self.model or 'default'}"
+
 
-  def __init__(self, *, provider: Provider, provider_name: str, model_sequence: list[str]) -> None:
-    self._provider = provider
-    self._provider_name = provider_name
-    self._model_sequence = model_sequence
-    self._active_index = -1
+def _is_failover_error(exc: Exception) -> bool:
+  """Return True when an error reflects the candidate's health rather than the request itself.
+
+  Only the status/transport classification counts: provider-name hints such as "gemini" also match malformed-output errors.
+  """
+  if isinstance(exc, NotImplementedError):
+    return False
+  return classify_error(exc) is not ErrorClass.FATAL
+
+
+class FallbackModel(AIModel):
+  """Model wrapper that fails over across ordered candidates, skipping those whose circuit is open.
+
+  How/Why:
+    - Each candidate's breaker is shared process-wide, so once an endpoint degrades every job shifts to the next healthy candidate
+      instead of paying for its timeouts first.
+    - When every circuit is open the primary is still tried, so a single-candidate agent keeps working exactly as before.
+  """
+
+  def __init__(self, *, provider: Provider, provider_name: str, candidates: list[ModelCandidate], response_cache: ResponseCache | None = None, breakers: CircuitBreakerRegistry | None = None) -> None:
+    self._providers: dict[str, Provider] = {provider_name: provider}
+    self._candidates = candidates
+    self._response_cache = response_cache
+    self._breakers = breakers or get_breaker_registry()
+    self._clients: dict[ModelCandidate, AIModel] = {}
     self._active_model: AIModel | None = None
     # Prime the first available model before serving requests.
-    self._activate_next_model()
+    for candidate in candidates:
+      model_client = self._client_for(candidate)
+      if model_client is not None:
+        self._activate(model_client, candidate)
+        break
 
   async def generate(self, prompt: str) -> ModelResponse:
-    """Generate text while falling back on provider/model errors."""
+    """Generate text while failing over on provider/model errors."""
     return await self._attempt(lambda model: model.generate(prompt))
 
   async def generate_structured(self, prompt: str, schema: dict[str, Any]) -> StructuredModelResponse:
-    """Generate structured output while falling back on provider/model errors."""
+    """Generate structured output while failing over on provider/model errors."""
     return await self._attempt(lambda model: model.generate_structured(prompt, schema))
 
   async def generate_image(self, prompt: str) -> bytes:
-    """Generate image bytes while falling back on provider/model errors."""
+    """Generate image bytes while failing over on provider/model errors."""
     return await self._attempt(lambda model: model.generate_image(prompt))
 
-  async def _attempt(self, func: Callable[[AIModel], Any]) -> Any:
-    """Execute a model call with provider-aware fallbacks."""
-    while True:
-      model = self._active_model
-
-      if model is None:
-        raise RuntimeError("No model available for provider fallback.")
+  async def generate_speech(self, text: str, voice: str | None = None) -> bytes:
+    """Generate speech audio while failing over on provider/model errors."""
+    return await self._attempt(lambda model: model.generate_speech(text, voice))
 
+  async def _attempt(self, func: Callable[[AIModel], Any]) -> Any:
+    """Try candidates in order, recording each outcome on its breaker."""
+    stats = self._breakers.stats
+    ready = [candidate for candidate in self._candidates if self._client_for(candidate) is not None]
+    if not ready:
+      raise RuntimeError("No model available for provider fallback.")
+
+    last_error: Exception | None = None
+    for candidate in ready:
+      # Ask the breaker only when the candidate is reached so a half-open probe is never admitted and then left unused.
+      if not self._breakers.breaker_for(candidate.key).allow_request():
+        stats.increment(stats.skipped_open, candidate.key)
+        continue
+      if last_error is not None:
+        stats.failovers += 1
+        logger.warning("Failing over to model candidate %s after: %s", candidate.key, last_error)
       try:
-        return await func(model)
+        return await self._call_candidate(candidate, func)
       except Exception as exc:  # noqa: BLE001
-        if not is_provider_error(exc):
+        if not _is_failover_error(exc):
           raise
-
-        if not self._activate_next_model():
-          raise
-
-  def _activate_next_model(self) -> bool:
-    """Activate the next available model in the fallback sequence."""
-    next_index = self._active_index + 1
-    while next_index < len(self._model_sequence):
-      model_name = self._model_sequence[next_index]
+        last_error = exc
+
+    if last_error is not None:
+      stats.exhausted += 1
+      raise last_error
+    logger.warning("All model candidates have open circuits; trying %s anyway.", ready[0].key)
+    return await self._call_candidate(ready[0], func)
+
+  async def _call_candidate(self, candidate: ModelCandidate, func: Callable[[AIModel], Any]) -> Any:
+    """Call one candidate and record the outcome on its breaker and counters."""
+    stats = self._breakers.stats
+    breaker = self._breakers.breaker_for(candidate.key)
+    model_client = self._clients[candidate]
+    stats.increment(stats.calls, candidate.key)
+    self._activate(model_client, candidate)
+    started = time.monotonic()
+    try:
+      result = await func(model_client)
+    except Exception as exc:  # noqa: BLE001
+      if _is_failover_error(exc):
+        breaker.record_failure()
+        stats.increment(stats.failures, candidate.key)
+      else:
+        # The candidate answered; a bad request or unparseable output says nothing about its health.
+        breaker.record_success(time.monotonic() - started)
+      raise
+    except BaseException:
+      breaker.release()
+      raise
+    breaker.record_success(time.monotonic() - started)
+    return result
+
+  def _client_for(self, candidate: ModelCandidate) -> AIModel | None:
+    """Return the audited client for a candidate, building it on first use; None when the provider rejects the model."""
+    model_client = self._clients.get(candidate)
+    if model_client is not None:
+      return model_client
+    provider = self._providers.get(candidate.provider_name)
+    if provider is None:
       try:
-        model_client = self._provider.get_model(model_name)
-      except Exception as exc:  # noqa: BLE001
-        if not is_provider_error(exc):
-          raise
-        next_index += 1
-        continue
-
-      # Wrap provider models to capture audit telemetry without changing call sites.
-      self._active_model = instrument_model(model_client, self._provider_name)
-      self.name = getattr(self._active_model, "name", model_name)
-      self.supports_structured_output = getattr(self._active_model, "supports_structured_output", False)
-      self._active_index = next_index
-      return True
-
-    return False
+        provider = get_provider_for_mode(candidate.provider_name)
+      except ValueError:
+        logger.warning("Skipping model candidate %s: unknown provider.", candidate.key)
+        return None
+      self._providers[candidate.provider_name] = provider
+    try:
+      raw_client = provider.get_model(candidate.model)
+    except Exception as exc:  # noqa: BLE001
+      if not is_provider_error(exc):
+        raise
+      return None
+
+    # Attach the cache to the provider client so the audit wrapper records its hit/miss outcome.
+    raw_client.response_cache = self._response_cache
+    # Wrap provider models to capture audit telemetry without changing call sites.
+    model_client = instrument_model(raw_client, candidate.provider_name)
+    self._clients[candidate] = model_client
+    return model_client
+
+  def _activate(self, model_client: AIModel, candidate: ModelCandidate) -> None:
+    """Expose the serving candidate's name and capabilities to callers."""
+    self._active_model = model_client
+    self.name = getattr(model_client, "name", candidate.model)
+    self.supports_structured_output = getattr(model_client, "supports_structured_output", False)
@@ -1,12 +1,12 @@
 from typing import Annotated, Literal
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import get_current_active_user
-from app.schema.jobs import Job
+from app.jobs.concurrency import get_active_job_count
 from app.schema.quotas import SubscriptionTier, UserTierOverride
 from app.schema.sql import User
 from app.services.users import get_user_subscription_tier
@@ -14,11 +14,13 @@ from app.services.users import get_user_subscription_tier
 FeatureType = Literal["lesson", "research", "writing", "tutor"]
 
 
-async def check_concurrency_limit(feature: FeatureType, user: User, db: AsyncSession) -> None:
-  """
-  Check if the user has reached the concurrency limit for the given feature.
-  Raises HTTPException(429) if limit is reached.
-  """
+def concurrency_limit_http_error(feature: str, limit: int, active_count: int) -> HTTPException:
+  """Build the 429 returned when a user is at their concurrency limit."""
+  return HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=f"Concurrency limit reached for {feature}. Limit: {limit}, Active: {active_count}. Please wait for your current request to complete.")
+
+
+async def resolve_concurrency_limit(feature: FeatureType, user: User, db: AsyncSession) -> int:
+  """Resolve the user's concurrency limit for a feature from their active override or tier."""
   # 1. Get User's Tier ID
   tier_id, _ = await get_user_subscription_tier(db, user.id)
 
@@ -40,30 +42,29 @@ async def check_concurrency_limit(feature: FeatureType, user: User, db: AsyncSes
       val = getattr(tier, limit_field, None)
       if val is not None:
         limit = val
+  return int(limit)
 
-  # 3. Count Active Jobs
-  active_statuses = ["queued", "running"]
-  query = select(func.count(Job.job_id)).where(Job.user_id == str(user.id), Job.status.in_(active_statuses))
 
-  if feature == "lesson":
-    # Include NULL for legacy support, but new writing/research jobs MUST set target_agent.
-    query = query.where(or_(Job.target_agent.is_(None), Job.target_agent.in_(["lesson", "planner"])))
-  elif feature == "research":
-    query = query.where(Job.target_agent == "research")
-  elif feature == "writing":
-    query = query.where(Job.target_agent == "writing")
-  elif feature == "tutor":
-    query = query.where(Job.target_agent == "tutor")
+async def check_concurrency_limit(feature: FeatureType, user: User, db: AsyncSession) -> int:
+  """
+  Check if the user has reached the concurrency limit for the given feature.
+  Raises HTTPException(429) if limit is reached, otherwise returns the resolved limit.
+
+  The pre-check reads the maintained active-job counter; callers that enqueue a job pass the
+  returned limit to job creation, which re-checks and increments the counter atomically.
+  """
+  limit = await resolve_concurrency_limit(feature, user, db)
 
-  count_result = await db.execute(query)
-  active_count = count_result.scalar_one()
+  # 3. Read Active Jobs from the counter maintained by the jobs repository.
+  active_count = await get_active_job_count(db, user_id=str(user.id), feature=feature)
 
   if active_count >= limit:
-    raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=f"Concurrency limit reached for {feature}. Limit: {limit}, Active: {active_count}. Please wait for your current request to complete.")
+    raise concurrency_limit_http_error(feature, limit, active_count)
+  return limit
 
 
 def verify_concurrency(feature: FeatureType):
-  async def _dependency(user: Annotated[User, Depends(get_current_active_user)], db: Annotated[AsyncSession, Depends(get_db)]):
-    await check_concurrency_limit(feature, user, db)
+  async def _dependency(user: Annotated[User, Depends(get_current_active_user)], db: Annotated[AsyncSession, Depends(get_db)]) -> int:
+    return await check_concurrency_limit(feature, user, db)
 
   return _dependency
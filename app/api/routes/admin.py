@@ -10,14 +10,15 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.concurrency import run_in_threadpool
 
+from app.ai.circuit_breaker import get_breaker_registry
 from app.ai.utils.cost import PricingTable
 from app.api.models import JobStatusResponse
 from app.api.msgspec_utils import encode_msgspec_response
 from app.config import Settings, get_settings
-from app.core.database import get_db
+from app.core.database import get_db, get_pool_status
 from app.core.firebase import build_rbac_claims, set_custom_claims
 from app.core.security import get_current_active_user, get_current_admin_user, require_permission, require_role_level
-from app.jobs.models import JobRecord, JobStatus
+from app.jobs.models import JobRecord, JobStatus, JobSummaryRecord
 from app.notifications.factory import build_notification_service
 from app.schema.quotas import SubscriptionTier, UserTierOverride
 from app.schema.sql import Role, RoleLevel, User, UserStatus
@@ -148,6 +149,7 @@ class LlmAuditCallWithCost(BaseModel):
   job_id: str | None
   status: str
   error_message: str | None
+  cache_status: str | None = None
   cost_usd: float
   cost_missing: bool
 
@@ -940,16 +942,15 @@ async def delete_user_promo(user_id: str, db_session: AsyncSession = Depends(get
   await delete_user_feature_flag_overrides(db_session, user_id=user.id)
 
 
-@router.post("/maintenance/archive-lessons", response_model=MaintenanceJobResponse, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:maintenance_archive_lessons"))])
-async def trigger_archive_lessons(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_active_user), settings: Settings = Depends(get_settings), db_session: AsyncSession = Depends(get_db)) -> MaintenanceJobResponse:  # noqa: B008
-  """Trigger a maintenance job to archive old lessons based on tier retention limits."""
+async def _enqueue_maintenance_job(action: str, *, background_tasks: BackgroundTasks, current_user: User, settings: Settings) -> MaintenanceJobResponse:
+  """Queue a maintenance job for the given worker action and kick off processing."""
   job_id = generate_job_id()
   timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
   record = JobRecord(
     job_id=job_id,
     user_id=str(current_user.id),
     job_kind="maintenance",
-    request={"action": "archive_old_lessons", "_meta": {"user_id": str(current_user.id)}},
+    request={"action": action, "_meta": {"user_id": str(current_user.id)}},
     status="queued",
     target_agent="maintenance",
     phase="queued",
@@ -971,6 +972,30 @@ async def trigger_archive_lessons(background_tasks: BackgroundTasks, current_use
   return MaintenanceJobResponse(job_id=job_id)
 
 
+@router.post("/maintenance/archive-lessons", response_model=MaintenanceJobResponse, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:maintenance_archive_lessons"))])
+async def trigger_archive_lessons(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_active_user), settings: Settings = Depends(get_settings), db_session: AsyncSession = Depends(get_db)) -> MaintenanceJobResponse:  # noqa: B008
+  """Trigger a maintenance job to archive old lessons based on tier retention limits."""
+  return await _enqueue_maintenance_job("archive_old_lessons", background_tasks=background_tasks, current_user=current_user, settings=settings)
+
+
+@router.post("/maintenance/reconcile-job-counters", response_model=MaintenanceJobResponse, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:maintenance_reconcile_job_counters"))])
+async def trigger_reconcile_job_counters(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_active_user), settings: Settings = Depends(get_settings)) -> MaintenanceJobResponse:  # noqa: B008
+  """Trigger a maintenance job that recounts active jobs and corrects drifted per-user concurrency counters."""
+  return await _enqueue_maintenance_job("reconcile_job_counters", background_tasks=background_tasks, current_user=current_user, settings=settings)
+
+
+@router.post("/maintenance/compact-job-events", response_model=MaintenanceJobResponse, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:maintenance_compact_job_events"))])
+async def trigger_compact_job_events(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_active_user), settings: Settings = Depends(get_settings)) -> MaintenanceJobResponse:  # noqa: B008
+  """Trigger a maintenance job that folds the events of long-finished jobs into jobs.event_log_json."""
+  return await _enqueue_maintenance_job("compact_job_events", background_tasks=background_tasks, current_user=current_user, settings=settings)
+
+
+@router.post("/maintenance/purge-llm-response-cache", response_model=MaintenanceJobResponse, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:maintenance_purge_llm_response_cache"))])
+async def trigger_purge_llm_response_cache(background_tasks: BackgroundTasks, current_user: User = Depends(get_current_active_user), settings: Settings = Depends(get_settings)) -> MaintenanceJobResponse:  # noqa: B008
+  """Trigger a maintenance job that deletes expired rows from the Postgres LLM response cache."""
+  return await _enqueue_maintenance_job("purge_llm_response_cache", background_tasks=background_tasks, current_user=current_user, settings=settings)
+
+
 @router.patch("/users/{user_id}/approve", response_model=UserStatusResponse, dependencies=[Depends(get_current_admin_user), Depends(require_permission("user_data:edit"))])
 async def approve_user(user_id: str, db_session: AsyncSession = Depends(get_db), settings: Settings = Depends(get_settings), current_user: User = Depends(get_current_admin_user)) -> UserStatusResponse:  # noqa: B008
   """Approve a user account and notify the user."""
@@ -1051,7 +1076,19 @@ async def delete_user_account(user_id: str, db_session: AsyncSession = Depends(g
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
 
-@router.get("/jobs", response_model=PaginatedResponse[JobRecord], dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:jobs_read"))])
+@router.get("/debug/db-pool", dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:jobs_read"))])
+async def get_db_pool_status() -> dict[str, Any]:
+  """Report live database pool occupancy and checkout wait metrics for diagnosing connection starvation."""
+  return get_pool_status()
+
+
+@router.get("/debug/model-circuits", dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:jobs_read"))])
+async def get_model_circuit_status() -> dict[str, Any]:
+  """Report per-candidate circuit breaker state and model failover counters for this process."""
+  return get_breaker_registry().snapshot()
+
+
+@router.get("/jobs", response_model=PaginatedResponse[JobSummaryRecord], dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:jobs_read"))])
 async def list_jobs(
   page: int = Query(1, ge=1),
   limit: int = Query(20, ge=1, le=100),
@@ -1062,8 +1099,8 @@ async def list_jobs(
   target_agent: str | None = None,
   sort_by: str = Query("created_at"),
   sort_order: str = Query("desc"),
-) -> PaginatedResponse[JobRecord]:
-  """List jobs for admins with pagination, filtering, and sorting to control load and exposure."""
+) -> PaginatedResponse[JobSummaryRecord]:
+  """List job summaries for admins with pagination, filtering, and sorting; payloads are served by the detail route."""
   # Resolve the repository here to keep handler orchestration focused.
   repo = get_jobs_repo()
   # Fetch results and totals together for consistent pagination output.
@@ -1072,6 +1109,15 @@ async def list_jobs(
   return PaginatedResponse(items=items, total=total, limit=limit, offset=(page - 1) * limit)
 
 
+@router.get("/jobs/{job_id}", response_model=JobRecord, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:jobs_read"))])
+async def get_job_detail(job_id: str) -> JobRecord:
+  """Return one job with its request, result, error payloads and recent logs."""
+  record = await get_jobs_repo().get_job(job_id)
+  if record is None:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+  return record
+
+
 @router.post("/jobs/{job_id}/resume-from-failure", response_model=JobStatusResponse, dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:jobs_read"))])
 async def resume_job_from_failure(
   job_id: str,
@@ -1084,15 +1130,23 @@ async def resume_job_from_failure(
 
 @router.get("/lessons", response_model=PaginatedResponse[LessonRecord], dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:lessons_read"))])
 async def list_lessons(
-  page: int = Query(1, ge=1), limit: int = Query(20, ge=1, le=100), topic: str | None = None, status: str | None = None, user_id: str | None = None, is_archived: bool | None = None, sort_by: str = Query("created_at"), sort_order: str = Query("desc")
+  page: int = Query(1, ge=1),
+  limit: int = Query(20, ge=1, le=100),
+  topic: str | None = None,
+  status: str | None = None,
+  user_id: str | None = None,
+  is_archived: bool | None = None,
+  sort_by: str = Query("created_at"),
+  sort_order: str = Query("desc"),
+  estimate_total: bool = False,
 ) -> PaginatedResponse[LessonRecord]:
-  """List lessons with pagination, filtering, and sorting to keep responses bounded and predictable."""
+  """List lessons with pagination, filtering, and sorting; estimate_total trades an exact count for the planner estimate."""
   # Resolve the repository here to keep handler orchestration focused.
   repo = get_lessons_repo()
   # Fetch results and totals together for consistent pagination output.
-  items, total = await repo.list_lessons(page=page, limit=limit, topic=topic, status=status, user_id=user_id, is_archived=is_archived, sort_by=sort_by, sort_order=sort_order)
+  result = await repo.list_lessons(page=page, limit=limit, topic=topic, status=status, user_id=user_id, is_archived=is_archived, sort_by=sort_by, sort_order=sort_order, total="estimated" if estimate_total else "exact")
   # Return a typed pagination envelope that callers can rely on.
-  return PaginatedResponse(items=items, total=total, limit=limit, offset=(page - 1) * limit)
+  return PaginatedResponse(items=result.items, total=result.total or 0, limit=limit, offset=(page - 1) * limit)
 
 
 @router.get("/llm-calls", response_model=PaginatedResponse[LlmAuditCallWithCost], dependencies=[Depends(require_role_level(RoleLevel.GLOBAL)), Depends(require_permission("admin:llm_calls_read"))])
@@ -1147,6 +1201,7 @@ async def list_llm_calls(
         job_id=item.job_id,
         status=item.status,
         error_message=item.error_message,
+        cache_status=item.cache_status,
         cost_usd=call_cost,
         cost_missing=cost_missing,
       )
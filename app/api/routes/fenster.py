@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import uuid
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,30 +13,89 @@ from app.core.security import get_current_active_user, require_feature_flag, req
 from app.schema.fenster import FensterWidget, FensterWidgetType
 from app.schema.lessons import Lesson, Section, Subsection, SubsectionWidget
 from app.schema.sql import User
+from app.services.fenster_blob_cache import get_fenster_blob_cache
+from app.utils.etags import etag_matches, strong_etag
 
 router = APIRouter()
 
+# Widgets are per-user and can be rebuilt in place, so clients keep them but revalidate with the ETag on every open.
+FENSTER_CACHE_CONTROL = "private, no-cache"
+FENSTER_VARY = "Accept-Encoding, Authorization"
+# Lookups read these columns only; the blob is fetched separately and only when it has to be sent.
+_HEAD_COLUMNS = (FensterWidget.fenster_id, FensterWidget.type, FensterWidget.url, FensterWidget.content_etag)
 
-def _render_fenster_widget_response(widget: FensterWidget) -> Response:
-  """Render the fenster widget based on persisted storage type."""
-  if widget.type == FensterWidgetType.INLINE_BLOB:
-    if not widget.content:
-      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget content missing")
-    return Response(content=widget.content, media_type="text/html; charset=utf-8", headers={"Content-Encoding": "br", "Content-Security-Policy": "frame-ancestors 'self'"})
-  if widget.type == FensterWidgetType.CDN_URL:
-    if not widget.url:
+
+async def _find_fenster_head(db: AsyncSession, *, user_id: str, fenster_id: uuid.UUID | None = None, public_id: str | None = None) -> Any | None:
+  """Return the visible fenster row (without content) by fenster UUID or public id."""
+  stmt = select(*_HEAD_COLUMNS).where(FensterWidget.creator_id == user_id, FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
+  stmt = stmt.where(FensterWidget.fenster_id == fenster_id) if fenster_id is not None else stmt.where(FensterWidget.public_id == public_id)
+  return (await db.execute(stmt)).first()
+
+
+async def _find_mapped_fenster_head(db: AsyncSession, *, user_id: str, subsection_widget_id: str) -> Any | None:
+  """Resolve a subsection_widget public id to its fenster row, including legacy UUID widget ids."""
+  mapping_stmt = (
+    select(SubsectionWidget.widget_id)
+    .join(Subsection, Subsection.id == SubsectionWidget.subsection_id)
+    .join(Section, Section.section_id == Subsection.section_id)
+    .join(Lesson, Lesson.lesson_id == Section.lesson_id)
+    .where(SubsectionWidget.public_id == subsection_widget_id, SubsectionWidget.widget_type == "fenster", SubsectionWidget.is_archived.is_(False), Subsection.is_archived.is_(False), Lesson.user_id == user_id, Lesson.is_archived.is_(False))
+    .limit(1)
+  )
+  mapping = (await db.execute(mapping_stmt)).first()
+  if mapping is None or mapping.widget_id is None:
+    return None
+  mapped_widget_id = str(mapping.widget_id).strip()
+  head = await _find_fenster_head(db, user_id=user_id, public_id=mapped_widget_id)
+  if head is None:
+    try:
+      mapped_uuid = uuid.UUID(mapped_widget_id)
+    except ValueError:
+      mapped_uuid = None
+    if mapped_uuid is not None:
+      head = await _find_fenster_head(db, user_id=user_id, fenster_id=mapped_uuid)
+  return head
+
+
+async def _render_fenster_widget_response(db: AsyncSession, head: Any, request: Request) -> Response:
+  """Render the fenster widget based on persisted storage type, answering 304 before any blob is read."""
+  if head.type == FensterWidgetType.CDN_URL:
+    if not head.url:
       raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget URL missing")
-    return RedirectResponse(url=widget.url, status_code=status.HTTP_302_FOUND)
-  raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Unsupported widget type: {widget.type}")
+    return RedirectResponse(url=head.url, status_code=status.HTTP_302_FOUND)
+  if head.type != FensterWidgetType.INLINE_BLOB:
+    raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Unsupported widget type: {head.type}")
+
+  headers = {"Cache-Control": FENSTER_CACHE_CONTROL, "Vary": FENSTER_VARY, "Content-Security-Policy": "frame-ancestors 'self'"}
+  if_none_match = request.headers.get("if-none-match")
+  etag = head.content_etag
+  if etag is not None and etag_matches(if_none_match, etag):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "ETag": etag})
+
+  cache = get_fenster_blob_cache()
+  cache_key = str(head.fenster_id)
+  blob = cache.get(cache_key, etag) if etag is not None else None
+  if blob is None:
+    blob = (await db.execute(select(FensterWidget.content).where(FensterWidget.fenster_id == head.fenster_id))).scalar_one_or_none()
+    if not blob:
+      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget content missing")
+    if etag is None:
+      # Rows written before content_etag existed still get a validator for the next request.
+      etag = strong_etag(blob)
+      if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "ETag": etag})
+    cache.put(cache_key, etag, blob)
+  return Response(content=blob, media_type="text/html; charset=utf-8", headers={**headers, "ETag": etag, "Content-Encoding": "br"})
 
 
 @router.get("/{widget_id}", dependencies=[Depends(require_permission("fenster:view")), Depends(require_tier(["Plus", "Pro"])), Depends(require_feature_flag("feature.fenster"))])
-async def get_fenster_widget(widget_id: str, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)) -> Response:
+async def get_fenster_widget(widget_id: str, request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)) -> Response:
   """
   Retrieve a Fenster widget by ID.
   Requires 'Plus' or 'Pro' tier.
   """
-  widget: FensterWidget | None = None
+  user_id = str(current_user.id)
+  head = None
   try:
     fenster_uuid = uuid.UUID(widget_id)
   except ValueError:
@@ -45,71 +105,20 @@ async def get_fenster_widget(widget_id: str, db: AsyncSession = Depends(get_db),
   # 1) Try direct fenster UUID lookup first.
   # 2) If not a UUID / not found, treat the same path param as subsection_widget public_id.
   if fenster_uuid is not None:
-    stmt = select(FensterWidget).where(FensterWidget.fenster_id == fenster_uuid, FensterWidget.creator_id == str(current_user.id), FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
-    result = await db.execute(stmt)
-    widget = result.scalar_one_or_none()
-  if widget is None:
-    stmt = select(FensterWidget).where(FensterWidget.public_id == widget_id, FensterWidget.creator_id == str(current_user.id), FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
-    result = await db.execute(stmt)
-    widget = result.scalar_one_or_none()
-  if widget is None:
-    mapping_stmt = (
-      select(SubsectionWidget.widget_id)
-      .join(Subsection, Subsection.id == SubsectionWidget.subsection_id)
-      .join(Section, Section.section_id == Subsection.section_id)
-      .join(Lesson, Lesson.lesson_id == Section.lesson_id)
-      .where(SubsectionWidget.public_id == widget_id, SubsectionWidget.widget_type == "fenster", SubsectionWidget.is_archived.is_(False), Subsection.is_archived.is_(False), Lesson.user_id == str(current_user.id), Lesson.is_archived.is_(False))
-      .limit(1)
-    )
-    mapping_result = await db.execute(mapping_stmt)
-    mapping = mapping_result.first()
-    if mapping is None or mapping.widget_id is None:
-      raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget not found")
-    mapped_widget_id = str(mapping.widget_id).strip()
-    fenster_stmt = select(FensterWidget).where(FensterWidget.public_id == mapped_widget_id, FensterWidget.creator_id == str(current_user.id), FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
-    fenster_result = await db.execute(fenster_stmt)
-    widget = fenster_result.scalar_one_or_none()
-    if widget is None:
-      try:
-        mapped_uuid = uuid.UUID(mapped_widget_id)
-      except ValueError:
-        mapped_uuid = None
-      if mapped_uuid is not None:
-        legacy_stmt = select(FensterWidget).where(FensterWidget.fenster_id == mapped_uuid, FensterWidget.creator_id == str(current_user.id), FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
-        widget = (await db.execute(legacy_stmt)).scalar_one_or_none()
-  if widget is None:
+    head = await _find_fenster_head(db, user_id=user_id, fenster_id=fenster_uuid)
+  if head is None:
+    head = await _find_fenster_head(db, user_id=user_id, public_id=widget_id)
+  if head is None:
+    head = await _find_mapped_fenster_head(db, user_id=user_id, subsection_widget_id=widget_id)
+  if head is None:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget not found")
-  return _render_fenster_widget_response(widget)
+  return await _render_fenster_widget_response(db, head, request)
 
 
 @router.get("/subsection-widget/{subsection_widget_id}", dependencies=[Depends(require_permission("fenster:view")), Depends(require_tier(["Plus", "Pro"])), Depends(require_feature_flag("feature.fenster"))])
-async def get_fenster_widget_by_subsection_widget_id(subsection_widget_id: str, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)) -> Response:
+async def get_fenster_widget_by_subsection_widget_id(subsection_widget_id: str, request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)) -> Response:
   """Retrieve a fenster widget using the subsection_widget public id."""
-  mapping_stmt = (
-    select(SubsectionWidget.widget_type, SubsectionWidget.widget_id)
-    .join(Subsection, Subsection.id == SubsectionWidget.subsection_id)
-    .join(Section, Section.section_id == Subsection.section_id)
-    .join(Lesson, Lesson.lesson_id == Section.lesson_id)
-    .where(SubsectionWidget.public_id == subsection_widget_id, SubsectionWidget.widget_type == "fenster", SubsectionWidget.is_archived.is_(False), Subsection.is_archived.is_(False), Lesson.user_id == str(current_user.id), Lesson.is_archived.is_(False))
-    .limit(1)
-  )
-  mapping_result = await db.execute(mapping_stmt)
-  mapping = mapping_result.first()
-  if mapping is None or mapping.widget_id is None:
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget not found")
-  mapped_widget_id = str(mapping.widget_id).strip()
-
-  fenster_stmt = select(FensterWidget).where(FensterWidget.public_id == mapped_widget_id, FensterWidget.creator_id == str(current_user.id), FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
-  fenster_result = await db.execute(fenster_stmt)
-  widget = fenster_result.scalar_one_or_none()
-  if widget is None:
-    try:
-      mapped_uuid = uuid.UUID(mapped_widget_id)
-    except ValueError:
-      mapped_uuid = None
-    if mapped_uuid is not None:
-      legacy_stmt = select(FensterWidget).where(FensterWidget.fenster_id == mapped_uuid, FensterWidget.creator_id == str(current_user.id), FensterWidget.is_archived.is_(False), FensterWidget.status == "completed")
-      widget = (await db.execute(legacy_stmt)).scalar_one_or_none()
-  if widget is None:
+  head = await _find_mapped_fenster_head(db, user_id=str(current_user.id), subsection_widget_id=subsection_widget_id)
+  if head is None:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Widget not found")
-  return _render_fenster_widget_response(widget)
+  return await _render_fenster_widget_response(db, head, request)
@@ -5,11 +5,13 @@ import time
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.pipeline.contracts import GenerationRequest
-from app.api.deps_concurrency import check_concurrency_limit
+from app.ai.response_cache import response_cache_for_agent
+from app.ai.router import model_fallbacks_for_agent
+from app.api.deps_concurrency import check_concurrency_limit, concurrency_limit_http_error
 from app.api.models import (
   GenerateLessonRequest,
   GenerateLessonResponse,
@@ -27,14 +29,15 @@ from app.api.models import (
 from app.config import Settings, get_settings
 from app.core.database import get_db
 from app.core.security import get_current_active_user, require_permission
+from app.jobs.concurrency import ConcurrencyLimitExceededError
 from app.jobs.models import JobRecord
 from app.jobs.progress import build_call_plan
-from app.schema.lesson_catalog import build_lesson_catalog
 from app.schema.lesson_requests import LessonRequest
 from app.schema.outcomes import OutcomesAgentResponse
 from app.schema.quotas import QuotaPeriod
 from app.schema.sql import User
 from app.services.jobs import create_job
+from app.services.lesson_catalog_cache import get_lesson_catalog_entry
 from app.services.outcomes import generate_lesson_outcomes
 from app.services.quota_buckets import QuotaExceededError, consume_quota, get_quota_snapshot, refund_quota
 from app.services.request_validation import _validate_generate_request
@@ -43,6 +46,7 @@ from app.services.tasks.factory import get_task_enqueuer
 from app.services.users import get_user_subscription_tier
 from app.services.widget_entitlements import validate_widget_entitlements
 from app.storage.factory import _get_jobs_repo, _get_repo
+from app.utils.etags import etag_matches
 from app.utils.ids import generate_job_id, generate_lesson_id
 
 router = APIRouter()
@@ -56,6 +60,7 @@ _MAX_LIMIT = 100
 
 @router.get("", response_model=list[LessonRecordResponse], dependencies=[Depends(require_permission("lesson:list_own"))])
 async def list_lessons(
+  response: Response,
   settings: Settings = Depends(get_settings),
   current_user: User = Depends(get_current_active_user),
   page: Annotated[int, Query(ge=1)] = _DEFAULT_PAGE,
@@ -64,31 +69,43 @@ async def list_lessons(
   topic: str | None = None,
   sort_by: str = Query("created_at"),
   sort_order: str = Query("desc"),
+  cursor: str | None = None,
 ) -> list[LessonRecordResponse]:
-  """List lessons for the current user with pagination, filtering, and sorting."""
-  repo = _get_repo(settings)
+  """List lessons for the current user with pagination, filtering, and sorting.
 
-  lessons, _total = await repo.list_lessons(page=page, limit=limit, user_id=str(current_user.id), status=status, topic=topic, sort_by=sort_by, sort_order=sort_order)
+  Pass the X-Next-Cursor header from one response as cursor to fetch the next page by keyset instead of page number.
+  """
+  repo = _get_repo(settings)
 
-  response = []
+  # Archived lessons are hidden from end users; the equality filter also lets the per-user sort indexes serve the page.
+  try:
+    result = await repo.list_lessons(page=page, limit=limit, user_id=str(current_user.id), is_archived=False, status=status, topic=topic, sort_by=sort_by, sort_order=sort_order, cursor=cursor, total="none")
+  except ValueError as exc:
+    # The status query parameter shadows fastapi.status here.
+    raise HTTPException(status_code=400, detail=str(exc)) from exc
+  lessons = result.items
+  if result.next_cursor is not None:
+    response.headers["X-Next-Cursor"] = result.next_cursor
+
+  # Fetch every table of contents in one projected query rather than one full section load per lesson.
+  summaries_by_lesson = await repo.list_section_summaries([record.lesson_id for record in lessons])
+  items = []
   for record in lessons:
-    sections = await repo.list_sections(record.lesson_id)
-    section_summaries = [SectionSummary(section_id=s.section_id, title=s.title, status=s.status) for s in sections]
-    response.append(LessonRecordResponse(lesson_id=record.lesson_id, topic=record.topic, title=record.title, created_at=record.created_at, sections=section_summaries))
+    section_summaries = [SectionSummary(section_id=s.section_id, title=s.title, status=s.status) for s in summaries_by_lesson.get(record.lesson_id, [])]
+    items.append(LessonRecordResponse(lesson_id=record.lesson_id, topic=record.topic, title=record.title, created_at=record.created_at, sections=section_summaries))
 
-  return response
+  return items
 
 
-@router.get("/catalog", response_model=LessonCatalogResponse)
-async def get_lesson_catalog(response: Response, settings: Settings = Depends(get_settings), db_session: AsyncSession = Depends(get_db)) -> LessonCatalogResponse:  # noqa: B008
+@router.get("/catalog", response_model=LessonCatalogResponse, responses={304: {"description": "Catalog unchanged since the supplied ETag."}})
+async def get_lesson_catalog(request: Request, settings: Settings = Depends(get_settings), db_session: AsyncSession = Depends(get_db)) -> Response:  # noqa: B008
   """Return blueprint, teaching style, and widget metadata for clients."""
-  # Toggle cache control with DB-backed config so operators can refresh dynamically.
-  runtime_config = await resolve_effective_runtime_config(db_session, settings=settings, org_id=None, subscription_tier_id=None, user_id=None)
-  if runtime_config.get("lessons.cache_catalog") is True:
-    response.headers["Cache-Control"] = "public, max-age=86400"
-  # Build a static payload so the client can cache the response safely.
-  payload = build_lesson_catalog(settings)
-  return LessonCatalogResponse(**payload)
+  # Serve pre-encoded bytes; cache headers follow the DB-backed toggle so operators can refresh dynamically.
+  entry = await get_lesson_catalog_entry(db_session, settings=settings)
+  headers = {"ETag": entry.etag, "Cache-Control": entry.cache_control}
+  if etag_matches(request.headers.get("if-none-match"), entry.etag):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+  return Response(content=entry.body, media_type="application/json", headers=headers)
 
 
 @router.post("/outcomes", response_model=OutcomesAgentResponse, dependencies=[Depends(require_permission("lesson:outcomes"))])
@@ -155,7 +172,16 @@ async def generate_outcomes_endpoint(  # noqa: B008
     widgets=request.widgets,
   )
   try:
-    payload, _model_used = await generate_lesson_outcomes(generation_request, settings=settings, provider=provider, model=str(model_name) if model_name else None, job_id=job_id, max_outcomes=max_outcomes)
+    payload, _model_used = await generate_lesson_outcomes(
+      generation_request,
+      settings=settings,
+      provider=provider,
+      model=str(model_name) if model_name else None,
+      job_id=job_id,
+      max_outcomes=max_outcomes,
+      response_cache=response_cache_for_agent(runtime_config, "outcomes"),
+      fallbacks=model_fallbacks_for_agent(runtime_config, "outcomes"),
+    )
   except Exception as exc:  # noqa: BLE001
     # Compensate quota reservation when the model call fails.
     try:
@@ -179,7 +205,7 @@ async def generate_lesson(  # noqa: B008
   if not request.idempotency_key:
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="idempotency_key is required.")
   # Enforce lesson concurrency after request validation to fail malformed bodies before DB-heavy checks.
-  await check_concurrency_limit("lesson", current_user, db_session)
+  concurrency_limit = await check_concurrency_limit("lesson", current_user, db_session)
   tier_id, _tier_name = await get_user_subscription_tier(db_session, current_user.id)
   runtime_config = await resolve_effective_runtime_config(db_session, settings=settings, org_id=current_user.org_id, subscription_tier_id=tier_id, user_id=None)
   validate_widget_entitlements(request.widgets, runtime_config=runtime_config)
@@ -303,7 +329,10 @@ async def generate_lesson(  # noqa: B008
     ttl=job_ttl,
     idempotency_key=request.idempotency_key or f"lesson-generate:{job_id}",
   )
-  await jobs_repo.create_job(job_record)
+  try:
+    await jobs_repo.create_job(job_record, concurrency_limit=concurrency_limit)
+  except ConcurrencyLimitExceededError as exc:
+    raise concurrency_limit_http_error(exc.feature, exc.limit, exc.active_count) from exc
   await db_session.commit()
 
   # Enqueue Task
@@ -337,9 +366,10 @@ async def get_lesson(  # noqa: B008
   if record.is_archived:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found.")
 
-  sections = await repo.list_sections(lesson_id_str)
+  # Only ids, titles and statuses are returned, so skip the section content documents entirely.
+  summaries_by_lesson = await repo.list_section_summaries([lesson_id_str])
 
-  section_summaries = [SectionSummary(section_id=s.section_id, title=s.title, status=s.status) for s in sections]
+  section_summaries = [SectionSummary(section_id=s.section_id, title=s.title, status=s.status) for s in summaries_by_lesson.get(lesson_id_str, [])]
 
   return LessonRecordResponse(lesson_id=record.lesson_id, topic=record.topic, title=record.title, created_at=record.created_at, sections=section_summaries)
 
@@ -386,7 +416,7 @@ async def create_lesson_job(  # noqa: B008
   validate_widget_entitlements(request.widgets, runtime_config=runtime_config)
   _validate_generate_request(request, settings, max_topic_length=runtime_config.get("limits.max_topic_length"))
   # Enforce lesson concurrency after request validation to fail malformed bodies before DB-heavy checks.
-  await check_concurrency_limit("lesson", current_user, db_session)
+  concurrency_limit = await check_concurrency_limit("lesson", current_user, db_session)
   if not request.idempotency_key:
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="idempotency_key is required.")
   lesson_id = generate_lesson_id()
@@ -412,4 +442,4 @@ async def create_lesson_job(  # noqa: B008
   payload["_meta"] = {"user_id": str(current_user.id), "lesson_request_id": int(lesson_request.id)}
   create_payload = JobCreateRequest(job_kind="lesson", target_agent="planner", idempotency_key=request.idempotency_key, payload=payload, lesson_id=lesson_id)
   await db_session.commit()
-  return await create_job(create_payload, settings, background_tasks, db_session, user_id=str(current_user.id))
+  return await create_job(create_payload, settings, background_tasks, db_session, user_id=str(current_user.id), concurrency_limit=concurrency_limit)
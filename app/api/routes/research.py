@@ -6,10 +6,11 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 
 from app.ai.agents.research import ResearchAgent
-from app.api.deps_concurrency import verify_concurrency
+from app.api.deps_concurrency import concurrency_limit_http_error, verify_concurrency
 from app.config import Settings, get_settings
 from app.core.database import get_session_factory
 from app.core.security import get_current_active_user, require_feature_flag, require_permission
+from app.jobs.concurrency import ConcurrencyLimitExceededError
 from app.jobs.models import JobRecord
 from app.schema.research import ResearchDiscoveryRequest, ResearchDiscoveryResponse, ResearchSynthesisRequest, ResearchSynthesisResponse
 from app.schema.sql import User
@@ -26,9 +27,13 @@ def get_research_agent() -> ResearchAgent:
   return ResearchAgent()
 
 
-@router.post("/discover", response_model=ResearchDiscoveryResponse, dependencies=[Depends(require_permission("research:use")), Depends(require_feature_flag("feature.research")), Depends(verify_concurrency("research"))])
+@router.post("/discover", response_model=ResearchDiscoveryResponse, dependencies=[Depends(require_permission("research:use")), Depends(require_feature_flag("feature.research"))])
 async def discover(
-  request: ResearchDiscoveryRequest, agent: Annotated[ResearchAgent, Depends(get_research_agent)], current_user: Annotated[User, Depends(get_current_active_user)], settings: Annotated[Settings, Depends(get_settings)]
+  request: ResearchDiscoveryRequest,
+  agent: Annotated[ResearchAgent, Depends(get_research_agent)],
+  current_user: Annotated[User, Depends(get_current_active_user)],
+  settings: Annotated[Settings, Depends(get_settings)],
+  concurrency_limit: Annotated[int, Depends(verify_concurrency("research"))],
 ) -> ResearchDiscoveryResponse:
   """
   Performs initial web search and returns candidate URLs.
@@ -60,7 +65,11 @@ async def discover(
     ttl=job_ttl,
     idempotency_key=f"research-discover:{tracking_job_id}",
   )
-  await jobs_repo.create_job(tracking_job)
+  try:
+    # The pre-check can race a concurrent request; the slot acquired with the insert is authoritative.
+    await jobs_repo.create_job(tracking_job, concurrency_limit=concurrency_limit)
+  except ConcurrencyLimitExceededError as exc:
+    raise concurrency_limit_http_error(exc.feature, exc.limit, exc.active_count) from exc
 
   try:
     # Resolve runtime config for model selection
@@ -81,9 +90,13 @@ async def discover(
     raise
 
 
-@router.post("/synthesize", response_model=ResearchSynthesisResponse, dependencies=[Depends(require_permission("research:use")), Depends(require_feature_flag("feature.research")), Depends(verify_concurrency("research"))])
+@router.post("/synthesize", response_model=ResearchSynthesisResponse, dependencies=[Depends(require_permission("research:use")), Depends(require_feature_flag("feature.research"))])
 async def synthesize(
-  request: ResearchSynthesisRequest, agent: Annotated[ResearchAgent, Depends(get_research_agent)], current_user: Annotated[User, Depends(get_current_active_user)], settings: Annotated[Settings, Depends(get_settings)]
+  request: ResearchSynthesisRequest,
+  agent: Annotated[ResearchAgent, Depends(get_research_agent)],
+  current_user: Annotated[User, Depends(get_current_active_user)],
+  settings: Annotated[Settings, Depends(get_settings)],
+  concurrency_limit: Annotated[int, Depends(verify_concurrency("research"))],
 ) -> ResearchSynthesisResponse:
   """
   Deep crawls provided URLs and generates a cited report.
@@ -115,7 +128,11 @@ async def synthesize(
     ttl=job_ttl,
     idempotency_key=f"research-synthesize:{tracking_job_id}",
   )
-  await jobs_repo.create_job(tracking_job)
+  try:
+    # The pre-check can race a concurrent request; the slot acquired with the insert is authoritative.
+    await jobs_repo.create_job(tracking_job, concurrency_limit=concurrency_limit)
+  except ConcurrencyLimitExceededError as exc:
+    raise concurrency_limit_http_error(exc.feature, exc.limit, exc.active_count) from exc
 
   try:
     # Resolve runtime config for model selection
@@ -27,6 +27,8 @@ class Settings:
   log_http_4xx: bool
   log_http_bodies: bool
   log_http_body_bytes: int
+  log_http_body_paths: tuple[str, ...]
+  log_http_body_sample_rate: float
   illustration_bucket: str
   export_bucket: str | None
   export_object_prefix: str
@@ -40,6 +42,20 @@ class Settings:
   pg_dsn: str | None
   pg_connect_timeout: int
   llm_audit_enabled: bool
+  llm_response_cache_backend: str
+  llm_response_cache_ttl_seconds: int
+  llm_response_cache_max_entries: int
+  llm_retry_max_attempts: int
+  llm_retry_deadline_seconds: float | None
+  llm_hedge_after_seconds: float | None
+  llm_breaker_error_rate: float
+  llm_breaker_min_calls: int
+  llm_breaker_slow_call_seconds: float
+  llm_breaker_cooldown_seconds: float
+  tutor_subsection_concurrency: int
+  job_progress_flush_seconds: float
+  job_event_compaction_days: int
+  fenster_blob_cache_bytes: int
   gcp_project_id: str | None
   gcp_location: str | None
   firebase_project_id: str | None
@@ -73,6 +89,12 @@ class DatabaseSettings:
   debug: bool
   pg_dsn: str | None
   pg_connect_timeout: int
+  pg_pool_size: int = 10
+  pg_max_overflow: int = 10
+  pg_pool_timeout_seconds: float = 30.0
+  pg_pool_recycle_seconds: int = 1800
+  pg_pool_pre_ping: bool = True
+  pg_statement_cache_size: int = 100
 
 
 def _parse_origins(raw: str | None) -> tuple[str, ...]:
@@ -90,6 +112,16 @@ def _parse_origins(raw: str | None) -> tuple[str, ...]:
   return tuple(origins)
 
 
+def _parse_path_prefixes(raw: str | None) -> tuple[str, ...]:
+  """Parse a comma-separated list of URL path prefixes."""
+
+  if not raw:
+    return ()
+
+  prefixes = [prefix.strip() for prefix in raw.split(",") if prefix.strip()]
+  return tuple(prefix if prefix.startswith("/") else f"/{prefix}" for prefix in prefixes)
+
+
 def _parse_json_dict(raw: str | None, default: dict[str, Any]) -> dict[str, Any]:
   if not raw:
     return default
@@ -139,6 +171,12 @@ def get_settings() -> Settings:
   if log_http_body_bytes <= 0:
     raise ValueError("DYLEN_LOG_HTTP_BODY_BYTES must be a positive integer.")
 
+  # Body capture is opt-in per route prefix and sampled so enabling it never taxes every request.
+  log_http_body_paths = _parse_path_prefixes(os.getenv("DYLEN_LOG_HTTP_BODY_PATHS"))
+  log_http_body_sample_rate = float(os.getenv("DYLEN_LOG_HTTP_BODY_SAMPLE_RATE", "1.0"))
+  if not 0.0 <= log_http_body_sample_rate <= 1.0:
+    raise ValueError("DYLEN_LOG_HTTP_BODY_SAMPLE_RATE must be between 0 and 1.")
+
   email_notifications_enabled = _parse_bool(os.getenv("DYLEN_EMAIL_NOTIFICATIONS_ENABLED"))
   email_from_address = _optional_str(os.getenv("DYLEN_EMAIL_FROM_ADDRESS"))
   email_from_name = _optional_str(os.getenv("DYLEN_EMAIL_FROM_NAME"))
@@ -155,6 +193,54 @@ def get_settings() -> Settings:
     raise ValueError("DYLEN_EXPORT_SIGNED_URL_TTL_SECONDS must be a positive integer.")
   export_max_zip_bytes = _parse_optional_int(os.getenv("DYLEN_EXPORT_MAX_ZIP_BYTES"))
 
+  # Structured LLM responses are cached only for agents opted in via runtime config; these select the store.
+  llm_response_cache_backend = (os.getenv("DYLEN_LLM_RESPONSE_CACHE_BACKEND") or "memory").strip().lower()
+  if llm_response_cache_backend not in {"memory", "postgres"}:
+    raise ValueError("DYLEN_LLM_RESPONSE_CACHE_BACKEND must be 'memory' or 'postgres'.")
+  llm_response_cache_ttl_seconds = int(os.getenv("DYLEN_LLM_RESPONSE_CACHE_TTL_SECONDS", "86400"))
+  if llm_response_cache_ttl_seconds <= 0:
+    raise ValueError("DYLEN_LLM_RESPONSE_CACHE_TTL_SECONDS must be a positive integer.")
+  llm_response_cache_max_entries = int(os.getenv("DYLEN_LLM_RESPONSE_CACHE_MAX_ENTRIES", "512"))
+  if llm_response_cache_max_entries <= 0:
+    raise ValueError("DYLEN_LLM_RESPONSE_CACHE_MAX_ENTRIES must be a positive integer.")
+
+  # Provider calls retry transient failures; the per-call deadline and hedging stay off unless a value is set.
+  llm_retry_max_attempts = int(os.getenv("DYLEN_LLM_RETRY_MAX_ATTEMPTS", "4"))
+  if llm_retry_max_attempts <= 0:
+    raise ValueError("DYLEN_LLM_RETRY_MAX_ATTEMPTS must be a positive integer.")
+  raw_retry_deadline = _optional_str(os.getenv("DYLEN_LLM_RETRY_DEADLINE_SECONDS"))
+  llm_retry_deadline_seconds = float(raw_retry_deadline) if raw_retry_deadline else None
+  if llm_retry_deadline_seconds is not None and llm_retry_deadline_seconds <= 0:
+    raise ValueError("DYLEN_LLM_RETRY_DEADLINE_SECONDS must be positive when set.")
+  raw_hedge_after = _optional_str(os.getenv("DYLEN_LLM_HEDGE_AFTER_SECONDS"))
+  llm_hedge_after_seconds = float(raw_hedge_after) if raw_hedge_after else None
+  if llm_hedge_after_seconds is not None and llm_hedge_after_seconds <= 0:
+    raise ValueError("DYLEN_LLM_HEDGE_AFTER_SECONDS must be positive when set.")
+  llm_breaker_error_rate = float(os.getenv("DYLEN_LLM_BREAKER_ERROR_RATE", "0.5"))
+  if not 0 < llm_breaker_error_rate <= 1:
+    raise ValueError("DYLEN_LLM_BREAKER_ERROR_RATE must be in (0, 1].")
+  llm_breaker_min_calls = int(os.getenv("DYLEN_LLM_BREAKER_MIN_CALLS", "5"))
+  if llm_breaker_min_calls <= 0:
+    raise ValueError("DYLEN_LLM_BREAKER_MIN_CALLS must be a positive integer.")
+  llm_breaker_slow_call_seconds = float(os.getenv("DYLEN_LLM_BREAKER_SLOW_CALL_SECONDS", "60"))
+  if llm_breaker_slow_call_seconds <= 0:
+    raise ValueError("DYLEN_LLM_BREAKER_SLOW_CALL_SECONDS must be positive.")
+  llm_breaker_cooldown_seconds = float(os.getenv("DYLEN_LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+  if llm_breaker_cooldown_seconds <= 0:
+    raise ValueError("DYLEN_LLM_BREAKER_COOLDOWN_SECONDS must be positive.")
+  tutor_subsection_concurrency = int(os.getenv("DYLEN_TUTOR_SUBSECTION_CONCURRENCY", "3"))
+  if tutor_subsection_concurrency <= 0:
+    raise ValueError("DYLEN_TUTOR_SUBSECTION_CONCURRENCY must be a positive integer.")
+  job_progress_flush_seconds = float(os.getenv("DYLEN_JOB_PROGRESS_FLUSH_SECONDS", "2"))
+  if job_progress_flush_seconds < 0:
+    raise ValueError("DYLEN_JOB_PROGRESS_FLUSH_SECONDS must be zero or positive.")
+  job_event_compaction_days = int(os.getenv("DYLEN_JOB_EVENT_COMPACTION_DAYS", "7"))
+  if job_event_compaction_days < 0:
+    raise ValueError("DYLEN_JOB_EVENT_COMPACTION_DAYS must be zero or positive.")
+  fenster_blob_cache_bytes = int(os.getenv("DYLEN_FENSTER_BLOB_CACHE_BYTES", str(32 * 1024 * 1024)))
+  if fenster_blob_cache_bytes < 0:
+    raise ValueError("DYLEN_FENSTER_BLOB_CACHE_BYTES must be zero or positive.")
+
   # Validate notification settings only when notifications are enabled.
   if email_notifications_enabled:
     if not email_from_address:
@@ -198,6 +284,8 @@ def get_settings() -> Settings:
     log_http_4xx=log_http_4xx,
     log_http_bodies=log_http_bodies,
     log_http_body_bytes=log_http_body_bytes,
+    log_http_body_paths=log_http_body_paths,
+    log_http_body_sample_rate=log_http_body_sample_rate,
     illustration_bucket=os.getenv("DYLEN_ILLUSTRATION_BUCKET", "dylen-illustrations"),
     export_bucket=_optional_str(os.getenv("DYLEN_EXPORT_BUCKET")),
     export_object_prefix=(os.getenv("DYLEN_EXPORT_OBJECT_PREFIX") or "data-transfer").strip(),
@@ -211,6 +299,20 @@ def get_settings() -> Settings:
     pg_dsn=os.getenv("DYLEN_PG_DSN") or os.getenv("DATABASE_URL"),
     pg_connect_timeout=int(os.getenv("DYLEN_PG_CONNECT_TIMEOUT", "5")),
     llm_audit_enabled=_parse_bool(os.getenv("DYLEN_LLM_AUDIT_ENABLED")),
+    llm_response_cache_backend=llm_response_cache_backend,
+    llm_response_cache_ttl_seconds=llm_response_cache_ttl_seconds,
+    llm_response_cache_max_entries=llm_response_cache_max_entries,
+    llm_retry_max_attempts=llm_retry_max_attempts,
+    llm_retry_deadline_seconds=llm_retry_deadline_seconds,
+    llm_hedge_after_seconds=llm_hedge_after_seconds,
+    llm_breaker_error_rate=llm_breaker_error_rate,
+    llm_breaker_min_calls=llm_breaker_min_calls,
+    llm_breaker_slow_call_seconds=llm_breaker_slow_call_seconds,
+    llm_breaker_cooldown_seconds=llm_breaker_cooldown_seconds,
+    tutor_subsection_concurrency=tutor_subsection_concurrency,
+    job_progress_flush_seconds=job_progress_flush_seconds,
+    job_event_compaction_days=job_event_compaction_days,
+    fenster_blob_cache_bytes=fenster_blob_cache_bytes,
     gcp_project_id=os.getenv("GCP_PROJECT_ID"),
     gcp_location=os.getenv("GCP_LOCATION"),
     firebase_project_id=os.getenv("FIREBASE_PROJECT_ID"),
@@ -250,7 +352,39 @@ def get_database_settings() -> DatabaseSettings:
   # Support fallback to DATABASE_URL for backward compatibility
   pg_dsn = os.getenv("DYLEN_PG_DSN") or os.getenv("DATABASE_URL")
 
-  return DatabaseSettings(debug=debug, pg_dsn=pg_dsn, pg_connect_timeout=pg_connect_timeout)
+  # Pool sizing is shared by API traffic, background tasks and job workers in the same process.
+  pg_pool_size = int(os.getenv("DYLEN_PG_POOL_SIZE", "10"))
+  if pg_pool_size <= 0:
+    raise ValueError("DYLEN_PG_POOL_SIZE must be a positive integer.")
+
+  pg_max_overflow = int(os.getenv("DYLEN_PG_MAX_OVERFLOW", "10"))
+  if pg_max_overflow < 0:
+    raise ValueError("DYLEN_PG_MAX_OVERFLOW must be zero or a positive integer.")
+
+  pg_pool_timeout_seconds = float(os.getenv("DYLEN_PG_POOL_TIMEOUT_SECONDS", "30"))
+  if pg_pool_timeout_seconds <= 0:
+    raise ValueError("DYLEN_PG_POOL_TIMEOUT_SECONDS must be positive.")
+
+  # Recycle below typical proxy/Cloud SQL idle cutoffs; -1 disables recycling.
+  pg_pool_recycle_seconds = int(os.getenv("DYLEN_PG_POOL_RECYCLE_SECONDS", "1800"))
+  pg_pool_pre_ping = _parse_bool(os.getenv("DYLEN_PG_POOL_PRE_PING", "true"))
+
+  # asyncpg prepared-statement cache; set to 0 behind transaction-mode PgBouncer.
+  pg_statement_cache_size = int(os.getenv("DYLEN_PG_STATEMENT_CACHE_SIZE", "100"))
+  if pg_statement_cache_size < 0:
+    raise ValueError("DYLEN_PG_STATEMENT_CACHE_SIZE must be zero or a positive integer.")
+
+  return DatabaseSettings(
+    debug=debug,
+    pg_dsn=pg_dsn,
+    pg_connect_timeout=pg_connect_timeout,
+    pg_pool_size=pg_pool_size,
+    pg_max_overflow=pg_max_overflow,
+    pg_pool_timeout_seconds=pg_pool_timeout_seconds,
+    pg_pool_recycle_seconds=pg_pool_recycle_seconds,
+    pg_pool_pre_ping=pg_pool_pre_ping,
+    pg_statement_cache_size=pg_statement_cache_size,
+  )
 
 
 def _optional_str(raw: str | None) -> str | None:
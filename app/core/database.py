@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 from collections.abc import AsyncGenerator
+from dataclasses import asdict, dataclass
+from typing import Any
 from urllib.parse import urlparse
 
-from app.config import get_database_settings
+from app.config import DatabaseSettings, get_database_settings
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 
 class Base(DeclarativeBase):
@@ -31,6 +38,79 @@ def _database_url() -> str | None:
 DATABASE_URL = _database_url()
 
 
+@dataclass
+class PoolMetrics:
+  """Cumulative connection pool counters for the process-wide engine."""
+
+  checkouts: int = 0
+  checkins: int = 0
+  connects: int = 0
+  invalidations: int = 0
+  checkout_timeouts: int = 0
+  waited_checkouts: int = 0
+  total_wait_seconds: float = 0.0
+  max_wait_seconds: float = 0.0
+  last_wait_seconds: float = 0.0
+
+
+# Checkouts slower than this are counted as having waited on a saturated pool.
+_WAIT_THRESHOLD_SECONDS = 0.005
+_pool_metrics = PoolMetrics()
+_pool_metrics_lock = threading.Lock()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+  """Queue pool that records how long callers wait for a connection."""
+
+  def _do_get(self) -> ConnectionPoolEntry:
+    started = time.perf_counter()
+    try:
+      connection = super()._do_get()
+    except PoolTimeoutError:
+      with _pool_metrics_lock:
+        _pool_metrics.checkout_timeouts += 1
+      _logger.warning("Database pool checkout timed out after %.3fs; %s", time.perf_counter() - started, self.status())
+      raise
+
+    waited = time.perf_counter() - started
+    with _pool_metrics_lock:
+      _pool_metrics.total_wait_seconds += waited
+      _pool_metrics.last_wait_seconds = waited
+      _pool_metrics.max_wait_seconds = max(_pool_metrics.max_wait_seconds, waited)
+      if waited >= _WAIT_THRESHOLD_SECONDS:
+        _pool_metrics.waited_checkouts += 1
+    return connection
+
+
+def _increment_pool_metric(name: str) -> None:
+  with _pool_metrics_lock:
+    setattr(_pool_metrics, name, getattr(_pool_metrics, name) + 1)
+
+
+def _attach_pool_listeners(pool: Any) -> None:
+  """Count pool lifecycle events so starvation is visible before it becomes an incident."""
+  event.listen(pool, "checkout", lambda *_: _increment_pool_metric("checkouts"))
+  event.listen(pool, "checkin", lambda *_: _increment_pool_metric("checkins"))
+  event.listen(pool, "connect", lambda *_: _increment_pool_metric("connects"))
+  event.listen(pool, "invalidate", lambda *_: _increment_pool_metric("invalidations"))
+
+
+def build_engine_options(settings: DatabaseSettings) -> dict[str, Any]:
+  """Translate database settings into create_async_engine keyword arguments."""
+  return {
+    "echo": settings.debug,
+    "future": True,
+    "poolclass": InstrumentedAsyncQueuePool,
+    "pool_size": settings.pg_pool_size,
+    "max_overflow": settings.pg_max_overflow,
+    "pool_timeout": settings.pg_pool_timeout_seconds,
+    "pool_recycle": settings.pg_pool_recycle_seconds,
+    "pool_pre_ping": settings.pg_pool_pre_ping,
+    # asyncpg keeps its own per-connection prepared statement cache; SQLAlchemy's adapter keeps a second one.
+    "connect_args": {"timeout": settings.pg_connect_timeout, "statement_cache_size": settings.pg_statement_cache_size, "prepared_statement_cache_size": settings.pg_statement_cache_size},
+  }
+
+
 def get_db_engine():  # type: ignore
   global engine
   settings = get_database_settings()
@@ -38,11 +118,47 @@ def get_db_engine():  # type: ignore
   # Initialize the engine once so pooled connections reuse the same config.
   if engine is None and database_url:
     # Log the sanitized database URL for troubleshooting.
-    _logger.info("Database engine initialized; DYLEN_PG_DSN=%s", _redact_dsn(database_url))
-    engine = create_async_engine(database_url, echo=settings.debug, future=True)
+    _logger.info(
+      "Database engine initialized; DYLEN_PG_DSN=%s pool_size=%s max_overflow=%s pool_timeout=%ss recycle=%ss pre_ping=%s statement_cache_size=%s",
+      _redact_dsn(database_url),
+      settings.pg_pool_size,
+      settings.pg_max_overflow,
+      settings.pg_pool_timeout_seconds,
+      settings.pg_pool_recycle_seconds,
+      settings.pg_pool_pre_ping,
+      settings.pg_statement_cache_size,
+    )
+    engine = create_async_engine(database_url, **build_engine_options(settings))
+    _attach_pool_listeners(engine.sync_engine.pool)
   return engine
 
 
+def get_pool_status() -> dict[str, Any]:
+  """Report live pool occupancy, configuration and cumulative checkout metrics."""
+  settings = get_database_settings()
+  with _pool_metrics_lock:
+    metrics = asdict(_pool_metrics)
+  checkouts = metrics["checkouts"]
+  metrics["avg_wait_seconds"] = metrics["total_wait_seconds"] / checkouts if checkouts else 0.0
+  config = {
+    "pool_size": settings.pg_pool_size,
+    "max_overflow": settings.pg_max_overflow,
+    "pool_timeout_seconds": settings.pg_pool_timeout_seconds,
+    "pool_recycle_seconds": settings.pg_pool_recycle_seconds,
+    "pool_pre_ping": settings.pg_pool_pre_ping,
+    "statement_cache_size": settings.pg_statement_cache_size,
+  }
+  # Report configuration even before the first connection so operators can verify settings.
+  if engine is None:
+    return {"initialized": False, "config": config, "metrics": metrics}
+
+  pool = engine.sync_engine.pool
+  state: dict[str, Any] = {"status": pool.status()}
+  if isinstance(pool, AsyncAdaptedQueuePool):
+    state.update({"size": pool.size(), "checked_in": pool.checkedin(), "checked_out": pool.checkedout(), "overflow": pool.overflow()})
+  return {"initialized": True, "config": config, "state": state, "metrics": metrics}
+
+
 def get_session_factory():  # type: ignore
   global SessionLocal
   if SessionLocal is None:
@@ -114,6 +114,8 @@ REQUIRED_ENV_REGISTRY: tuple[EnvVarDefinition, ...] = (
   EnvVarDefinition(name="DYLEN_LOG_HTTP_4XX", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_LOG_HTTP_BODIES", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_LOG_HTTP_BODY_BYTES", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_LOG_HTTP_BODY_PATHS", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_LOG_HTTP_BODY_SAMPLE_RATE", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_FENSTER_TECHNICAL_CONSTRAINTS", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_EXPORT_BUCKET", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_EXPORT_OBJECT_PREFIX", required=False, secret=False, used_by="service"),
@@ -124,6 +126,12 @@ REQUIRED_ENV_REGISTRY: tuple[EnvVarDefinition, ...] = (
   EnvVarDefinition(name="DYLEN_PROMPT_VERSION", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_SCHEMA_VERSION", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_PG_CONNECT_TIMEOUT", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_PG_POOL_SIZE", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_PG_MAX_OVERFLOW", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_PG_POOL_TIMEOUT_SECONDS", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_PG_POOL_RECYCLE_SECONDS", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_PG_POOL_PRE_PING", required=False, secret=False, used_by="service"),
+  EnvVarDefinition(name="DYLEN_PG_STATEMENT_CACHE_SIZE", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_LLM_AUDIT_ENABLED", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="FIREBASE_SERVICE_ACCOUNT_JSON_PATH", required=False, secret=False, used_by="service"),
   EnvVarDefinition(name="DYLEN_EMAIL_PROVIDER", required=False, secret=False, used_by="service"),
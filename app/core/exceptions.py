@@ -2,7 +2,7 @@ import logging
 from typing import Any
 
 from app.config import Settings
-from app.core.json import DecimalJSONResponse
+from app.core.json import MsgspecJSONResponse
 from fastapi import HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 
@@ -73,7 +73,7 @@ def _sanitize_http_detail(detail: Any) -> Any:
   return detail
 
 
-async def global_exception_handler(request: Request, exc: Exception) -> DecimalJSONResponse:
+async def global_exception_handler(request: Request, exc: Exception) -> MsgspecJSONResponse:
   """Global exception handler to catch unhandled errors."""
   from app.config import get_settings
 
@@ -81,10 +81,10 @@ async def global_exception_handler(request: Request, exc: Exception) -> DecimalJ
   logger = logging.getLogger("uvicorn.error")
   request_id = getattr(request.state, "request_id", None)
   logger.error("Global exception request_id=%s path=%s error_type=%s", request_id, request.url.path, type(exc).__name__, exc_info=True)
-  return DecimalJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=_error_payload("Internal Server Error", settings, request_id=request_id))
+  return MsgspecJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=_error_payload("Internal Server Error", settings, request_id=request_id))
 
 
-async def request_validation_exception_handler(request: Request, exc: RequestValidationError) -> DecimalJSONResponse:
+async def request_validation_exception_handler(request: Request, exc: RequestValidationError) -> MsgspecJSONResponse:
   """Log request validation errors for debugging without leaking payloads."""
   from app.config import get_settings
 
@@ -94,10 +94,10 @@ async def request_validation_exception_handler(request: Request, exc: RequestVal
   # Keep validation logs concise because 422s are client-correctable and expected.
   logger = logging.getLogger("uvicorn.error")
   logger.warning("Request validation failed request_id=%s path=%s method=%s errors=%s", request_id, request.url.path, request.method, sanitized_errors)
-  return DecimalJSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content=_error_payload(sanitized_errors, settings, request_id=request_id))
+  return MsgspecJSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content=_error_payload(sanitized_errors, settings, request_id=request_id))
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> DecimalJSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> MsgspecJSONResponse:
   """Handle FastAPI HTTPExceptions while avoiding leaking internal diagnostics."""
   from app.config import get_settings
 
@@ -107,7 +107,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> Decima
   if exc.status_code >= 500:
     logger = logging.getLogger("uvicorn.error")
     logger.error("HTTPException request_id=%s path=%s status_code=%s detail=%s", request_id, request.url.path, exc.status_code, exc.detail, exc_info=True)
-    return DecimalJSONResponse(status_code=exc.status_code, content=_error_payload("Internal Server Error", settings, request_id=request_id))
+    return MsgspecJSONResponse(status_code=exc.status_code, content=_error_payload("Internal Server Error", settings, request_id=request_id))
 
   # Log 4xx HTTPExceptions when explicitly enabled for debugging.
   if settings.log_http_4xx:
@@ -116,4 +116,4 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> Decima
     logger.warning("HTTPException request_id=%s path=%s status_code=%s detail=%s", request_id, request.url.path, exc.status_code, sanitized_detail, exc_info=True)
 
   # Preserve 4xx details for client-correctable errors.
-  return DecimalJSONResponse(status_code=exc.status_code, content=_error_payload(exc.detail, settings, request_id=request_id))
+  return MsgspecJSONResponse(status_code=exc.status_code, content=_error_payload(exc.detail, settings, request_id=request_id))
@@ -1,7 +1,9 @@
 import json
+import math
 from decimal import Decimal
 from typing import Any
 
+import msgspec
 from fastapi.responses import JSONResponse
 
 
@@ -19,3 +21,54 @@ class DecimalJSONResponse(JSONResponse):
 
   def render(self, content: Any) -> bytes:
     return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"), cls=DecimalJSONEncoder).encode("utf-8")
+
+
+# Encoders are reusable and thread-safe; one instance avoids per-response setup cost.
+_MSGSPEC_ENCODER = msgspec.json.Encoder(decimal_format="number")
+
+
+def _needs_legacy_encoder(content: Any) -> bool:
+  """Return True when content holds a Decimal or a non-finite float anywhere in its JSON structure.
+
+  How/Why: msgspec spells Decimals differently from DecimalJSONEncoder (``2.0`` vs ``2``, ``1E+2`` vs ``100``),
+  emits non-finite Decimals as bare ``NaN``/``Infinity`` and silently turns non-finite floats into ``null``.
+  Those values must take the stdlib path, which keeps the legacy spelling and rejects non-finite numbers.
+  The walk is iterative and only pushes containers, so walk plus msgspec stays cheaper than stdlib encoding for plain payloads.
+  """
+  node_type = type(content)
+  if node_type is not dict and node_type is not list and node_type is not tuple:
+    return (node_type is float and not math.isfinite(content)) or isinstance(content, Decimal)
+  stack = [content]
+  while stack:
+    node = stack.pop()
+    for item in node.values() if type(node) is dict else node:
+      item_type = type(item)
+      if item_type is str or item_type is int or item_type is bool or item is None:
+        continue
+      if item_type is float:
+        if not math.isfinite(item):
+          return True
+      elif item_type is dict or item_type is list or item_type is tuple:
+        stack.append(item)
+      elif isinstance(item, Decimal):
+        return True
+  return False
+
+
+class MsgspecJSONResponse(DecimalJSONResponse):
+  """JSONResponse that encodes with msgspec, with native datetime and UUID support.
+
+  Output matches DecimalJSONResponse byte-for-byte for the plain JSON structures endpoints
+  produce, except that exponent-form floats use msgspec's equivalent number spelling (for
+  example ``1e-7`` instead of ``1e-07``). Content holding Decimals or non-finite floats, and
+  content msgspec cannot encode such as dicts with boolean keys, renders through the stdlib
+  encoder so the wire format never regresses and invalid JSON is never emitted.
+  """
+
+  def render(self, content: Any) -> bytes:
+    if _needs_legacy_encoder(content):
+      return super().render(content)
+    try:
+      return _MSGSPEC_ENCODER.encode(content)
+    except TypeError:
+      return super().render(content)
@@ -96,9 +96,10 @@ def setup_logging(settings: Settings) -> Path:
 def _log_widget_registry(logger: logging.Logger) -> None:
   rules_path = Path(__file__).parent.parent / "schema" / "widgets_prompt.md"
   try:
-    from app.schema.widgets_loader import load_widget_registry
+    from app.schema.widgets_loader import get_widget_registry
 
-    registry = load_widget_registry(rules_path)
+    # Warm the process-wide registry at startup so request paths never parse markdown.
+    registry = get_widget_registry(rules_path)
   except (FileNotFoundError, PermissionError, UnicodeDecodeError, ValueError) as exc:
     logger.warning("Failed to load widget registry from %s: %s", rules_path, exc)
     return
@@ -1,11 +1,12 @@
 import json
 import logging
+import random
 import time
 import uuid
 from collections.abc import Awaitable, Callable
 from typing import Any
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 from fastapi import Request, Response
 from starlette.datastructures import MutableHeaders
 from starlette.types import ASGIApp, Receive, Scope, Send
@@ -111,15 +112,86 @@ def _format_body_for_log(body: bytes, content_type: str | None, max_bytes: int)
   return text
 
 
+# Routes whose payloads are binary media, audio or uploads; their bodies are never copied into log buffers.
+_BODY_CAPTURE_EXCLUDED_PREFIXES: tuple[str, ...] = ("/media", "/v1/tutor", "/resource/image")
+# Textual content types that are delivered incrementally and must not be held back for logging.
+_STREAMING_CONTENT_TYPES: tuple[str, ...] = ("text/event-stream", "application/x-ndjson", "application/stream+json")
+
+
+def _path_matches_prefix(path: str, prefix: str) -> bool:
+  """Match a request path against a route prefix on segment boundaries."""
+  normalized = prefix.rstrip("/")
+  return path == normalized or path.startswith(f"{normalized}/")
+
+
+def _should_capture_bodies(path: str, settings: Settings) -> bool:
+  """Decide whether this request is opted into body capture and selected by sampling."""
+  if not settings.log_http_bodies:
+    return False
+
+  # Binary routes stay excluded even when an operator opts in a broad prefix such as "/".
+  if any(_path_matches_prefix(path, prefix) for prefix in _BODY_CAPTURE_EXCLUDED_PREFIXES):
+    return False
+
+  if not any(_path_matches_prefix(path, prefix) for prefix in settings.log_http_body_paths):
+    return False
+
+  sample_rate = settings.log_http_body_sample_rate
+  if sample_rate >= 1.0:
+    return True
+
+  return random.random() < sample_rate  # nosec B311
+
+
+def _is_capturable_content_type(content_type: str | None) -> bool:
+  """Allow capture only for textual payloads that are not streamed."""
+  if not _is_textual_content_type(content_type):
+    return False
+
+  normalized = (content_type or "").lower()
+  return not any(streaming in normalized for streaming in _STREAMING_CONTENT_TYPES)
+
+
+class _BodyCapture:
+  """Keep a capped prefix of a body stream without buffering the rest of it."""
+
+  def __init__(self, max_bytes: int) -> None:
+    self.max_bytes = max_bytes
+    self.chunks: list[bytes] = []
+    self.size = 0
+    self.truncated = False
+
+  def feed(self, chunk: bytes) -> None:
+    """Record as much of the chunk as still fits under the cap."""
+    if not chunk:
+      return
+
+    remaining = self.max_bytes - self.size
+    if remaining <= 0:
+      self.truncated = True
+      return
+
+    kept = chunk[:remaining]
+    self.chunks.append(kept)
+    self.size += len(kept)
+    if len(chunk) > remaining:
+      self.truncated = True
+
+  @property
+  def body(self) -> bytes:
+    """Return the captured prefix."""
+    return b"".join(self.chunks)
+
+
 class RequestLoggingMiddleware:
-  """Log request/response details while preserving body streams for downstream handlers."""
+  """Log request/response details while streaming bodies through to downstream handlers."""
 
   def __init__(self, app: ASGIApp) -> None:
     """Store the downstream ASGI application for request logging."""
     self.app = app
 
   async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-    """Record request/response metadata without logging request bodies."""
+    """Record request/response metadata and, when opted in, a capped sample of the bodies."""
     # Skip non-HTTP scopes to avoid interfering with websocket or lifespan events.
     if scope["type"] != "http":
       await self.app(scope, receive, send)
@@ -127,7 +199,6 @@ class RequestLoggingMiddleware:
 
     # Resolve logging settings once; the cache keeps this cheap per request.
     settings = get_settings()
-    log_http_bodies = settings.log_http_bodies
     log_http_body_bytes = settings.log_http_body_bytes
 
     # Generate a request id and store it for downstream handlers and exception logging.
@@ -147,50 +218,43 @@ class RequestLoggingMiddleware:
     if content_type or content_length:
       logger.debug("Request metadata request_id=%s content-type=%s content-length=%s", request_id, content_type, content_length)
 
-    # Buffer request bodies only when explicitly enabled.
-    request_body = b""
-    receive_wrapper = receive
-    if log_http_bodies:
-      # Drain the incoming body so we can log it and replay for downstream handlers.
-      body_chunks: list[bytes] = []
-      more_body = True
-      while more_body:
-        message = await receive()
-        if message.get("type") != "http.request":
-          break
+    # Decide once per request whether bodies are captured at all; disabled requests pass streams through untouched.
+    capture_bodies = _should_capture_bodies(scope.get("path", ""), settings)
+    capture_request_body = capture_bodies and _is_capturable_content_type(content_type)
+    request_capture = _BodyCapture(log_http_body_bytes)
+    request_body_logged = False
 
-        chunk = message.get("body", b"")
-        if chunk:
-          body_chunks.append(chunk)
+    def log_request_body() -> None:
+      nonlocal request_body_logged
+      request_body_logged = True
+      formatted_request_body = _format_body_for_log(request_capture.body, content_type, log_http_body_bytes)
+      if request_capture.truncated:
+        formatted_request_body = f"{formatted_request_body}...(truncated)"
 
-        more_body = message.get("more_body", False)
+      logger.info("Request body request_id=%s body=%s", request_id, formatted_request_body)
 
-      request_body = b"".join(body_chunks)
-      # Replay the drained body so request handlers receive the payload as usual.
-      body_sent = False
+    receive_wrapper = receive
+    if capture_request_body:
 
       async def receive_wrapper() -> dict[str, Any]:
-        nonlocal body_sent
-        if body_sent:
-          return {"type": "http.request", "body": b"", "more_body": False}
-
-        body_sent = True
-        return {"type": "http.request", "body": request_body, "more_body": False}
+        # Tee a capped prefix of each chunk while handing the original message straight to the handler.
+        message = await receive()
+        if message.get("type") == "http.request" and not request_body_logged:
+          request_capture.feed(message.get("body", b""))
+          if not message.get("more_body", False):
+            log_request_body()
 
-      if request_body or content_type:
-        formatted_request_body = _format_body_for_log(request_body, content_type, log_http_body_bytes)
-        logger.info("Request body request_id=%s body=%s", request_id, formatted_request_body)
+        return message
 
     # Capture response status for response timing logs.
     status_code: int | None = None
-    response_body_chunks: list[bytes] = []
-    response_body_size = 0
-    response_body_truncated = False
+    response_capture = _BodyCapture(log_http_body_bytes)
+    capture_response_body = False
     response_content_type: str | None = None
 
     async def send_wrapper(message: dict[str, Any]) -> None:
       # Track the response status from the response start message.
-      nonlocal status_code, response_body_size, response_body_truncated, response_content_type
+      nonlocal status_code, capture_response_body, response_content_type
       if message.get("type") == "http.response.start":
         status_code = message.get("status")
         # Attach a request id to responses to correlate clients with server logs.
@@ -198,35 +262,30 @@ class RequestLoggingMiddleware:
         if "x-request-id" not in response_headers:
           response_headers["x-request-id"] = request_id
         response_content_type = response_headers.get("content-type")
+        # Binary and streaming responses are never copied into log buffers.
+        capture_response_body = capture_bodies and _is_capturable_content_type(response_content_type)
 
-      # Collect response bodies only when explicitly enabled.
-      if log_http_bodies and message.get("type") == "http.response.body":
-        body_chunk = message.get("body", b"")
-        if body_chunk and not response_body_truncated:
-          remaining = log_http_body_bytes - response_body_size
-          if remaining > 0:
-            response_body_chunks.append(body_chunk[:remaining])
-            response_body_size += len(body_chunk[:remaining])
-
-          if len(body_chunk) > remaining:
-            response_body_truncated = True
-
-        elif body_chunk:
-          response_body_truncated = True
+      # Collect a capped prefix of response bodies only when capture is enabled for this request.
+      if capture_response_body and message.get("type") == "http.response.body":
+        response_capture.feed(message.get("body", b""))
 
       await send(message)
 
     # Execute downstream handlers to keep middleware focused on observation.
     await self.app(scope, receive_wrapper, send_wrapper)
 
+    # Handlers that never drained the request still get whatever prefix was observed.
+    if capture_request_body and not request_body_logged and request_capture.size:
+      request_capture.truncated = True
+      log_request_body()
+
     # Emit response timing metrics for operational visibility.
     process_time = (time.time() - start_time) * 1000
     response_status = status_code or 0
     logger.info("Response request_id=%s status=%s (took %.2fms)", request_id, response_status, process_time)
-    if log_http_bodies and (response_body_chunks or response_content_type):
-      response_body = b"".join(response_body_chunks)
-      formatted_response_body = _format_body_for_log(response_body, response_content_type, log_http_body_bytes)
-      if response_body_truncated:
+    if capture_response_body:
+      formatted_response_body = _format_body_for_log(response_capture.body, response_content_type, log_http_body_bytes)
+      if response_capture.truncated:
         formatted_response_body = f"{formatted_response_body}...(truncated)"
 
       logger.info("Response body request_id=%s status=%s body=%s", request_id, response_status, formatted_response_body)
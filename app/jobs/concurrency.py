@@ -0,0 +1,94 @@
+"""Active-job counters used to enforce per-user concurrency limits."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from sqlalchemy import Select, case, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schema.jobs import Job, UserActiveJobCounter
+
+ConcurrencyFeature = Literal["lesson", "research", "writing", "tutor"]
+
+# Only these statuses hold a concurrency slot; everything else has released it.
+ACTIVE_JOB_STATUSES = ("queued", "running")
+_LESSON_TARGET_AGENTS = ("lesson", "planner")
+_SINGLE_AGENT_FEATURES: tuple[ConcurrencyFeature, ...] = ("research", "writing", "tutor")
+
+
+class ConcurrencyLimitExceededError(RuntimeError):
+  """Raised when admitting a job would exceed the user's concurrency limit."""
+
+  def __init__(self, *, feature: str, limit: int, active_count: int) -> None:
+    super().__init__(f"Concurrency limit reached for {feature}. Limit: {limit}, Active: {active_count}.")
+    self.feature = feature
+    self.limit = limit
+    self.active_count = active_count
+
+
+def concurrency_feature_for_target_agent(target_agent: str | None) -> ConcurrencyFeature | None:
+  """Map a job's target agent onto the feature whose concurrency limit it counts against."""
+  # Legacy lesson jobs were created without target_agent, so NULL still counts as a lesson.
+  if target_agent is None or target_agent in _LESSON_TARGET_AGENTS:
+    return "lesson"
+  if target_agent in _SINGLE_AGENT_FEATURES:
+    return target_agent  # type: ignore[return-value]
+  return None
+
+
+def job_slot_key(*, user_id: str | None, status: str | None, target_agent: str | None) -> tuple[str, ConcurrencyFeature] | None:
+  """Return the (user, feature) counter a job occupies, or None when it holds no slot."""
+  if user_id is None or status not in ACTIVE_JOB_STATUSES:
+    return None
+  feature = concurrency_feature_for_target_agent(target_agent)
+  if feature is None:
+    return None
+  return user_id, feature
+
+
+async def get_active_job_count(session: AsyncSession, *, user_id: str, feature: str) -> int:
+  """Read the current counter value with a primary-key lookup."""
+  stmt = select(func.coalesce(func.sum(UserActiveJobCounter.active_count), 0)).where(UserActiveJobCounter.user_id == user_id, UserActiveJobCounter.feature == feature)
+  result = await session.execute(stmt)
+  return int(result.scalar_one() or 0)
+
+
+async def acquire_job_slot(session: AsyncSession, *, user_id: str, feature: str, limit: int) -> None:
+  """Increment the counter only when it is below the limit, raising when the slot is unavailable.
+
+  How/Why:
+    - The check and increment run as a single conditional upsert, so simultaneous admissions serialize on the counter row.
+    - Callers run this in the same transaction as the job insert so the counter never drifts from rejected jobs.
+  """
+  if limit <= 0:
+    raise ConcurrencyLimitExceededError(feature=feature, limit=limit, active_count=await get_active_job_count(session, user_id=user_id, feature=feature))
+
+  stmt = insert(UserActiveJobCounter).values(user_id=user_id, feature=feature, active_count=1)
+  stmt = stmt.on_conflict_do_update(
+    index_elements=[UserActiveJobCounter.user_id, UserActiveJobCounter.feature], set_={"active_count": UserActiveJobCounter.active_count + 1, "updated_at": func.now()}, where=UserActiveJobCounter.active_count < limit
+  ).returning(UserActiveJobCounter.active_count)
+  result = await session.execute(stmt)
+  if result.scalar_one_or_none() is None:
+    raise ConcurrencyLimitExceededError(feature=feature, limit=limit, active_count=await get_active_job_count(session, user_id=user_id, feature=feature))
+
+
+async def adjust_active_job_count(session: AsyncSession, *, user_id: str, feature: str, delta: int) -> None:
+  """Apply an unconditional counter change for jobs entering or leaving the active statuses."""
+  if delta > 0:
+    stmt = insert(UserActiveJobCounter).values(user_id=user_id, feature=feature, active_count=delta)
+    stmt = stmt.on_conflict_do_update(index_elements=[UserActiveJobCounter.user_id, UserActiveJobCounter.feature], set_={"active_count": UserActiveJobCounter.active_count + delta, "updated_at": func.now()})
+    await session.execute(stmt)
+    return
+  if delta < 0:
+    # Clamp at zero so a missed increment cannot push the counter negative before reconciliation runs.
+    await session.execute(update(UserActiveJobCounter).where(UserActiveJobCounter.user_id == user_id, UserActiveJobCounter.feature == feature).values(active_count=func.greatest(UserActiveJobCounter.active_count + delta, 0)))
+
+
+def active_job_counts_query() -> Select[tuple[str, str, int]]:
+  """Return a SELECT of (user_id, feature, active_count) computed from the jobs table."""
+  lesson_condition = or_(Job.target_agent.is_(None), Job.target_agent.in_(_LESSON_TARGET_AGENTS))
+  feature_expr = case((lesson_condition, literal("lesson")), *[(Job.target_agent == feature, literal(feature)) for feature in _SINGLE_AGENT_FEATURES], else_=None).label("feature")
+  counted = select(Job.user_id.label("user_id"), feature_expr).where(Job.user_id.is_not(None), Job.status.in_(ACTIVE_JOB_STATUSES)).subquery()
+  return select(counted.c.user_id, counted.c.feature, func.count().label("active_count")).where(counted.c.feature.is_not(None)).group_by(counted.c.user_id, counted.c.feature)
@@ -8,21 +8,21 @@ from typing import Protocol
 from app.config import Settings
 from app.jobs.models import JobRecord
 from app.services.tasks.interface import TaskEnqueuer
-from app.storage.jobs_repo import JobsRepository
+from app.storage.jobs_repo import JobsRepository, JobStatusSummary
 
 
 class JobProcessorHandler(Protocol):
   """Processor contract for a concrete target_agent implementation."""
 
-  async def process(self, job: JobRecord) -> JobRecord | None:
-    """Process one queued job record."""
+  async def process(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
+    """Process one queued job record, returning the job's final state when it is known."""
 
 
 @dataclass(frozen=True)
 class JobProcessResult:
   """Result wrapper returned by the central dispatch function."""
 
-  record: JobRecord | None
+  record: JobRecord | JobStatusSummary | None
 
 
 class JobProcessorRegistry:
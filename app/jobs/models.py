@@ -54,3 +54,25 @@ class JobRecord:
   completed_at: str | None = None
   ttl: int | None = None
   idempotency_key: str | None = None
+
+
+@dataclass
+class JobSummaryRecord:
+  """Listing view of a job: identity, status and progress, without request/result/error payloads or logs."""
+
+  job_id: str
+  user_id: str | None
+  job_kind: JobKind
+  status: JobStatus
+  created_at: str
+  updated_at: str
+  root_job_id: str | None = None
+  parent_job_id: str | None = None
+  superseded_by_job_id: str | None = None
+  lesson_id: str | None = None
+  section_id: int | None = None
+  target_agent: str | None = None
+  phase: str | None = None
+  progress: float | None = None
+  started_at: str | None = None
+  completed_at: str | None = None
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import time
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
 from typing import Any
 
-from app.jobs.models import JobRecord, JobStatus
-from app.storage.jobs_repo import JobsRepository
+from app.jobs.models import JobStatus
+from app.storage.jobs_repo import JobsRepository, JobStatusSummary
 
 MAX_TRACKED_LOGS = 100
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
 
 
 class JobCanceledError(Exception):
@@ -125,9 +126,26 @@ class SectionProgress:
 
 
 class JobProgressTracker:
-  """Track job progress, phases, and log updates."""
-
-  def __init__(self, *, job_id: str, jobs_repo: JobsRepository, total_steps: int, total_ai_calls: int, label_prefix: str, initial_logs: Iterable[str] | None = None, completed_section_indexes: Iterable[int] | None = None) -> None:
+  """Track job progress, phases, and log updates.
+
+  Progress writes are coalesced in memory and flushed when the phase changes, a section finishes, the status
+  leaves running, or flush_interval_seconds have passed since the last write. Calls that do not flush check
+  cancellation with a status-only read instead. Each flush appends only log lines not yet persisted.
+  """
+
+  def __init__(
+    self,
+    *,
+    job_id: str,
+    jobs_repo: JobsRepository,
+    total_steps: int,
+    total_ai_calls: int,
+    label_prefix: str,
+    initial_logs: Iterable[str] | None = None,
+    completed_section_indexes: Iterable[int] | None = None,
+    flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    clock: Callable[[], float] = time.monotonic,
+  ) -> None:
     self._job_id = job_id
     self._jobs_repo = jobs_repo
     self._total_steps = max(total_steps, 1)
@@ -136,13 +154,21 @@ class JobProgressTracker:
     self._completed_steps = 0
     self._ai_call_index = 1
     self._logs: list[str] = list(initial_logs or [])[-MAX_TRACKED_LOGS:]
+    # Log lines added since the last write; the repository appends them as job events.
+    self._unflushed_logs: list[str] = list(self._logs)
     # Preserve existing completed sections so retries can merge partial output.
     self._completed_section_indexes = list(completed_section_indexes or [])
+    self._flush_interval_seconds = max(flush_interval_seconds, 0.0)
+    self._clock = clock
+    self._pending: dict[str, Any] = {}
+    self._flushed_phase: str | None = None
+    self._last_flush_at: float | None = None
 
   def add_logs(self, *messages: str) -> None:
     """Append log lines while preserving the rolling window."""
 
     self._logs.extend(messages)
+    self._unflushed_logs.extend(messages)
     if len(self._logs) > MAX_TRACKED_LOGS:
       self._logs = self._logs[-MAX_TRACKED_LOGS:]
 
@@ -152,6 +178,14 @@ class JobProgressTracker:
     for message in messages:
       self.add_logs(message)
 
+  def take_logs(self, *messages: str) -> list[str]:
+    """Add messages and return every log line not yet persisted, marking them as written by the caller."""
+
+    self.add_logs(*messages)
+    unflushed = self._unflushed_logs
+    self._unflushed_logs = []
+    return unflushed
+
   def current_ai_subphase(self) -> str:
     """Return the subphase label for the active AI call."""
 
@@ -162,9 +196,9 @@ class JobProgressTracker:
       return 0.0
     return min(round((self._completed_steps / self._total_steps) * 100, 2), 100.0)
 
-  async def _update_job(self, *, status: JobStatus, phase: str, subphase: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobRecord | None:
-    # Build the base payload for persistence.
-    payload = {"status": status, "phase": phase, "subphase": subphase, "progress": self._progress_percent(), "total_steps": self._total_steps, "completed_steps": self._completed_steps, "logs": self._logs}
+  async def _update_job(self, *, status: JobStatus, phase: str, subphase: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobStatusSummary | None:
+    # Fold this update into the pending payload; later values win.
+    payload: dict[str, Any] = {"status": status, "phase": phase, "subphase": subphase, "progress": self._progress_percent(), "total_steps": self._total_steps, "completed_steps": self._completed_steps}
 
     # Attach partial lesson JSON when streaming progress updates.
     if result_json is not None:
@@ -175,9 +209,11 @@ class JobProgressTracker:
       payload["expected_sections"] = expected_sections
 
     # Attach the active section metadata when available.
+    section_finished = False
     if section_progress is not None:
       # Record completed section indices for retry merging.
       if section_progress.status == "completed":
+        section_finished = section_progress.index not in self._completed_section_indexes
         self._record_completed_section(section_progress.index)
 
       payload["completed_sections"] = section_progress.completed_sections
@@ -187,12 +223,42 @@ class JobProgressTracker:
       payload["current_section_title"] = section_progress.title
       payload["completed_section_indexes"] = list(self._completed_section_indexes)
 
-    record = await self._jobs_repo.update_job(self._job_id, **payload)
+    self._pending.update(payload)
+    if self._should_flush(status=status, phase=phase, section_finished=section_finished):
+      record = await self.flush()
+      if record and record.status == "canceled":
+        raise JobCanceledError(f"Job {self._job_id} was canceled.")
+      return record
 
-    if record and record.status == "canceled":
+    if await self._jobs_repo.get_job_status(self._job_id) == "canceled":
       raise JobCanceledError(f"Job {self._job_id} was canceled.")
-
-    return record
+    return None
+
+  def _should_flush(self, *, status: JobStatus, phase: str, section_finished: bool) -> bool:
+    """Return True at phase boundaries, terminal transitions, and once the flush interval has elapsed."""
+    if self._last_flush_at is None or status != "running" or phase != self._flushed_phase or section_finished:
+      return True
+    return self._clock() - self._last_flush_at >= self._flush_interval_seconds
+
+  async def flush(self) -> JobStatusSummary | None:
+    """Write pending progress and unpersisted log lines in one update; a no-op when nothing is pending."""
+
+    if not self._pending and not self._unflushed_logs:
+      return None
+    payload = dict(self._pending)
+    logs = self.take_logs()
+    if logs:
+      payload["logs"] = logs
+    self._pending = {}
+    self._flushed_phase = payload.get("phase", self._flushed_phase)
+    self._last_flush_at = self._clock()
+    # Progress ticks must not resurrect a job that was canceled or finalized since the last write.
+    if payload.get("status") == "running":
+      record = await self._jobs_repo.update_job(self._job_id, expected_status=("queued", "running"), **payload)
+      if record is None and await self._jobs_repo.get_job_status(self._job_id) == "canceled":
+        raise JobCanceledError(f"Job {self._job_id} was canceled.")
+      return record
+    return await self._jobs_repo.update_job(self._job_id, **payload)
 
   def _record_completed_section(self, index: int) -> None:
     """Track completed sections in completion order while avoiding duplicates."""
@@ -202,18 +268,18 @@ class JobProgressTracker:
 
     self._completed_section_indexes.append(index)
 
-  async def set_cost(self, cost: dict[str, Any]) -> JobRecord | None:
+  async def set_cost(self, cost: dict[str, Any]) -> JobStatusSummary | None:
     """Update the job's cost metrics."""
     timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
     payload = {"cost": cost, "updated_at": timestamp}
     return await self._jobs_repo.update_job(self._job_id, **payload)
 
-  async def set_phase(self, *, phase: str, subphase: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobRecord | None:
-    """Update the phase without advancing progress."""
+  async def set_phase(self, *, phase: str, subphase: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobStatusSummary | None:
+    """Update the phase without advancing progress; returns the record only when the update was flushed."""
 
     return await self._update_job(status="running", phase=phase, subphase=subphase, result_json=result_json, expected_sections=expected_sections, section_progress=section_progress)
 
-  async def complete_ai_call(self, *, phase: str, message: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobRecord | None:
+  async def complete_ai_call(self, *, phase: str, message: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobStatusSummary | None:
     """Mark an AI call as finished and advance progress."""
 
     if message:
@@ -224,7 +290,7 @@ class JobProgressTracker:
     self._ai_call_index = min(self._ai_call_index + 1, self._total_ai_calls)
     return record
 
-  async def complete_step(self, *, phase: str, subphase: str | None, message: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobRecord | None:
+  async def complete_step(self, *, phase: str, subphase: str | None, message: str | None = None, result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobStatusSummary | None:
     """Advance progress with a custom subphase label."""
 
     if message:
@@ -232,7 +298,9 @@ class JobProgressTracker:
     self._completed_steps = min(self._completed_steps + 1, self._total_steps)
     return await self._update_job(status="running", phase=phase, subphase=subphase, result_json=result_json, expected_sections=expected_sections, section_progress=section_progress)
 
-  async def complete_validation(self, *, message: str | None = None, status: JobStatus = "running", result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None) -> JobRecord | None:
+  async def complete_validation(
+    self, *, message: str | None = None, status: JobStatus = "running", result_json: dict[str, Any] | None = None, expected_sections: int | None = None, section_progress: SectionProgress | None = None
+  ) -> JobStatusSummary | None:
     """Mark validation as finished and finalize progress."""
 
     if message:
@@ -240,13 +308,13 @@ class JobProgressTracker:
     self._completed_steps = self._total_steps
     return await self._update_job(phase="validate", subphase="validation", status=status, result_json=result_json, expected_sections=expected_sections, section_progress=section_progress)
 
-  async def fail(self, *, phase: str, message: str) -> JobRecord | None:
-    """Set the job to an error state."""
+  async def fail(self, *, phase: str, message: str) -> JobStatusSummary | None:
+    """Set the job to an error state, flushing any coalesced progress with it."""
 
     self.add_logs(message)
     self._completed_steps = self._total_steps
-    payload = {"status": "error", "phase": phase, "subphase": "error", "progress": self._progress_percent(), "logs": self._logs}
-    return await self._jobs_repo.update_job(self._job_id, **payload)
+    self._pending.update({"status": "error", "phase": phase, "subphase": "error", "progress": self._progress_percent()})
+    return await self.flush()
 
   @property
   def logs(self) -> list[str]:
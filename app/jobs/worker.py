@@ -7,7 +7,7 @@ import os
 import time
 import uuid
 from collections.abc import Awaitable, Callable, Iterable
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from sqlalchemy import select
@@ -20,7 +20,8 @@ from app.ai.agents.section_builder import SectionBuilder
 from app.ai.agents.tutor import TutorAgent
 from app.ai.pipeline.contracts import GenerationRequest, JobContext, PlanSection, RepairInput, SectionDraft
 from app.ai.pipeline.lesson_requests import GenerateLessonRequestStruct
-from app.ai.router import get_model_for_mode
+from app.ai.response_cache import response_cache_for_agent
+from app.ai.router import get_model_for_mode, model_fallbacks_for_agent
 from app.ai.utils.cost import calculate_total_cost
 from app.config import Settings
 from app.core.database import get_session_factory
@@ -39,7 +40,7 @@ from app.schema.service import SchemaService
 from app.services.data_transfer_bundle import execute_export_run, execute_hydrate_run
 from app.services.feature_flags import resolve_feature_flag_decision
 from app.services.llm_pricing import load_pricing_table
-from app.services.maintenance import archive_old_lessons
+from app.services.maintenance import archive_old_lessons, compact_job_events, purge_expired_llm_responses, reconcile_active_job_counters
 from app.services.quota_buckets import QuotaExceededError, get_quota_snapshot
 from app.services.runtime_config import get_fenster_model, get_illustration_model, get_planner_model, get_repair_model, get_section_builder_model, get_tutor_model, resolve_effective_runtime_config
 from app.services.section_shorthand import build_section_shorthand_content
@@ -47,9 +48,10 @@ from app.services.storage_client import build_storage_client
 from app.services.tasks.factory import get_task_enqueuer
 from app.services.users import get_user_by_id, get_user_subscription_tier
 from app.storage.factory import _get_repo
-from app.storage.jobs_repo import JobsRepository
+from app.storage.jobs_repo import JobsRepository, JobStatusSummary
 from app.storage.lessons_repo import LessonRecord
 from app.utils.compression import compress_html
+from app.utils.etags import strong_etag
 from app.utils.ids import generate_lesson_id, generate_nanoid
 
 
@@ -68,10 +70,10 @@ class JobProcessor:
     class _MethodHandler:
       """Adapter that exposes worker coroutine methods as DI handlers."""
 
-      def __init__(self, method: Callable[[JobRecord], Awaitable[JobRecord | None]]) -> None:
+      def __init__(self, method: Callable[[JobRecord], Awaitable[JobRecord | JobStatusSummary | None]]) -> None:
         self._method = method
 
-      async def process(self, job: JobRecord) -> JobRecord | None:
+      async def process(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
         return await self._method(job)
 
     handlers: dict[str, JobProcessorHandler] = {
@@ -84,17 +86,22 @@ class JobProcessor:
     }
     return JobProcessorRegistry(handlers)
 
-  async def process_job(self, job: JobRecord) -> JobRecord | None:
+  async def process_job(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute a single queued job, routing by type."""
     if job.status != "queued":
       return job
+    return await self._run_job(job, claimed=False)
+
+  async def _run_job(self, job: JobRecord, *, claimed: bool) -> JobRecord | JobStatusSummary | None:
+    """Dispatch a job to its agent; claimed jobs were already moved to running by claim_queued."""
     target_agent = str(job.target_agent or "").strip()
     if target_agent == "lesson":
       target_agent = "planner"
     if target_agent == "":
       await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=list(job.logs or []) + ["Missing target_agent on queued job."], error_json={"message": "Missing target_agent on queued job."})
       return None
-    await self._jobs_repo.update_job(job.job_id, status="running")
+    if not claimed:
+      await self._jobs_repo.update_job(job.job_id, status="running")
     try:
       result = await dispatch_process_job(job, target_agent, self._registry, self._jobs_repo, get_task_enqueuer(self._settings), None, self._settings)
       return result.record
@@ -164,7 +171,7 @@ class JobProcessor:
         attempt_count=1,
         last_error=str(exc),
       )
-      await self._jobs_repo.update_job(parent_job.job_id, logs=list(parent_job.logs or []) + [f"Failed to enqueue child job {child_job_id}."])
+      await self._jobs_repo.update_job(parent_job.job_id, logs=[f"Failed to enqueue child job {child_job_id}."])
       await _notify_child_job_failed(settings=self._settings, parent_job=parent_job, child_job_id=child_job_id)
       return None
     return child_record
@@ -238,9 +245,7 @@ class JobProcessor:
     await self._checkpoint_mark_state(job=job, stage=stage, section_index=section_index, state="running")
     return "claimed"
 
-  async def _fan_out_section_children(
-    self, *, job: JobRecord, updated_parent: JobRecord, tracker: JobProgressTracker, lesson_id: str, section_number: int, db_section_id: int | None, section_payload: dict[str, Any], topic: str, learner_level: str | None
-  ) -> None:
+  async def _fan_out_section_children(self, *, job: JobRecord, tracker: JobProgressTracker, lesson_id: str, section_number: int, db_section_id: int | None, section_payload: dict[str, Any], topic: str, learner_level: str | None) -> None:
     """Queue downstream section agents for unfinished checkpoints only."""
     if db_section_id is None:
       return
@@ -250,34 +255,30 @@ class JobProcessor:
     if not await self._checkpoint_is_done(job=job, stage="illustration", section_index=section_number):
       if not image_generation_enabled:
         await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="illustration", section_index=section_number, state="done", artifact_refs_json={"section_id": db_section_id, "skipped": True, "reason": "feature_disabled"})
-        await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Illustration job skipped for section {section_number}: feature.image_generation disabled."])
+        await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Illustration job skipped for section {section_number}: feature.image_generation disabled."))
         removed_widget_refs.append(f"{section_number}.1.1.illustration")
         section_payload.pop("illustration", None)
       else:
         try:
           await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="illustration", section_index=section_number, state="pending", artifact_refs_json={"section_id": db_section_id})
           await self._create_child_job(
-            parent_job=updated_parent,
-            target_agent="illustration",
-            payload={"section_index": section_number, "section_id": db_section_id, "lesson_id": lesson_id, "topic": topic, "section_data": section_payload},
-            lesson_id=lesson_id,
-            section_id=db_section_id,
+            parent_job=job, target_agent="illustration", payload={"section_index": section_number, "section_id": db_section_id, "lesson_id": lesson_id, "topic": topic, "section_data": section_payload}, lesson_id=lesson_id, section_id=db_section_id
           )
         except QuotaExceededError:
           await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="illustration", section_index=section_number, state="done", artifact_refs_json={"section_id": db_section_id, "skipped": True, "reason": "quota_unavailable"})
-          await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Illustration job skipped for section {section_number}: quota unavailable."])
+          await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Illustration job skipped for section {section_number}: quota unavailable."))
           removed_widget_refs.append(f"{section_number}.1.1.illustration")
           section_payload.pop("illustration", None)
     if not await self._checkpoint_is_done(job=job, stage="tutor", section_index=section_number):
       if not tutor_mode_enabled:
         await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="tutor", section_index=section_number, state="done", artifact_refs_json={"section_id": db_section_id, "skipped": True, "reason": "feature_disabled"})
-        await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Tutor job skipped for section {section_number}: feature.tutor.mode disabled."])
+        await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Tutor job skipped for section {section_number}: feature.tutor.mode disabled."))
         removed_widget_refs.append(f"{section_number}.1.1.tutor")
       else:
         try:
           await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="tutor", section_index=section_number, state="pending", artifact_refs_json={"section_id": db_section_id})
           await self._create_child_job(
-            parent_job=updated_parent,
+            parent_job=job,
             target_agent="tutor",
             payload={"section_index": section_number, "section_id": db_section_id, "topic": topic, "section_data": section_payload, "learning_data_points": section_payload.get("learning_data_points", [])},
             lesson_id=lesson_id,
@@ -285,7 +286,7 @@ class JobProcessor:
           )
         except QuotaExceededError:
           await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="tutor", section_index=section_number, state="done", artifact_refs_json={"section_id": db_section_id, "skipped": True, "reason": "quota_unavailable"})
-          await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Tutor job skipped for section {section_number}: quota unavailable."])
+          await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Tutor job skipped for section {section_number}: quota unavailable."))
           removed_widget_refs.append(f"{section_number}.1.1.tutor")
     if _section_contains_fenster(section_payload) and not await self._checkpoint_is_done(job=job, stage="fenster_builder", section_index=section_number):
       await self._jobs_repo.upsert_checkpoint(job_id=job.job_id, stage="fenster_builder", section_index=section_number, state="pending", artifact_refs_json={"section_id": db_section_id})
@@ -293,7 +294,7 @@ class JobProcessor:
       for fenster_public_id in fenster_widget_ids:
         try:
           await self._create_child_job(
-            parent_job=updated_parent,
+            parent_job=job,
             target_agent="fenster_builder",
             payload={
               "lesson_id": lesson_id,
@@ -307,7 +308,7 @@ class JobProcessor:
             section_id=db_section_id,
           )
         except QuotaExceededError:
-          await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Fenster job skipped for section {section_number}: quota unavailable for widget {fenster_public_id}."])
+          await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Fenster job skipped for section {section_number}: quota unavailable for widget {fenster_public_id}."))
           removed_widget_refs.extend(_remove_widget_items_by_public_id(section_payload=section_payload, section_index=section_number, widget_type="fenster", public_ids=[fenster_public_id]))
           await _update_subsection_widget_status(section_id=db_section_id, widget_types=("fenster",), status="skipped", public_ids=[fenster_public_id])
     if removed_widget_refs:
@@ -347,7 +348,7 @@ class JobProcessor:
       self._logger.error("Feature-flag lookup failed for key=%s user_id=%s", feature_key, user_id, exc_info=True)
       return False
 
-  async def _process_planner_job(self, job: JobRecord) -> JobRecord | None:
+  async def _process_planner_job(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute planner-only work and fan out one section-builder job per section."""
     planner_claim = await self._checkpoint_claim_state(job=job, stage="planner", section_index=None)
     if planner_claim == "done":
@@ -356,7 +357,7 @@ class JobProcessor:
     if planner_claim == "locked":
       await self._jobs_repo.append_event(job_id=job.job_id, event_type="checkpoint", message="Planner checkpoint is locked by another worker; skipping duplicate execution.", payload_json={"stage": "planner"})
       return await self._jobs_repo.get_job(job.job_id)
-    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="planner", initial_logs=["Planner job picked up."])
+    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="planner", initial_logs=["Planner job picked up."], flush_interval_seconds=self._settings.job_progress_flush_seconds)
     await tracker.set_phase(phase="planning", subphase="planner_start")
     lesson_request_id: int | None = None
     try:
@@ -393,7 +394,7 @@ class JobProcessor:
               runtime_config = await resolve_effective_runtime_config(session, settings=self._settings, org_id=user.org_id, subscription_tier_id=tier_id, user_id=None)
 
       provider, model_name = get_planner_model(runtime_config)
-      model_instance = get_model_for_mode(provider, model_name, agent="planner")
+      model_instance = get_model_for_mode(provider, model_name, agent="planner", response_cache=response_cache_for_agent(runtime_config, "planner"), fallbacks=model_fallbacks_for_agent(runtime_config, "planner"))
       planner_agent = PlannerAgent(model=model_instance, prov=provider, schema=SchemaService())
       lesson_id = str(job.lesson_id or generate_lesson_id())
       job_metadata = {"settings": self._settings, "lesson_id": lesson_id}
@@ -436,7 +437,7 @@ class JobProcessor:
         "status": "done",
         "phase": "complete",
         "progress": 100.0,
-        "logs": tracker.logs + ["Planner completed successfully."],
+        "logs": tracker.take_logs("Planner completed successfully."),
         "result_json": {"lesson_id": lesson_id, "planned_sections": len(lesson_plan.sections)},
         "lesson_id": lesson_id,
         "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -456,9 +457,9 @@ class JobProcessor:
           "schema_version": request_model.schema_version or self._settings.schema_version,
         }
         try:
-          await self._create_child_job(parent_job=updated_parent, target_agent="section_builder", payload=child_payload, lesson_id=lesson_id, section_id=None)
+          await self._create_child_job(parent_job=job, target_agent="section_builder", payload=child_payload, lesson_id=lesson_id, section_id=None)
         except QuotaExceededError as exc:
-          await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Planner stopped section fan-out due to quota: {exc}"])
+          await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Planner stopped section fan-out due to quota: {exc}"))
           break
       return await self._jobs_repo.get_job(job.job_id)
     except Exception as exc:  # noqa: BLE001
@@ -466,12 +467,14 @@ class JobProcessor:
       await _update_lesson_request_status(lesson_request_id=lesson_request_id, status="failed")
       await self._checkpoint_mark_state(job=job, stage="planner", section_index=None, state="error", last_error=str(exc))
       await tracker.fail(phase="failed", message=f"Planner job failed: {exc}")
-      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.logs, error_json={"message": str(exc)})
+      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.take_logs(), error_json={"message": str(exc)})
       return None
 
-  async def _process_section_builder_job(self, job: JobRecord) -> JobRecord | None:
+  async def _process_section_builder_job(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute one section-builder unit and fan out section child jobs."""
-    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="section_builder", initial_logs=["Section builder job picked up."])
+    tracker = JobProgressTracker(
+      job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="section_builder", initial_logs=["Section builder job picked up."], flush_interval_seconds=self._settings.job_progress_flush_seconds
+    )
     await tracker.set_phase(phase="building", subphase="section_builder_start")
     lesson_id = ""
     section_number = 0
@@ -506,7 +509,7 @@ class JobProcessor:
               "status": "done",
               "phase": "complete",
               "progress": 100.0,
-              "logs": tracker.logs + [f"Section {section_number} already exists. Skipping regeneration."],
+              "logs": tracker.take_logs(f"Section {section_number} already exists. Skipping regeneration."),
               "result_json": {"lesson_id": lesson_id, "section_number": section_number, "section_id": db_section_id, "skipped": True},
               "section_id": db_section_id,
               "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -518,7 +521,7 @@ class JobProcessor:
             learner_level = str(generation_payload.get("learner_level") or "").strip() or None
             if updated_parent is not None:
               await self._fan_out_section_children(
-                job=job, updated_parent=updated_parent, tracker=tracker, lesson_id=lesson_id, section_number=section_number, db_section_id=db_section_id, section_payload=dict(existing_section.content), topic=generation_topic, learner_level=learner_level
+                job=job, tracker=tracker, lesson_id=lesson_id, section_number=section_number, db_section_id=db_section_id, section_payload=dict(existing_section.content), topic=generation_topic, learner_level=learner_level
               )
             return updated_parent
       generation_payload = request_payload.get("generation_request") or {}
@@ -538,7 +541,7 @@ class JobProcessor:
               runtime_config = await resolve_effective_runtime_config(session, settings=self._settings, org_id=user.org_id, subscription_tier_id=tier_id, user_id=None)
 
       provider, model_name = get_section_builder_model(runtime_config)
-      model_instance = get_model_for_mode(provider, model_name, agent="section_builder")
+      model_instance = get_model_for_mode(provider, model_name, agent="section_builder", response_cache=response_cache_for_agent(runtime_config, "section_builder"), fallbacks=model_fallbacks_for_agent(runtime_config, "section_builder"))
       section_agent = SectionBuilder(model=model_instance, prov=provider, schema=SchemaService())
       metadata = {"settings": self._settings, "lesson_id": lesson_id, "schema_version": str(request_payload.get("schema_version") or self._settings.schema_version), "structured_output": True}
       if job.user_id:
@@ -547,11 +550,11 @@ class JobProcessor:
       structured = await section_agent.run(plan_section, job_ctx)
       non_blocking_validation_errors = _extract_non_blocking_length_errors(structured.validation_errors)
       if non_blocking_validation_errors:
-        await self._jobs_repo.update_job(job.job_id, logs=tracker.logs + [f"Section {section_number} ignored non-blocking length violations and continued generation."])
+        await self._jobs_repo.update_job(job.job_id, logs=tracker.take_logs(f"Section {section_number} ignored non-blocking length violations and continued generation."))
         structured.validation_errors = [err for err in structured.validation_errors if err not in non_blocking_validation_errors]
       if structured.validation_errors:
         repair_provider, repair_model_name = get_repair_model(runtime_config)
-        repair_model_instance = get_model_for_mode(repair_provider, repair_model_name, agent="repairer")
+        repair_model_instance = get_model_for_mode(repair_provider, repair_model_name, agent="repairer", response_cache=response_cache_for_agent(runtime_config, "repairer"), fallbacks=model_fallbacks_for_agent(runtime_config, "repairer"))
         repair_agent = RepairerAgent(model=repair_model_instance, prov=repair_provider, schema=SchemaService())
         repair_input = RepairInput(section=SectionDraft(section_number=section_number, title=plan_section.title, plan_section=plan_section, raw_text=""), structured=structured)
         repair_result = await repair_agent.run(repair_input, job_ctx)
@@ -566,7 +569,7 @@ class JobProcessor:
             status="error",
             phase="failed",
             progress=100.0,
-            logs=tracker.logs,
+            logs=tracker.take_logs(),
             result_json={"lesson_id": lesson_id, "section_number": section_number, "errors": repair_result.errors},
             error_json={"message": "SECTION_VALIDATION_REPAIR_FAILED", "errors": [str(item) for item in repair_result.errors]},
           )
@@ -578,7 +581,7 @@ class JobProcessor:
         "status": "done",
         "phase": "complete",
         "progress": 100.0,
-        "logs": tracker.logs + [f"Section {section_number} completed successfully."],
+        "logs": tracker.take_logs(f"Section {section_number} completed successfully."),
         "result_json": {"lesson_id": lesson_id, "section_number": section_number, "section_id": db_section_id},
         "section_id": db_section_id,
         "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -587,9 +590,7 @@ class JobProcessor:
       if updated_parent is None:
         return None
       await self._checkpoint_mark_state(job=job, stage="section_builder", section_index=section_number, state="done", artifact_refs_json={"section_id": db_section_id})
-      await self._fan_out_section_children(
-        job=job, updated_parent=updated_parent, tracker=tracker, lesson_id=lesson_id, section_number=section_number, db_section_id=db_section_id, section_payload=structured.payload, topic=generation_topic, learner_level=learner_level
-      )
+      await self._fan_out_section_children(job=job, tracker=tracker, lesson_id=lesson_id, section_number=section_number, db_section_id=db_section_id, section_payload=structured.payload, topic=generation_topic, learner_level=learner_level)
       return await self._jobs_repo.get_job(job.job_id)
     except Exception as exc:  # noqa: BLE001
       self._logger.error("Section builder job failed", exc_info=True)
@@ -599,25 +600,25 @@ class JobProcessor:
       if section_number > 0:
         await self._checkpoint_mark_state(job=job, stage="section_builder", section_index=section_number, state="error", last_error=str(exc))
       await tracker.fail(phase="failed", message=f"Section builder job failed: {exc}")
-      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.logs, error_json={"message": str(exc)})
+      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.take_logs(), error_json={"message": str(exc)})
       return None
 
-  async def _process_maintenance_job(self, job: JobRecord) -> JobRecord | None:
+  async def _process_maintenance_job(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute a background maintenance job (retention, cleanup, etc.)."""
-    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="maintenance", initial_logs=["Maintenance job acknowledged."])
+    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="maintenance", initial_logs=["Maintenance job acknowledged."], flush_interval_seconds=self._settings.job_progress_flush_seconds)
     await tracker.set_phase(phase="maintenance", subphase="start")
     wrapped_payload = job.request.get("payload")
     request_payload = wrapped_payload if isinstance(wrapped_payload, dict) else job.request
     action = request_payload.get("action")
     if not isinstance(action, str) or action.strip() == "":
       await tracker.fail(phase="failed", message="Maintenance job missing action.")
-      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.logs)
+      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.take_logs())
       return None
     action = action.strip().lower()
     session_factory = get_session_factory()
     if session_factory is None:
       await tracker.fail(phase="failed", message="Database is not initialized.")
-      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.logs)
+      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.take_logs())
       return None
     try:
       if action == "archive_old_lessons":
@@ -625,6 +626,21 @@ class JobProcessor:
           archived_count = await archive_old_lessons(session, settings=self._settings)
         tracker.add_logs(f"Archived {archived_count} lesson(s).")
         result_json: dict[str, Any] = {"action": action, "archived_count": archived_count}
+      elif action == "reconcile_job_counters":
+        async with session_factory() as session:
+          corrected_count = await reconcile_active_job_counters(session)
+        tracker.add_logs(f"Corrected {corrected_count} active-job counter(s).")
+        result_json = {"action": action, "corrected_count": corrected_count}
+      elif action == "purge_llm_response_cache":
+        async with session_factory() as session:
+          purged_count = await purge_expired_llm_responses(session)
+        tracker.add_logs(f"Purged {purged_count} expired LLM response cache row(s).")
+        result_json = {"action": action, "purged_count": purged_count}
+      elif action == "compact_job_events":
+        async with session_factory() as session:
+          compacted_count = await compact_job_events(session, older_than=timedelta(days=self._settings.job_event_compaction_days))
+        tracker.add_logs(f"Compacted events of {compacted_count} finished job(s).")
+        result_json = {"action": action, "compacted_count": compacted_count}
       elif action in {"data_export", "data_hydrate"}:
         raw_run_id = request_payload.get("run_id")
         if not isinstance(raw_run_id, str) or raw_run_id.strip() == "":
@@ -663,10 +679,10 @@ class JobProcessor:
             result_json = {"action": action, "run_id": str(run.id), **hydrate_result}
       else:
         await tracker.fail(phase="failed", message="Unsupported maintenance action.")
-        await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.logs)
+        await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.take_logs())
         return None
       completed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-      payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.logs, "result_json": result_json, "completed_at": completed_at}
+      payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.take_logs(), "result_json": result_json, "completed_at": completed_at}
       updated = await self._jobs_repo.update_job(job.job_id, **payload)
       return updated
     except Exception as exc:  # noqa: BLE001
@@ -688,12 +704,12 @@ class JobProcessor:
                 session.add(run)
                 await session.commit()
       await tracker.fail(phase="failed", message=f"Maintenance job failed: {exc}")
-      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.logs, error_json={"message": str(exc)})
+      await self._jobs_repo.update_job(job.job_id, status="error", phase="failed", progress=100.0, logs=tracker.take_logs(), error_json={"message": str(exc)})
       return None
 
-  async def _process_fenster_build(self, job: JobRecord) -> JobRecord | None:
+  async def _process_fenster_build(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute Fenster Widget generation."""
-    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="fenster", initial_logs=["Fenster job picked up."])
+    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="fenster", initial_logs=["Fenster job picked up."], flush_interval_seconds=self._settings.job_progress_flush_seconds)
     await tracker.set_phase(phase="building", subphase="generating_code")
     section_id = 0
     section_index = 0
@@ -723,7 +739,7 @@ class JobProcessor:
               runtime_config = await resolve_effective_runtime_config(session, settings=self._settings, org_id=user.org_id, subscription_tier_id=tier_id, user_id=None)
 
       provider, model_name = get_fenster_model(runtime_config)
-      model_instance = get_model_for_mode(provider, model_name, agent="fenster_builder")
+      model_instance = get_model_for_mode(provider, model_name, agent="fenster_builder", fallbacks=model_fallbacks_for_agent(runtime_config, "fenster_builder"))
 
       schema_service = SchemaService()
 
@@ -762,7 +778,9 @@ class JobProcessor:
           if existing_widget is None:
             existing_widget = (await session.execute(select(FensterWidget).where(FensterWidget.public_id == fenster_resource_id).limit(1))).scalar_one_or_none()
           if existing_widget is None:
-            existing_widget = FensterWidget(fenster_id=uuid.uuid4(), public_id=fenster_resource_id, creator_id=str(job.user_id or ""), status="completed", is_archived=False, type=FensterWidgetType.INLINE_BLOB, content=compressed, url=None)
+            existing_widget = FensterWidget(
+              fenster_id=uuid.uuid4(), public_id=fenster_resource_id, creator_id=str(job.user_id or ""), status="completed", is_archived=False, type=FensterWidgetType.INLINE_BLOB, content=compressed, content_etag=strong_etag(compressed), url=None
+            )
             session.add(existing_widget)
           else:
             existing_widget.creator_id = str(job.user_id or existing_widget.creator_id)
@@ -770,6 +788,7 @@ class JobProcessor:
             existing_widget.is_archived = False
             existing_widget.type = FensterWidgetType.INLINE_BLOB
             existing_widget.content = compressed
+            existing_widget.content_etag = strong_etag(compressed)
             existing_widget.url = None
             session.add(existing_widget)
           pricing_table = await load_pricing_table(session)
@@ -787,7 +806,7 @@ class JobProcessor:
 
       result_json = {"fenster_resource_id": fenster_resource_id}
 
-      payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.logs + ["Widget built and stored."], "result_json": result_json, "cost": cost_summary, "completed_at": completed_at}
+      payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.take_logs("Widget built and stored."), "result_json": result_json, "cost": cost_summary, "completed_at": completed_at}
       updated = await self._jobs_repo.update_job(job.job_id, **payload)
       await self._checkpoint_mark_state(job=job, stage="fenster_builder", section_index=section_index if section_index > 0 else None, state="done", artifact_refs_json={"section_id": section_id, "fenster_resource_id": fenster_resource_id})
       return updated
@@ -800,7 +819,7 @@ class JobProcessor:
         if section_id > 0:
           await _update_subsection_widget_status(section_id=section_id, widget_types=("fenster",), status="skipped", public_ids=widget_public_ids)
         completed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.logs + ["Quota disabled. Skipping widget build."], "result_json": {}, "completed_at": completed_at}
+        payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.take_logs("Quota disabled. Skipping widget build."), "result_json": {}, "completed_at": completed_at}
         updated = await self._jobs_repo.update_job(job.job_id, **payload)
         await self._checkpoint_mark_state(job=job, stage="fenster_builder", section_index=section_index if section_index > 0 else None, state="done", artifact_refs_json={"section_id": section_id, "skipped": True})
         return updated
@@ -809,14 +828,14 @@ class JobProcessor:
       if section_id > 0:
         await _update_subsection_widget_status(section_id=section_id, widget_types=("fenster",), status="failed", public_ids=widget_public_ids)
       await tracker.fail(phase="failed", message=f"Fenster build failed: {exc}")
-      payload = {"status": "error", "phase": "failed", "progress": 100.0, "logs": tracker.logs, "error_json": {"message": str(exc)}}
+      payload = {"status": "error", "phase": "failed", "progress": 100.0, "logs": tracker.take_logs(), "error_json": {"message": str(exc)}}
       await self._jobs_repo.update_job(job.job_id, **payload)
       await self._checkpoint_mark_state(job=job, stage="fenster_builder", section_index=section_index if section_index > 0 else None, state="error", last_error=str(exc))
       return None
 
-  async def _process_tutor_job(self, job: JobRecord) -> JobRecord | None:
+  async def _process_tutor_job(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute tutor generation."""
-    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="tutor", initial_logs=["Tutor job picked up."])
+    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="tutor", initial_logs=["Tutor job picked up."], flush_interval_seconds=self._settings.job_progress_flush_seconds)
     await tracker.set_phase(phase="building", subphase="generating_audio")
     section_index = 0
 
@@ -858,14 +877,14 @@ class JobProcessor:
 
       if not tutor_mode_enabled:
         completed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.logs + ["Tutor mode disabled. Skipping tutor generation."], "result_json": {"tutor_ids": [], "count": 0, "skipped": True}, "completed_at": completed_at}
+        payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.take_logs("Tutor mode disabled. Skipping tutor generation."), "result_json": {"tutor_ids": [], "count": 0, "skipped": True}, "completed_at": completed_at}
         updated = await self._jobs_repo.update_job(job.job_id, **payload)
         await self._checkpoint_mark_state(job=job, stage="tutor", section_index=section_index if section_index > 0 else None, state="done", artifact_refs_json={"section_index": section_index, "skipped": True})
         return updated
 
       provider, model_name = get_tutor_model(runtime_config)
 
-      model_instance = get_model_for_mode(provider, model_name or None, agent="tutor")
+      model_instance = get_model_for_mode(provider, model_name or None, agent="tutor", fallbacks=model_fallbacks_for_agent(runtime_config, "tutor"))
       schema_service = SchemaService()
 
       usage_list = []
@@ -903,7 +922,7 @@ class JobProcessor:
       completed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
       result_json = {"tutor_ids": audio_ids, "count": len(audio_ids)}
 
-      payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.logs + [f"Generated {len(audio_ids)} audio segments."], "result_json": result_json, "cost": cost_summary, "completed_at": completed_at}
+      payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.take_logs(f"Generated {len(audio_ids)} audio segments."), "result_json": result_json, "cost": cost_summary, "completed_at": completed_at}
       updated = await self._jobs_repo.update_job(job.job_id, **payload)
       await self._checkpoint_mark_state(job=job, stage="tutor", section_index=section_index if section_index > 0 else None, state="done", artifact_refs_json={"section_index": section_index, "count": len(audio_ids)})
       return updated
@@ -911,14 +930,14 @@ class JobProcessor:
     except Exception as exc:
       self._logger.error("Tutor job failed", exc_info=True)
       await tracker.fail(phase="failed", message=f"Tutor job failed: {exc}")
-      payload = {"status": "error", "phase": "failed", "progress": 100.0, "logs": tracker.logs, "error_json": {"message": str(exc)}}
+      payload = {"status": "error", "phase": "failed", "progress": 100.0, "logs": tracker.take_logs(), "error_json": {"message": str(exc)}}
       await self._jobs_repo.update_job(job.job_id, **payload)
       await self._checkpoint_mark_state(job=job, stage="tutor", section_index=section_index if section_index > 0 else None, state="error", last_error=str(exc))
       return None
 
-  async def _process_illustration_job(self, job: JobRecord) -> JobRecord | None:
+  async def _process_illustration_job(self, job: JobRecord) -> JobRecord | JobStatusSummary | None:
     """Execute section illustration generation and persistence."""
-    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="illustration", initial_logs=["Illustration job picked up."])
+    tracker = JobProgressTracker(job_id=job.job_id, jobs_repo=self._jobs_repo, total_steps=1, total_ai_calls=1, label_prefix="illustration", initial_logs=["Illustration job picked up."], flush_interval_seconds=self._settings.job_progress_flush_seconds)
     await tracker.set_phase(phase="building", subphase="generating_image")
 
     wrapped_payload = job.request.get("payload")
@@ -1009,7 +1028,7 @@ class JobProcessor:
               "status": "done",
               "phase": "complete",
               "progress": 100.0,
-              "logs": tracker.logs + [f"Illustration already exists for section {section_id}. Skipping regeneration."],
+              "logs": tracker.take_logs(f"Illustration already exists for section {section_id}. Skipping regeneration."),
               "result_json": result_json,
               "cost": cost_summary,
               "completed_at": completed_at,
@@ -1023,7 +1042,7 @@ class JobProcessor:
 
       # Resolve runtime-configured provider/model for the illustration agent.
       provider, model_name = get_illustration_model(runtime_config)
-      model_instance = get_model_for_mode(provider, model_name or None, agent="illustration")
+      model_instance = get_model_for_mode(provider, model_name or None, agent="illustration", fallbacks=model_fallbacks_for_agent(runtime_config, "illustration"))
       schema_service = SchemaService()
       usage_list: list[dict[str, Any]] = []
 
@@ -1105,7 +1124,7 @@ class JobProcessor:
       await tracker.set_cost(cost_summary)
       completed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
       result_json = {"section_id": section_id, "illustration_id": illustration_row_id, "resource_id": str(illustration_row.public_id), "image_name": uploaded_object_name or "", "mime_type": "image/webp"}
-      update_payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.logs + [f"Illustration generated for section {section_id}."], "result_json": result_json, "cost": cost_summary, "completed_at": completed_at}
+      update_payload = {"status": "done", "phase": "complete", "progress": 100.0, "logs": tracker.take_logs(f"Illustration generated for section {section_id}."), "result_json": result_json, "cost": cost_summary, "completed_at": completed_at}
       updated = await self._jobs_repo.update_job(job.job_id, **update_payload)
       await self._checkpoint_mark_state(
         job=job, stage="illustration", section_index=section_index if section_index > 0 else None, state="done", artifact_refs_json={"section_id": section_id, "illustration_id": illustration_row_id, "image_name": uploaded_object_name}
@@ -1160,17 +1179,17 @@ class JobProcessor:
       if section_id > 0:
         await _update_subsection_widget_status(section_id=section_id, widget_types=("illustration",), status="failed")
       await tracker.fail(phase="failed", message=f"Illustration job failed: {exc}")
-      payload = {"status": "error", "phase": "failed", "progress": 100.0, "logs": tracker.logs, "error_json": {"message": str(exc)}}
+      payload = {"status": "error", "phase": "failed", "progress": 100.0, "logs": tracker.take_logs(), "error_json": {"message": str(exc)}}
       await self._jobs_repo.update_job(job.job_id, **payload)
       await self._checkpoint_mark_state(job=job, stage="illustration", section_index=section_index if section_index > 0 else None, state="error", last_error=str(exc))
       return None
 
-  async def process_queue(self, limit: int = 5) -> list[JobRecord]:
-    """Process a small batch of queued jobs."""
-    queued = await self._jobs_repo.find_queued(limit=limit)
-    results: list[JobRecord] = []
-    for job in queued:
-      processed = await self.process_job(job)
+  async def process_queue(self, limit: int = 5) -> list[JobRecord | JobStatusSummary]:
+    """Claim and process a small batch of queued jobs; safe to run from several workers at once."""
+    claimed = await self._jobs_repo.claim_queued(limit=limit)
+    results: list[JobRecord | JobStatusSummary] = []
+    for job in claimed:
+      processed = await self._run_job(job, claimed=True)
       if processed:
         results.append(processed)
     return results
@@ -7,13 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import admin, auth, configuration, data_transfer, fenster, jobs, lessons, media, notifications, onboarding, purgatory, push, quotas, research, resources, sections, tasks, tutor, users, worker, writing
 from app.config import get_settings
 from app.core.exceptions import global_exception_handler, http_exception_handler, request_validation_exception_handler
-from app.core.json import DecimalJSONResponse
+from app.core.json import MsgspecJSONResponse
 from app.core.lifespan import lifespan
 from app.core.middleware import RequestLoggingMiddleware, SecurityHeadersMiddleware
 
 settings = get_settings()
 
-app = FastAPI(default_response_class=DecimalJSONResponse, lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+app = FastAPI(default_response_class=MsgspecJSONResponse, lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
 
 app.add_middleware(CORSMiddleware, allow_origins=settings.allowed_origins, allow_credentials=True, allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"], allow_headers=["content-type", "authorization"], expose_headers=["content-length"])
 
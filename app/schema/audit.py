@@ -32,3 +32,4 @@ class LlmCallAudit(Base):
   job_id: Mapped[str | None] = mapped_column(String, nullable=True)
   status: Mapped[str] = mapped_column(String, nullable=False)
   error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+  cache_status: Mapped[str | None] = mapped_column(String, nullable=True)
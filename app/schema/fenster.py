@@ -26,5 +26,6 @@ class FensterWidget(Base):
   type: Mapped[FensterWidgetType] = mapped_column(Enum(FensterWidgetType, name="fensterwidgettype", create_type=False), nullable=False)
   content: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)  # brotli compressed content
   url: Mapped[str | None] = mapped_column(String, nullable=True)  # cdn url
+  content_etag: Mapped[str | None] = mapped_column(String, nullable=True)  # strong ETag of content, set when content is written
   created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
   updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func, text
+from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -14,6 +14,8 @@ class Job(Base):
   __table_args__ = (
     UniqueConstraint("user_id", "job_kind", "idempotency_key", name="ux_jobs_user_kind_idempotency"),
     Index("ux_jobs_active_resume_source", "resume_source_job_id", unique=True, postgresql_where=text("resume_source_job_id IS NOT NULL AND status IN ('queued', 'running')")),
+    # Queue order for claim_queued; only queued rows are indexed, so it stays small as finished jobs accumulate.
+    Index("ix_jobs_queued_created_at", "created_at", postgresql_where=text("status = 'queued'")),
   )
 
   job_id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -30,6 +32,28 @@ class Job(Base):
   target_agent: Mapped[str | None] = mapped_column(String, nullable=True)
   result_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
   error_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+  phase: Mapped[str | None] = mapped_column(String, nullable=True)
+  subphase: Mapped[str | None] = mapped_column(String, nullable=True)
+  progress: Mapped[float | None] = mapped_column(Float, nullable=True)
+  total_steps: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  completed_steps: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  expected_sections: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  completed_sections: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  completed_section_indexes: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+  current_section_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  current_section_status: Mapped[str | None] = mapped_column(String, nullable=True)
+  current_section_retry_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  current_section_title: Mapped[str | None] = mapped_column(String, nullable=True)
+  retry_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  max_retries: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  retry_sections: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+  retry_agents: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+  retry_parent_job_id: Mapped[str | None] = mapped_column(String, nullable=True)
+  artifacts_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+  validation_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+  cost_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+  # Events of finished jobs folded out of job_events by the compact_job_events maintenance action, oldest first.
+  event_log_json: Mapped[list | None] = mapped_column(JSONB, nullable=True)
   created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
   started_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
   updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -64,3 +88,15 @@ class JobEvent(Base):
   message: Mapped[str] = mapped_column(Text, nullable=False)
   payload_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
   created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class UserActiveJobCounter(Base):
+  """Per-user, per-feature count of jobs currently queued or running."""
+
+  __tablename__ = "user_active_job_counters"
+  __table_args__ = (CheckConstraint("active_count >= 0", name="ck_user_active_job_counters_non_negative"),)
+
+  user_id: Mapped[str] = mapped_column(String, primary_key=True)
+  feature: Mapped[str] = mapped_column(String, primary_key=True)
+  active_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+  updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
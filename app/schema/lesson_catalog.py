@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 from app.config import Settings
 from app.schema.service import DEFAULT_WIDGETS_PATH
 from app.schema.widget_preference import WIDGET_PREFERENCES
-from app.schema.widgets_loader import load_widget_registry
+from app.schema.widgets_loader import WidgetRegistry, get_widget_registry
 
 _RAW_BLUEPRINTS: list[dict[str, Any]] = [
   {
@@ -189,11 +190,10 @@ def _build_teaching_style_options() -> list[dict[str, str]]:
   return options
 
 
-def _build_widget_options() -> list[dict[str, str]]:
+def _build_widget_options(registry: WidgetRegistry) -> list[dict[str, str]]:
   """Build widget option payloads with tooltip guidance."""
   options: list[dict[str, str]] = []
   seen_widget_ids: set[str] = set()
-  registry = load_widget_registry(DEFAULT_WIDGETS_PATH)
   label_map = {
     "markdown": "Markdown Text",
     "table": "Table",
@@ -259,14 +259,23 @@ def build_widget_defaults() -> dict[str, dict[str, list[str]]]:
 
 
 def build_lesson_catalog(settings: Settings) -> dict[str, Any]:
-  """Return a static payload for lesson option metadata."""
+  """Return a static payload for lesson option metadata.
+
+  The payload is shared across calls and rebuilt only when the widget registry is reloaded, so callers must not mutate it.
+  """
   # Retain settings arg for compatibility with existing call sites.
   _ = settings
+  return _build_catalog_for_registry(get_widget_registry(DEFAULT_WIDGETS_PATH))
+
+
+@lru_cache(maxsize=1)
+def _build_catalog_for_registry(registry: WidgetRegistry) -> dict[str, Any]:
+  """Assemble the catalog once per registry instance so repeat requests skip markdown parsing and tooltip work."""
   # Build widget defaults so the UI can reflect blueprint/style defaults.
   widget_defaults = build_widget_defaults()
 
   # Assemble option payloads for selectable UI fields.
   blueprints = _build_blueprint_options()
   teaching_styles = _build_teaching_style_options()
-  widgets = _build_widget_options()
+  widgets = _build_widget_options(registry)
   return {"blueprints": blueprints, "teaching_styles": teaching_styles, "learner_levels": list(_LEARNER_LEVELS), "depths": list(_DEPTH_OPTIONS), "widgets": widgets, "default_widgets": widget_defaults}
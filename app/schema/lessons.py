@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import ARRAY, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func, text
+from sqlalchemy import ARRAY, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func, text
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -40,6 +40,14 @@ def _subsection_widget_type_values(enum_cls: type[PyEnum]) -> list[str]:
 
 class Lesson(Base):
   __tablename__ = "lessons"
+  # One index per listing sort key so per-user keyset pages are a single index range scan.
+  __table_args__ = (
+    Index("ix_lessons_user_archived_created_at", "user_id", "is_archived", "created_at", "lesson_id"),
+    Index("ix_lessons_user_archived_lesson_id", "user_id", "is_archived", "lesson_id"),
+    Index("ix_lessons_user_archived_topic", "user_id", "is_archived", "topic", "lesson_id"),
+    Index("ix_lessons_user_archived_title", "user_id", "is_archived", "title", "lesson_id"),
+    Index("ix_lessons_user_archived_status", "user_id", "is_archived", "status", "lesson_id"),
+  )
 
   lesson_id: Mapped[str] = mapped_column(String, primary_key=True)
   user_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
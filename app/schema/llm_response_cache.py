@@ -0,0 +1,24 @@
+"""SQLAlchemy models for cached structured LLM responses."""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class LlmResponseCacheEntry(Base):
+  """Structured model output keyed by a hash of the model, prompt, schema and generation config."""
+
+  __tablename__ = "llm_response_cache"
+
+  cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+  model: Mapped[str] = mapped_column(String, nullable=False)
+  content: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+  created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+  expires_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+import threading
 from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -156,3 +157,41 @@ def load_widget_registry(path: Path) -> WidgetRegistry:
     definitions[name] = WidgetDefinition(name=name, description=section_text or "Undocumented widget.", fields=fields, is_shorthand=is_shorthand, shorthand_positions=shorthand_positions)
 
   return WidgetRegistry(definitions)
+
+
+# Registries are parsed once per (path, mtime); callers reuse them and their derived views process-wide.
+_REGISTRY_CACHE: dict[Path, tuple[int, WidgetRegistry]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_widget_registry(path: Path) -> WidgetRegistry:
+  """Return the process-wide registry for a widget file, parsing it on first use only."""
+  key = path.resolve()
+  cached = _REGISTRY_CACHE.get(key)
+  if cached is not None:
+    return cached[1]
+
+  with _REGISTRY_LOCK:
+    cached = _REGISTRY_CACHE.get(key)
+    if cached is None:
+      mtime_ns = key.stat().st_mtime_ns if key.is_file() else 0
+      cached = (mtime_ns, load_widget_registry(key))
+      _REGISTRY_CACHE[key] = cached
+  return cached[1]
+
+
+def reload_widget_registry(path: Path, *, force: bool = False) -> WidgetRegistry:
+  """Re-parse a widget file when its mtime changed (or when forced) and publish the new registry.
+
+  Intended for development hot-reload; derived views keyed on the registry object rebuild automatically.
+  """
+  key = path.resolve()
+  with _REGISTRY_LOCK:
+    cached = _REGISTRY_CACHE.get(key)
+    mtime_ns = key.stat().st_mtime_ns if key.is_file() else 0
+    if cached is not None and cached[0] == mtime_ns and not force:
+      return cached[1]
+
+    registry = load_widget_registry(key)
+    _REGISTRY_CACHE[key] = (mtime_ns, registry)
+  return registry
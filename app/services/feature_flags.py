@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import datetime
 import re
+import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from app.config import get_settings
 from app.schema.feature_flags import FeatureFlag, OrganizationFeatureFlag, SubscriptionTierFeatureFlag, UserFeatureFlagOverride
@@ -43,6 +44,70 @@ class FeatureFlagDecision:
   missing_scope: str | None = None
 
 
+@dataclass
+class _FeatureFlagTable:
+  """Precompiled static flag layers shared by every evaluation until an admin write invalidates them."""
+
+  defaults: dict[str, bool]
+  globally_disabled: frozenset[str]
+  tier_is_tenant: dict[int, bool]
+  tier_flags: dict[int, dict[str, bool]]
+  loaded_at: float
+  # Tenant rows scale with organization count, so they are compiled lazily per org.
+  tenant_flags: dict[uuid.UUID, dict[str, bool]] = field(default_factory=dict)
+
+
+# Other instances invalidate only their own tables, so a short TTL bounds cross-instance staleness.
+FEATURE_FLAG_TABLE_TTL_SECONDS = 30.0
+_flag_table: _FeatureFlagTable | None = None
+_flag_table_generation = 0
+
+
+def invalidate_feature_flag_cache() -> None:
+  """Drop the compiled decision table so the next evaluation reloads static layers."""
+  global _flag_table, _flag_table_generation
+  _flag_table = None
+  _flag_table_generation += 1
+
+
+async def _load_feature_flag_table(session: AsyncSession) -> _FeatureFlagTable:
+  """Return the compiled decision table, rebuilding it when missing or expired."""
+  global _flag_table
+  table = _flag_table
+  if table is not None and time.monotonic() - table.loaded_at < FEATURE_FLAG_TABLE_TTL_SECONDS:
+    return table
+
+  # Capture the generation so a table built across an admin write is not published stale.
+  generation = _flag_table_generation
+  flags_result = await session.execute(select(FeatureFlag.key, FeatureFlag.default_enabled))
+  defaults = {str(key): bool(enabled) for key, enabled in flags_result.fetchall()}
+  tiers_result = await session.execute(select(SubscriptionTier.id, SubscriptionTier.is_tenant_tier))
+  tier_is_tenant = {int(tier_id): bool(is_tenant) for tier_id, is_tenant in tiers_result.fetchall()}
+  tier_rows = await session.execute(select(SubscriptionTierFeatureFlag.subscription_tier_id, FeatureFlag.key, SubscriptionTierFeatureFlag.enabled).join(FeatureFlag, FeatureFlag.id == SubscriptionTierFeatureFlag.feature_flag_id))
+  tier_flags: dict[int, dict[str, bool]] = {}
+  for tier_id, key, enabled in tier_rows.fetchall():
+    tier_flags.setdefault(int(tier_id), {})[str(key)] = bool(enabled)
+  globally_disabled = frozenset(await resolve_global_disabled_features(session))
+
+  table = _FeatureFlagTable(defaults=defaults, globally_disabled=globally_disabled, tier_is_tenant=tier_is_tenant, tier_flags=tier_flags, loaded_at=time.monotonic())
+  if generation == _flag_table_generation:
+    _flag_table = table
+  return table
+
+
+async def _tenant_flag_map(session: AsyncSession, table: _FeatureFlagTable, org_id: uuid.UUID) -> dict[str, bool]:
+  """Return compiled tenant overrides for an organization, loading them on first use."""
+  tenant_map = table.tenant_flags.get(org_id)
+  if tenant_map is not None:
+    return tenant_map
+
+  tenant_stmt = select(FeatureFlag.key, OrganizationFeatureFlag.enabled).join(OrganizationFeatureFlag, OrganizationFeatureFlag.feature_flag_id == FeatureFlag.id).where(OrganizationFeatureFlag.org_id == org_id)
+  tenant_result = await session.execute(tenant_stmt)
+  tenant_map = {str(key): bool(enabled) for key, enabled in tenant_result.fetchall()}
+  table.tenant_flags[org_id] = tenant_map
+  return tenant_map
+
+
 def feature_flag_to_permission_slug(key: str) -> str:
   """Convert a feature flag key into a permission slug."""
   normalized = validate_flag_key(key)
@@ -89,6 +154,7 @@ async def create_feature_flag(session: AsyncSession, *, key: str, description: s
   permission_stmt = permission_stmt.on_conflict_do_update(index_elements=["slug"], set_={"display_name": permission_display, "description": permission_description})
   await session.execute(permission_stmt)
   await session.commit()
+  invalidate_feature_flag_cache()
   await session.refresh(flag)
   return flag
 
@@ -104,6 +170,7 @@ async def set_feature_flag_default_enabled(session: AsyncSession, *, key: str, e
   # Persist the updated default so global evaluation reflects the toggle.
   flag.default_enabled = enabled
   await session.commit()
+  invalidate_feature_flag_cache()
   await session.refresh(flag)
   return flag
 
@@ -115,6 +182,7 @@ async def set_tier_feature_flag(session: AsyncSession, *, subscription_tier_id:
   stmt = stmt.on_conflict_do_update(index_elements=["subscription_tier_id", "feature_flag_id"], set_={"enabled": enabled})
   await session.execute(stmt)
   await session.commit()
+  invalidate_feature_flag_cache()
 
 
 async def set_org_feature_flag(session: AsyncSession, *, org_id: uuid.UUID, feature_flag_id: uuid.UUID, enabled: bool) -> None:
@@ -124,6 +192,7 @@ async def set_org_feature_flag(session: AsyncSession, *, org_id: uuid.UUID, feat
   stmt = stmt.on_conflict_do_update(index_elements=["org_id", "feature_flag_id"], set_={"enabled": enabled})
   await session.execute(stmt)
   await session.commit()
+  invalidate_feature_flag_cache()
 
 
 async def ensure_org_feature_flag_rows(session: AsyncSession, *, org_id: uuid.UUID) -> None:
@@ -142,6 +211,7 @@ async def ensure_org_feature_flag_rows(session: AsyncSession, *, org_id: uuid.UU
       continue
     session.add(OrganizationFeatureFlag(org_id=org_id, feature_flag_id=flag_id, enabled=flag_key.startswith("perm.")))
   await session.commit()
+  invalidate_feature_flag_cache()
 
 
 async def set_user_feature_flag_override(session: AsyncSession, *, user_id: uuid.UUID, feature_flag_id: uuid.UUID, enabled: bool, starts_at: datetime.datetime, expires_at: datetime.datetime) -> None:
@@ -216,59 +286,36 @@ async def resolve_feature_flag_decisions(session: AsyncSession, *, keys: list[st
   if keys is not None:
     requested_keys = [validate_flag_key(value) for value in keys]
 
-  # Load all candidate flag definitions in a single query to avoid N+1 behavior.
-  flags_stmt = select(FeatureFlag)
-  if requested_keys is not None:
-    flags_stmt = flags_stmt.where(FeatureFlag.key.in_(requested_keys))
-  flags_result = await session.execute(flags_stmt.order_by(FeatureFlag.key.asc()))
-  flags = list(flags_result.scalars().all())
-  flags_by_key = {flag.key: flag for flag in flags}
-
-  # Resolve globally disabled runtime-config keys once per request.
-  globally_disabled = await resolve_global_disabled_features(session)
+  # Static layers (definitions, tier/tenant maps, global disables) come from the compiled table.
+  table = await _load_feature_flag_table(session)
+  flag_defaults = table.defaults
+  globally_disabled = table.globally_disabled
 
   # Resolve whether this user context should follow tenant chain semantics.
   is_tenant_tier: bool | None = None
   if subscription_tier_id is not None:
-    tier_stmt = select(SubscriptionTier.is_tenant_tier).where(SubscriptionTier.id == int(subscription_tier_id))
-    tier_result = await session.execute(tier_stmt)
-    row = tier_result.one_or_none()
-    is_tenant_tier = bool(row[0]) if row is not None else None
+    is_tenant_tier = table.tier_is_tenant.get(int(subscription_tier_id))
   is_tenant_context = bool(org_id is not None and is_tenant_tier is True)
 
-  # Load tier overrides for all relevant flags in one query.
   tier_map: dict[str, bool] = {}
   if subscription_tier_id is not None:
-    tier_stmt = (
-      select(FeatureFlag.key, SubscriptionTierFeatureFlag.enabled).join(SubscriptionTierFeatureFlag, SubscriptionTierFeatureFlag.feature_flag_id == FeatureFlag.id).where(SubscriptionTierFeatureFlag.subscription_tier_id == int(subscription_tier_id))
-    )
-    if requested_keys is not None:
-      tier_stmt = tier_stmt.where(FeatureFlag.key.in_(requested_keys))
-    tier_result = await session.execute(tier_stmt)
-    tier_map = {str(key): bool(enabled) for key, enabled in tier_result.fetchall()}
+    tier_map = table.tier_flags.get(int(subscription_tier_id), {})
 
-  # Load tenant overrides for all relevant flags in one query.
   tenant_map: dict[str, bool] = {}
   if org_id is not None:
-    tenant_stmt = select(FeatureFlag.key, OrganizationFeatureFlag.enabled).join(OrganizationFeatureFlag, OrganizationFeatureFlag.feature_flag_id == FeatureFlag.id).where(OrganizationFeatureFlag.org_id == org_id)
-    if requested_keys is not None:
-      tenant_stmt = tenant_stmt.where(FeatureFlag.key.in_(requested_keys))
-    tenant_result = await session.execute(tenant_stmt)
-    tenant_map = {str(key): bool(enabled) for key, enabled in tenant_result.fetchall()}
+    tenant_map = await _tenant_flag_map(session, table, org_id)
 
-  # Load active promo overrides in one query for non-tenant fallback checks.
+  # Only time-bounded promo overrides are evaluated per call, in a single statement.
   promo_map: dict[str, bool] = {}
   if user_id is not None:
     promo_map = await list_active_user_feature_overrides(session, user_id=user_id)
-    if requested_keys is not None:
-      promo_map = {key: value for key, value in promo_map.items() if key in requested_keys}
 
   # Evaluate every requested/known key using strict scope chain semantics.
-  ordered_keys = requested_keys if requested_keys is not None else sorted(flags_by_key.keys())
+  ordered_keys = requested_keys if requested_keys is not None else sorted(flag_defaults.keys())
   decisions: dict[str, FeatureFlagDecision] = {}
   for key in ordered_keys:
-    flag = flags_by_key.get(key)
-    if flag is None:
+    default_enabled = flag_defaults.get(key)
+    if default_enabled is None:
       decisions[key] = FeatureFlagDecision(
         key=key,
         enabled=False,
@@ -287,7 +334,7 @@ async def resolve_feature_flag_decisions(session: AsyncSession, *, keys: list[st
       continue
 
     # Evaluate global default and runtime kill-switch first so hard disables always win.
-    global_enabled = bool(flag.default_enabled) and key not in globally_disabled
+    global_enabled = default_enabled and key not in globally_disabled
     if not global_enabled:
       decisions[key] = FeatureFlagDecision(
         key=key,
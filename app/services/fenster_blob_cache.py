@@ -0,0 +1,58 @@
+"""Process-local LRU of compressed fenster blobs, bounded by total bytes."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+
+from app.config import get_settings
+
+
+class FensterBlobCache:
+  """Keep recently served blobs keyed by fenster id, valid only while the stored ETag is unchanged.
+
+  Entries are checked against the ETag read with the row on every request, so a rebuilt widget is never served stale.
+  """
+
+  def __init__(self, max_bytes: int) -> None:
+    self._max_bytes = max_bytes
+    self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+    self._size_bytes = 0
+
+  @property
+  def size_bytes(self) -> int:
+    return self._size_bytes
+
+  def get(self, fenster_id: str, etag: str) -> bytes | None:
+    """Return the cached blob when it matches etag, dropping an entry left over from an older build."""
+    entry = self._entries.get(fenster_id)
+    if entry is None:
+      return None
+    cached_etag, blob = entry
+    if cached_etag != etag:
+      self._remove(fenster_id)
+      return None
+    self._entries.move_to_end(fenster_id)
+    return blob
+
+  def put(self, fenster_id: str, etag: str, blob: bytes) -> None:
+    """Store a blob, evicting least recently used entries until the byte budget holds; oversized blobs are not cached."""
+    if len(blob) > self._max_bytes:
+      return
+    self._remove(fenster_id)
+    self._entries[fenster_id] = (etag, blob)
+    self._size_bytes += len(blob)
+    while self._size_bytes > self._max_bytes:
+      oldest = next(iter(self._entries))
+      self._remove(oldest)
+
+  def _remove(self, fenster_id: str) -> None:
+    entry = self._entries.pop(fenster_id, None)
+    if entry is not None:
+      self._size_bytes -= len(entry[1])
+
+
+@lru_cache(maxsize=1)
+def get_fenster_blob_cache() -> FensterBlobCache:
+  """Build the process-wide blob cache from settings."""
+  return FensterBlobCache(get_settings().fenster_blob_cache_bytes)
@@ -6,6 +6,7 @@ from typing import Any
 from app.api.models import ChildJobStatus, JobCreateRequest, JobCreateResponse, JobRetryRequest, JobStatusResponse
 from app.config import Settings
 from app.core.database import get_session_factory
+from app.jobs.concurrency import ConcurrencyLimitExceededError
 from app.jobs.models import JobKind, JobRecord
 from app.schema.illustrations import Illustration
 from app.schema.jobs import Job
@@ -18,6 +19,7 @@ from app.services.storage_client import build_storage_client
 from app.services.tasks.factory import get_task_enqueuer
 from app.services.users import get_user_by_id, get_user_subscription_tier
 from app.storage.factory import _get_jobs_repo
+from app.storage.jobs_repo import JobStatusSummary
 from app.utils.ids import generate_job_id
 from fastapi import BackgroundTasks, HTTPException, status
 from sqlalchemy import select
@@ -50,7 +52,7 @@ def _expected_sections_from_payload(payload: dict[str, Any], target_agent: str)
 
 
 def _job_status_from_record(
-  record: JobRecord, *, child_jobs: list[ChildJobStatus] | None = None, requested_job_id: str | None = None, resolved_job_id: str | None = None, superseded_job_id: str | None = None, follow_from_job_id: str | None = None
+  record: JobRecord | JobStatusSummary, *, child_jobs: list[ChildJobStatus] | None = None, requested_job_id: str | None = None, resolved_job_id: str | None = None, superseded_job_id: str | None = None, follow_from_job_id: str | None = None
 ) -> JobStatusResponse:
   return JobStatusResponse(
     job_id=record.job_id,
@@ -139,23 +141,7 @@ async def _infer_resume_scope_from_source(*, source: JobRecord) -> tuple[list[in
   return None, inferred_agents
 
 
-async def _resolve_latest_record(record: JobRecord, settings: Settings) -> JobRecord:
-  repo = _get_jobs_repo(settings)
-  current = record
-  visited = {current.job_id}
-  while current.superseded_by_job_id:
-    next_job_id = str(current.superseded_by_job_id)
-    if next_job_id in visited:
-      break
-    visited.add(next_job_id)
-    next_record = await repo.get_job(next_job_id)
-    if next_record is None:
-      break
-    current = next_record
-  return current
-
-
-async def _resolve_child_jobs(record: JobRecord, settings: Settings) -> list[ChildJobStatus] | None:
+async def _resolve_child_jobs(record: JobRecord | JobStatusSummary, settings: Settings) -> list[ChildJobStatus] | None:
   repo = _get_jobs_repo(settings)
   children = await repo.list_child_jobs(parent_job_id=record.job_id, include_done=False)
   if not children:
@@ -188,7 +174,7 @@ async def _ensure_quota_available(db_session: AsyncSession, *, settings: Setting
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail={"error": "QUOTA_EXCEEDED", "metric": metric_key})
 
 
-async def create_job(request: JobCreateRequest, settings: Settings, background_tasks: BackgroundTasks, db_session: AsyncSession, *, user_id: str | None = None) -> JobCreateResponse:
+async def create_job(request: JobCreateRequest, settings: Settings, background_tasks: BackgroundTasks, db_session: AsyncSession, *, user_id: str | None = None, concurrency_limit: int | None = None) -> JobCreateResponse:
   if user_id is None:
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied.")
   compatible_targets = _COMPATIBLE_TARGETS.get(request.job_kind, set())
@@ -232,7 +218,10 @@ async def create_job(request: JobCreateRequest, settings: Settings, background_t
     completed_at=None,
     idempotency_key=request.idempotency_key,
   )
-  await repo.create_job(record)
+  try:
+    await repo.create_job(record, concurrency_limit=concurrency_limit)
+  except ConcurrencyLimitExceededError as exc:
+    raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=f"{exc} Please wait for your current request to complete.") from exc
   trigger_job_processing(background_tasks, job_id, settings, auto_process=auto_process)
   return JobCreateResponse(job_id=job_id, expected_sections=_expected_sections_from_payload(request.payload, request.target_agent))
 
@@ -247,9 +236,9 @@ async def retry_job(job_id: str, payload: JobRetryRequest, settings: Settings, b
   if record.status not in ("error", "canceled"):
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Only failed or canceled jobs can be retried.")
   await _apply_in_place_retry_filters(repo=repo, record=record, payload=payload)
-  updated = await repo.update_job(job_id, status="queued", completed_at=None, error_json=None, logs=["Manual retry queued."])
+  updated = await repo.update_job(job_id, expected_status=("error", "canceled"), status="queued", completed_at=None, error_json=None, logs=["Manual retry queued."])
   if updated is None:
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_JOB_NOT_FOUND_MSG)
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Only failed or canceled jobs can be retried.")
   trigger_job_processing(background_tasks, updated.job_id, settings, auto_process=True)
   child_jobs = await _resolve_child_jobs(updated, settings)
   return _job_status_from_record(updated, child_jobs=child_jobs, requested_job_id=job_id, resolved_job_id=updated.job_id)
@@ -386,9 +375,10 @@ async def cancel_job(job_id: str, settings: Settings, user_id: str | None = None
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied.")
   if record.status in ("done", "error", "canceled", "superseded"):
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job is already finalized and cannot be canceled.")
-  updated = await repo.update_job(job_id, status="canceled", completed_at=time.strftime(_DATE_FORMAT, time.gmtime()), logs=["Job cancellation requested by client."])
+  # The precondition closes the race with a worker finalizing the job after the check above.
+  updated = await repo.update_job(job_id, expected_status=("queued", "running", "processing", "in_progress"), status="canceled", completed_at=time.strftime(_DATE_FORMAT, time.gmtime()), logs=["Job cancellation requested by client."])
   if updated is None:
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_JOB_NOT_FOUND_MSG)
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job is already finalized and cannot be canceled.")
   child_jobs = await _resolve_child_jobs(updated, settings)
   return _job_status_from_record(updated, child_jobs=child_jobs, requested_job_id=job_id, resolved_job_id=updated.job_id)
 
@@ -397,13 +387,13 @@ async def get_job_status(job_id: str, settings: Settings, user_id: str | None =
   if not user_id:
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied.")
   repo = _get_jobs_repo(settings)
-  requested = await repo.get_job(job_id)
-  if requested is None:
+  chain = await repo.resolve_job_chain(job_id)
+  if chain is None:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_JOB_NOT_FOUND_MSG)
+  requested, resolved = chain.requested, chain.resolved
   if requested.user_id != user_id:
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied.")
-  resolved = await _resolve_latest_record(requested, settings)
-  child_jobs = await _resolve_child_jobs(resolved, settings)
+  child_jobs = [ChildJobStatus(job_id=child.job_id, status=child.status) for child in chain.children] or None
   return _job_status_from_record(
     resolved,
     child_jobs=child_jobs,
@@ -414,7 +404,7 @@ async def get_job_status(job_id: str, settings: Settings, user_id: str | None =
   )
 
 
-async def process_job_sync(job_id: str, settings: Settings) -> JobRecord | None:
+async def process_job_sync(job_id: str, settings: Settings) -> JobRecord | JobStatusSummary | None:
   repo = _get_jobs_repo(settings)
   try:
     from app.jobs.worker import JobProcessor
@@ -0,0 +1,66 @@
+"""Pre-encoded lesson catalog responses shared across requests."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app.api.models import LessonCatalogResponse
+from app.config import Settings
+from app.schema.lesson_catalog import build_lesson_catalog
+from app.services.runtime_config import resolve_effective_runtime_config
+from app.utils.etags import strong_etag
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Other instances only see admin writes through their own invalidation, so a short TTL bounds staleness.
+CATALOG_CACHE_TTL_SECONDS = 30.0
+CATALOG_CACHE_CONTROL = "public, max-age=86400"
+# Without operator opt-in, clients may store the catalog but must revalidate it with the ETag.
+CATALOG_REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True)
+class LessonCatalogEntry:
+  """Encoded catalog body with the validators and headers served alongside it."""
+
+  body: bytes
+  etag: str
+  cache_control: str
+  payload: dict[str, Any]
+  loaded_at: float
+
+
+_catalog_entry: LessonCatalogEntry | None = None
+_catalog_generation = 0
+
+
+def invalidate_lesson_catalog_cache() -> None:
+  """Drop the encoded catalog so the next request re-resolves config and re-encodes."""
+  global _catalog_entry, _catalog_generation
+  _catalog_entry = None
+  _catalog_generation += 1
+
+
+async def get_lesson_catalog_entry(session: AsyncSession, *, settings: Settings) -> LessonCatalogEntry:
+  """Return the cached catalog entry, rebuilding it after expiry, invalidation or a widget registry reload.
+
+  How/Why:
+    - The catalog only varies by global runtime config and the widget registry, so one entry serves every caller.
+    - Encoding once lets hot requests skip runtime-config resolution, model validation and JSON serialization.
+  """
+  global _catalog_entry
+  payload = build_lesson_catalog(settings)
+  entry = _catalog_entry
+  if entry is not None and entry.payload is payload and time.monotonic() - entry.loaded_at < CATALOG_CACHE_TTL_SECONDS:
+    return entry
+
+  # Capture the generation so an entry built across an admin write is not published stale.
+  generation = _catalog_generation
+  runtime_config = await resolve_effective_runtime_config(session, settings=settings, org_id=None, subscription_tier_id=None, user_id=None)
+  cache_control = CATALOG_CACHE_CONTROL if runtime_config.get("lessons.cache_catalog") is True else CATALOG_REVALIDATE_CACHE_CONTROL
+  body = LessonCatalogResponse(**payload).model_dump_json().encode("utf-8")
+  entry = LessonCatalogEntry(body=body, etag=strong_etag(body), cache_control=cache_control, payload=payload, loaded_at=time.monotonic())
+  if generation == _catalog_generation:
+    _catalog_entry = entry
+  return entry
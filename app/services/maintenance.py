@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import sqlalchemy as sa
 from app.config import Settings
+from app.jobs.concurrency import active_job_counts_query
+from app.schema.jobs import Job, JobEvent, UserActiveJobCounter
 from app.schema.lessons import Lesson
+from app.schema.llm_response_cache import LlmResponseCacheEntry
 from app.schema.quotas import UserUsageMetrics
 from app.schema.sql import User
 from app.services.runtime_config import resolve_effective_runtime_config
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -46,3 +51,67 @@ async def archive_old_lessons(session: AsyncSession, *, settings: Settings) -> i
     archived_total += len(lesson_ids)
   await session.commit()
   return archived_total
+
+
+async def reconcile_active_job_counters(session: AsyncSession) -> int:
+  """Correct drift between the active-job counters and the jobs table.
+
+  How/Why:
+    - Counters are maintained incrementally on job transitions, so out-of-band writes (manual SQL, account merges) can skew them.
+    - Counter rows are locked before jobs are counted; in-flight transitions wait on those locks and apply their delta on top of the corrected value.
+  """
+  stored_result = await session.execute(select(UserActiveJobCounter.user_id, UserActiveJobCounter.feature, UserActiveJobCounter.active_count).with_for_update())
+  stored = {(str(user_id), str(feature)): int(active_count) for user_id, feature, active_count in stored_result.fetchall()}
+  actual_result = await session.execute(active_job_counts_query())
+  actual = {(str(user_id), str(feature)): int(active_count) for user_id, feature, active_count in actual_result.fetchall()}
+
+  corrected = 0
+  for user_id, feature in sorted(stored.keys() | actual.keys()):
+    expected = actual.get((user_id, feature), 0)
+    current = stored.get((user_id, feature))
+    if current == expected or (current is None and expected == 0):
+      continue
+    stmt = insert(UserActiveJobCounter).values(user_id=user_id, feature=feature, active_count=expected)
+    stmt = stmt.on_conflict_do_update(index_elements=[UserActiveJobCounter.user_id, UserActiveJobCounter.feature], set_={"active_count": expected, "updated_at": sa.func.now()})
+    await session.execute(stmt)
+    corrected += 1
+  await session.commit()
+  return corrected
+
+
+async def purge_expired_llm_responses(session: AsyncSession) -> int:
+  """Delete expired rows from the Postgres LLM response cache; reads already ignore them."""
+  result = await session.execute(sa.delete(LlmResponseCacheEntry).where(LlmResponseCacheEntry.expires_at <= sa.func.now()))
+  await session.commit()
+  return int(result.rowcount or 0)
+
+
+_FINISHED_JOB_STATUSES = ("done", "error", "canceled", "superseded")
+_EVENT_COMPACTION_BATCH_SIZE = 500
+
+
+async def compact_job_events(session: AsyncSession, *, older_than: timedelta, batch_size: int = _EVENT_COMPACTION_BATCH_SIZE) -> int:
+  """Fold the job_events rows of finished jobs into each job's event_log_json blob.
+
+  How/Why:
+    - job_events grows by one row per log line; once a job is finished its timeline is only ever read whole, so one JSONB value per job is enough.
+    - Each batch deletes the events and appends them to the blob in a single statement, so readers see either the rows or the blob, never both or neither.
+    - updated_at is left untouched so compaction does not make old jobs look recently active.
+  """
+  cutoff = datetime.now(UTC) - older_than
+  compacted = 0
+  while True:
+    has_events = sa.exists().where(JobEvent.job_id == Job.job_id)
+    job_ids = (await session.execute(select(Job.job_id).where(Job.status.in_(_FINISHED_JOB_STATUSES), Job.updated_at < cutoff, has_events).limit(batch_size))).scalars().all()
+    if not job_ids:
+      break
+    moved = sa.delete(JobEvent).where(JobEvent.job_id.in_(job_ids)).returning(JobEvent.id, JobEvent.job_id, JobEvent.event_type, JobEvent.message, JobEvent.payload_json, JobEvent.created_at).cte("moved")
+    entry = sa.func.jsonb_build_object("id", moved.c.id, "event_type", moved.c.event_type, "message", moved.c.message, "payload_json", moved.c.payload_json, "created_at", moved.c.created_at)
+    folded = select(moved.c.job_id, sa.func.jsonb_agg(aggregate_order_by(entry, moved.c.created_at, moved.c.id)).label("events")).group_by(moved.c.job_id).subquery("folded")
+    blob = sa.func.coalesce(Job.event_log_json, sa.cast(sa.literal("[]"), JSONB)).op("||")(folded.c.events)
+    result = await session.execute(sa.update(Job).where(Job.job_id == folded.c.job_id).values(event_log_json=blob, updated_at=Job.updated_at).execution_options(synchronize_session=False))
+    await session.commit()
+    compacted += int(result.rowcount or 0)
+    if len(job_ids) < batch_size:
+      break
+  return compacted
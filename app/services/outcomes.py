@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
 from app.ai.agents.outcomes import OutcomesAgent
 from app.ai.pipeline.contracts import GenerationRequest, JobContext
+from app.ai.response_cache import ResponseCache
 from app.ai.router import get_model_for_mode
 from app.config import Settings
 from app.schema.outcomes import OutcomesAgentInput, OutcomesAgentResponse
 from app.schema.service import SchemaService
 
 
-async def generate_lesson_outcomes(request: GenerationRequest, *, settings: Settings, provider: str, model: str | None, job_id: str, max_outcomes: int) -> tuple[OutcomesAgentResponse, str]:
+async def generate_lesson_outcomes(
+  request: GenerationRequest, *, settings: Settings, provider: str, model: str | None, job_id: str, max_outcomes: int, response_cache: ResponseCache | None = None, fallbacks: Sequence[str] | None = None
+) -> tuple[OutcomesAgentResponse, str]:
   """Generate a small list of outcomes for a lesson topic.
 
   How/Why:
@@ -21,7 +25,7 @@ async def generate_lesson_outcomes(request: GenerationRequest, *, settings: Sett
   """
   schema = SchemaService()
   # Use the outcomes agent model ordering to keep this agent independent.
-  model_instance = get_model_for_mode(provider, model, agent="outcomes")
+  model_instance = get_model_for_mode(provider, model, agent="outcomes", response_cache=response_cache, fallbacks=fallbacks)
   agent = OutcomesAgent(model=model_instance, prov=provider, schema=schema)
 
   input_data = OutcomesAgentInput(
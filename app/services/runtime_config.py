@@ -78,6 +78,8 @@ _RUNTIME_CONFIG_DEFINITIONS: dict[str, RuntimeConfigDefinition] = {
   "ai.illustration.model": RuntimeConfigDefinition(key="ai.illustration.model", value_type="str", description="Default model for illustration (provider/model).", allowed_scopes=_SCOPES_GLOBAL_TIER_TENANT),
   "ai.youtube.model": RuntimeConfigDefinition(key="ai.youtube.model", value_type="str", description="Default model for YouTube capture (provider/model).", allowed_scopes=_SCOPES_GLOBAL_TIER_TENANT),
   "ai.research.model": RuntimeConfigDefinition(key="ai.research.model", value_type="str", description="Default model for research discovery (provider/model).", allowed_scopes=_SCOPES_GLOBAL_TIER_TENANT),
+  "ai.response_cache.agents": RuntimeConfigDefinition(key="ai.response_cache.agents", value_type="json", description="Agents whose structured LLM responses are served from the response cache.", allowed_scopes=_SCOPES_GLOBAL_TIER_TENANT),
+  "ai.model_failover": RuntimeConfigDefinition(key="ai.model_failover", value_type="json", description='Ordered fallback models per agent, e.g. {"planner": ["vertexai/vertex-gemini-2.5-pro"]}.', allowed_scopes=_SCOPES_GLOBAL_TIER_TENANT),
   "ai.research.router_model": RuntimeConfigDefinition(key="ai.research.router_model", value_type="str", description="Default router model for research intent classification (provider/model).", allowed_scopes=_SCOPES_GLOBAL_TIER_TENANT),
   "email.from_address": RuntimeConfigDefinition(key="email.from_address", value_type="str", description="Email 'from' address for outbound notifications.", allowed_scopes=_SCOPES_GLOBAL_TENANT),
   "email.from_name": RuntimeConfigDefinition(key="email.from_name", value_type="str", description="Email 'from' name for outbound notifications.", allowed_scopes=_SCOPES_GLOBAL_TENANT),
@@ -138,6 +140,21 @@ def _validate_value(definition: RuntimeConfigDefinition, value: Any) -> Any:
       if not isinstance(value, list) or any((not isinstance(item, str) or item.strip() == "") for item in value):
         raise ValueError("features.disabled_global must be a list of non-empty strings.")
       return [item.strip().lower() for item in value]
+    if definition.key == "ai.response_cache.agents":
+      # Agent names match the router's agent labels, which are lowercase.
+      if not isinstance(value, list) or any((not isinstance(item, str) or item.strip() == "") for item in value):
+        raise ValueError("ai.response_cache.agents must be a list of non-empty strings.")
+      return [item.strip().lower() for item in value]
+    if definition.key == "ai.model_failover":
+      # Map router agent labels to ordered provider/model candidates tried after the agent's own model.
+      if not isinstance(value, dict):
+        raise ValueError("ai.model_failover must be an object mapping agent names to lists of provider/model strings.")
+      normalized_failover: dict[str, list[str]] = {}
+      for agent, candidates in value.items():
+        if not isinstance(agent, str) or agent.strip() == "" or not isinstance(candidates, list) or any((not isinstance(item, str) or item.strip() == "") for item in candidates):
+          raise ValueError("ai.model_failover must be an object mapping agent names to lists of provider/model strings.")
+        normalized_failover[agent.strip().lower()] = [item.strip() for item in candidates]
+      return normalized_failover
     if definition.key == "themes.allowed":
       # Validate theme allowlists so clients cannot be tricked into rendering unknown themes.
       if not isinstance(value, list) or any((not isinstance(item, str) or item.strip() == "") for item in value):
@@ -240,6 +257,10 @@ def _env_fallback(settings: Settings, key: str) -> Any:
     return "gemini/gemini-2.0-flash"
   if key == "ai.research.router_model":
     return "gemini/gemini-2.0-flash"
+  if key == "ai.response_cache.agents":
+    return []  # Response caching is opt-in per agent
+  if key == "ai.model_failover":
+    return {}  # Each agent uses only its own model unless failover candidates are configured
 
   if key == "email.from_address":
     return str(settings.email_from_address or "")
@@ -326,6 +347,17 @@ async def upsert_runtime_config_value(session: AsyncSession, *, key: str, scope:
   await session.execute(stmt)
   await session.commit()
 
+  # The feature-flag decision table compiles the global kill-switch, so drop it when that key changes.
+  if definition.key == "features.disabled_global" and scope == RuntimeConfigScope.GLOBAL:
+    from app.services.feature_flags import invalidate_feature_flag_cache
+
+    invalidate_feature_flag_cache()
+  # The pre-encoded lesson catalog bakes in its cache headers, so re-encode it when that toggle changes.
+  if definition.key == "lessons.cache_catalog":
+    from app.services.lesson_catalog_cache import invalidate_lesson_catalog_cache
+
+    invalidate_lesson_catalog_cache()
+
 
 async def list_runtime_config_values(session: AsyncSession, *, scope: RuntimeConfigScope, org_id: uuid.UUID | None, subscription_tier_id: int | None, user_id: uuid.UUID | None = None) -> dict[str, Any]:
   """List runtime config values explicitly set for a given scope."""
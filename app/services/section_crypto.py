@@ -0,0 +1,134 @@
+"""Per-user section payload encryption with cached keys and pre-encoded plaintext."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+import msgspec
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from starlette.concurrency import run_in_threadpool
+
+# Derived keys are cheap to rebuild, so a short TTL bounds how long a uid's key lingers in memory.
+KEY_CACHE_TTL_SECONDS = 300.0
+KEY_CACHE_MAX_ENTRIES = 4096
+# Pre-encoded plaintext is bounded by total bytes because section payloads vary widely in size.
+PLAINTEXT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Below this size AES-GCM finishes faster than a threadpool hop.
+OFFLOAD_THRESHOLD_BYTES = 64 * 1024
+
+_NONCE_BYTES = 12
+_ENCODER = msgspec.json.Encoder()
+
+
+class _KeyCache:
+  """TTL cache of AES-GCM ciphers keyed by Firebase uid."""
+
+  def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+    self._ttl_seconds = ttl_seconds
+    self._max_entries = max_entries
+    self._entries: OrderedDict[str, tuple[AESGCM, float]] = OrderedDict()
+
+  def get(self, firebase_uid: str) -> AESGCM:
+    """Return the cipher for a uid, deriving it when missing or expired."""
+    now = time.monotonic()
+    entry = self._entries.get(firebase_uid)
+    if entry is not None and entry[1] > now:
+      self._entries.move_to_end(firebase_uid)
+      return entry[0]
+
+    # Derive a stable 256-bit key from the Firebase uid for client-specific payload wrapping.
+    cipher = AESGCM(hashlib.sha256(firebase_uid.encode("utf-8")).digest())
+    self._entries[firebase_uid] = (cipher, now + self._ttl_seconds)
+    self._entries.move_to_end(firebase_uid)
+    while len(self._entries) > self._max_entries:
+      self._entries.popitem(last=False)
+    return cipher
+
+  def clear(self) -> None:
+    self._entries.clear()
+
+
+class _PlaintextCache:
+  """LRU of encoded section payloads keyed by section id and row version, bounded by total bytes."""
+
+  def __init__(self, max_bytes: int) -> None:
+    self._max_bytes = max_bytes
+    self._size = 0
+    self._entries: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+
+  def get(self, key: tuple[int, int]) -> bytes | None:
+    payload = self._entries.get(key)
+    if payload is not None:
+      self._entries.move_to_end(key)
+    return payload
+
+  def put(self, key: tuple[int, int], payload: bytes) -> None:
+    # Skip payloads that would evict the whole cache on their own.
+    if len(payload) > self._max_bytes:
+      return
+
+    previous = self._entries.pop(key, None)
+    if previous is not None:
+      self._size -= len(previous)
+    self._entries[key] = payload
+    self._size += len(payload)
+    while self._size > self._max_bytes:
+      _, evicted = self._entries.popitem(last=False)
+      self._size -= len(evicted)
+
+  @property
+  def size_bytes(self) -> int:
+    return self._size
+
+  def clear(self) -> None:
+    self._entries.clear()
+    self._size = 0
+
+
+_key_cache = _KeyCache(KEY_CACHE_TTL_SECONDS, KEY_CACHE_MAX_ENTRIES)
+_plaintext_cache = _PlaintextCache(PLAINTEXT_CACHE_MAX_BYTES)
+
+
+def encode_section_plaintext(section_id: int, row_version: int | None, content_shorthand: dict[str, Any]) -> bytes:
+  """Serialize a section payload once per row version so unchanged sections skip re-encoding."""
+  # Rows without a version cannot be invalidated safely, so they are always encoded fresh.
+  if row_version is None:
+    return _ENCODER.encode({"section": content_shorthand})
+
+  key = (section_id, row_version)
+  cached = _plaintext_cache.get(key)
+  if cached is not None:
+    return cached
+
+  plaintext = _ENCODER.encode({"section": content_shorthand})
+  _plaintext_cache.put(key, plaintext)
+  return plaintext
+
+
+def _seal(cipher: AESGCM, plaintext: bytes) -> str:
+  # Use a random nonce for each response to prevent repeated ciphertext output.
+  nonce = os.urandom(_NONCE_BYTES)
+  # Encrypt the payload and keep auth tag embedded in the ciphertext output.
+  ciphertext = cipher.encrypt(nonce, plaintext, None)
+  # Return nonce + ciphertext as base64 text so it can be transmitted in JSON safely.
+  return base64.urlsafe_b64encode(nonce + ciphertext).decode("ascii")
+
+
+async def encrypt_section_plaintext(plaintext: bytes, firebase_uid: str) -> str:
+  """Encrypt encoded section bytes for a user, moving large payloads off the event loop."""
+  cipher = _key_cache.get(firebase_uid)
+  if len(plaintext) < OFFLOAD_THRESHOLD_BYTES:
+    return _seal(cipher, plaintext)
+
+  return await run_in_threadpool(_seal, cipher, plaintext)
+
+
+def clear_section_crypto_caches() -> None:
+  """Drop cached keys and encoded payloads (used by tests and key rotation)."""
+  _key_cache.clear()
+  _plaintext_cache.clear()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from functools import lru_cache
 
 from app.schema.service import DEFAULT_WIDGETS_PATH
-from app.schema.widgets_loader import load_widget_registry
+from app.schema.widgets_loader import WidgetRegistry, get_widget_registry
 
 
 def _normalize_option_id(value: str) -> str:
@@ -12,12 +12,14 @@ def _normalize_option_id(value: str) -> str:
   return "".join(ch for ch in value.lower() if ch.isalnum())
 
 
-@lru_cache(maxsize=1)
 def _widget_id_map() -> dict[str, str]:
-  """Build a mapping from normalized widget ids to canonical widget keys."""
-  # Load widget registry once to align client ids with schema keys.
+  """Return the mapping from normalized widget ids to canonical widget keys."""
+  return _widget_id_map_for(get_widget_registry(DEFAULT_WIDGETS_PATH))
+
 
-  registry = load_widget_registry(DEFAULT_WIDGETS_PATH)
+@lru_cache(maxsize=1)
+def _widget_id_map_for(registry: WidgetRegistry) -> dict[str, str]:
+  """Build the id map once per registry instance to align client ids with schema keys."""
   mapping: dict[str, str] = {}
 
   for widget_name in registry.available_types():
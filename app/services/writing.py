@@ -6,7 +6,7 @@ import json
 from dataclasses import dataclass
 from typing import Any
 
-from app.ai.agents.prompts import _load_prompt
+from app.ai.agents.prompts import load_prompt_template
 from app.ai.router import get_model_for_mode
 from app.ai.utils.cost import calculate_total_cost
 from app.schema.lessons import FreeText, InputLine, Lesson, Section, Subsection, SubsectionWidget
@@ -15,6 +15,8 @@ from app.telemetry.context import llm_call_context
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+_PROMPT_PLACEHOLDERS = frozenset({"AI_PROMPT", "WORDLIST_BLOCK", "USER_TEXT"})
+
 
 @dataclass(frozen=True)
 class WritingCheckResult:
@@ -108,12 +110,8 @@ class WritingCheckService:
       return WritingCheckResult(ok=False, issues=[f"Evaluation error: {str(e)}"], feedback="We encountered an error while evaluating your response.", logs=[f"Error during writing check: {str(e)}"], usage=[], total_cost=0.0)
 
   def _render_prompt(self, text: str, ai_prompt: str, wordlist: str | None = None) -> str:
-    template = _load_prompt("writing_check.md")
+    template = load_prompt_template("writing_check.md", _PROMPT_PLACEHOLDERS)
     wordlist_block = ""
     if wordlist:
       wordlist_block = f"\nWORDLIST (Optional terms to usage):\n{wordlist}\n"
-    rendered = template
-    rendered = rendered.replace("{{AI_PROMPT}}", ai_prompt)
-    rendered = rendered.replace("{{WORDLIST_BLOCK}}", wordlist_block)
-    rendered = rendered.replace("{{USER_TEXT}}", text)
-    return rendered
+    return template.render({"AI_PROMPT": ai_prompt, "WORDLIST_BLOCK": wordlist_block, "USER_TEXT": text})
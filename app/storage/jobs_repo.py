@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Collection, Sequence
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Protocol, TypedDict, Unpack
 
-from app.jobs.models import JobKind, JobRecord, JobStatus
+from app.jobs.models import JobKind, JobRecord, JobStatus, JobSummaryRecord
 
 
 @dataclass(frozen=True)
@@ -22,60 +23,89 @@ class JobCheckpointRecord:
   last_error: str | None
 
 
+@dataclass(frozen=True)
+class JobStatusSummary:
+  """Status-only projection of a job, without request, result or event payloads."""
+
+  job_id: str
+  user_id: str | None
+  status: JobStatus
+  lesson_id: str | None
+  superseded_by_job_id: str | None
+
+
+@dataclass(frozen=True)
+class ResolvedJobChain:
+  """A requested job, the last job in its superseded_by chain, and that job's unfinished children."""
+
+  requested: JobStatusSummary
+  resolved: JobStatusSummary
+  children: list[JobStatusSummary]
+  logs: list[str] | None = None
+
+
+class JobUpdateFields(TypedDict, total=False):
+  """Job fields accepted by JobsRepository.update_job; logs are appended as job events rather than stored on the row."""
+
+  root_job_id: str | None
+  parent_job_id: str | None
+  resume_source_job_id: str | None
+  superseded_by_job_id: str | None
+  lesson_id: str | None
+  section_id: int | None
+  target_agent: str | None
+  job_kind: JobKind | None
+  status: JobStatus | None
+  phase: str | None
+  subphase: str | None
+  expected_sections: int | None
+  completed_sections: int | None
+  completed_section_indexes: list[int] | None
+  current_section_index: int | None
+  current_section_status: str | None
+  current_section_retry_count: int | None
+  current_section_title: str | None
+  retry_count: int | None
+  max_retries: int | None
+  retry_sections: list[int] | None
+  retry_agents: list[str] | None
+  retry_parent_job_id: str | None
+  total_steps: int | None
+  completed_steps: int | None
+  progress: float | None
+  request: dict | None
+  result_json: dict | None
+  error_json: dict | None
+  logs: list[str] | None
+  artifacts: dict | None
+  validation: dict | None
+  cost: dict | None
+  started_at: str | None
+  completed_at: str | None
+  updated_at: str | None
+
+
 class JobsRepository(Protocol):
   """Repository contract for job persistence."""
 
-  async def create_job(self, record: JobRecord) -> None:
-    """Persist an initial job record."""
+  async def create_job(self, record: JobRecord, *, concurrency_limit: int | None = None) -> None:
+    """Persist an initial job record, enforcing the user's active-job limit when one is given."""
 
   async def get_job(self, job_id: str) -> JobRecord | None:
     """Fetch a job by identifier."""
 
-  async def update_job(
-    self,
-    job_id: str,
-    *,
-    root_job_id: str | None = None,
-    parent_job_id: str | None = None,
-    resume_source_job_id: str | None = None,
-    superseded_by_job_id: str | None = None,
-    lesson_id: str | None = None,
-    section_id: int | None = None,
-    target_agent: str | None = None,
-    job_kind: JobKind | None = None,
-    status: JobStatus | None = None,
-    phase: str | None = None,
-    subphase: str | None = None,
-    expected_sections: int | None = None,
-    completed_sections: int | None = None,
-    completed_section_indexes: list[int] | None = None,
-    current_section_index: int | None = None,
-    current_section_status: str | None = None,
-    current_section_retry_count: int | None = None,
-    current_section_title: str | None = None,
-    retry_count: int | None = None,
-    max_retries: int | None = None,
-    retry_sections: list[int] | None = None,
-    retry_agents: list[str] | None = None,
-    retry_parent_job_id: str | None = None,
-    total_steps: int | None = None,
-    completed_steps: int | None = None,
-    progress: float | None = None,
-    request: dict | None = None,
-    result_json: dict | None = None,
-    error_json: dict | None = None,
-    logs: list[str] | None = None,
-    artifacts: dict | None = None,
-    validation: dict | None = None,
-    cost: dict | None = None,
-    started_at: str | None = None,
-    completed_at: str | None = None,
-    updated_at: str | None = None,
-  ) -> JobRecord | None:
-    """Apply partial updates to a job."""
-
-  async def find_queued(self, limit: int = 5) -> list[JobRecord]:
-    """Return a small batch of queued jobs."""
+  async def get_job_status(self, job_id: str) -> JobStatus | None:
+    """Return only the status of a job, for cheap cancellation checks."""
+
+  async def update_job(self, job_id: str, *, expected_status: Collection[JobStatus] | None = None, **changes: Unpack[JobUpdateFields]) -> JobStatusSummary | None:
+    """Apply partial updates to a job and return its status summary; None values leave a field unchanged.
+
+    When expected_status is given the update only applies while the job's status is one of those values, and None is returned otherwise.
+    Callers that need payloads or logs after the write load them with get_job.
+    """
+
+  async def claim_queued(self, limit: int = 5) -> list[JobRecord]:
+    """Atomically move up to limit of the oldest queued jobs to running and return them; concurrent callers never share a job."""
 
   async def find_by_idempotency_key(self, idempotency_key: str) -> JobRecord | None:
     """Return a job created with a given idempotency key, if present."""
@@ -83,17 +113,25 @@ class JobsRepository(Protocol):
   async def find_by_user_kind_idempotency_key(self, *, user_id: str | None, job_kind: JobKind, idempotency_key: str) -> JobRecord | None:
     """Return a job created with a given (user, kind, idempotency_key) tuple."""
 
-  async def list_child_jobs(self, *, parent_job_id: str, include_done: bool = False) -> list[JobRecord]:
-    """Return direct child jobs for a parent job."""
+  async def resolve_job_chain(self, job_id: str, *, include_logs: bool = False) -> ResolvedJobChain | None:
+    """Follow superseded_by_job_id from job_id to the latest job and summarize its unfinished children; logs are the resolved job's, when requested."""
+
+  async def list_child_jobs(self, *, parent_job_id: str, include_done: bool = False) -> list[JobSummaryRecord]:
+    """Return summaries of direct child jobs for a parent job; use get_job for a child's payloads."""
 
-  async def list_jobs(self, limit: int, offset: int, status: str | None = None, job_id: str | None = None) -> tuple[list[JobRecord], int]:
-    """Return a paginated list of jobs with optional filters, and total count."""
+  async def list_jobs(
+    self, page: int = 1, limit: int = 20, status: str | None = None, job_id: str | None = None, job_kind: str | None = None, user_id: str | None = None, target_agent: str | None = None, sort_by: str = "created_at", sort_order: str = "desc"
+  ) -> tuple[list[JobSummaryRecord], int]:
+    """Return a page of job summaries with optional filters, and the total count."""
 
   async def append_event(self, *, job_id: str, event_type: str, message: str, payload_json: dict | None = None) -> None:
     """Append one timeline event for a job."""
 
+  async def append_events(self, *, job_id: str, event_type: str, messages: Sequence[str]) -> int:
+    """Append many timeline events for a job in one batch, skipping blank messages; returns the number appended."""
+
   async def list_events(self, *, job_id: str, limit: int = 100) -> list[str]:
-    """List recent event messages for a job."""
+    """List recent event messages for a job, including events folded into its compacted log."""
 
   async def claim_checkpoint(self, *, job_id: str, stage: str, section_index: int | None) -> JobCheckpointRecord | None:
     """Atomically claim a checkpoint row for processing."""
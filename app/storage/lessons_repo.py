@@ -23,6 +23,17 @@ class SectionRecord:
   tutor_id: int | None = None
 
 
+@dataclass(frozen=True)
+class SectionSummaryRecord:
+  """Table-of-contents view of a section, without its content payloads."""
+
+  section_id: int
+  lesson_id: str
+  title: str
+  order_index: int
+  status: str
+
+
 @dataclass(frozen=True)
 class LessonRecord:
   """Record stored in the lessons repository."""
@@ -47,6 +58,15 @@ class LessonRecord:
   lesson_request_id: int | None = None
 
 
+@dataclass(frozen=True)
+class LessonPage:
+  """One page of a lesson listing; pass next_cursor back to continue with keyset paging."""
+
+  items: list[LessonRecord]
+  total: int | None
+  next_cursor: str | None = None
+
+
 @dataclass(frozen=True)
 class SectionErrorRecord:
   """Validation error persisted for a generated section."""
@@ -109,6 +129,46 @@ class SubsectionWidgetRecord:
   is_archived: bool = False
 
 
+@dataclass(frozen=True)
+class SectionGraphWidget:
+  """One generated widget: its typed payload row plus the subsection_widgets link pointing at it."""
+
+  subsection_index: int
+  widget_index: int
+  widget_type: str
+  payload_json: dict[str, Any]
+  public_id: str | None = None
+
+
+@dataclass(frozen=True)
+class SectionGraphSubsection:
+  """One subsection of a section graph with its widgets in display order."""
+
+  subsection_index: int
+  subsection_title: str
+  widgets: list[SectionGraphWidget]
+  status: str = "completed"
+
+
+@dataclass(frozen=True)
+class SectionGraph:
+  """Everything hanging off an existing section row, written as one unit of work."""
+
+  section_id: int
+  creator_id: str
+  subsections: list[SectionGraphSubsection]
+  markdown_payload: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class SectionGraphResult:
+  """Ids assigned while persisting a section graph."""
+
+  markdown_id: int | None
+  subsections: list[SubsectionRecord]
+  widgets: list[SubsectionWidgetRecord]
+
+
 class LessonsRepository(Protocol):
   """Repository contract for lesson persistence."""
 
@@ -136,6 +196,9 @@ class LessonsRepository(Protocol):
   async def create_widget_payload(self, *, widget_type: str, creator_id: str, payload_json: dict[str, Any]) -> str:
     """Persist a typed widget payload and return persisted widget row id."""
 
+  async def persist_section_graph(self, graph: SectionGraph) -> SectionGraphResult:
+    """Persist a section's markdown, subsections, typed widget rows and widget links in one transaction."""
+
   async def create_section_errors(self, records: list[SectionErrorRecord]) -> list[SectionErrorRecord]:
     """Persist section validation errors."""
 
@@ -157,8 +220,24 @@ class LessonsRepository(Protocol):
   async def list_sections(self, lesson_id: str) -> list[SectionRecord]:
     """List all sections for a lesson."""
 
+  async def list_section_summaries(self, lesson_ids: list[str]) -> dict[str, list[SectionSummaryRecord]]:
+    """Return ordered section summaries per lesson id without loading section content."""
+
   async def update_lesson_title(self, lesson_id: str, title: str) -> None:
     """Update an existing lesson's title."""
 
-  async def list_lessons(self, limit: int, offset: int, topic: str | None = None, status: str | None = None, user_id: str | None = None) -> tuple[list[LessonRecord], int]:
-    """Return a paginated list of lessons with optional filters, and total count."""
+  async def list_lessons(
+    self,
+    page: int = 1,
+    limit: int = 20,
+    topic: str | None = None,
+    status: str | None = None,
+    user_id: str | None = None,
+    is_archived: bool | None = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    *,
+    cursor: str | None = None,
+    total: str = "exact",
+  ) -> LessonPage:
+    """Return a page of lessons without lesson plans; cursor switches to keyset paging and total is "exact", "estimated" or "none"."""
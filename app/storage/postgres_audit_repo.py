@@ -42,6 +42,7 @@ class LlmAuditRecord:
   job_id: str | None
   status: str
   error_message: str | None
+  cache_status: str | None = None
 
 
 @dataclass(frozen=True)
@@ -104,7 +105,18 @@ class PostgresLlmAuditRepository:
       return audit.id
 
   async def update_record(
-    self, *, record_id: int, timestamp_response: datetime, response_payload: str | None, status: str, error_message: str | None, duration_ms: int, prompt_tokens: int | None, completion_tokens: int | None, total_tokens: int | None
+    self,
+    *,
+    record_id: int,
+    timestamp_response: datetime,
+    response_payload: str | None,
+    status: str,
+    error_message: str | None,
+    duration_ms: int,
+    prompt_tokens: int | None,
+    completion_tokens: int | None,
+    total_tokens: int | None,
+    cache_status: str | None = None,
   ) -> None:
     """Update an existing audit record after the LLM call completes."""
     async with self._session_factory() as session:
@@ -121,6 +133,7 @@ class PostgresLlmAuditRepository:
       audit.prompt_tokens = prompt_tokens
       audit.completion_tokens = completion_tokens
       audit.total_tokens = total_tokens
+      audit.cache_status = cache_status
 
       await session.commit()
       logger.debug("Updated LLM audit record %s", record_id)
@@ -215,6 +228,7 @@ class PostgresLlmAuditRepository:
             job_id=row.job_id,
             status=row.status,
             error_message=row.error_message,
+            cache_status=row.cache_status,
           )
         )
 
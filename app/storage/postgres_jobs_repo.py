@@ -2,17 +2,46 @@
 
 from __future__ import annotations
 
+from collections.abc import Collection, Sequence
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Unpack
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import Integer, and_, any_, cast, func, insert, literal, not_, null, or_, select, union_all, update
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.core.database import get_session_factory
-from app.jobs.models import JobKind, JobRecord, JobStatus
+from app.jobs.concurrency import acquire_job_slot, adjust_active_job_count, job_slot_key
+from app.jobs.models import JobKind, JobRecord, JobStatus, JobSummaryRecord
 from app.schema.jobs import Job, JobCheckpoint, JobEvent
-from app.storage.jobs_repo import JobCheckpointRecord, JobsRepository
+from app.storage.jobs_repo import JobCheckpointRecord, JobsRepository, JobStatusSummary, JobUpdateFields, ResolvedJobChain
+
+# update_job field names that are stored under a different column name.
+_UPDATE_COLUMNS = {"request": "request_json", "artifacts": "artifacts_json", "validation": "validation_json", "cost": "cost_json"}
+_TIMESTAMP_FIELDS = frozenset({"started_at", "completed_at", "updated_at"})
+# Columns behind JobSummaryRecord; listings never select the JSONB payload columns.
+_SUMMARY_COLUMNS = (
+  Job.job_id,
+  Job.user_id,
+  Job.job_kind,
+  Job.status,
+  Job.created_at,
+  Job.updated_at,
+  Job.root_job_id,
+  Job.parent_job_id,
+  Job.superseded_by_job_id,
+  Job.lesson_id,
+  Job.section_id,
+  Job.target_agent,
+  Job.phase,
+  Job.progress,
+  Job.started_at,
+  Job.completed_at,
+)
+# Columns an update sends back: the JobStatusSummary fields plus what the active-slot bookkeeping needs.
+_UPDATE_RETURNING = (Job.job_id, Job.user_id, Job.status, Job.lesson_id, Job.superseded_by_job_id, Job.target_agent)
 
 
 def _now_utc() -> datetime:
@@ -33,6 +62,31 @@ def _to_datetime(value: datetime | str | None) -> datetime | None:
   return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
 
 
+def _status_summary(row: Any) -> JobStatusSummary:
+  return JobStatusSummary(job_id=row.job_id, user_id=row.user_id, status=row.status, lesson_id=row.lesson_id, superseded_by_job_id=row.superseded_by_job_id)
+
+
+def _summary_to_record(row: Any) -> JobSummaryRecord:
+  return JobSummaryRecord(
+    job_id=row.job_id,
+    user_id=row.user_id,
+    job_kind=row.job_kind,
+    status=row.status,
+    created_at=_to_iso_z(row.created_at) or "",
+    updated_at=_to_iso_z(row.updated_at) or "",
+    root_job_id=row.root_job_id,
+    parent_job_id=row.parent_job_id,
+    superseded_by_job_id=row.superseded_by_job_id,
+    lesson_id=row.lesson_id,
+    section_id=row.section_id,
+    target_agent=row.target_agent,
+    phase=row.phase,
+    progress=row.progress,
+    started_at=_to_iso_z(row.started_at),
+    completed_at=_to_iso_z(row.completed_at),
+  )
+
+
 def _to_iso_z(value: datetime | None) -> str | None:
   if value is None:
     return None
@@ -48,7 +102,7 @@ class PostgresJobsRepository(JobsRepository):
     if self._session_factory is None:
       raise RuntimeError("Database not initialized")
 
-  async def create_job(self, record: JobRecord) -> None:
+  async def create_job(self, record: JobRecord, *, concurrency_limit: int | None = None) -> None:
     async with self._session_factory() as session:
       job = Job(
         job_id=record.job_id,
@@ -65,12 +119,36 @@ class PostgresJobsRepository(JobsRepository):
         target_agent=record.target_agent,
         result_json=record.result_json,
         error_json=record.error_json,
+        phase=record.phase,
+        subphase=record.subphase,
+        progress=record.progress,
+        total_steps=record.total_steps,
+        completed_steps=record.completed_steps,
+        expected_sections=record.expected_sections,
+        completed_sections=record.completed_sections,
+        completed_section_indexes=record.completed_section_indexes,
+        retry_count=record.retry_count,
+        max_retries=record.max_retries,
+        retry_sections=record.retry_sections,
+        retry_agents=record.retry_agents,
+        retry_parent_job_id=record.retry_parent_job_id,
+        artifacts_json=record.artifacts,
+        validation_json=record.validation,
+        cost_json=record.cost,
         created_at=_to_datetime(record.created_at) or _now_utc(),
         updated_at=_to_datetime(record.updated_at) or _now_utc(),
         completed_at=_to_datetime(record.completed_at),
         idempotency_key=str(record.idempotency_key or f"{record.job_id}:{record.job_kind}"),
       )
       session.add(job)
+      # Count the job against its user's active slots in the same transaction as the insert.
+      slot = job_slot_key(user_id=record.user_id, status=record.status, target_agent=record.target_agent)
+      if slot is not None:
+        # A rejected slot raises before commit, so the session discards the job insert too.
+        if concurrency_limit is not None:
+          await acquire_job_slot(session, user_id=slot[0], feature=slot[1], limit=concurrency_limit)
+        else:
+          await adjust_active_job_count(session, user_id=slot[0], feature=slot[1], delta=1)
       await session.commit()
       if record.logs:
         await self._append_events_in_session(session=session, job_id=record.job_id, event_type="log", messages=record.logs)
@@ -81,121 +159,69 @@ class PostgresJobsRepository(JobsRepository):
       row = await session.get(Job, job_id)
       if row is None:
         return None
-      logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
+      logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100, compacted=row.event_log_json)
       return self._model_to_record(row, logs=logs)
 
-  async def update_job(  # pylint: disable=too-many-arguments
-    self,
-    job_id: str,
-    *,
-    root_job_id: str | None = None,
-    parent_job_id: str | None = None,
-    resume_source_job_id: str | None = None,
-    superseded_by_job_id: str | None = None,
-    lesson_id: str | None = None,
-    section_id: int | None = None,
-    target_agent: str | None = None,
-    job_kind: JobKind | None = None,
-    status: JobStatus | None = None,
-    phase: str | None = None,
-    subphase: str | None = None,
-    expected_sections: int | None = None,
-    completed_sections: int | None = None,
-    completed_section_indexes: list[int] | None = None,
-    current_section_index: int | None = None,
-    current_section_status: str | None = None,
-    current_section_retry_count: int | None = None,
-    current_section_title: str | None = None,
-    retry_count: int | None = None,
-    max_retries: int | None = None,
-    retry_sections: list[int] | None = None,
-    retry_agents: list[str] | None = None,
-    retry_parent_job_id: str | None = None,
-    total_steps: int | None = None,
-    completed_steps: int | None = None,
-    progress: float | None = None,
-    request: dict | None = None,
-    result_json: dict | None = None,
-    error_json: dict | None = None,
-    logs: list[str] | None = None,
-    artifacts: dict | None = None,
-    validation: dict | None = None,
-    cost: dict | None = None,
-    started_at: str | None = None,
-    completed_at: str | None = None,
-    updated_at: str | None = None,
-  ) -> JobRecord | None:
+  async def get_job_status(self, job_id: str) -> JobStatus | None:
     async with self._session_factory() as session:
-      row = await session.get(Job, job_id)
+      status = (await session.execute(select(Job.status).where(Job.job_id == job_id))).scalar_one_or_none()
+      return status
+
+  async def update_job(self, job_id: str, *, expected_status: Collection[JobStatus] | None = None, **changes: Unpack[JobUpdateFields]) -> JobStatusSummary | None:
+    """Apply a partial update as a single UPDATE ... RETURNING.
+
+    How/Why:
+      - Only the supplied columns are SET and nothing is loaded first, so a progress tick no longer reads request_json/result_json just to change one field.
+      - RETURNING carries status-level columns only and no event log is read back, so the JSONB payloads never leave the database on a tick; callers that need the full record use get_job.
+      - Status or agent changes read the previous values from a FOR UPDATE CTE in the same statement, so the active-job counters move exactly once.
+    """
+    logs = changes.pop("logs", None)
+    values: dict[str, Any] = {}
+    for name, value in changes.items():
+      if value is None:
+        continue
+      values[_UPDATE_COLUMNS.get(name, name)] = _to_datetime(value) if name in _TIMESTAMP_FIELDS else value
+    values["updated_at"] = values.get("updated_at") or _now_utc()
+    conditions = [Job.job_id == job_id]
+    if expected_status is not None:
+      conditions.append(Job.status.in_(tuple(expected_status)))
+    async with self._session_factory() as session:
+      if "status" in values or "target_agent" in values:
+        previous = select(Job.job_id, Job.status, Job.target_agent).where(*conditions).with_for_update().cte("previous")
+        stmt = update(Job).where(Job.job_id == previous.c.job_id).values(**values).returning(*_UPDATE_RETURNING, previous.c.status.label("previous_status"), previous.c.target_agent.label("previous_target_agent"))
+      else:
+        stmt = update(Job).where(*conditions).values(**values).returning(*_UPDATE_RETURNING, Job.status.label("previous_status"), Job.target_agent.label("previous_target_agent"))
+      row = (await session.execute(stmt.execution_options(synchronize_session=False))).one_or_none()
       if row is None:
         return None
-      if root_job_id is not None:
-        row.root_job_id = root_job_id
-      if parent_job_id is not None:
-        row.parent_job_id = parent_job_id
-      if resume_source_job_id is not None:
-        row.resume_source_job_id = resume_source_job_id
-      if superseded_by_job_id is not None:
-        row.superseded_by_job_id = superseded_by_job_id
-      if lesson_id is not None:
-        row.lesson_id = lesson_id
-      if section_id is not None:
-        row.section_id = section_id
-      if target_agent is not None:
-        row.target_agent = target_agent
-      if job_kind is not None:
-        row.job_kind = job_kind
-      if status is not None:
-        row.status = status
-      _ = (
-        phase,
-        subphase,
-        expected_sections,
-        completed_sections,
-        completed_section_indexes,
-        current_section_index,
-        current_section_status,
-        current_section_retry_count,
-        current_section_title,
-        retry_count,
-        max_retries,
-        retry_sections,
-        retry_agents,
-        retry_parent_job_id,
-        total_steps,
-        completed_steps,
-        progress,
-        artifacts,
-        validation,
-        cost,
-      )
-      if request is not None:
-        row.request_json = request
-      if result_json is not None:
-        row.result_json = result_json
-      if error_json is not None:
-        row.error_json = error_json
-      if started_at is not None:
-        row.started_at = _to_datetime(started_at)
-      if completed_at is not None:
-        row.completed_at = _to_datetime(completed_at)
-      row.updated_at = _to_datetime(updated_at) or _now_utc()
-      session.add(row)
-      await session.flush()
+      previous_slot = job_slot_key(user_id=row.user_id, status=row.previous_status, target_agent=row.previous_target_agent)
+      current_slot = job_slot_key(user_id=row.user_id, status=row.status, target_agent=row.target_agent)
+      if previous_slot != current_slot:
+        if previous_slot is not None:
+          await adjust_active_job_count(session, user_id=previous_slot[0], feature=previous_slot[1], delta=-1)
+        if current_slot is not None:
+          await adjust_active_job_count(session, user_id=current_slot[0], feature=current_slot[1], delta=1)
       if logs:
         await self._append_events_in_session(session=session, job_id=job_id, event_type="log", messages=logs)
       await session.commit()
-      await session.refresh(row)
-      logs_snapshot = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
-      return self._model_to_record(row, logs=logs_snapshot)
+      return _status_summary(row)
+
+  async def claim_queued(self, limit: int = 5) -> list[JobRecord]:
+    """Claim the oldest queued jobs in one UPDATE ... RETURNING.
 
-  async def find_queued(self, limit: int = 5) -> list[JobRecord]:
+    How/Why:
+      - The inner SELECT walks the ix_jobs_queued_created_at partial index, so the scan stays proportional to the queue, not the job history.
+      - FOR UPDATE SKIP LOCKED lets concurrent workers claim disjoint batches instead of blocking on, or double-processing, the same rows.
+    """
     async with self._session_factory() as session:
-      stmt = select(Job).where(Job.status == "queued").order_by(Job.created_at.asc()).limit(limit)
-      rows = (await session.execute(stmt)).scalars().all()
+      claimable = select(Job.job_id).where(Job.status == "queued").order_by(Job.created_at.asc()).limit(limit).with_for_update(skip_locked=True).cte("claimable")
+      # queued and running hold the same concurrency slot, so the flip needs no counter adjustment.
+      stmt = update(Job).where(Job.job_id.in_(select(claimable.c.job_id))).values(status="running", started_at=func.coalesce(Job.started_at, func.now()), updated_at=func.now()).returning(Job).execution_options(synchronize_session=False)
+      rows = sorted((await session.execute(stmt)).scalars().all(), key=lambda row: row.created_at)
+      await session.commit()
       result: list[JobRecord] = []
       for row in rows:
-        logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
+        logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100, compacted=row.event_log_json)
         result.append(self._model_to_record(row, logs=logs))
       return result
 
@@ -205,7 +231,7 @@ class PostgresJobsRepository(JobsRepository):
       row = (await session.execute(stmt)).scalar_one_or_none()
       if row is None:
         return None
-      logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
+      logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100, compacted=row.event_log_json)
       return self._model_to_record(row, logs=logs)
 
   async def find_by_user_kind_idempotency_key(self, *, user_id: str | None, job_kind: JobKind, idempotency_key: str) -> JobRecord | None:
@@ -214,27 +240,52 @@ class PostgresJobsRepository(JobsRepository):
       row = (await session.execute(stmt)).scalar_one_or_none()
       if row is None:
         return None
-      logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
+      logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100, compacted=row.event_log_json)
       return self._model_to_record(row, logs=logs)
 
-  async def list_child_jobs(self, *, parent_job_id: str, include_done: bool = False) -> list[JobRecord]:
+  async def resolve_job_chain(self, job_id: str, *, include_logs: bool = False) -> ResolvedJobChain | None:
+    """Resolve the superseded_by chain and child statuses in one round trip.
+
+    How/Why:
+      - A recursive CTE walks superseded_by_job_id, carrying the visited ids so a cyclic chain stops instead of looping.
+      - The requested job, the last job in the chain and that job's unfinished children come back as status-only rows, so a poll costs the same for one hop or fifty.
+    """
+    successor = aliased(Job)
+    chain = select(Job.job_id, Job.superseded_by_job_id, literal(0).label("depth"), postgresql.array([Job.job_id]).label("path")).where(Job.job_id == job_id).cte("chain", recursive=True)
+    chain = chain.union_all(
+      select(successor.job_id, successor.superseded_by_job_id, chain.c.depth + 1, func.array_append(chain.c.path, successor.job_id)).join(chain, successor.job_id == chain.c.superseded_by_job_id).where(not_(successor.job_id == any_(chain.c.path)))
+    )
+    resolved_id = select(chain.c.job_id).order_by(chain.c.depth.desc()).limit(1).scalar_subquery()
+    columns = (Job.job_id, Job.user_id, Job.status, Job.lesson_id, Job.superseded_by_job_id, Job.created_at)
+    chain_rows = select(*columns, chain.c.depth).join(chain, chain.c.job_id == Job.job_id).where(or_(chain.c.depth == 0, Job.job_id == resolved_id))
+    child_rows = select(*columns, cast(null(), Integer).label("depth")).where(Job.parent_job_id == resolved_id, Job.status != "done")
     async with self._session_factory() as session:
-      stmt = select(Job).where(Job.parent_job_id == parent_job_id).order_by(Job.created_at.asc())
+      rows = (await session.execute(union_all(chain_rows, child_rows))).all()
+      ends = sorted((row for row in rows if row.depth is not None), key=lambda row: row.depth)
+      if not ends:
+        return None
+      children = sorted((row for row in rows if row.depth is None), key=lambda row: row.created_at)
+      logs = None
+      if include_logs:
+        compacted = (await session.execute(select(Job.event_log_json).where(Job.job_id == ends[-1].job_id))).scalar_one_or_none()
+        logs = await self._list_event_messages_in_session(session=session, job_id=ends[-1].job_id, limit=100, compacted=compacted)
+    return ResolvedJobChain(requested=_status_summary(ends[0]), resolved=_status_summary(ends[-1]), children=[_status_summary(row) for row in children], logs=logs)
+
+  async def list_child_jobs(self, *, parent_job_id: str, include_done: bool = False) -> list[JobSummaryRecord]:
+    """Project summary columns only, so polling many children never transfers their JSONB payloads or event logs."""
+    async with self._session_factory() as session:
+      stmt = select(*_SUMMARY_COLUMNS).where(Job.parent_job_id == parent_job_id).order_by(Job.created_at.asc())
       if not include_done:
         stmt = stmt.where(Job.status != "done")
-      rows = (await session.execute(stmt)).scalars().all()
-      result: list[JobRecord] = []
-      for row in rows:
-        logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
-        result.append(self._model_to_record(row, logs=logs))
-      return result
+      rows = (await session.execute(stmt)).all()
+      return [_summary_to_record(row) for row in rows]
 
   async def list_jobs(
     self, page: int = 1, limit: int = 20, status: str | None = None, job_id: str | None = None, job_kind: str | None = None, user_id: str | None = None, target_agent: str | None = None, sort_by: str = "created_at", sort_order: str = "desc"
-  ) -> tuple[list[JobRecord], int]:
+  ) -> tuple[list[JobSummaryRecord], int]:
     async with self._session_factory() as session:
       offset = (page - 1) * limit
-      stmt = select(Job).limit(limit).offset(offset)
+      stmt = select(*_SUMMARY_COLUMNS).limit(limit).offset(offset)
       count_stmt = select(func.count()).select_from(Job)
       filters = []
       if status:
@@ -261,21 +312,24 @@ class PostgresJobsRepository(JobsRepository):
         sort_column = Job.job_kind
       stmt = stmt.order_by(sort_column.asc() if sort_order.lower() == "asc" else sort_column.desc())
       total = await session.scalar(count_stmt)
-      rows = (await session.execute(stmt)).scalars().all()
-      items: list[JobRecord] = []
-      for row in rows:
-        logs = await self._list_event_messages_in_session(session=session, job_id=row.job_id, limit=100)
-        items.append(self._model_to_record(row, logs=logs))
-      return items, int(total or 0)
+      rows = (await session.execute(stmt)).all()
+      return [_summary_to_record(row) for row in rows], int(total or 0)
 
   async def append_event(self, *, job_id: str, event_type: str, message: str, payload_json: dict | None = None) -> None:
     async with self._session_factory() as session:
-      session.add(JobEvent(job_id=job_id, event_type=event_type, message=message, payload_json=payload_json))
+      await session.execute(insert(JobEvent).values(job_id=job_id, event_type=event_type, message=message, payload_json=payload_json))
+      await session.commit()
+
+  async def append_events(self, *, job_id: str, event_type: str, messages: Sequence[str]) -> int:
+    async with self._session_factory() as session:
+      appended = await self._append_events_in_session(session=session, job_id=job_id, event_type=event_type, messages=messages)
       await session.commit()
+      return appended
 
   async def list_events(self, *, job_id: str, limit: int = 100) -> list[str]:
     async with self._session_factory() as session:
-      return await self._list_event_messages_in_session(session=session, job_id=job_id, limit=limit)
+      compacted = (await session.execute(select(Job.event_log_json).where(Job.job_id == job_id))).scalar_one_or_none()
+      return await self._list_event_messages_in_session(session=session, job_id=job_id, limit=limit, compacted=compacted)
 
   async def claim_checkpoint(self, *, job_id: str, stage: str, section_index: int | None) -> JobCheckpointRecord | None:
     async with self._session_factory() as session:
@@ -347,16 +401,22 @@ class PostgresJobsRepository(JobsRepository):
       rows = (await session.execute(stmt)).scalars().all()
       return [self._checkpoint_to_record(row) for row in rows]
 
-  async def _append_events_in_session(self, *, session: AsyncSession, job_id: str, event_type: str, messages: list[str]) -> None:
-    for message in messages:
-      if str(message).strip() == "":
-        continue
-      session.add(JobEvent(job_id=job_id, event_type=event_type, message=str(message), payload_json=None))
+  async def _append_events_in_session(self, *, session: AsyncSession, job_id: str, event_type: str, messages: Sequence[str]) -> int:
+    """Insert all non-blank messages with one multi-row INSERT, preserving their order."""
+    rows = [{"job_id": job_id, "event_type": event_type, "message": str(message), "payload_json": None} for message in messages if str(message).strip() != ""]
+    if rows:
+      await session.execute(insert(JobEvent).values(rows))
+    return len(rows)
 
-  async def _list_event_messages_in_session(self, *, session: AsyncSession, job_id: str, limit: int) -> list[str]:
+  async def _list_event_messages_in_session(self, *, session: AsyncSession, job_id: str, limit: int, compacted: list[dict[str, Any]] | None) -> list[str]:
+    """Return the newest messages, oldest first, topping live job_events rows up from the compacted log blob."""
     stmt = select(JobEvent.message).where(JobEvent.job_id == job_id).order_by(JobEvent.created_at.desc(), JobEvent.id.desc()).limit(limit)
     rows = (await session.execute(stmt)).scalars().all()
     ordered = list(reversed([str(item) for item in rows]))
+    # Compaction only folds events that predate any live row, so the blob's tail directly precedes them.
+    missing = limit - len(ordered)
+    if compacted and missing > 0:
+      ordered = [str(entry.get("message", "")) for entry in compacted[-missing:]] + ordered
     return ordered
 
   def _checkpoint_to_record(self, row: JobCheckpoint) -> JobCheckpointRecord:
@@ -387,8 +447,28 @@ class PostgresJobsRepository(JobsRepository):
       lesson_id=row.lesson_id,
       section_id=row.section_id,
       target_agent=row.target_agent,
+      phase=row.phase,
+      subphase=row.subphase,
+      expected_sections=row.expected_sections,
+      completed_sections=row.completed_sections,
+      completed_section_indexes=row.completed_section_indexes,
+      current_section_index=row.current_section_index,
+      current_section_status=row.current_section_status,
+      current_section_retry_count=row.current_section_retry_count,
+      current_section_title=row.current_section_title,
+      retry_count=row.retry_count,
+      max_retries=row.max_retries,
+      retry_sections=row.retry_sections,
+      retry_agents=row.retry_agents,
+      retry_parent_job_id=row.retry_parent_job_id,
+      total_steps=row.total_steps,
+      completed_steps=row.completed_steps,
+      progress=row.progress,
       logs=logs,
       result_json=row.result_json,
+      artifacts=row.artifacts_json,
+      validation=row.validation_json,
+      cost=row.cost_json,
       error_json=row.error_json,
       started_at=_to_iso_z(row.started_at),
       completed_at=_to_iso_z(row.completed_at),
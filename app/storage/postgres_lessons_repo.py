@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from app.core.database import get_session_factory
 from app.schema.fenster import FensterWidget, FensterWidgetType
@@ -27,11 +32,109 @@ from app.schema.widgets_content import (
   TranslationWidget,
   TreeviewWidget,
 )
-from app.storage.lessons_repo import FreeTextRecord, InputLineRecord, LessonRecord, LessonsRepository, SectionErrorRecord, SectionRecord, SubsectionRecord, SubsectionWidgetRecord
+from app.storage.lessons_repo import (
+  FreeTextRecord,
+  InputLineRecord,
+  LessonPage,
+  LessonRecord,
+  LessonsRepository,
+  SectionErrorRecord,
+  SectionGraph,
+  SectionGraphResult,
+  SectionGraphWidget,
+  SectionRecord,
+  SectionSummaryRecord,
+  SubsectionRecord,
+  SubsectionWidgetRecord,
+)
 from app.utils.ids import generate_nanoid
 
 logger = logging.getLogger(__name__)
 
+# Typed payload tables keyed by widget shorthand name.
+_PAYLOAD_WIDGET_MODELS: dict[str, type[Any]] = {
+  "markdown": MarkdownWidget,
+  "flipcards": FlipcardsWidget,
+  "tr": TranslationWidget,
+  "fillblank": FillBlankWidget,
+  "table": TableDataWidget,
+  "compare": CompareWidget,
+  "swipecards": SwipeCardWidget,
+  "stepFlow": StepFlowWidget,
+  "asciiDiagram": AsciiDiagramWidget,
+  "checklist": ChecklistWidget,
+  "interactiveTerminal": InteractiveTerminalWidget,
+  "terminalDemo": TerminalDemoWidget,
+  "codeEditor": CodeEditorWidget,
+  "treeview": TreeviewWidget,
+  "mcqs": McqsWidget,
+}
+# Every widget table a section graph can write; input widgets and fensters have their own columns.
+_GRAPH_WIDGET_MODELS: dict[str, type[Any]] = {**_PAYLOAD_WIDGET_MODELS, "inputLine": InputLine, "freeText": FreeText, "fenster": FensterWidget}
+
+
+# Sort keys for lesson listings; each is backed by an ix_lessons_user_archived_<key> index ending in lesson_id.
+_LESSON_SORT_COLUMNS: dict[str, Any] = {"created_at": Lesson.created_at, "lesson_id": Lesson.lesson_id, "topic": Lesson.topic, "title": Lesson.title, "status": Lesson.status}
+# Listing projection: every lesson column except the lesson_plan JSONB.
+_LESSON_LIST_COLUMNS = (
+  Lesson.lesson_id,
+  Lesson.user_id,
+  Lesson.topic,
+  Lesson.title,
+  Lesson.created_at,
+  Lesson.schema_version,
+  Lesson.prompt_version,
+  Lesson.provider_a,
+  Lesson.model_a,
+  Lesson.provider_b,
+  Lesson.model_b,
+  Lesson.status,
+  Lesson.latency_ms,
+  Lesson.is_archived,
+  Lesson.idempotency_key,
+  Lesson.tags,
+  Lesson.lesson_request_id,
+)
+_LESSON_TOTAL_MODES = frozenset({"exact", "estimated", "none"})
+
+
+class _ExplainJson(Executable, ClauseElement):
+  """EXPLAIN (FORMAT JSON) around a select, compiled by the dialect so bind parameters stay bound."""
+
+  inherit_cache = False
+
+  def __init__(self, stmt: Any) -> None:
+    self.stmt = stmt
+
+
+@compiles(_ExplainJson, "postgresql")
+def _compile_explain_json(element: _ExplainJson, compiler: Any, **kw: Any) -> str:
+  return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+def _encode_lesson_cursor(sort_by: str, sort_value: str, lesson_id: str) -> str:
+  return base64.urlsafe_b64encode(json.dumps([sort_by, sort_value, lesson_id]).encode()).decode("ascii")
+
+
+def _decode_lesson_cursor(cursor: str, sort_by: str) -> tuple[str, str]:
+  """Return (sort_value, lesson_id) from a cursor issued for the same sort key."""
+  try:
+    cursor_sort, sort_value, lesson_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+  except (ValueError, TypeError) as exc:
+    raise ValueError("Invalid lesson cursor.") from exc
+  if cursor_sort != sort_by or not isinstance(sort_value, str) or not isinstance(lesson_id, str):
+    raise ValueError("Lesson cursor does not match the requested sort.")
+  return sort_value, lesson_id
+
+
+def _widget_row_values(widget_type: str, creator_id: str, payload_json: dict[str, Any]) -> dict[str, Any]:
+  """Build insert values for one typed widget row, mirroring the single-row create_* helpers."""
+  if widget_type in ("inputLine", "freeText"):
+    return {"creator_id": creator_id, "ai_prompt": str(payload_json.get("ai_prompt") or ""), "wordlist": payload_json.get("wordlist_csv"), "is_archived": False}
+  if widget_type == "fenster":
+    return {"public_id": generate_nanoid(), "creator_id": creator_id, "status": "pending", "is_archived": False, "type": FensterWidgetType.INLINE_BLOB, "content": None, "url": None}
+  return {"creator_id": creator_id, "is_archived": False, "payload_json": payload_json}
+
 
 class PostgresLessonsRepository(LessonsRepository):
   """Persist lessons to Postgres using SQLAlchemy."""
@@ -202,6 +305,83 @@ class PostgresLessonsRepository(LessonsRepository):
       await session.commit()
       return created_records
 
+  async def persist_section_graph(self, graph: SectionGraph) -> SectionGraphResult:
+    """Persist a section graph with one INSERT ... RETURNING per table and a single commit.
+
+    How/Why:
+      - Typed widget rows are grouped by table, so a section costs a few round-trips instead of a transaction and refresh per widget.
+      - Subsections and widget links upsert on their natural keys, keeping the re-run semantics of create_subsections/create_subsection_widgets.
+    """
+    groups: dict[str, list[SectionGraphWidget]] = {}
+    for subsection in graph.subsections:
+      for widget in subsection.widgets:
+        if widget.widget_type not in _GRAPH_WIDGET_MODELS:
+          raise RuntimeError(f"Unsupported widget type for persistence: {widget.widget_type}")
+        groups.setdefault(widget.widget_type, []).append(widget)
+
+    async with self._session_factory() as session:
+      markdown_id: int | None = None
+      if graph.markdown_payload is not None:
+        markdown_stmt = insert(MarkdownWidget).values(creator_id=graph.creator_id, is_archived=False, payload_json=graph.markdown_payload).returning(MarkdownWidget.id)
+        markdown_id = int((await session.execute(markdown_stmt)).scalar_one())
+        await session.execute(update(Section).where(Section.section_id == graph.section_id).values(markdown_id=markdown_id))
+
+      # Typed rows: one multi-row insert per table, ids returned in parameter order.
+      widget_row_ids: dict[tuple[int, int], str] = {}
+      for widget_type, widgets in groups.items():
+        model_cls = _GRAPH_WIDGET_MODELS[widget_type]
+        key_column = model_cls.public_id if model_cls is FensterWidget else model_cls.id
+        stmt = insert(model_cls).returning(key_column, sort_by_parameter_order=True)
+        row_ids = (await session.execute(stmt, [_widget_row_values(widget_type, graph.creator_id, widget.payload_json) for widget in widgets])).scalars().all()
+        for widget, row_id in zip(widgets, row_ids, strict=True):
+          widget_row_ids[(widget.subsection_index, widget.widget_index)] = str(row_id)
+
+      subsections: list[SubsectionRecord] = []
+      links: list[SubsectionWidgetRecord] = []
+      if graph.subsections:
+        subsection_stmt = insert(Subsection).values([{"section_id": graph.section_id, "subsection_index": sub.subsection_index, "subsection_title": sub.subsection_title, "status": sub.status, "is_archived": False} for sub in graph.subsections])
+        subsection_stmt = subsection_stmt.on_conflict_do_update(
+          constraint="ux_subsections_section_subsection_index", set_={"subsection_title": subsection_stmt.excluded.subsection_title, "status": subsection_stmt.excluded.status, "is_archived": subsection_stmt.excluded.is_archived, "updated_at": func.now()}
+        ).returning(Subsection.id, Subsection.section_id, Subsection.subsection_index, Subsection.subsection_title, Subsection.status, Subsection.is_archived)
+        subsection_rows = (await session.execute(subsection_stmt)).all()
+        subsections = sorted(
+          (SubsectionRecord(id=row.id, section_id=row.section_id, subsection_index=row.subsection_index, subsection_title=row.subsection_title, status=row.status, is_archived=row.is_archived) for row in subsection_rows),
+          key=lambda record: record.subsection_index,
+        )
+        subsection_ids = {record.subsection_index: int(record.id) for record in subsections if record.id is not None}
+
+        link_values = [
+          {
+            "public_id": str(widget.public_id or generate_nanoid()),
+            "subsection_id": subsection_ids[sub.subsection_index],
+            "widget_id": widget_row_ids[(sub.subsection_index, widget.widget_index)],
+            "widget_index": widget.widget_index,
+            "widget_type": widget.widget_type,
+            "status": "pending",
+            "is_archived": False,
+          }
+          for sub in graph.subsections
+          for widget in sub.widgets
+        ]
+        if link_values:
+          # Existing links keep their public_id, as create_subsection_widgets does.
+          link_stmt = insert(SubsectionWidget).values(link_values)
+          link_stmt = link_stmt.on_conflict_do_update(
+            constraint="ux_subsection_widgets_subsection_widget_index_type", set_={"widget_id": link_stmt.excluded.widget_id, "status": link_stmt.excluded.status, "is_archived": link_stmt.excluded.is_archived, "updated_at": func.now()}
+          ).returning(SubsectionWidget.id, SubsectionWidget.public_id, SubsectionWidget.subsection_id, SubsectionWidget.widget_id, SubsectionWidget.widget_index, SubsectionWidget.widget_type, SubsectionWidget.status, SubsectionWidget.is_archived)
+          link_rows = (await session.execute(link_stmt)).all()
+          links = sorted(
+            (
+              SubsectionWidgetRecord(
+                id=row.id, public_id=row.public_id, subsection_id=row.subsection_id, widget_id=row.widget_id, widget_index=row.widget_index, widget_type=getattr(row.widget_type, "value", row.widget_type), status=row.status, is_archived=row.is_archived
+              )
+              for row in link_rows
+            ),
+            key=lambda record: (record.subsection_id, record.widget_index),
+          )
+      await session.commit()
+      return SectionGraphResult(markdown_id=markdown_id, subsections=subsections, widgets=links)
+
   async def create_section_errors(self, records: list[SectionErrorRecord]) -> list[SectionErrorRecord]:
     """Persist section validation errors."""
     async with self._session_factory() as session:
@@ -340,6 +520,23 @@ class PostgresLessonsRepository(LessonsRepository):
         for s in sections
       ]
 
+  async def list_section_summaries(self, lesson_ids: list[str]) -> dict[str, list[SectionSummaryRecord]]:
+    """Return ordered section summaries per lesson id in one projected query.
+
+    How/Why:
+      - Selecting only scalar columns keeps the content/content_shorthand JSONB documents from being detoasted, sent and decoded.
+      - Taking many lesson ids lets listings fetch every table of contents in one round trip.
+    """
+    summaries: dict[str, list[SectionSummaryRecord]] = {lesson_id: [] for lesson_id in lesson_ids}
+    if not lesson_ids:
+      return summaries
+    async with self._session_factory() as session:
+      stmt = select(Section.section_id, Section.lesson_id, Section.title, Section.order_index, Section.status).where(Section.lesson_id.in_(lesson_ids)).order_by(Section.lesson_id, Section.order_index)
+      result = await session.execute(stmt)
+      for section_id, lesson_id, title, order_index, status in result.all():
+        summaries[lesson_id].append(SectionSummaryRecord(section_id=section_id, lesson_id=lesson_id, title=title, order_index=order_index, status=status))
+    return summaries
+
   async def update_lesson_title(self, lesson_id: str, title: str) -> None:
     """Update an existing lesson's title."""
     async with self._session_factory() as session:
@@ -352,59 +549,78 @@ class PostgresLessonsRepository(LessonsRepository):
       await session.commit()
 
   async def list_lessons(
-    self, page: int = 1, limit: int = 20, topic: str | None = None, status: str | None = None, user_id: str | None = None, is_archived: bool | None = None, sort_by: str = "created_at", sort_order: str = "desc"
-  ) -> tuple[list[LessonRecord], int]:
-    """Return a paginated list of lessons with optional filters, sorting, and total count."""
+    self,
+    page: int = 1,
+    limit: int = 20,
+    topic: str | None = None,
+    status: str | None = None,
+    user_id: str | None = None,
+    is_archived: bool | None = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    *,
+    cursor: str | None = None,
+    total: str = "exact",
+  ) -> LessonPage:
+    """Return a page of lessons with optional filters and sorting, without loading lesson plans.
+
+    How/Why:
+      - With a cursor the page is a keyset seek on (sort key, lesson_id), so deep pages cost the same as the first.
+      - Filtering on user_id and is_archived lets that seek walk the matching ix_lessons_user_archived_* index.
+      - total="estimated" reads the planner's row estimate instead of counting, and total="none" skips it.
+    """
+    if total not in _LESSON_TOTAL_MODES:
+      raise ValueError(f"Unsupported lesson total mode: {total}")
+    sort_column = _LESSON_SORT_COLUMNS.get(sort_by, Lesson.created_at)
+    sort_key = sort_by if sort_by in _LESSON_SORT_COLUMNS else "created_at"
+    descending = sort_order.lower() != "asc"
+    key_columns = [sort_column] if sort_column is Lesson.lesson_id else [sort_column, Lesson.lesson_id]
+
+    conditions = []
+    if topic:
+      conditions.append(Lesson.topic == topic)
+    if status:
+      conditions.append(Lesson.status == status)
+    if user_id:
+      conditions.append(Lesson.user_id == user_id)
+    if is_archived is not None:
+      conditions.append(Lesson.is_archived == is_archived)
+
+    # Fetch one extra row to learn whether another page exists.
+    stmt = select(*_LESSON_LIST_COLUMNS).where(*conditions).order_by(*(column.desc() if descending else column.asc() for column in key_columns)).limit(limit + 1)
+    if cursor is not None:
+      sort_value, last_lesson_id = _decode_lesson_cursor(cursor, sort_key)
+      boundary = [sort_value] if len(key_columns) == 1 else [sort_value, last_lesson_id]
+      key, after = tuple_(*key_columns), tuple_(*boundary)
+      stmt = stmt.where(key < after if descending else key > after)
+    elif page > 1:
+      stmt = stmt.offset((page - 1) * limit)
+
     async with self._session_factory() as session:
-      # Calculate offset from page
-      offset = (page - 1) * limit
-
-      # Build base query
-      stmt = select(Lesson).limit(limit).offset(offset)
-      count_stmt = select(func.count()).select_from(Lesson)
-
-      # Apply filters
-      conditions = []
-      if topic:
-        conditions.append(Lesson.topic == topic)
-      if status:
-        conditions.append(Lesson.status == status)
-      if user_id:
-        conditions.append(Lesson.user_id == user_id)
-      if is_archived is not None:
-        conditions.append(Lesson.is_archived == is_archived)
-
-      if conditions:
-        stmt = stmt.where(*conditions)
-        count_stmt = count_stmt.where(*conditions)
-
-      # Apply sorting
-      sort_column = Lesson.created_at  # default
-      if sort_by == "lesson_id":
-        sort_column = Lesson.lesson_id
-      elif sort_by == "created_at":
-        sort_column = Lesson.created_at
-      elif sort_by == "topic":
-        sort_column = Lesson.topic
-      elif sort_by == "title":
-        sort_column = Lesson.title
-      elif sort_by == "status":
-        sort_column = Lesson.status
-
-      if sort_order.lower() == "asc":
-        stmt = stmt.order_by(sort_column.asc())
+      rows = (await session.execute(stmt)).all()
+      if total == "exact":
+        total_count: int | None = int(await session.scalar(select(func.count()).select_from(Lesson).where(*conditions)) or 0)
+      elif total == "estimated":
+        total_count = await self._estimate_row_count(session, select(Lesson.lesson_id).where(*conditions))
       else:
-        stmt = stmt.order_by(sort_column.desc())
-
-      # Execute queries
-      total = await session.scalar(count_stmt)
-      result = await session.execute(stmt)
-      lessons = result.scalars().all()
-
-      return [self._model_to_record(lesson) for lesson in lessons], (total or 0)
-
-  def _model_to_record(self, lesson: Lesson) -> LessonRecord:
-    """Convert a SQLAlchemy model to a domain record."""
+        total_count = None
+
+    next_cursor = None
+    if len(rows) > limit:
+      rows = rows[:limit]
+      last = rows[-1]
+      next_cursor = _encode_lesson_cursor(sort_key, str(getattr(last, sort_key)), last.lesson_id)
+    return LessonPage(items=[self._model_to_record(row) for row in rows], total=total_count, next_cursor=next_cursor)
+
+  async def _estimate_row_count(self, session: Any, stmt: Any) -> int:
+    """Return the planner's row estimate for stmt, which is cheap and close enough for page counters."""
+    plan = (await session.execute(_ExplainJson(stmt))).scalar_one()
+    if isinstance(plan, str):
+      plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+  def _model_to_record(self, lesson: Any) -> LessonRecord:
+    """Convert a SQLAlchemy model, or a listing row without lesson_plan, to a domain record."""
     tags = set(lesson.tags) if lesson.tags else None
     return LessonRecord(
       lesson_id=lesson.lesson_id,
@@ -423,29 +639,12 @@ class PostgresLessonsRepository(LessonsRepository):
       is_archived=bool(getattr(lesson, "is_archived", False)),
       idempotency_key=lesson.idempotency_key,
       tags=tags,
-      lesson_plan=lesson.lesson_plan,
+      lesson_plan=getattr(lesson, "lesson_plan", None),
       lesson_request_id=lesson.lesson_request_id,
     )
 
   async def create_widget_payload(self, *, widget_type: str, creator_id: str, payload_json: dict[str, Any]) -> str:
     """Persist a widget payload in its typed table and return the typed row id."""
-    model_map = {
-      "markdown": MarkdownWidget,
-      "flipcards": FlipcardsWidget,
-      "tr": TranslationWidget,
-      "fillblank": FillBlankWidget,
-      "table": TableDataWidget,
-      "compare": CompareWidget,
-      "swipecards": SwipeCardWidget,
-      "stepFlow": StepFlowWidget,
-      "asciiDiagram": AsciiDiagramWidget,
-      "checklist": ChecklistWidget,
-      "interactiveTerminal": InteractiveTerminalWidget,
-      "terminalDemo": TerminalDemoWidget,
-      "codeEditor": CodeEditorWidget,
-      "treeview": TreeviewWidget,
-      "mcqs": McqsWidget,
-    }
     if widget_type == "fenster":
       async with self._session_factory() as session:
         row = FensterWidget(public_id=generate_nanoid(), creator_id=creator_id, status="pending", is_archived=False, type=FensterWidgetType.INLINE_BLOB, content=None, url=None)
@@ -453,7 +652,7 @@ class PostgresLessonsRepository(LessonsRepository):
         await session.commit()
         await session.refresh(row)
         return str(row.public_id)
-    model_cls = model_map.get(widget_type)
+    model_cls = _PAYLOAD_WIDGET_MODELS.get(widget_type)
     if model_cls is None:
       raise RuntimeError(f"Unsupported widget type for persistence: {widget_type}")
     async with self._session_factory() as session:
@@ -84,7 +84,7 @@ async def start_llm_call(*, provider: str, model: str, request_type: str, reques
   return await _insert_record(repo, record)
 
 
-async def finalize_llm_call(*, call_id: int | None, response_payload: str | None, usage: dict[str, int] | None, duration_ms: int, error: BaseException | None) -> None:
+async def finalize_llm_call(*, call_id: int | None, response_payload: str | None, usage: dict[str, int] | None, duration_ms: int, error: BaseException | None, cache_status: str | None = None) -> None:
   """Update the pending LLM call row after the response or failure."""
   # Avoid update attempts when the insert did not happen.
 
@@ -122,7 +122,17 @@ async def finalize_llm_call(*, call_id: int | None, response_payload: str | None
   safe_response = _scrub_pii(response_payload)
 
   await _update_record(
-    repo, call_id, finished_at=finished_at, response_payload=safe_response, status=status, error_message=error_message, duration_ms=duration_ms, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=total_tokens
+    repo,
+    call_id,
+    finished_at=finished_at,
+    response_payload=safe_response,
+    status=status,
+    error_message=error_message,
+    duration_ms=duration_ms,
+    prompt_tokens=prompt_tokens,
+    completion_tokens=completion_tokens,
+    total_tokens=total_tokens,
+    cache_status=cache_status,
   )
 
 
@@ -176,14 +186,34 @@ async def _insert_record(repo: PostgresLlmAuditRepository, record: LlmAuditRecor
 
 
 async def _update_record(
-  repo: PostgresLlmAuditRepository, record_id: int, *, finished_at: datetime, response_payload: str | None, status: str, error_message: str | None, duration_ms: int, prompt_tokens: int | None, completion_tokens: int | None, total_tokens: int | None
+  repo: PostgresLlmAuditRepository,
+  record_id: int,
+  *,
+  finished_at: datetime,
+  response_payload: str | None,
+  status: str,
+  error_message: str | None,
+  duration_ms: int,
+  prompt_tokens: int | None,
+  completion_tokens: int | None,
+  total_tokens: int | None,
+  cache_status: str | None,
 ) -> None:
   """Update an existing audit record and swallow database failures."""
   logger = logging.getLogger(__name__)
 
   try:
     await repo.update_record(
-      record_id=record_id, timestamp_response=finished_at, response_payload=response_payload, status=status, error_message=error_message, duration_ms=duration_ms, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=total_tokens
+      record_id=record_id,
+      timestamp_response=finished_at,
+      response_payload=response_payload,
+      status=status,
+      error_message=error_message,
+      duration_ms=duration_ms,
+      prompt_tokens=prompt_tokens,
+      completion_tokens=completion_tokens,
+      total_tokens=total_tokens,
+      cache_status=cache_status,
     )
 
   except Exception as exc:  # noqa: BLE001 - avoid breaking upstream calls
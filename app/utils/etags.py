@@ -0,0 +1,25 @@
+"""HTTP entity-tag helpers for conditional GET responses."""
+
+from __future__ import annotations
+
+import hashlib
+
+
+def strong_etag(body: bytes) -> str:
+  """Return a quoted strong ETag derived from the response bytes."""
+  return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+  """Return True when an If-None-Match header matches the current ETag.
+
+  If-None-Match uses weak comparison, so a W/ prefix on either side is ignored.
+  """
+  if not if_none_match:
+    return False
+  candidate = etag.removeprefix("W/")
+  for raw_tag in if_none_match.split(","):
+    tag = raw_tag.strip()
+    if tag == "*" or tag.removeprefix("W/") == candidate:
+      return True
+  return False
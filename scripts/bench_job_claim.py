@@ -0,0 +1,112 @@
+"""Benchmark queued-job claim latency against a large job history.
+
+Seeds --history finished jobs plus --queued queued jobs (all ids prefixed "bench-"), then drains the queue with
+--workers concurrent claimers calling PostgresJobsRepository.claim_queued, and reports per-claim latency.
+Requires DYLEN_PG_DSN pointing at a migrated, disposable database.
+
+Usage: python scripts/bench_job_claim.py [--history 1000000] [--queued 500] [--batch 5] [--workers 4] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.database import get_session_factory  # noqa: E402
+from app.storage.postgres_jobs_repo import PostgresJobsRepository  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+_SEED_SQL = text(
+  """
+  INSERT INTO jobs (job_id, root_job_id, job_kind, request_json, status, target_agent, created_at, updated_at, idempotency_key)
+  SELECT CAST(:prefix AS text) || g, CAST(:prefix AS text) || g, 'lesson', '{}'::jsonb,
+         CASE WHEN CAST(:status AS text) = 'history' THEN (ARRAY['done', 'error', 'canceled'])[1 + g % 3] ELSE CAST(:status AS text) END,
+         'planner', now() - (g * interval '1 second') - CAST(:offset AS integer) * interval '1 second', now(), CAST(:prefix AS text) || g
+  FROM generate_series(1, :count) AS g
+  """
+)
+_EXPLAIN_SQL = text("EXPLAIN SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT :batch FOR UPDATE SKIP LOCKED")
+
+
+async def _seed(*, history: int, queued: int) -> None:
+  session_factory = get_session_factory()
+  async with session_factory() as session:
+    started = time.perf_counter()
+    await session.execute(_SEED_SQL, {"prefix": "bench-h-", "status": "history", "count": history, "offset": 0})
+    await session.execute(_SEED_SQL, {"prefix": "bench-q-", "status": "queued", "count": queued, "offset": -3600})
+    await session.commit()
+    await session.execute(text("ANALYZE jobs"))
+    await session.commit()
+    print(f"seeded {history} finished + {queued} queued jobs in {time.perf_counter() - started:.1f}s")
+
+
+async def _explain(batch: int) -> None:
+  session_factory = get_session_factory()
+  async with session_factory() as session:
+    plan = (await session.execute(_EXPLAIN_SQL, {"batch": batch})).scalars().all()
+    await session.rollback()
+  print("claim plan:")
+  for line in plan:
+    print(f"  {line}")
+
+
+async def _drain(*, batch: int, workers: int) -> tuple[list[float], list[str]]:
+  repo = PostgresJobsRepository()
+  latencies: list[float] = []
+  claimed: list[str] = []
+
+  async def _worker() -> None:
+    while True:
+      started = time.perf_counter()
+      jobs = await repo.claim_queued(limit=batch)
+      latencies.append((time.perf_counter() - started) * 1000)
+      if not jobs:
+        return
+      claimed.extend(job.job_id for job in jobs)
+
+  await asyncio.gather(*(_worker() for _ in range(workers)))
+  return latencies, claimed
+
+
+async def _cleanup() -> None:
+  session_factory = get_session_factory()
+  async with session_factory() as session:
+    await session.execute(text("DELETE FROM jobs WHERE job_id LIKE 'bench-%'"))
+    await session.commit()
+
+
+async def _main(args: argparse.Namespace) -> None:
+  await _seed(history=args.history, queued=args.queued)
+  try:
+    await _explain(args.batch)
+    started = time.perf_counter()
+    latencies, claimed = await _drain(batch=args.batch, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    duplicates = len(claimed) - len(set(claimed))
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+    print(f"claimed {len(claimed)} jobs in {elapsed:.2f}s with {args.workers} workers, duplicates={duplicates}")
+    print(f"claim latency ms: p50={statistics.median(latencies):.2f} p95={p95:.2f} max={latencies[-1]:.2f}")
+  finally:
+    if not args.keep:
+      await _cleanup()
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--history", type=int, default=1_000_000, help="Finished jobs to seed as history.")
+  parser.add_argument("--queued", type=int, default=500, help="Queued jobs to drain.")
+  parser.add_argument("--batch", type=int, default=5, help="Jobs per claim call.")
+  parser.add_argument("--workers", type=int, default=4, help="Concurrent claimers.")
+  parser.add_argument("--keep", action="store_true", help="Keep the seeded rows for further inspection.")
+  asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+  main()
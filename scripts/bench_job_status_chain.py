@@ -0,0 +1,130 @@
+"""Benchmark job status resolution on long superseded_by (retry/resume) chains.
+
+Seeds one chain per --lengths value (ids prefixed "bench-chain-"), each ending in a running job with --children
+unfinished child jobs and every job carrying --events log events. For each chain it times the previous per-hop walk
+(get_job per hop, then list_child_jobs) against PostgresJobsRepository.resolve_job_chain, polling from the first job.
+Requires DYLEN_PG_DSN pointing at a migrated, disposable database.
+
+Usage: python scripts/bench_job_status_chain.py [--lengths 1 5 20 50] [--children 10] [--events 50] [--iterations 50] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.database import get_session_factory  # noqa: E402
+from app.storage.postgres_jobs_repo import PostgresJobsRepository  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+_PREFIX = "bench-chain-"
+_SEED_JOBS_SQL = text(
+  """
+  INSERT INTO jobs (job_id, root_job_id, user_id, job_kind, request_json, status, superseded_by_job_id, parent_job_id, target_agent, created_at, updated_at, idempotency_key)
+  SELECT CAST(:chain AS text) || '-' || g, CAST(:chain AS text) || '-1', 'bench-user', 'lesson', '{"topic": "bench"}'::jsonb,
+         CASE WHEN g < CAST(:length AS integer) THEN 'superseded' ELSE 'running' END,
+         CASE WHEN g < CAST(:length AS integer) THEN CAST(:chain AS text) || '-' || (g + 1) END,
+         NULL, 'planner', now(), now(), CAST(:chain AS text) || '-' || g
+  FROM generate_series(1, CAST(:length AS integer)) AS g
+  UNION ALL
+  SELECT CAST(:chain AS text) || '-child-' || g, CAST(:chain AS text) || '-1', 'bench-user', 'lesson', '{"topic": "bench"}'::jsonb,
+         'queued', NULL, CAST(:chain AS text) || '-' || CAST(:length AS integer), 'section_builder', now(), now(), CAST(:chain AS text) || '-child-' || g
+  FROM generate_series(1, CAST(:children AS integer)) AS g
+  """
+)
+_SEED_EVENTS_SQL = text(
+  """
+  INSERT INTO job_events (job_id, event_type, message)
+  SELECT jobs.job_id, 'log', 'bench event ' || g FROM jobs, generate_series(1, CAST(:events AS integer)) AS g WHERE jobs.job_id LIKE CAST(:chain AS text) || '-%'
+  """
+)
+
+
+async def _seed(*, lengths: list[int], children: int, events: int) -> None:
+  session_factory = get_session_factory()
+  async with session_factory() as session:
+    for length in lengths:
+      chain = f"{_PREFIX}{length}"
+      await session.execute(_SEED_JOBS_SQL, {"chain": chain, "length": length, "children": children})
+      await session.execute(_SEED_EVENTS_SQL, {"chain": chain, "events": events})
+    await session.commit()
+    await session.execute(text("ANALYZE jobs"))
+    await session.execute(text("ANALYZE job_events"))
+    await session.commit()
+
+
+async def _walk_per_hop(repo: PostgresJobsRepository, job_id: str) -> str:
+  """The resolution get_job_status used before: one get_job (with events) per hop, then list_child_jobs."""
+  current = await repo.get_job(job_id)
+  visited = {job_id}
+  while current is not None and current.superseded_by_job_id and current.superseded_by_job_id not in visited:
+    visited.add(current.superseded_by_job_id)
+    next_record = await repo.get_job(current.superseded_by_job_id)
+    if next_record is None:
+      break
+    current = next_record
+  await repo.list_child_jobs(parent_job_id=current.job_id, include_done=False)
+  return current.job_id
+
+
+async def _resolve_chain(repo: PostgresJobsRepository, job_id: str) -> str:
+  chain = await repo.resolve_job_chain(job_id)
+  return chain.resolved.job_id
+
+
+async def _time(func: Callable[[PostgresJobsRepository, str], Awaitable[str]], repo: PostgresJobsRepository, job_id: str, iterations: int) -> tuple[list[float], str]:
+  samples: list[float] = []
+  resolved = ""
+  for _ in range(iterations):
+    started = time.perf_counter()
+    resolved = await func(repo, job_id)
+    samples.append((time.perf_counter() - started) * 1000)
+  samples.sort()
+  return samples, resolved
+
+
+async def _cleanup() -> None:
+  session_factory = get_session_factory()
+  async with session_factory() as session:
+    await session.execute(text("DELETE FROM jobs WHERE job_id LIKE :pattern"), {"pattern": f"{_PREFIX}%"})
+    await session.commit()
+
+
+async def _main(args: argparse.Namespace) -> None:
+  await _seed(lengths=args.lengths, children=args.children, events=args.events)
+  try:
+    repo = PostgresJobsRepository()
+    print(f"{'length':>6}  {'per-hop p50':>11}  {'per-hop p95':>11}  {'cte p50':>8}  {'cte p95':>8}  speedup")
+    for length in args.lengths:
+      job_id = f"{_PREFIX}{length}-1"
+      walk, walk_resolved = await _time(_walk_per_hop, repo, job_id, args.iterations)
+      cte, cte_resolved = await _time(_resolve_chain, repo, job_id, args.iterations)
+      if walk_resolved != cte_resolved:
+        raise RuntimeError(f"Resolution mismatch for length {length}: {walk_resolved} != {cte_resolved}")
+      p95 = max(int(len(walk) * 0.95) - 1, 0)
+      speedup = statistics.median(walk) / statistics.median(cte)
+      print(f"{length:>6}  {statistics.median(walk):>9.2f}ms  {walk[p95]:>9.2f}ms  {statistics.median(cte):>6.2f}ms  {cte[p95]:>6.2f}ms  {speedup:>6.1f}x")
+  finally:
+    if not args.keep:
+      await _cleanup()
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--lengths", type=int, nargs="+", default=[1, 5, 20, 50], help="Chain lengths to seed and poll.")
+  parser.add_argument("--children", type=int, default=10, help="Unfinished child jobs under each chain's last job.")
+  parser.add_argument("--events", type=int, default=50, help="Log events per seeded job.")
+  parser.add_argument("--iterations", type=int, default=50, help="Status polls per chain and strategy.")
+  parser.add_argument("--keep", action="store_true", help="Keep the seeded rows for further inspection.")
+  asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,54 @@
+"""Microbenchmark for lenient JSON parsing of large section-builder responses.
+
+Usage: python scripts/bench_json_parser.py [--items 1200] [--rounds 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.ai.json_parser import parse_json_with_fallback  # noqa: E402
+
+_ITEM = '{"markdown": ["Lists use square brackets [] and items are separated by commas, e.g. \\"[1, 2]\\"."]}'
+
+
+def _build_payloads(items: int) -> dict[str, str]:
+  """Build ~100 KB section responses covering the strict path and each repair path."""
+  body = ", ".join([_ITEM] * items)
+  valid = '{"section": "Lists", "items": [' + body + "]}"
+  return {
+    "valid": valid,
+    "prose_wrapped": f"Here is the section:\n```json\n{valid}\n```\nLet me know if you need changes.",
+    "trailing_commas": '{"section": "Lists", "items": [' + body + ",],}",
+    "bare_keys_missing_commas": '{section: "Lists", items: [' + " ".join([_ITEM] * items) + "]}",
+  }
+
+
+def _time(func: Callable[[str], object], payload: str, rounds: int) -> float:
+  """Return the mean wall time in milliseconds after one warm-up call."""
+  func(payload)
+  started = time.perf_counter()
+  for _ in range(rounds):
+    func(payload)
+  return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--items", type=int, default=1200, help="Widget items per synthetic section.")
+  parser.add_argument("--rounds", type=int, default=50, help="Timed iterations per payload.")
+  args = parser.parse_args()
+
+  for name, payload in _build_payloads(args.items).items():
+    elapsed = _time(parse_json_with_fallback, payload, args.rounds)
+    print(f"{name:<26} {len(payload) / 1024:8.1f} KiB {elapsed:8.2f} ms")
+
+
+if __name__ == "__main__":
+  main()
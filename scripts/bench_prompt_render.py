@@ -0,0 +1,79 @@
+"""Microbenchmark for prompt rendering across every agent prompt template.
+
+Usage: python scripts/bench_prompt_render.py [--rounds 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.ai.agents.prompts import load_prompt_template, render_planner_prompt, render_repair_prompt, render_section_builder_prompt  # noqa: E402
+from app.ai.pipeline.contracts import GenerationRequest, PlanSection, PlanSubsection, SectionDraft  # noqa: E402
+
+_REQUEST = GenerationRequest(
+  topic="Introduction to Linear Algebra",
+  depth="detailed",
+  section_count=6,
+  prompt="Focus on intuition and geometric interpretations before formal definitions.",
+  outcomes=["Multiply matrices", "Interpret eigenvectors geometrically", "Solve linear systems"],
+  blueprint="Knowledge & Understanding",
+  teaching_style=["conceptual", "practical"],
+  lesson_language="English",
+  learner_level="Intermediate",
+  widgets=["markdown", "flipcards", "quiz", "fillblank"],
+)
+_SECTION = PlanSection(
+  section_number=1, title="Vectors and spaces", subsections=[PlanSubsection(title=f"Subsection {index}", planned_widgets=["markdown", "quiz"]) for index in range(1, 5)], goals="Build intuition for vectors.", continuity_note="Leads into matrices."
+)
+_SUBSECTION = {"title": "Dot products", "items": [{"markdown": ["The dot product measures alignment between vectors."]}] * 8}
+_REPAIR_TARGETS = [{"path": f"items[{index}]", "widget": {"quiz": [{"q": "?", "choices": ["a", "b"], "answer": 0}]}} for index in range(10)]
+
+
+def _renderers() -> dict[str, Callable[[], str]]:
+  """Build one zero-argument renderer per agent prompt, mirroring the values each agent substitutes."""
+  tutor = load_prompt_template("tutor_script.md", frozenset({"TOPIC", "SUBSECTION_TITLE", "LEARNING_POINTS", "SUBSECTION_CONTENT"}))
+  outcomes = load_prompt_template("outcomes_agent_improved.md", frozenset({"TOPIC", "DETAILS", "LEARNER_LEVEL", "TEACHING_STYLE", "DEPTH", "PRIMARY_LANGUAGE", "SECONDARY_LANGUAGE", "MAX_OUTCOMES"}))
+  illustration = load_prompt_template("illustration_fallback.md", frozenset({"TOPIC", "SECTION_TITLE", "FOCUS_LINE"}))
+  fenster = load_prompt_template("fenster_builder.md", frozenset({"concept_context", "target_audience", "technical_constraints"}))
+  writing = load_prompt_template("writing_check.md", frozenset({"AI_PROMPT", "WORDLIST_BLOCK", "USER_TEXT"}))
+  subsection_json = json.dumps(_SUBSECTION, indent=2, default=str)
+  return {
+    "planner": lambda: render_planner_prompt(_REQUEST),
+    "section_builder": lambda: render_section_builder_prompt(_REQUEST, _SECTION, "1"),
+    "repair": lambda: render_repair_prompt(_REQUEST, SectionDraft(section_number=1, title="Vectors", plan_section=_SECTION, raw_text=""), _REPAIR_TARGETS, ["items[0]: missing answer"] * 10),
+    "tutor": lambda: tutor.render({"TOPIC": _REQUEST.topic, "SUBSECTION_TITLE": "Dot products", "LEARNING_POINTS": "- Alignment\n- Projection", "SUBSECTION_CONTENT": subsection_json}),
+    "outcomes": lambda: outcomes.render({"TOPIC": _REQUEST.topic, "DETAILS": "-", "LEARNER_LEVEL": "Intermediate", "TEACHING_STYLE": "conceptual", "DEPTH": "detailed", "PRIMARY_LANGUAGE": "English", "SECONDARY_LANGUAGE": "-", "MAX_OUTCOMES": "5"}),
+    "illustration": lambda: illustration.render({"TOPIC": _REQUEST.topic, "SECTION_TITLE": "Vectors and spaces", "FOCUS_LINE": "Arrows in the plane."}),
+    "fenster": lambda: fenster.render({"concept_context": "Vector addition", "target_audience": "Students", "technical_constraints": "None"}),
+    "writing": lambda: writing.render({"AI_PROMPT": "Describe a vector.", "WORDLIST_BLOCK": "", "USER_TEXT": "A vector has magnitude and direction."}),
+  }
+
+
+def _time(func: Callable[[], str], rounds: int) -> tuple[float, int]:
+  """Return the mean wall time in microseconds and the rendered size after one warm-up call."""
+  size = len(func())
+  started = time.perf_counter()
+  for _ in range(rounds):
+    func()
+  return (time.perf_counter() - started) / rounds * 1_000_000, size
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--rounds", type=int, default=2000, help="Timed iterations per agent prompt.")
+  args = parser.parse_args()
+
+  for name, renderer in _renderers().items():
+    elapsed, size = _time(renderer, args.rounds)
+    print(f"{name:<16} {size / 1024:8.1f} KiB {elapsed:10.2f} us")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,85 @@
+"""Seed data for migration c1d7723ac5f9: permissions for the scheduled maintenance triggers."""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+ROLE_SUPER_ADMIN_ID = uuid.UUID("3e56ebfc-1d62-42cb-a920-ab6e916e58bf")
+ROLE_ADMIN_ID = uuid.UUID("33caeb8d-9824-4506-953a-c5e949db3dba")
+
+# Permission UUIDs - fixed for consistency
+PERMISSIONS = {"admin:maintenance_reconcile_job_counters": uuid.UUID("dbd8de18-3154-4c44-a0e5-c3418d44bd9d")}
+
+PERMISSION_DEFS = [{"slug": "admin:maintenance_reconcile_job_counters", "display_name": "Reconcile Job Counters Maintenance", "description": "Recount active jobs and correct per-user concurrency counters."}]
+
+
+async def _table_exists(connection: AsyncConnection, *, table_name: str) -> bool:
+  """Return True when a table exists in the public schema."""
+  result = await connection.execute(text("SELECT 1 FROM information_schema.tables WHERE table_schema = 'public' AND table_name = :table_name LIMIT 1"), {"table_name": table_name})
+  return result.first() is not None
+
+
+async def seed(connection: AsyncConnection) -> None:
+  """Insert the maintenance permissions, grant them to Super Admin and Admin, and open their perm.* gates like the baseline does."""
+  if not await _table_exists(connection, table_name="permissions"):
+    return
+  for perm_def in PERMISSION_DEFS:
+    perm_id = PERMISSIONS[perm_def["slug"]]
+    await connection.execute(
+      text(
+        """
+        INSERT INTO permissions (id, slug, display_name, description)
+        VALUES (:id, :slug, :display_name, :description)
+        ON CONFLICT (slug) DO UPDATE
+        SET display_name = EXCLUDED.display_name,
+            description = EXCLUDED.description
+        """
+      ),
+      {"id": perm_id, **perm_def},
+    )
+    if await _table_exists(connection, table_name="role_permissions"):
+      for role_id in (ROLE_SUPER_ADMIN_ID, ROLE_ADMIN_ID):
+        await connection.execute(
+          text(
+            """
+            INSERT INTO role_permissions (role_id, permission_id)
+            SELECT :role_id, p.id FROM permissions p WHERE p.slug = :slug
+            ON CONFLICT (role_id, permission_id) DO NOTHING
+            """
+          ),
+          {"role_id": role_id, "slug": perm_def["slug"]},
+        )
+
+  if not await _table_exists(connection, table_name="feature_flags"):
+    return
+  flag_keys = [f"perm.{slug}" for slug in PERMISSIONS]
+  for flag_key in flag_keys:
+    await connection.execute(
+      text("INSERT INTO feature_flags (id, key, description, default_enabled) VALUES (:id, :key, :description, TRUE) ON CONFLICT (key) DO UPDATE SET description = EXCLUDED.description, default_enabled = EXCLUDED.default_enabled"),
+      {"id": uuid.uuid4(), "key": flag_key, "description": f"Permission gate for {flag_key.removeprefix('perm.')}"},
+    )
+  if await _table_exists(connection, table_name="subscription_tier_feature_flags"):
+    await connection.execute(
+      text(
+        """
+        INSERT INTO subscription_tier_feature_flags (subscription_tier_id, feature_flag_id, enabled)
+        SELECT st.id, ff.id, TRUE FROM subscription_tiers st CROSS JOIN feature_flags ff WHERE ff.key = ANY(:keys)
+        ON CONFLICT (subscription_tier_id, feature_flag_id) DO UPDATE SET enabled = EXCLUDED.enabled
+        """
+      ),
+      {"keys": flag_keys},
+    )
+  if await _table_exists(connection, table_name="organization_feature_flags"):
+    await connection.execute(
+      text(
+        """
+        INSERT INTO organization_feature_flags (org_id, feature_flag_id, enabled)
+        SELECT org.id, ff.id, TRUE FROM organizations org CROSS JOIN feature_flags ff WHERE ff.key = ANY(:keys)
+        ON CONFLICT (org_id, feature_flag_id) DO UPDATE SET enabled = EXCLUDED.enabled
+        """
+      ),
+      {"keys": flag_keys},
+    )
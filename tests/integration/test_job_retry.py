@@ -14,6 +14,11 @@ os.environ["DYLEN_JOBS_AUTO_PROCESS"] = "0"
 from app.core.security import get_current_active_user  # noqa: E402
 from app.main import app  # noqa: E402
 from app.schema.sql import User, UserStatus  # noqa: E402
+from app.storage.jobs_repo import JobStatusSummary, ResolvedJobChain  # noqa: E402
+
+
+def _summary(record: JobRecord) -> JobStatusSummary:
+  return JobStatusSummary(job_id=record.job_id, user_id=record.user_id, status=record.status, lesson_id=record.lesson_id, superseded_by_job_id=record.superseded_by_job_id)
 
 
 class InMemoryJobsRepo:
@@ -22,17 +27,21 @@ class InMemoryJobsRepo:
   def __init__(self) -> None:
     self._jobs: dict[str, JobRecord] = {}
 
-  async def create_job(self, record: JobRecord) -> None:
+  async def create_job(self, record: JobRecord, *, concurrency_limit: int | None = None) -> None:
     self._jobs[record.job_id] = record
 
   async def get_job(self, job_id: str) -> JobRecord | None:
     return self._jobs.get(job_id)
 
-  async def update_job(self, job_id: str, **kwargs: object) -> JobRecord | None:
+  async def get_job_status(self, job_id: str) -> str | None:
+    record = self._jobs.get(job_id)
+    return record.status if record else None
+
+  async def update_job(self, job_id: str, *, expected_status: tuple[str, ...] | None = None, **kwargs: object) -> JobRecord | None:
     record = self._jobs.get(job_id)
 
     # Bail out when the job id is unknown.
-    if record is None:
+    if record is None or (expected_status is not None and record.status not in expected_status):
       return None
 
     # Apply partial updates to mimic repository behavior.
@@ -40,7 +49,7 @@ class InMemoryJobsRepo:
     self._jobs[job_id] = updated
     return updated
 
-  async def find_queued(self, limit: int = 5) -> list[JobRecord]:
+  async def claim_queued(self, limit: int = 5) -> list[JobRecord]:
     return []
 
   async def find_by_idempotency_key(self, idempotency_key: str) -> JobRecord | None:
@@ -49,6 +58,18 @@ class InMemoryJobsRepo:
   async def find_by_user_kind_idempotency_key(self, *, user_id: str | None, job_kind: str, idempotency_key: str) -> JobRecord | None:
     return None
 
+  async def resolve_job_chain(self, job_id: str, *, include_logs: bool = False) -> ResolvedJobChain | None:
+    requested = self._jobs.get(job_id)
+    if requested is None:
+      return None
+    resolved = requested
+    visited = {resolved.job_id}
+    while resolved.superseded_by_job_id and resolved.superseded_by_job_id not in visited and resolved.superseded_by_job_id in self._jobs:
+      resolved = self._jobs[resolved.superseded_by_job_id]
+      visited.add(resolved.job_id)
+    children = await self.list_child_jobs(parent_job_id=resolved.job_id)
+    return ResolvedJobChain(requested=_summary(requested), resolved=_summary(resolved), children=[_summary(child) for child in children], logs=list(resolved.logs) if include_logs else None)
+
   async def list_child_jobs(self, *, parent_job_id: str, include_done: bool = False) -> list[JobRecord]:
     children = [record for record in self._jobs.values() if record.parent_job_id == parent_job_id]
     if include_done:
@@ -0,0 +1,74 @@
+"""Shared fakes for repository unit tests that assert on the SQL a repository emits."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+
+class FakeSession:
+  """Async session stand-in that records every statement and answers from queued results or configured defaults.
+
+  Queued `results` are returned in order; once they run out, each execute() gets a fresh result whose
+  all/one_or_none/scalars().all()/scalar_one accessors return the configured values. Pass `respond` to
+  build results from the statement itself instead.
+  """
+
+  def __init__(self, *, results: Iterable[Any] = (), rows: Iterable[Any] = (), one: Any = None, scalars: Iterable[Any] = (), scalar_one: Any = None, scalar: Any = None, respond: Callable[[Any, Any], Any] | None = None) -> None:
+    self.statements: list[Any] = []
+    self.calls: list[tuple[Any, Any]] = []
+    self.commits = 0
+    self._results = list(results)
+    self._rows = list(rows)
+    self._one = one
+    self._scalars = list(scalars)
+    self._scalar_one = scalar_one
+    self._scalar = scalar
+    self._respond = respond
+
+  @property
+  def committed(self) -> bool:
+    return self.commits > 0
+
+  async def __aenter__(self) -> FakeSession:
+    return self
+
+  async def __aexit__(self, *_exc: object) -> None:
+    return None
+
+  async def execute(self, stmt: Any, params: Any = None) -> Any:
+    self.statements.append(stmt)
+    self.calls.append((stmt, params))
+    if self._respond is not None:
+      return self._respond(stmt, params)
+    if self._results:
+      return self._results.pop(0)
+    result = MagicMock()
+    result.all.return_value = list(self._rows)
+    result.one_or_none.return_value = self._one
+    result.scalars.return_value.all.return_value = list(self._scalars)
+    result.scalar_one.return_value = self._scalar_one
+    return result
+
+  async def scalar(self, stmt: Any) -> Any:
+    self.statements.append(stmt)
+    self.calls.append((stmt, None))
+    return self._scalar
+
+  async def commit(self) -> None:
+    self.commits += 1
+
+
+def make_repo[R](repo_cls: type[R], session: FakeSession) -> R:
+  """Build a repository without touching the database engine, bound to the given fake session."""
+  repo = repo_cls.__new__(repo_cls)
+  repo._session_factory = lambda: session  # type: ignore[attr-defined]
+  return repo
+
+
+def compile_sql(stmt: Any) -> str:
+  """Render a statement with the PostgreSQL dialect on one line."""
+  return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
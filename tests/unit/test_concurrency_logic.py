@@ -90,3 +90,66 @@ async def test_check_concurrency_limit_with_override():
 
     await check_concurrency_limit("lesson", user, db)
     # Should not raise
+
+
+def test_job_slot_key_counts_only_active_jobs_for_limited_features():
+  from app.jobs.concurrency import job_slot_key
+
+  assert job_slot_key(user_id="user1", status="queued", target_agent=None) == ("user1", "lesson")
+  assert job_slot_key(user_id="user1", status="running", target_agent="planner") == ("user1", "lesson")
+  assert job_slot_key(user_id="user1", status="queued", target_agent="tutor") == ("user1", "tutor")
+  assert job_slot_key(user_id="user1", status="done", target_agent="planner") is None
+  assert job_slot_key(user_id="user1", status="queued", target_agent="section_builder") is None
+  assert job_slot_key(user_id=None, status="queued", target_agent="planner") is None
+
+
+@pytest.mark.anyio
+async def test_acquire_job_slot_uses_conditional_upsert():
+  from app.jobs.concurrency import acquire_job_slot
+  from sqlalchemy.dialects import postgresql
+
+  db = AsyncMock()
+  acquired = MagicMock()
+  acquired.scalar_one_or_none.return_value = 1
+  db.execute.return_value = acquired
+
+  await acquire_job_slot(db, user_id="user1", feature="lesson", limit=2)
+
+  compiled = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+  assert "ON CONFLICT (user_id, feature) DO UPDATE" in compiled
+  assert "WHERE user_active_job_counters.active_count <" in compiled
+  assert "RETURNING user_active_job_counters.active_count" in compiled
+
+
+@pytest.mark.anyio
+async def test_acquire_job_slot_rejects_when_counter_is_full():
+  from app.jobs.concurrency import ConcurrencyLimitExceededError, acquire_job_slot
+
+  db = AsyncMock()
+  rejected = MagicMock()
+  rejected.scalar_one_or_none.return_value = None
+  current = MagicMock()
+  current.scalar_one.return_value = 2
+  db.execute.side_effect = [rejected, current]
+
+  with pytest.raises(ConcurrencyLimitExceededError) as exc:
+    await acquire_job_slot(db, user_id="user1", feature="lesson", limit=2)
+  assert (exc.value.limit, exc.value.active_count) == (2, 2)
+
+
+@pytest.mark.anyio
+async def test_research_discover_passes_limit_to_job_creation_and_maps_rejection():
+  from app.api.routes import research
+  from app.jobs.concurrency import ConcurrencyLimitExceededError
+  from app.schema.research import ResearchDiscoveryRequest
+
+  jobs_repo = MagicMock()
+  jobs_repo.create_job = AsyncMock(side_effect=ConcurrencyLimitExceededError(feature="research", limit=1, active_count=1))
+  agent = AsyncMock()
+
+  with patch.object(research, "_get_jobs_repo", return_value=jobs_repo), pytest.raises(HTTPException) as exc:
+    await research.discover(ResearchDiscoveryRequest(query="tides"), agent, User(id="user1"), MagicMock(), concurrency_limit=1)
+
+  assert exc.value.status_code == 429
+  assert jobs_repo.create_job.await_args.kwargs == {"concurrency_limit": 1}
+  agent.discover.assert_not_called()
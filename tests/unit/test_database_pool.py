@@ -0,0 +1,54 @@
+"""Unit tests for database pool configuration and instrumentation."""
+
+from __future__ import annotations
+
+import pytest
+from app.config import DatabaseSettings, get_database_settings
+from app.core import database
+
+
+def test_database_settings_read_pool_tuning_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Pool tuning knobs are parsed from the environment."""
+  monkeypatch.setenv("DYLEN_PG_POOL_SIZE", "25")
+  monkeypatch.setenv("DYLEN_PG_MAX_OVERFLOW", "5")
+  monkeypatch.setenv("DYLEN_PG_POOL_TIMEOUT_SECONDS", "2.5")
+  monkeypatch.setenv("DYLEN_PG_POOL_RECYCLE_SECONDS", "600")
+  monkeypatch.setenv("DYLEN_PG_POOL_PRE_PING", "false")
+  monkeypatch.setenv("DYLEN_PG_STATEMENT_CACHE_SIZE", "0")
+  get_database_settings.cache_clear()
+  try:
+    settings = get_database_settings()
+  finally:
+    get_database_settings.cache_clear()
+
+  assert (settings.pg_pool_size, settings.pg_max_overflow, settings.pg_pool_timeout_seconds) == (25, 5, 2.5)
+  assert (settings.pg_pool_recycle_seconds, settings.pg_pool_pre_ping, settings.pg_statement_cache_size) == (600, False, 0)
+
+
+def test_database_settings_reject_invalid_pool_size(monkeypatch: pytest.MonkeyPatch) -> None:
+  """A non-positive pool size is a configuration error."""
+  monkeypatch.setenv("DYLEN_PG_POOL_SIZE", "0")
+  get_database_settings.cache_clear()
+  try:
+    with pytest.raises(ValueError, match="DYLEN_PG_POOL_SIZE"):
+      get_database_settings()
+  finally:
+    get_database_settings.cache_clear()
+
+
+def test_engine_options_use_instrumented_pool_and_statement_cache() -> None:
+  """Engine options carry pool tuning and both prepared-statement cache sizes."""
+  settings = DatabaseSettings(debug=False, pg_dsn=None, pg_connect_timeout=7, pg_pool_size=3, pg_max_overflow=1, pg_statement_cache_size=0)
+  options = database.build_engine_options(settings)
+  assert options["poolclass"] is database.InstrumentedAsyncQueuePool
+  assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (3, 1, True)
+  assert options["connect_args"] == {"timeout": 7, "statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+
+def test_pool_status_reports_config_before_engine_initialization(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Operators can inspect pool configuration even before the first connection."""
+  monkeypatch.setattr(database, "engine", None)
+  status = database.get_pool_status()
+  assert status["initialized"] is False
+  assert status["config"]["pool_size"] == get_database_settings().pg_pool_size
+  assert "avg_wait_seconds" in status["metrics"]
@@ -0,0 +1,88 @@
+"""Unit tests for the compiled feature-flag decision table."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services import feature_flags
+from app.services.feature_flags import invalidate_feature_flag_cache, resolve_feature_flag_decisions
+
+_ORG_ID = uuid.uuid4()
+_USER_ID = uuid.uuid4()
+
+
+def _result(rows: list[tuple[Any, ...]]) -> MagicMock:
+  result = MagicMock()
+  result.fetchall.return_value = rows
+  return result
+
+
+def _session() -> AsyncMock:
+  """Return a session that answers the table loads in order: flags, tiers, tier maps, tenant map."""
+  session = AsyncMock()
+  session.execute.side_effect = [
+    _result([("feature.notes", True), ("feature.tutor", True), ("feature.killed", True)]),
+    _result([(1, False), (2, True)]),
+    _result([(1, "feature.notes", False), (2, "feature.notes", True)]),
+    _result([("feature.notes", True), ("feature.tutor", False)]),
+  ]
+  return session
+
+
+@pytest.fixture(autouse=True)
+def _isolated_table(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+  invalidate_feature_flag_cache()
+  monkeypatch.setattr(feature_flags, "resolve_global_disabled_features", AsyncMock(return_value={"feature.killed"}))
+  yield
+  invalidate_feature_flag_cache()
+
+
+@pytest.mark.anyio
+async def test_static_layers_are_loaded_once_and_reused(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Repeat evaluations only query active user overrides."""
+  overrides = AsyncMock(return_value={"feature.tutor": True})
+  monkeypatch.setattr(feature_flags, "list_active_user_feature_overrides", overrides)
+  session = _session()
+
+  first = await resolve_feature_flag_decisions(session, keys=None, org_id=_ORG_ID, subscription_tier_id=2, user_id=_USER_ID)
+  second = await resolve_feature_flag_decisions(session, keys=["feature.notes"], org_id=_ORG_ID, subscription_tier_id=2, user_id=_USER_ID)
+
+  assert session.execute.await_count == 4
+  assert overrides.await_count == 2
+  assert list(first) == ["feature.killed", "feature.notes", "feature.tutor"]
+  assert first["feature.killed"].enabled is False
+  assert first["feature.notes"].enabled is True
+  # Tenant contexts ignore promo overrides when the tier row is missing.
+  assert first["feature.tutor"].enabled is False
+  assert second["feature.notes"].enabled is True
+
+
+@pytest.mark.anyio
+async def test_invalidation_forces_reload(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Admin writes drop the compiled table so the next evaluation sees fresh rows."""
+  monkeypatch.setattr(feature_flags, "list_active_user_feature_overrides", AsyncMock(return_value={}))
+  session = _session()
+  stale = await resolve_feature_flag_decisions(session, keys=["feature.notes"], org_id=None, subscription_tier_id=1, user_id=None)
+  assert stale["feature.notes"].enabled is False
+
+  invalidate_feature_flag_cache()
+  session.execute.side_effect = [_result([("feature.notes", True)]), _result([(1, False)]), _result([(1, "feature.notes", True)])]
+  decisions = await resolve_feature_flag_decisions(session, keys=["feature.notes"], org_id=None, subscription_tier_id=1, user_id=None)
+
+  assert session.execute.await_count == 6
+  assert decisions["feature.notes"].enabled is True
+
+
+@pytest.mark.anyio
+async def test_unknown_keys_are_denied_without_extra_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Keys missing from the compiled table resolve to a deny decision."""
+  monkeypatch.setattr(feature_flags, "list_active_user_feature_overrides", AsyncMock(return_value={}))
+  session = _session()
+  decisions = await resolve_feature_flag_decisions(session, keys=["feature.missing"], org_id=None, subscription_tier_id=None, user_id=None)
+
+  assert decisions["feature.missing"].enabled is False
+  assert session.execute.await_count == 3
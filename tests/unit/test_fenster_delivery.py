@@ -0,0 +1,101 @@
+"""Unit tests for conditional, cached fenster blob delivery."""
+
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from app.api.routes import fenster as fenster_routes
+from app.schema.fenster import FensterWidgetType
+from app.services.fenster_blob_cache import FensterBlobCache
+from app.utils.compression import compress_html
+from app.utils.etags import strong_etag
+from starlette.requests import Request
+
+_BLOB = compress_html("<div>widget</div>")
+
+
+class _Db:
+  def __init__(self, blob: bytes | None = _BLOB) -> None:
+    self.statements: list[Any] = []
+    self._blob = blob
+
+  async def execute(self, stmt: Any) -> Any:
+    self.statements.append(stmt)
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = self._blob
+    return result
+
+
+def _request(if_none_match: str | None = None) -> Request:
+  headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+  return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _head(etag: str | None) -> SimpleNamespace:
+  return SimpleNamespace(fenster_id=uuid.uuid4(), type=FensterWidgetType.INLINE_BLOB, url=None, content_etag=etag)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> FensterBlobCache:
+  cache = FensterBlobCache(max_bytes=1024 * 1024)
+  monkeypatch.setattr(fenster_routes, "get_fenster_blob_cache", lambda: cache)
+  return cache
+
+
+@pytest.mark.anyio
+async def test_matching_etag_answers_304_without_reading_the_blob(cache: FensterBlobCache) -> None:
+  etag = strong_etag(_BLOB)
+  db = _Db()
+
+  response = await fenster_routes._render_fenster_widget_response(db, _head(etag), _request(f"W/{etag}"))  # type: ignore[arg-type]
+
+  assert response.status_code == 304
+  assert response.headers["etag"] == etag
+  assert response.headers["cache-control"] == "private, no-cache"
+  assert response.headers["vary"] == "Accept-Encoding, Authorization"
+  assert db.statements == []
+
+
+@pytest.mark.anyio
+async def test_blob_is_served_once_from_postgres_then_from_the_cache(cache: FensterBlobCache) -> None:
+  head = _head(strong_etag(_BLOB))
+  db = _Db()
+
+  first = await fenster_routes._render_fenster_widget_response(db, head, _request())  # type: ignore[arg-type]
+  second = await fenster_routes._render_fenster_widget_response(db, head, _request('"stale"'))  # type: ignore[arg-type]
+
+  assert first.status_code == second.status_code == 200
+  assert first.body == second.body == _BLOB
+  assert first.headers["content-encoding"] == "br"
+  assert len(db.statements) == 1
+  assert "content" in str(db.statements[0]).split("FROM")[0]
+
+
+@pytest.mark.anyio
+async def test_rows_without_stored_etag_get_one_from_the_blob(cache: FensterBlobCache) -> None:
+  db = _Db()
+
+  response = await fenster_routes._render_fenster_widget_response(db, _head(None), _request(strong_etag(_BLOB)))  # type: ignore[arg-type]
+
+  assert response.status_code == 304
+  assert response.headers["etag"] == strong_etag(_BLOB)
+
+
+def test_cache_is_bounded_by_bytes_and_drops_rebuilt_entries() -> None:
+  cache = FensterBlobCache(max_bytes=10)
+  cache.put("a", '"1"', b"aaaa")
+  cache.put("b", '"1"', b"bbbb")
+  assert cache.get("a", '"1"') == b"aaaa"
+
+  cache.put("c", '"1"', b"cccc")
+  assert cache.get("b", '"1"') is None
+  assert cache.size_bytes == 8
+
+  assert cache.get("a", '"2"') is None
+  assert cache.size_bytes == 4
+  cache.put("big", '"1"', b"x" * 11)
+  assert cache.get("big", '"1"') is None
@@ -0,0 +1,64 @@
+"""Unit tests for single-query superseded-chain resolution."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.services import jobs as jobs_service
+from app.storage.jobs_repo import JobStatusSummary, ResolvedJobChain
+from app.storage.postgres_jobs_repo import PostgresJobsRepository
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+def _row(job_id: str, depth: int | None, *, status: str = "done", minute: int = 0, superseded_by: str | None = None) -> SimpleNamespace:
+  return SimpleNamespace(job_id=job_id, user_id="user-1", status=status, lesson_id="lesson-1", superseded_by_job_id=superseded_by, created_at=datetime(2026, 1, 1, 0, minute, tzinfo=UTC), depth=depth)
+
+
+@pytest.mark.anyio
+async def test_chain_is_resolved_with_one_recursive_query() -> None:
+  rows = [_row("child-b", None, status="running", minute=2), _row("job-3", 2, status="running"), _row("job-1", 0, status="superseded", superseded_by="job-2"), _row("child-a", None, status="queued", minute=1)]
+  session = FakeSession(rows=rows)
+  repo = make_repo(PostgresJobsRepository, session)
+
+  chain = await repo.resolve_job_chain("job-1")
+
+  (stmt,) = session.statements
+  sql = compile_sql(stmt)
+  assert sql.startswith("WITH RECURSIVE chain(job_id, superseded_by_job_id, depth, path) AS")
+  assert "JOIN chain ON jobs_1.job_id = chain.superseded_by_job_id WHERE NOT (jobs_1.job_id = ANY (chain.path))" in sql
+  assert "UNION ALL SELECT jobs.job_id, jobs.user_id, jobs.status" in sql
+  assert "request_json" not in sql and "result_json" not in sql and "job_events" not in sql
+  assert chain is not None
+  assert chain.requested.job_id == "job-1" and chain.requested.superseded_by_job_id == "job-2"
+  assert chain.resolved.job_id == "job-3"
+  assert [child.job_id for child in chain.children] == ["child-a", "child-b"]
+  assert chain.logs is None
+
+
+@pytest.mark.anyio
+async def test_unknown_job_resolves_to_none() -> None:
+  repo = make_repo(PostgresJobsRepository, FakeSession())
+
+  assert await repo.resolve_job_chain("missing") is None
+
+
+@pytest.mark.anyio
+async def test_get_job_status_makes_a_single_repository_call(monkeypatch: pytest.MonkeyPatch) -> None:
+  requested = JobStatusSummary(job_id="job-1", user_id="user-1", status="superseded", lesson_id="lesson-1", superseded_by_job_id="job-2")
+  resolved = JobStatusSummary(job_id="job-3", user_id="user-1", status="running", lesson_id="lesson-1", superseded_by_job_id=None)
+  child = JobStatusSummary(job_id="child-a", user_id="user-1", status="queued", lesson_id="lesson-1", superseded_by_job_id=None)
+  repo = MagicMock()
+  repo.resolve_job_chain = AsyncMock(return_value=ResolvedJobChain(requested=requested, resolved=resolved, children=[child]))
+  monkeypatch.setattr(jobs_service, "_get_jobs_repo", lambda _settings: repo)
+
+  response = await jobs_service.get_job_status("job-1", MagicMock(), user_id="user-1")
+
+  assert response.job_id == "job-3"
+  assert response.was_superseded and response.superseded_job_id == "job-1" and response.follow_from_job_id == "job-3"
+  assert [(item.job_id, item.status) for item in response.child_jobs] == [("child-a", "queued")]
+  repo.resolve_job_chain.assert_awaited_once_with("job-1")
+  assert not repo.get_job.called and not repo.list_child_jobs.called
@@ -0,0 +1,57 @@
+"""Unit tests for the atomic queued-job claim and the worker's use of it."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.jobs.worker import JobProcessor
+from app.schema.jobs import Job
+from app.storage.postgres_jobs_repo import PostgresJobsRepository
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+@pytest.mark.anyio
+async def test_claim_is_a_single_skip_locked_update() -> None:
+  session = FakeSession()
+  repo = make_repo(PostgresJobsRepository, session)
+
+  assert await repo.claim_queued(limit=3) == []
+
+  (stmt,) = session.statements
+  sql = compile_sql(stmt)
+  assert sql.startswith("WITH claimable AS (SELECT jobs.job_id")
+  assert "ORDER BY jobs.created_at ASC LIMIT" in sql
+  assert "FOR UPDATE SKIP LOCKED) UPDATE jobs SET status=" in sql
+  assert "RETURNING" in sql
+  assert session.committed
+
+
+def test_queue_index_is_partial_on_queued_status() -> None:
+  index = next(index for index in Job.__table__.indexes if index.name == "ix_jobs_queued_created_at")
+  assert [column.name for column in index.columns] == ["created_at"]
+  assert str(index.dialect_options["postgresql"]["where"]) == "status = 'queued'"
+
+
+@pytest.mark.anyio
+async def test_process_queue_dispatches_claimed_jobs_without_a_second_status_write(monkeypatch: pytest.MonkeyPatch) -> None:
+  claimed_job = MagicMock(job_id="job-1", status="running", target_agent="planner", logs=[])
+  jobs_repo = MagicMock()
+  jobs_repo.claim_queued = AsyncMock(return_value=[claimed_job])
+  jobs_repo.update_job = AsyncMock()
+  dispatch = AsyncMock(return_value=MagicMock(record=claimed_job))
+  monkeypatch.setattr("app.jobs.worker.dispatch_process_job", dispatch)
+  monkeypatch.setattr("app.jobs.worker.get_task_enqueuer", lambda _settings: None)
+  processor = JobProcessor.__new__(JobProcessor)
+  processor._jobs_repo = jobs_repo
+  processor._registry = {}
+  processor._settings = MagicMock()
+  processor._logger = MagicMock()
+
+  results = await processor.process_queue(limit=2)
+
+  assert results == [claimed_job]
+  jobs_repo.claim_queued.assert_awaited_once_with(limit=2)
+  jobs_repo.update_job.assert_not_awaited()
+  assert dispatch.await_args.args[1] == "planner"
@@ -0,0 +1,63 @@
+"""Unit tests for batched job event appends and compacted job logs."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from app.services.maintenance import compact_job_events
+from app.storage.postgres_jobs_repo import PostgresJobsRepository
+from sqlalchemy.dialects import postgresql
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+def _rows(values: list[Any]) -> MagicMock:
+  result = MagicMock()
+  result.scalars.return_value.all.return_value = values
+  result.scalar_one_or_none.return_value = values[0] if values else None
+  return result
+
+
+@pytest.mark.anyio
+async def test_append_events_is_one_multi_row_insert() -> None:
+  session = FakeSession()
+
+  appended = await make_repo(PostgresJobsRepository, session).append_events(job_id="job-1", event_type="log", messages=["First.", "  ", "Second."])
+
+  assert appended == 2
+  (stmt,) = session.statements
+  compiled = stmt.compile(dialect=postgresql.dialect())
+  assert compile_sql(stmt).startswith("INSERT INTO job_events (job_id, event_type, message, payload_json) VALUES")
+  assert [compiled.params["message_m0"], compiled.params["message_m1"]] == ["First.", "Second."]
+  assert session.commits == 1
+
+
+@pytest.mark.anyio
+async def test_list_events_tops_live_rows_up_from_the_compacted_log() -> None:
+  compacted = [{"message": "Queued."}, {"message": "Planned."}, {"message": "Built."}]
+  session = FakeSession(results=[_rows([compacted]), _rows(["Retried.", "Resumed."])])
+
+  messages = await make_repo(PostgresJobsRepository, session).list_events(job_id="job-1", limit=4)
+
+  # Live rows come back newest first and are reversed; the blob supplies the older remainder.
+  assert messages == ["Planned.", "Built.", "Resumed.", "Retried."]
+
+
+@pytest.mark.anyio
+async def test_compaction_moves_events_into_the_blob_in_one_statement_per_batch() -> None:
+  update_result = MagicMock(rowcount=2)
+  session = FakeSession(results=[_rows(["job-1", "job-2"]), update_result])
+
+  compacted = await compact_job_events(session, older_than=timedelta(days=7), batch_size=5)
+
+  assert compacted == 2
+  select_sql, update_sql = (compile_sql(stmt) for stmt in session.statements)
+  assert "jobs.status IN (" in select_sql and "EXISTS (SELECT * FROM job_events" in select_sql
+  assert update_sql.startswith("WITH moved AS (DELETE FROM job_events WHERE job_events.job_id IN")
+  assert "jsonb_agg(jsonb_build_object(" in update_sql and "ORDER BY moved.created_at, moved.id" in update_sql
+  assert "UPDATE jobs SET event_log_json=(coalesce(jobs.event_log_json" in update_sql
+  assert "updated_at=jobs.updated_at" in update_sql
+  assert session.commits == 1
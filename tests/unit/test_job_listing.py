@@ -0,0 +1,63 @@
+"""Unit tests for summary-only job listings."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from app.jobs.models import JobSummaryRecord
+from app.storage.postgres_jobs_repo import PostgresJobsRepository
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+def _row(job_id: str, *, status: str = "running") -> SimpleNamespace:
+  created = datetime(2026, 1, 1, tzinfo=UTC)
+  return SimpleNamespace(
+    job_id=job_id,
+    user_id="user-1",
+    job_kind="lesson",
+    status=status,
+    created_at=created,
+    updated_at=created,
+    root_job_id=job_id,
+    parent_job_id="parent-1",
+    superseded_by_job_id=None,
+    lesson_id=None,
+    section_id=None,
+    target_agent="planner",
+    phase="plan",
+    progress=40.0,
+    started_at=created,
+    completed_at=None,
+  )
+
+
+@pytest.mark.anyio
+async def test_list_child_jobs_projects_summary_columns_only() -> None:
+  session = FakeSession(rows=[_row("child-1"), _row("child-2", status="queued")])
+
+  children = await make_repo(PostgresJobsRepository, session).list_child_jobs(parent_job_id="parent-1")
+
+  (stmt,) = session.statements
+  sql = compile_sql(stmt)
+  assert "request_json" not in sql and "result_json" not in sql and "error_json" not in sql and "event_log_json" not in sql
+  assert "job_events" not in sql
+  assert all(isinstance(child, JobSummaryRecord) for child in children)
+  assert [(child.job_id, child.status) for child in children] == [("child-1", "running"), ("child-2", "queued")]
+  assert children[0].created_at == "2026-01-01T00:00:00Z"
+
+
+@pytest.mark.anyio
+async def test_list_jobs_issues_no_per_row_event_queries() -> None:
+  session = FakeSession(rows=[_row(f"job-{index}") for index in range(5)], scalar=12)
+
+  items, total = await make_repo(PostgresJobsRepository, session).list_jobs(page=1, limit=5, status="running")
+
+  assert total == 12
+  assert len(items) == 5
+  assert len(session.statements) == 2
+  for stmt in session.statements:
+    sql = compile_sql(stmt)
+    assert "request_json" not in sql and "result_json" not in sql and "job_events" not in sql
@@ -4,7 +4,7 @@ from dataclasses import replace
 
 import pytest
 from app.jobs.models import JobRecord
-from app.jobs.progress import JobProgressTracker, SectionProgress
+from app.jobs.progress import JobCanceledError, JobProgressTracker, SectionProgress
 
 
 class InMemoryJobsRepo:
@@ -12,8 +12,10 @@ class InMemoryJobsRepo:
 
   def __init__(self, record: JobRecord) -> None:
     self._record = record
+    self.updates: list[dict[str, object]] = []
+    self.status_reads = 0
 
-  async def create_job(self, record: JobRecord) -> None:
+  async def create_job(self, record: JobRecord, *, concurrency_limit: int | None = None) -> None:
     self._record = record
 
   async def get_job(self, job_id: str) -> JobRecord | None:
@@ -22,15 +24,20 @@ class InMemoryJobsRepo:
 
     return self._record
 
-  async def update_job(self, job_id: str, **kwargs: object) -> JobRecord | None:
-    if job_id != self._record.job_id:
+  async def get_job_status(self, job_id: str) -> str | None:
+    self.status_reads += 1
+    return self._record.status if job_id == self._record.job_id else None
+
+  async def update_job(self, job_id: str, *, expected_status: tuple[str, ...] | None = None, **kwargs: object) -> JobRecord | None:
+    if job_id != self._record.job_id or (expected_status is not None and self._record.status not in expected_status):
       return None
 
+    self.updates.append(kwargs)
     # Merge updates onto the latest record to mimic persistence behavior.
     self._record = replace(self._record, **{key: value for key, value in kwargs.items() if value is not None})
     return self._record
 
-  async def find_queued(self, limit: int = 5) -> list[JobRecord]:
+  async def claim_queued(self, limit: int = 5) -> list[JobRecord]:
     return []
 
   async def find_by_idempotency_key(self, idempotency_key: str) -> JobRecord | None:
@@ -61,3 +68,74 @@ async def test_job_progress_tracker_persists_partial_results() -> None:
   assert updated.current_section_status == "generating"
   assert updated.current_section_retry_count == 0
   assert updated.current_section_title == "Intro"
+
+
+def _running_record() -> JobRecord:
+  return JobRecord(job_id="job-123", job_kind="lesson", request={"topic": "Test"}, status="running", created_at="2024-01-01T00:00:00Z", updated_at="2024-01-01T00:00:00Z", logs=[], user_id=None, idempotency_key="progress-key")
+
+
+@pytest.mark.anyio
+async def test_job_progress_tracker_coalesces_writes_until_interval_or_phase_change() -> None:
+  repo = InMemoryJobsRepo(_running_record())
+  now = [0.0]
+  tracker = JobProgressTracker(job_id="job-123", jobs_repo=repo, total_steps=10, total_ai_calls=5, label_prefix="ai", initial_logs=["Picked up."], flush_interval_seconds=5.0, clock=lambda: now[0])
+
+  await tracker.set_phase(phase="building", subphase="start")
+  for step in range(3):
+    now[0] += 1.0
+    assert await tracker.complete_step(phase="building", subphase=f"step_{step}", message=f"Step {step} done.") is None
+  assert len(repo.updates) == 1
+  assert repo.status_reads == 3
+
+  # The interval elapsed: one write carries the latest progress and only the lines not yet persisted.
+  now[0] += 2.5
+  record = await tracker.complete_step(phase="building", subphase="step_3", message="Step 3 done.")
+  assert record is not None
+  assert repo.updates[0]["logs"] == ["Picked up."]
+  assert repo.updates[1]["logs"] == ["Step 0 done.", "Step 1 done.", "Step 2 done.", "Step 3 done."]
+  assert repo.updates[1]["subphase"] == "step_3"
+  assert repo.updates[1]["completed_steps"] == 4
+
+  # A phase change flushes immediately, and the worker's terminal write gets only the remaining lines.
+  await tracker.set_phase(phase="validate", subphase="validation")
+  assert len(repo.updates) == 3
+  assert "logs" not in repo.updates[2]
+  assert tracker.take_logs("Finished.") == ["Finished."]
+  assert tracker.logs[-1] == "Finished."
+
+
+@pytest.mark.anyio
+async def test_job_progress_tracker_detects_cancellation_between_flushes() -> None:
+  repo = InMemoryJobsRepo(_running_record())
+  tracker = JobProgressTracker(job_id="job-123", jobs_repo=repo, total_steps=4, total_ai_calls=2, label_prefix="ai", flush_interval_seconds=60.0, clock=lambda: 0.0)
+  await tracker.set_phase(phase="building")
+  await repo.update_job("job-123", status="canceled")
+
+  with pytest.raises(JobCanceledError):
+    await tracker.complete_ai_call(phase="building", message="Call done.")
+  assert len(repo.updates) == 2
+
+
+@pytest.mark.anyio
+async def test_job_progress_tracker_fail_flushes_pending_progress() -> None:
+  repo = InMemoryJobsRepo(_running_record())
+  tracker = JobProgressTracker(job_id="job-123", jobs_repo=repo, total_steps=4, total_ai_calls=2, label_prefix="ai", flush_interval_seconds=60.0, clock=lambda: 0.0)
+  await tracker.set_phase(phase="building")
+  await tracker.complete_step(phase="building", subphase="draft", message="Drafted.", result_json={"title": "Partial"})
+
+  await tracker.fail(phase="failed", message="Boom.")
+  assert repo.updates[-1]["status"] == "error"
+  assert repo.updates[-1]["result_json"] == {"title": "Partial"}
+  assert repo.updates[-1]["logs"] == ["Drafted.", "Boom."]
+
+
+@pytest.mark.anyio
+async def test_job_progress_tracker_does_not_overwrite_a_canceled_job() -> None:
+  repo = InMemoryJobsRepo(_running_record())
+  tracker = JobProgressTracker(job_id="job-123", jobs_repo=repo, total_steps=4, total_ai_calls=2, label_prefix="ai", clock=lambda: 0.0)
+  await tracker.set_phase(phase="building")
+  await repo.update_job("job-123", status="canceled")
+
+  with pytest.raises(JobCanceledError):
+    await tracker.set_phase(phase="validate")
+  assert (await repo.get_job("job-123")).status == "canceled"
@@ -0,0 +1,68 @@
+"""Unit tests for the single-statement partial job update."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from app.storage.jobs_repo import JobStatusSummary
+from app.storage.postgres_jobs_repo import PostgresJobsRepository
+from sqlalchemy.dialects import postgresql
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+def _returned(**overrides: Any) -> SimpleNamespace:
+  fields = {"job_id": "job-1", "user_id": "user-1", "status": "running", "lesson_id": None, "superseded_by_job_id": None, "target_agent": "planner", "previous_status": "running", "previous_target_agent": "planner"}
+  return SimpleNamespace(**{**fields, **overrides})
+
+
+@pytest.mark.anyio
+async def test_progress_update_sets_only_changed_columns_without_loading_the_row() -> None:
+  session = FakeSession(one=_returned())
+
+  record = await make_repo(PostgresJobsRepository, session).update_job("job-1", phase="building", subphase=None, progress=50.0, cost={"total": 1.0})
+
+  update_sql = compile_sql(session.statements[0])
+  assert update_sql.startswith("UPDATE jobs SET phase=")
+  assert "progress=" in update_sql and "cost_json=" in update_sql and "updated_at=" in update_sql
+  assert "subphase=" not in update_sql and "request_json=" not in update_sql and "status=" not in update_sql
+  assert "FOR UPDATE" not in update_sql
+  returning = update_sql.split("RETURNING", 1)[1]
+  assert returning.strip().startswith("jobs.job_id, jobs.user_id, jobs.status, jobs.lesson_id, jobs.superseded_by_job_id, jobs.target_agent")
+  for payload_column in ("request_json", "result_json", "error_json", "artifacts_json", "validation_json", "cost_json", "event_log_json"):
+    assert payload_column not in returning
+  assert record == JobStatusSummary(job_id="job-1", user_id="user-1", status="running", lesson_id=None, superseded_by_job_id=None)
+  # Nothing is read back after the commit: no event log snapshot rides along with the update.
+  assert len(session.statements) == 1
+  assert session.committed
+
+
+@pytest.mark.anyio
+async def test_status_update_honours_precondition_and_moves_the_active_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+  adjust = AsyncMock()
+  monkeypatch.setattr("app.storage.postgres_jobs_repo.adjust_active_job_count", adjust)
+  session = FakeSession(one=_returned(status="done"))
+
+  await make_repo(PostgresJobsRepository, session).update_job("job-1", expected_status=("running",), status="done", logs=["Finished."])
+
+  update_sql = compile_sql(session.statements[0])
+  assert update_sql.startswith("WITH previous AS (SELECT jobs.job_id AS job_id, jobs.status AS status, jobs.target_agent AS target_agent FROM jobs WHERE jobs.job_id = ")
+  assert "jobs.status IN (" in update_sql and "FOR UPDATE) UPDATE jobs SET status=" in update_sql
+  assert "FROM previous WHERE jobs.job_id = previous.job_id RETURNING" in update_sql
+  adjust.assert_awaited_once()
+  assert adjust.await_args.kwargs["delta"] == -1
+  insert_sql = compile_sql(session.statements[1])
+  assert insert_sql.startswith("INSERT INTO job_events")
+  assert session.statements[1].compile(dialect=postgresql.dialect()).params["message_m0"] == "Finished."
+
+
+@pytest.mark.anyio
+async def test_failed_precondition_returns_none_without_side_effects() -> None:
+  session = FakeSession()
+
+  assert await make_repo(PostgresJobsRepository, session).update_job("job-1", expected_status=("queued", "running"), status="running", logs=["Tick."]) is None
+  assert len(session.statements) == 1
+  assert not session.committed
@@ -0,0 +1,61 @@
+"""Regression corpus for the lenient LLM JSON parser."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from app.ai.json_parser import _repair_json_block, parse_json_with_fallback
+from app.ai.providers.base import AIModel
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "fixtures"
+
+RECOVERY_CORPUS: list[tuple[str, str, Any]] = [
+  ("valid_object", '{"a": 1, "b": [true, false, null]}', {"a": 1, "b": [True, False, None]}),
+  ("valid_array", '[1, 2, {"x": "y"}]', [1, 2, {"x": "y"}]),
+  ("surrounding_prose", 'Here is the JSON:\n{"section": "Intro", "items": []}\nHope this helps!', {"section": "Intro", "items": []}),
+  ("brace_inside_string", 'Note "quoted" text then {"a": "b}"} trailing } text', {"a": "b}"}),
+  ("trailing_commas", '{"a": [1, 2, 3,], "b": {"c": 1,},}', {"a": [1, 2, 3], "b": {"c": 1}}),
+  ("trailing_comma_whitespace", '{"a": [1, 2,\n  ]\n ,\n}', {"a": [1, 2]}),
+  ("bare_keys", '{section: "Intro", items: [{markdown: ["x"]}], snake_case: 1, dash-key: 2}', {"section": "Intro", "items": [{"markdown": ["x"]}], "snake_case": 1, "dash-key": 2}),
+  ("missing_commas_object", '{"a": 1 "b": "two" "c": [1 2 3] "d": {"e": null} "f": true}', {"a": 1, "b": "two", "c": [1, 2, 3], "d": {"e": None}, "f": True}),
+  ("missing_commas_array", '[{"a": 1} {"b": 2} "x" 1 -2 true false null [3]]', [{"a": 1}, {"b": 2}, "x", 1, -2, True, False, None, [3]]),
+  ("missing_commas_strings", '["one" "two" "three"]', ["one", "two", "three"]),
+  ("combined_defects", 'Sure!\n```json\n{section: "S", items: [{"flip": ["a" "b"]}, {"blank": ["x", "y",]} ], meta: {count: 2 "ok": true},}\n```', {"section": "S", "items": [{"flip": ["a", "b"]}, {"blank": ["x", "y"]}], "meta": {"count": 2, "ok": True}}),
+  ("escaped_quotes", '{"text": "He said \\"hi\\" and left" "next": "a\\\\"}', {"text": 'He said "hi" and left', "next": "a\\"}),
+  ("nested_trailing_comma", '{"a": {"b": {"c": [1, [2, [3, {"d": "e",}]]]}}}', {"a": {"b": {"c": [1, [2, [3, {"d": "e"}]]]}}}),
+  ("unicode", '{"title": "Résumé — 漢字", "emoji": "😀",}', {"title": "Résumé — 漢字", "emoji": "😀"}),
+  ("array_values_missing_commas", '{"a": [1] "b": [2]}', {"a": [1], "b": [2]}),
+  ("numbers", "[1.5e10 -0.25 3]", [15000000000.0, -0.25, 3]),
+  ("brackets_inside_strings", '{"code": "if (x) { return [1, 2]; }", "k": 1,}', {"code": "if (x) { return [1, 2]; }", "k": 1}),
+  # Recovered only by the single-pass scanner; the previous multi-pass repair rejected it.
+  ("bare_key_after_value", '{"a": 1 b: 2}', {"a": 1, "b": 2}),
+]
+
+
+@pytest.mark.parametrize(("name", "raw", "expected"), RECOVERY_CORPUS, ids=[case[0] for case in RECOVERY_CORPUS])
+def test_parse_json_with_fallback_recovers_corpus(name: str, raw: str, expected: Any) -> None:
+  """Each corpus entry parses to the expected value."""
+  assert parse_json_with_fallback(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["I cannot help with that.", '{"a": [1, 2', '{"a": "oops}', '{"a": 1 2}'])
+def test_parse_json_with_fallback_rejects_unrecoverable_payloads(raw: str) -> None:
+  """Payloads without a recoverable block still raise JSONDecodeError."""
+  with pytest.raises(json.JSONDecodeError):
+    parse_json_with_fallback(raw)
+
+
+@pytest.mark.parametrize("raw", ['{"a": [1, {"b": "c, ]"}], "d": null}', "[]", '{"nested": {"deep": [[], {}]}}'])
+def test_repair_leaves_valid_blocks_and_string_contents_untouched(raw: str) -> None:
+  """Valid JSON passes through the scanner byte-for-byte, including comma-bracket text in strings."""
+  assert _repair_json_block(f"prefix {raw} suffix") == raw
+
+
+@pytest.mark.parametrize("fixture_name", ["dummy_planner_response.md", "dummy_section_builder_response.md", "dummy_repairer_response.md", "dummy_outcomes_response.md"])
+def test_dummy_fixtures_parse(fixture_name: str) -> None:
+  """Dummy model fixtures stay parseable after fence stripping."""
+  raw = (FIXTURES_DIR / fixture_name).read_text(encoding="utf-8")
+  assert isinstance(parse_json_with_fallback(AIModel.strip_json_fences(raw)), dict)
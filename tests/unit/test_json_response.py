@@ -0,0 +1,143 @@
+"""Compatibility tests for the msgspec-backed default JSON response class."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from app.api.routes import admin, lessons
+from app.core.database import get_db
+from app.core.json import DecimalJSONResponse, MsgspecJSONResponse
+from app.core.security import get_current_active_user
+from app.main import app
+from app.schema.sql import RoleLevel, User, UserStatus
+from fastapi.testclient import TestClient
+
+# Representative payload shapes for the lesson, section, outline, job and admin list routes after FastAPI encoding.
+ENDPOINT_PAYLOADS: list[Any] = [
+  {"lesson_id": "les_123", "title": "Intro to Ümlauts — ∑ & 漢字", "sections": [{"section_id": 1, "title": "Basics", "status": "completed"}, {"section_id": 2, "title": "Next", "status": "pending"}]},
+  {"section_id": 7, "content": {"section": "Loops", "markdown": {"md": 'Line one\nLine "two"\t\\ end   <b>&</b>'}, "subsections": [{"section": "A", "items": [{"flip": ["front", "back"]}, {"mcqs": {"questions": []}}]}]}},
+  {"items": [{"id": index, "email": f"user{index}@example.com", "created_at": "2024-01-01T00:00:00+00:00", "is_active": index % 2 == 0, "score": index * 0.25} for index in range(50)], "total": 50, "limit": 50, "offset": 0},
+  {"job_id": "job_1", "status": "running", "progress": 42.5, "logs": ["a", "b"], "result": None, "cost": {"input_tokens": 1200, "output_tokens": 800, "total_cost": 0.0123}},
+  {"detail": [{"type": "value_error", "loc": ["body", "widgets", 0], "msg": "Value error"}], "request_id": str(uuid.UUID(int=1))},
+  [],
+  {},
+  "plain string",
+  12345678901234567890,
+]
+
+
+@pytest.mark.parametrize("payload", ENDPOINT_PAYLOADS)
+def test_msgspec_response_matches_legacy_encoder_byte_for_byte(payload: Any) -> None:
+  """Endpoint payloads render to identical bytes under both encoders."""
+  assert MsgspecJSONResponse(payload).body == DecimalJSONResponse(payload).body
+
+
+@pytest.mark.parametrize("payload", [{"cost": 3e-05}, {"big": 1e21}])
+def test_msgspec_response_exponent_floats_are_json_equivalent(payload: Any) -> None:
+  """Exponent floats may be spelled differently but parse to the same values."""
+  assert json.loads(MsgspecJSONResponse(payload).body) == json.loads(DecimalJSONResponse(payload).body)
+
+
+@pytest.mark.parametrize("payload", [{"amount": Decimal("1.50")}, {"credits": Decimal("2")}, {"whole": Decimal("2.0")}, {"rate": Decimal("0.125")}, {"scaled": [Decimal("1E+2")]}, {"nested": {"cost": (Decimal("0.5"),)}}])
+def test_msgspec_response_decimals_match_legacy_encoder_byte_for_byte(payload: Any) -> None:
+  """Decimals keep the legacy int-or-float spelling, including exponent and trailing-zero forms."""
+  assert MsgspecJSONResponse(payload).body == DecimalJSONResponse(payload).body
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf"), Decimal("NaN"), Decimal("Infinity"), Decimal("-Infinity")])
+def test_msgspec_response_rejects_non_finite_numbers(value: Any) -> None:
+  """Non-finite numbers raise like the legacy encoder instead of emitting invalid JSON or null."""
+  for payload in (value, {"score": value}, {"items": [{"scores": [1.0, value]}]}):
+    # The legacy Decimal conversion raises InvalidOperation for infinities and json raises ValueError for NaN.
+    with pytest.raises((ValueError, ArithmeticError)):
+      MsgspecJSONResponse(payload)
+
+
+def test_msgspec_response_encodes_datetime_and_uuid_natively() -> None:
+  """Raw datetimes and UUIDs no longer need a pre-encoding pass."""
+  identifier = uuid.UUID(int=5)
+  body = MsgspecJSONResponse({"at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC), "id": identifier}).body
+  assert body == b'{"at":"2024-01-02T03:04:05Z","id":"00000000-0000-0000-0000-000000000005"}'
+
+
+def test_msgspec_response_falls_back_for_unsupported_keys() -> None:
+  """Content msgspec rejects still renders through the stdlib encoder."""
+  assert MsgspecJSONResponse({True: 1}).body == b'{"true":1}'
+
+
+def test_msgspec_response_is_app_default() -> None:
+  """The application uses the msgspec response class unless a route overrides it."""
+  assert app.router.default_response_class is MsgspecJSONResponse
+
+
+@pytest.fixture
+def route_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple[TestClient, list[Any]]]:
+  """Client for real routes that records the content each response hands to the msgspec encoder."""
+  rendered: list[Any] = []
+  original_render = MsgspecJSONResponse.render
+
+  def _recording_render(self: MsgspecJSONResponse, content: Any) -> bytes:
+    rendered.append(content)
+    return original_render(self, content)
+
+  async def _no_db() -> Iterator[None]:
+    yield None
+
+  monkeypatch.setattr(MsgspecJSONResponse, "render", _recording_render)
+  app.dependency_overrides[get_current_active_user] = lambda: User(id=uuid.UUID(int=7), email="owner@example.com", status=UserStatus.APPROVED)
+  app.dependency_overrides[get_db] = _no_db
+  try:
+    yield TestClient(app), rendered
+  finally:
+    app.dependency_overrides.clear()
+
+
+def _lesson(lesson_id: str, title: str) -> SimpleNamespace:
+  plan = {"sections": [{"title": "Basics — ∑", "subsections": [{"title": "Ümlauts"}, {"title": 'Quotes "and" \\ slashes'}]}, {"title": "Next", "subsections": []}]}
+  return SimpleNamespace(lesson_id=lesson_id, topic="Loops & <b>tags</b>", title=title, created_at="2024-01-01T00:00:00+00:00", is_archived=False, lesson_plan=plan)
+
+
+class _LessonsRepo:
+  def __init__(self) -> None:
+    self._lessons = [_lesson(str(uuid.UUID(int=index)), f"Lesson 漢字 {index}") for index in range(1, 4)]
+
+  async def list_lessons(self, **_kwargs: Any) -> SimpleNamespace:
+    return SimpleNamespace(items=self._lessons, next_cursor=None)
+
+  async def get_lesson(self, lesson_id: str, *, user_id: str) -> SimpleNamespace | None:
+    return next((lesson for lesson in self._lessons if lesson.lesson_id == lesson_id), None)
+
+  async def list_section_summaries(self, lesson_ids: list[str]) -> dict[str, list[SimpleNamespace]]:
+    return {lesson_id: [SimpleNamespace(section_id=1, title="Basics\tone", status="completed"), SimpleNamespace(section_id=2, title="Next", status="pending")] for lesson_id in lesson_ids}
+
+
+async def _list_users(_db_session: Any, *, org_id: Any, filters: Any) -> tuple[list[tuple[User, str | None, str | None]], int]:
+  users = [User(id=uuid.UUID(int=index), email=f"user{index}@example.com", status=UserStatus.APPROVED, is_archived=index % 2 == 0, role_id=uuid.UUID(int=100), org_id=None) for index in range(1, 26)]
+  return [(user, "Admin", None) for user in users], 25
+
+
+@pytest.mark.parametrize("path", ["/v1/lessons", f"/v1/lessons/{uuid.UUID(int=2)}", f"/v1/lessons/{uuid.UUID(int=2)}/outline", "/admin/users?limit=25"])
+def test_route_payloads_match_legacy_encoder_byte_for_byte(route_client: tuple[TestClient, list[Any]], monkeypatch: pytest.MonkeyPatch, path: str) -> None:
+  """Lesson, outline and admin list responses built by the app render to identical bytes under both encoders."""
+  repo = _LessonsRepo()
+  monkeypatch.setattr(lessons, "_get_repo", lambda _settings: repo)
+  monkeypatch.setattr(admin, "check_tenant_permissions", lambda *_args, **_kwargs: _async_value(SimpleNamespace(level=RoleLevel.GLOBAL)))
+  monkeypatch.setattr(admin, "list_users", _list_users)
+  client, rendered = route_client
+
+  response = client.get(path)
+
+  assert response.status_code == 200, response.text
+  assert len(rendered) == 1
+  assert response.content == DecimalJSONResponse(rendered[0]).body
+
+
+async def _async_value(value: Any) -> Any:
+  return value
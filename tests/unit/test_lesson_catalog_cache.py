@@ -0,0 +1,83 @@
+"""Unit tests for the pre-encoded lesson catalog response."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.api.models import LessonCatalogResponse
+from app.api.routes.lessons import get_lesson_catalog
+from app.schema.lesson_catalog import build_lesson_catalog
+from app.services import lesson_catalog_cache
+from app.services.lesson_catalog_cache import get_lesson_catalog_entry, invalidate_lesson_catalog_cache
+from app.utils.etags import etag_matches
+from starlette.requests import Request
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+  raw_headers = [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (headers or {}).items()]
+  return Request({"type": "http", "method": "GET", "path": "/v1/lessons/catalog", "query_string": b"", "headers": raw_headers})
+
+
+@pytest.fixture(autouse=True)
+def _runtime_config(monkeypatch: pytest.MonkeyPatch) -> Iterator[AsyncMock]:
+  invalidate_lesson_catalog_cache()
+  resolver = AsyncMock(return_value={"lessons.cache_catalog": True})
+  monkeypatch.setattr(lesson_catalog_cache, "resolve_effective_runtime_config", resolver)
+  yield resolver
+  invalidate_lesson_catalog_cache()
+
+
+@pytest.mark.anyio
+async def test_catalog_is_encoded_once_and_reused(_runtime_config: AsyncMock) -> None:
+  """Repeat requests reuse the encoded bytes without resolving runtime config again."""
+  settings: Any = MagicMock()
+  first = await get_lesson_catalog_entry(AsyncMock(), settings=settings)
+  second = await get_lesson_catalog_entry(AsyncMock(), settings=settings)
+
+  assert second is first
+  assert _runtime_config.await_count == 1
+  assert first.body == LessonCatalogResponse(**build_lesson_catalog(settings)).model_dump_json().encode("utf-8")
+  assert first.cache_control == "public, max-age=86400"
+
+
+@pytest.mark.anyio
+async def test_invalidation_re_resolves_cache_headers(_runtime_config: AsyncMock) -> None:
+  """Admin config writes re-encode the catalog with the new cache policy."""
+  settings: Any = MagicMock()
+  first = await get_lesson_catalog_entry(AsyncMock(), settings=settings)
+
+  _runtime_config.return_value = {"lessons.cache_catalog": False}
+  invalidate_lesson_catalog_cache()
+  second = await get_lesson_catalog_entry(AsyncMock(), settings=settings)
+
+  assert second is not first
+  assert second.cache_control == "no-cache"
+  assert second.etag == first.etag
+
+
+@pytest.mark.anyio
+async def test_catalog_route_answers_matching_etag_with_304() -> None:
+  """Clients revalidating with the current ETag receive an empty 304."""
+  settings: Any = MagicMock()
+  full = await get_lesson_catalog(_request(), settings=settings, db_session=AsyncMock())
+  etag = full.headers["etag"]
+  assert full.status_code == 200
+  assert full.headers["cache-control"] == "public, max-age=86400"
+
+  revalidated = await get_lesson_catalog(_request({"If-None-Match": f'W/{etag}, "other"'}), settings=settings, db_session=AsyncMock())
+  assert revalidated.status_code == 304
+  assert revalidated.body == b""
+  assert revalidated.headers["etag"] == etag
+
+  stale = await get_lesson_catalog(_request({"If-None-Match": '"stale"'}), settings=settings, db_session=AsyncMock())
+  assert stale.status_code == 200
+
+
+def test_etag_matches_handles_lists_and_wildcards() -> None:
+  assert etag_matches('"a", "b"', '"b"')
+  assert etag_matches("*", '"b"')
+  assert not etag_matches(None, '"b"')
+  assert not etag_matches('"a"', '"b"')
@@ -0,0 +1,86 @@
+"""Unit tests for keyset-paged, plan-free lesson listings."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from app.storage.postgres_lessons_repo import PostgresLessonsRepository
+from sqlalchemy.dialects import postgresql
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+def _row(index: int) -> SimpleNamespace:
+  return SimpleNamespace(
+    lesson_id=f"lesson-{index}",
+    user_id="user-1",
+    topic="Vectors",
+    title=f"Lesson {index}",
+    created_at=f"2026-01-0{index}T00:00:00Z",
+    schema_version="1",
+    prompt_version="1",
+    provider_a="gemini",
+    model_a="a",
+    provider_b="gemini",
+    model_b="b",
+    status="completed",
+    latency_ms=10,
+    is_archived=False,
+    idempotency_key=None,
+    tags=None,
+    lesson_request_id=None,
+  )
+
+
+@pytest.mark.anyio
+async def test_cursor_pages_seek_on_sort_key_and_skip_lesson_plan() -> None:
+  session = FakeSession(rows=[_row(3), _row(2), _row(1)])
+  repo = make_repo(PostgresLessonsRepository, session)
+
+  first = await repo.list_lessons(limit=2, user_id="user-1", is_archived=False, total="none")
+
+  assert [item.lesson_id for item in first.items] == ["lesson-3", "lesson-2"]
+  assert first.total is None and first.next_cursor is not None
+  assert first.items[0].lesson_plan is None
+  (stmt,) = session.statements
+  sql = compile_sql(stmt)
+  assert "lesson_plan" not in sql and "OFFSET" not in sql
+  assert "ORDER BY lessons.created_at DESC, lessons.lesson_id DESC LIMIT" in sql
+  assert stmt.compile().params["param_1"] == 3
+
+  session.statements.clear()
+  await repo.list_lessons(limit=2, user_id="user-1", is_archived=False, cursor=first.next_cursor, total="none")
+  (stmt,) = session.statements
+  assert "(lessons.created_at, lessons.lesson_id) < (%(param_1)s::VARCHAR, %(param_2)s::VARCHAR)" in compile_sql(stmt)
+  params = stmt.compile().params
+  assert (params["param_1"], params["param_2"]) == ("2026-01-02T00:00:00Z", "lesson-2")
+
+
+@pytest.mark.anyio
+async def test_cursor_must_match_sort_key() -> None:
+  session = FakeSession(rows=[_row(2), _row(1)])
+  repo = make_repo(PostgresLessonsRepository, session)
+  page = await repo.list_lessons(limit=1, sort_by="title", sort_order="asc", total="none")
+
+  with pytest.raises(ValueError, match="sort"):
+    await repo.list_lessons(limit=1, sort_by="created_at", cursor=page.next_cursor, total="none")
+  with pytest.raises(ValueError, match="Invalid"):
+    await repo.list_lessons(limit=1, cursor="not-a-cursor", total="none")
+
+
+@pytest.mark.anyio
+async def test_totals_are_exact_or_estimated_from_the_plan() -> None:
+  session = FakeSession(rows=[_row(1)], scalar_one='[{"Plan": {"Plan Rows": 1234}}]', scalar=42)
+  repo = make_repo(PostgresLessonsRepository, session)
+
+  exact = await repo.list_lessons(limit=5, user_id="user-1")
+  estimated = await repo.list_lessons(limit=5, user_id="user-1", total="estimated")
+
+  assert exact.total == 42
+  assert estimated.total == 1234
+  assert exact.next_cursor is None
+  explain = session.statements[-1]
+  compiled = explain.compile(dialect=postgresql.dialect())
+  assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT lessons.lesson_id")
+  assert "user-1" in compiled.params.values()
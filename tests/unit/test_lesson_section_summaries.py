@@ -0,0 +1,33 @@
+"""Unit tests for the projected section summary query used by lesson reads."""
+
+from __future__ import annotations
+
+import pytest
+from app.storage.lessons_repo import SectionSummaryRecord
+from app.storage.postgres_lessons_repo import PostgresLessonsRepository
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+@pytest.mark.anyio
+async def test_section_summaries_never_select_content_columns() -> None:
+  session = FakeSession(rows=[(11, "lesson-a", "Intro", 0, "completed"), (12, "lesson-a", "Vectors", 1, "pending"), (21, "lesson-b", "Only", 0, "completed")])
+
+  summaries = await make_repo(PostgresLessonsRepository, session).list_section_summaries(["lesson-a", "lesson-b", "lesson-c"])
+
+  assert summaries["lesson-a"] == [SectionSummaryRecord(section_id=11, lesson_id="lesson-a", title="Intro", order_index=0, status="completed"), SectionSummaryRecord(section_id=12, lesson_id="lesson-a", title="Vectors", order_index=1, status="pending")]
+  assert [summary.section_id for summary in summaries["lesson-b"]] == [21]
+  assert summaries["lesson-c"] == []
+
+  (stmt,) = session.statements
+  selected = [column.name for column in stmt.selected_columns]
+  assert selected == ["section_id", "lesson_id", "title", "order_index", "status"]
+  sql = compile_sql(stmt)
+  assert "content" not in sql
+
+
+@pytest.mark.anyio
+async def test_section_summaries_skip_the_query_without_ids() -> None:
+  session = FakeSession()
+  assert await make_repo(PostgresLessonsRepository, session).list_section_summaries([]) == {}
+  assert session.statements == []
@@ -0,0 +1,166 @@
+"""Unit tests for the provider retry policy, driven by a fault-injecting fake transport."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+from app.ai.backoff import ErrorClass, RetryPolicy, call_with_retry, classify_error
+from app.ai.providers.gemini import GeminiModel
+from app.config import get_settings
+from google.genai import errors as genai_errors
+
+
+class FakeTransport:
+  """Stand-in for `client.aio.models.generate_content` that replays scripted faults, delays and responses."""
+
+  def __init__(self, script: list[Any]) -> None:
+    self._script = list(script)
+    self.calls = 0
+
+  async def generate_content(self, **_kwargs: Any) -> Any:
+    self.calls += 1
+    step = self._script.pop(0) if self._script else self._last
+    self._last = step
+    if isinstance(step, tuple):
+      delay, step = step
+      await asyncio.sleep(delay)
+    if isinstance(step, BaseException):
+      raise step
+    return SimpleNamespace(text=step, usage_metadata=None)
+
+
+class _Sleeps:
+  def __init__(self) -> None:
+    self.delays: list[float] = []
+
+  async def __call__(self, delay: float) -> None:
+    self.delays.append(delay)
+
+
+def _server_error(code: int) -> genai_errors.APIError:
+  return genai_errors.ServerError(code, {"error": {"message": "backend unavailable", "status": "UNAVAILABLE"}})
+
+
+def _model(transport: FakeTransport, policy: RetryPolicy) -> GeminiModel:
+  model = GeminiModel("gemini-2.5-flash", api_key="test-key", retry_policy=policy)
+  model._client = SimpleNamespace(aio=SimpleNamespace(models=transport))
+  return model
+
+
+@pytest.mark.parametrize(
+  ("exc", "expected"),
+  [
+    (_server_error(503), ErrorClass.TRANSIENT),
+    (genai_errors.ClientError(429, {"error": {"message": "slow down"}}), ErrorClass.RATE_LIMITED),
+    (genai_errors.ClientError(400, {"error": {"message": "bad schema"}}), ErrorClass.FATAL),
+    (httpx.ReadTimeout("read timed out"), ErrorClass.TRANSIENT),
+    (ConnectionResetError("connection reset by peer"), ErrorClass.TRANSIENT),
+    (RuntimeError("429 Too Many Requests"), ErrorClass.RATE_LIMITED),
+    (RuntimeError("429 Quota Exceeded for project"), ErrorClass.FATAL),
+    (ValueError("unexpected payload"), ErrorClass.FATAL),
+  ],
+)
+def test_classify_error(exc: BaseException, expected: ErrorClass) -> None:
+  assert classify_error(exc) is expected
+
+
+@pytest.mark.anyio
+async def test_transient_faults_are_retried_with_jittered_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.delenv("DYLEN_USE_DUMMY_SECTION_BUILDER_RESPONSE", raising=False)
+  transport = FakeTransport([_server_error(503), httpx.ConnectError("connection reset"), "hello"])
+  sleeps = _Sleeps()
+  policy = RetryPolicy(max_attempts=4, base_delay_seconds=0.5, max_delay_seconds=8.0)
+
+  result = await call_with_retry(transport.generate_content, policy=policy, sleep=sleeps, rng=random.Random(7), model="m", contents="hi")
+
+  assert result.text == "hello"
+  assert transport.calls == 3
+  assert len(sleeps.delays) == 2
+  assert 0.0 <= sleeps.delays[0] <= 0.5 and 0.0 <= sleeps.delays[1] <= 1.0
+
+
+@pytest.mark.anyio
+async def test_fatal_errors_and_exhausted_attempts_raise() -> None:
+  fatal = FakeTransport([genai_errors.ClientError(400, {"error": {"message": "bad schema"}}), "unused"])
+  with pytest.raises(genai_errors.ClientError):
+    await call_with_retry(fatal.generate_content, policy=RetryPolicy(), sleep=_Sleeps())
+  assert fatal.calls == 1
+
+  flaky = FakeTransport([_server_error(500)])
+  with pytest.raises(genai_errors.ServerError):
+    await call_with_retry(flaky.generate_content, policy=RetryPolicy(max_attempts=3), sleep=_Sleeps())
+  assert flaky.calls == 3
+
+
+@pytest.mark.anyio
+async def test_deadline_bounds_slow_attempts() -> None:
+  """A hung attempt is cut off at the remaining budget instead of stalling the job."""
+  transport = FakeTransport([(5.0, "too late")])
+  with pytest.raises(TimeoutError):
+    await call_with_retry(transport.generate_content, policy=RetryPolicy(deadline_seconds=0.05, max_attempts=5), sleep=_Sleeps())
+
+
+@pytest.mark.anyio
+async def test_backoff_never_sleeps_past_the_deadline() -> None:
+  now = [0.0]
+  transport = FakeTransport([_server_error(503)])
+  policy = RetryPolicy(max_attempts=10, base_delay_seconds=4.0, max_delay_seconds=4.0, deadline_seconds=5.0)
+
+  async def _advance(delay: float) -> None:
+    now[0] += delay
+
+  with pytest.raises(genai_errors.ServerError):
+    await call_with_retry(transport.generate_content, policy=policy, sleep=_advance, clock=lambda: now[0], rng=random.Random(0))
+  assert now[0] < policy.deadline_seconds
+
+
+@pytest.mark.anyio
+async def test_hedged_request_wins_when_primary_stalls(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.delenv("DYLEN_USE_DUMMY_SECTION_BUILDER_RESPONSE", raising=False)
+  transport = FakeTransport([(1.0, "slow"), (0.0, "fast")])
+  model = _model(transport, RetryPolicy(hedge_after_seconds=0.02, deadline_seconds=5.0))
+
+  response = await asyncio.wait_for(model.generate("short prompt"), timeout=0.5)
+
+  assert response.content == "fast"
+  assert transport.calls == 2
+
+
+@pytest.mark.anyio
+async def test_long_prompts_are_not_hedged(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.delenv("DYLEN_USE_DUMMY_SECTION_BUILDER_RESPONSE", raising=False)
+  transport = FakeTransport([(0.05, "only")])
+  model = _model(transport, RetryPolicy(hedge_after_seconds=0.01, hedge_max_prompt_chars=10))
+
+  response = await model.generate("x" * 50)
+
+  assert response.content == "only"
+  assert transport.calls == 1
+
+
+@pytest.mark.anyio
+async def test_default_policy_has_no_deadline() -> None:
+  """Slow but valid calls are not cut off unless a deadline is configured."""
+  transport = FakeTransport([(0.05, "slow but fine")])
+  policy = RetryPolicy()
+  assert policy.deadline_seconds is None
+  response = await call_with_retry(transport.generate_content, policy=policy, sleep=_Sleeps())
+  assert response.text == "slow but fine"
+
+
+@pytest.mark.parametrize(("raw", "expected"), [(None, None), ("", None), ("300", 300.0)])
+def test_retry_deadline_setting_is_opt_in(monkeypatch: pytest.MonkeyPatch, raw: str | None, expected: float | None) -> None:
+  if raw is None:
+    monkeypatch.delenv("DYLEN_LLM_RETRY_DEADLINE_SECONDS", raising=False)
+  else:
+    monkeypatch.setenv("DYLEN_LLM_RETRY_DEADLINE_SECONDS", raw)
+  get_settings.cache_clear()
+  try:
+    assert get_settings().llm_retry_deadline_seconds == expected
+  finally:
+    get_settings.cache_clear()
@@ -0,0 +1,86 @@
+"""Unit tests for the structured LLM response cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from app.ai import response_cache
+from app.ai.providers.gemini import GeminiModel
+from app.ai.response_cache import InMemoryResponseCache, ResponseCache, response_cache_for_agent, structured_cache_key
+
+_SCHEMA = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+
+def _gemini_model(monkeypatch: pytest.MonkeyPatch, raw_text: str) -> tuple[GeminiModel, AsyncMock]:
+  monkeypatch.delenv("DYLEN_USE_DUMMY_SECTION_BUILDER_RESPONSE", raising=False)
+  model = GeminiModel("gemini-2.5-flash", api_key="test-key")
+  generate_content = AsyncMock(return_value=SimpleNamespace(text=raw_text, usage_metadata=SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)))
+  model._client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+  return model, generate_content
+
+
+def test_cache_key_covers_model_prompt_schema_and_config() -> None:
+  base = {"model": "m", "prompt": "p", "schema": _SCHEMA, "generation_config": {"response_mime_type": "application/json"}}
+  key = structured_cache_key(**base)
+
+  assert key == structured_cache_key(**{**base, "schema": dict(reversed(list(_SCHEMA.items())))})
+  assert key != structured_cache_key(**{**base, "model": "other"})
+  assert key != structured_cache_key(**{**base, "prompt": "p2"})
+  assert key != structured_cache_key(**{**base, "schema": {"type": "object"}})
+  assert key != structured_cache_key(**{**base, "generation_config": {"response_mime_type": "text/plain"}})
+
+
+@pytest.mark.anyio
+async def test_in_memory_backend_evicts_lru_and_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+  now = [100.0]
+  monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+  backend = InMemoryResponseCache(max_entries=2)
+  await backend.set("a", model="m", content={"v": 1}, ttl_seconds=10)
+  await backend.set("b", model="m", content={"v": 2}, ttl_seconds=10)
+  assert await backend.get("a") == {"v": 1}
+  await backend.set("c", model="m", content={"v": 3}, ttl_seconds=10)
+
+  assert await backend.get("b") is None
+  cached = await backend.get("a")
+  assert cached == {"v": 1}
+  cached["v"] = 99
+  assert await backend.get("a") == {"v": 1}
+
+  now[0] = 111.0
+  assert await backend.get("c") is None
+
+
+@pytest.mark.anyio
+async def test_generate_structured_replays_cached_response(monkeypatch: pytest.MonkeyPatch) -> None:
+  """A repeated request is served without a provider call and reports a hit with no billable usage."""
+  model, generate_content = _gemini_model(monkeypatch, '{"title": "Vectors"}')
+  model.response_cache = ResponseCache(InMemoryResponseCache(max_entries=4), ttl_seconds=60)
+
+  first = await model.generate_structured("prompt", _SCHEMA)
+  assert model.last_cache_status == "miss"
+  assert first.usage == {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+  second = await model.generate_structured("prompt", _SCHEMA)
+  assert model.last_cache_status == "hit"
+  assert second.content == {"title": "Vectors"}
+  assert second.usage is None
+  assert generate_content.await_count == 1
+
+
+@pytest.mark.anyio
+async def test_invalid_json_is_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+  model, generate_content = _gemini_model(monkeypatch, "not json at all")
+  model.response_cache = ResponseCache(InMemoryResponseCache(max_entries=4), ttl_seconds=60)
+
+  for _ in range(2):
+    with pytest.raises(RuntimeError):
+      await model.generate_structured("prompt", _SCHEMA)
+  assert generate_content.await_count == 2
+
+
+def test_cache_is_opt_in_per_agent() -> None:
+  assert response_cache_for_agent({}, "section_builder") is None
+  assert response_cache_for_agent({"ai.response_cache.agents": ["planner"]}, "section_builder") is None
+  assert response_cache_for_agent({"ai.response_cache.agents": ["planner", "section_builder"]}, "section_builder") is not None
@@ -0,0 +1,34 @@
+"""Unit tests for the admin routes that queue scheduled maintenance jobs."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.api.routes import admin
+from app.schema.sql import User
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+  ("route", "action"),
+  [(admin.trigger_archive_lessons, "archive_old_lessons"), (admin.trigger_reconcile_job_counters, "reconcile_job_counters"), (admin.trigger_compact_job_events, "compact_job_events"), (admin.trigger_purge_llm_response_cache, "purge_llm_response_cache")],
+)
+async def test_maintenance_trigger_queues_a_job_for_its_action(monkeypatch: pytest.MonkeyPatch, route: Callable[..., Awaitable[Any]], action: str) -> None:
+  repo = MagicMock()
+  repo.create_job = AsyncMock()
+  trigger = MagicMock()
+  monkeypatch.setattr(admin, "get_jobs_repo", lambda: repo)
+  monkeypatch.setattr(admin, "trigger_job_processing", trigger)
+  background_tasks = MagicMock()
+  settings = MagicMock()
+
+  response = await route(background_tasks, current_user=User(id="admin-1"), settings=settings)
+
+  (record,) = repo.create_job.await_args.args
+  assert record.job_kind == "maintenance" and record.target_agent == "maintenance" and record.status == "queued"
+  assert record.request["action"] == action
+  assert response.job_id == record.job_id
+  trigger.assert_called_once_with(background_tasks, record.job_id, settings, auto_process=True)
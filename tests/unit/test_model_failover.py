@@ -0,0 +1,162 @@
+"""Unit tests for multi-model failover and per-candidate circuit breakers in the AI router."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from app.ai import router
+from app.ai.circuit_breaker import BreakerPolicy, CircuitBreaker, CircuitBreakerRegistry, CircuitState
+from app.ai.providers.base import AIModel, Provider, SimpleModelResponse
+from app.ai.router import FallbackModel, ModelCandidate, get_model_for_mode, model_fallbacks_for_agent
+from app.services.runtime_config import _validate_value, get_runtime_config_definition
+
+
+class _ScriptedModel(AIModel):
+  def __init__(self, name: str, outcomes: list[Any]) -> None:
+    self.name = name
+    self.supports_structured_output = True
+    self._outcomes = outcomes
+    self.calls = 0
+
+  async def generate(self, prompt: str) -> SimpleModelResponse:
+    self.calls += 1
+    outcome = self._outcomes[min(self.calls - 1, len(self._outcomes) - 1)]
+    if isinstance(outcome, BaseException):
+      raise outcome
+    return SimpleModelResponse(content=outcome)
+
+  async def generate_structured(self, prompt: str, schema: dict[str, Any]) -> Any:
+    raise NotImplementedError
+
+
+class _Provider(Provider):
+  def __init__(self, name: str, models: dict[str, _ScriptedModel]) -> None:
+    self.name = name
+    self._models = models
+
+  def get_model(self, model: str | None = None) -> AIModel:
+    return self._models[model or ""]
+
+
+@pytest.fixture(autouse=True)
+def _no_audit(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.setattr(router, "instrument_model", lambda model, _provider: model)
+
+
+def _registry(now: list[float], **policy: Any) -> CircuitBreakerRegistry:
+  return CircuitBreakerRegistry(BreakerPolicy(**{"min_calls": 2, "error_rate": 0.5, "cooldown_seconds": 30.0, **policy}), clock=lambda: now[0])
+
+
+def _fallback(primary: _ScriptedModel, backup: _ScriptedModel, registry: CircuitBreakerRegistry) -> FallbackModel:
+  provider = _Provider("gemini", {"primary": primary, "backup": backup})
+  candidates = [ModelCandidate(provider_name="gemini", model="primary"), ModelCandidate(provider_name="gemini", model="backup")]
+  return FallbackModel(provider=provider, provider_name="gemini", candidates=candidates, breakers=registry)
+
+
+def test_breaker_opens_on_error_rate_and_probes_after_cooldown() -> None:
+  now = [0.0]
+  breaker = CircuitBreaker(BreakerPolicy(min_calls=4, error_rate=0.5, cooldown_seconds=10.0), clock=lambda: now[0])
+  breaker.record_success(0.1)
+  breaker.record_failure()
+  breaker.record_success(0.1)
+  assert breaker.state is CircuitState.CLOSED
+  breaker.record_failure()
+  assert breaker.state is CircuitState.OPEN
+  assert not breaker.allow_request()
+
+  now[0] = 10.0
+  assert breaker.state is CircuitState.HALF_OPEN
+  assert breaker.allow_request()
+  assert not breaker.allow_request()
+  breaker.record_success(0.1)
+  assert breaker.state is CircuitState.CLOSED
+
+
+def test_slow_calls_open_the_breaker() -> None:
+  breaker = CircuitBreaker(BreakerPolicy(min_calls=2, error_rate=0.5, slow_call_seconds=5.0))
+  breaker.record_success(0.2)
+  breaker.record_success(9.0)
+  assert breaker.state is CircuitState.OPEN
+
+
+@pytest.mark.anyio
+async def test_fails_over_then_skips_open_candidate() -> None:
+  now = [0.0]
+  registry = _registry(now)
+  primary = _ScriptedModel("primary", [RuntimeError("503 Service Unavailable")])
+  backup = _ScriptedModel("backup", ["from backup"])
+  model = _fallback(primary, backup, registry)
+
+  for _ in range(2):
+    response = await model.generate("hi")
+    assert response.content == "from backup"
+  assert model.name == "backup"
+  assert registry.breaker_for("gemini/primary").state is CircuitState.OPEN
+
+  await model.generate("hi")
+  assert primary.calls == 2
+  snapshot = registry.snapshot()
+  assert snapshot["failovers"] == 2
+  assert snapshot["candidates"]["gemini/primary"]["skipped_open"] == 1
+  assert snapshot["candidates"]["gemini/backup"]["calls"] == 3
+
+
+@pytest.mark.anyio
+async def test_output_errors_do_not_fail_over() -> None:
+  registry = _registry([0.0])
+  primary = _ScriptedModel("primary", [ValueError("Invalid JSON in response")])
+  backup = _ScriptedModel("backup", ["unused"])
+  model = _fallback(primary, backup, registry)
+
+  with pytest.raises(ValueError):
+    await model.generate("hi")
+  assert backup.calls == 0
+  assert registry.breaker_for("gemini/primary").snapshot()["window_failures"] == 0
+
+
+@pytest.mark.parametrize("error", [RuntimeError("Gemini returned invalid JSON: Expecting value: line 1 column 1 (char 0)"), ValueError("Gemini structured output must be a JSON object, got list.")])
+@pytest.mark.anyio
+async def test_provider_output_errors_do_not_fail_over_or_trip_the_breaker(error: Exception) -> None:
+  registry = _registry([0.0], min_calls=1)
+  primary = _ScriptedModel("primary", [error])
+  backup = _ScriptedModel("backup", ["unused"])
+  model = _fallback(primary, backup, registry)
+
+  for _ in range(3):
+    with pytest.raises(type(error)):
+      await model.generate("hi")
+  assert backup.calls == 0
+  assert registry.breaker_for("gemini/primary").state is CircuitState.CLOSED
+  assert registry.snapshot()["failovers"] == 0
+
+
+@pytest.mark.anyio
+async def test_primary_is_tried_when_every_circuit_is_open() -> None:
+  registry = _registry([0.0], min_calls=1)
+  primary = _ScriptedModel("primary", [RuntimeError("503 Service Unavailable"), "recovered"])
+  backup = _ScriptedModel("backup", [RuntimeError("504 Gateway Timeout")])
+  model = _fallback(primary, backup, registry)
+
+  with pytest.raises(RuntimeError, match="504"):
+    await model.generate("hi")
+  assert registry.snapshot()["exhausted"] == 1
+
+  response = await model.generate("hi")
+  assert response.content == "recovered"
+
+
+def test_fallbacks_come_from_runtime_config(monkeypatch: pytest.MonkeyPatch) -> None:
+  definition = get_runtime_config_definition("ai.model_failover")
+  runtime_config = {"ai.model_failover": _validate_value(definition, {"Planner": [" vertexai/vertex-gemini-2.5-pro ", "gemini-2.5-pro"]})}
+  with pytest.raises(ValueError):
+    _validate_value(definition, {"planner": "gemini-2.5-pro"})
+
+  fallbacks = model_fallbacks_for_agent(runtime_config, "planner")
+  assert fallbacks == ["vertexai/vertex-gemini-2.5-pro", "gemini-2.5-pro"]
+  assert model_fallbacks_for_agent(runtime_config, "repairer") == []
+
+  monkeypatch.setattr(router, "get_provider_for_mode", lambda mode: _Provider(str(mode), {}))
+  monkeypatch.setattr(FallbackModel, "_client_for", lambda self, candidate: None)
+  model = get_model_for_mode("gemini", "gemini-2.5-flash", agent="planner", fallbacks=fallbacks + ["gemini/gemini-2.5-flash"])
+  assert [candidate.key for candidate in model._candidates] == ["gemini/gemini-2.5-flash", "vertexai/vertex-gemini-2.5-pro", "gemini/gemini-2.5-pro"]
@@ -0,0 +1,65 @@
+"""Unit tests for precompiled prompt templates."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from app.ai.agents import prompts
+from app.ai.agents.prompts import PLANNER_PLACEHOLDERS, REPAIR_TOKENS, load_prompt_template, render_planner_prompt, render_section_builder_prompt
+from app.ai.pipeline.contracts import GenerationRequest, PlanSection
+
+_PROMPTS_DIR = Path(prompts.__file__).parents[1] / "prompts"
+
+
+def _sequential_replace(template: str, values: dict[str, str], marker: str) -> str:
+  rendered = template
+  for key, value in values.items():
+    rendered = rendered.replace(marker.format(key=key), value)
+  return rendered
+
+
+@pytest.mark.parametrize("name", sorted(path.name for path in _PROMPTS_DIR.glob("planner_*.md")))
+def test_every_planner_prompt_compiles_against_planner_placeholders(name: str) -> None:
+  template = load_prompt_template(name, PLANNER_PLACEHOLDERS)
+  assert set(template.slots) == PLANNER_PLACEHOLDERS
+  assert len(template.segments) == len(template.slots) + 1
+
+
+def test_planner_render_matches_sequential_replacement() -> None:
+  """Single-join rendering yields the same prompt the per-key replace loop produced."""
+  request = GenerationRequest(topic="Fractions", depth="highlights", section_count=2, blueprint="Skill Building", widgets=["quiz"], outcomes=["Add fractions"])
+  rendered = render_planner_prompt(request)
+
+  template_text = prompts._load_prompt("planner_skill_building.md")
+  assert "{{" not in rendered
+  assert rendered.startswith(template_text[: template_text.index("{{")])
+  assert "Fractions" in rendered and "- Add fractions" in rendered and "quiz, markdown" in rendered
+
+
+def test_section_builder_render_matches_token_replacement_and_is_single_pass() -> None:
+  """Bare tokens are filled once, so values that contain another token stay untouched."""
+  request = GenerationRequest(topic="Fractions", depth="DEPTH deep", section_count=1, blueprint="BLUEPRINT Skill", learner_level="Beginner")
+  section = PlanSection(section_number=1, title="Intro", subsections=[], goals="Learn", continuity_note="-")
+  rendered = render_section_builder_prompt(request, section, "1")
+
+  assert "Depth:** `DEPTH deep`" in rendered
+  assert "Context:** `BLUEPRINT Skill`" in rendered
+  assert "PLANNER_SECTION_JSON" not in rendered
+
+  values = {"FAILED_ITEMS_JSON": "[]", "ERRORS": "- bad"}
+  expected = _sequential_replace(prompts._load_prompt("repair.md"), values, "{key}")
+  assert load_prompt_template("repair.md", REPAIR_TOKENS, bare_tokens=True).render(values) == expected
+
+
+def test_placeholder_mismatches_fail_at_load_time() -> None:
+  with pytest.raises(RuntimeError, match="unknown=\\['TOPIC'\\]"):
+    load_prompt_template("planner_coding.md", PLANNER_PLACEHOLDERS - {"TOPIC"})
+  with pytest.raises(RuntimeError, match="missing=\\['EXTRA'\\]"):
+    load_prompt_template("repair.md", REPAIR_TOKENS | {"EXTRA"}, bare_tokens=True)
+
+
+def test_render_rejects_values_that_do_not_match_slots() -> None:
+  template = load_prompt_template("repair.md", REPAIR_TOKENS, bare_tokens=True)
+  with pytest.raises(ValueError, match="missing=\\['ERRORS'\\]"):
+    template.render({"FAILED_ITEMS_JSON": "[]"})
@@ -0,0 +1,125 @@
+"""Unit tests for opt-in, streaming-safe request body logging."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import Any
+
+import pytest
+from app.config import get_settings
+from app.core import middleware
+from app.core.middleware import RequestLoggingMiddleware, _BodyCapture, _should_capture_bodies
+
+
+def _settings(**overrides: Any) -> Any:
+  return dataclasses.replace(get_settings(), **overrides)
+
+
+def _scope(path: str, content_type: str) -> dict[str, Any]:
+  return {"type": "http", "method": "POST", "path": path, "query_string": b"", "headers": [(b"content-type", content_type.encode("latin-1"))]}
+
+
+async def _echo_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+  received: list[bytes] = []
+  more_body = True
+  while more_body:
+    message = await receive()
+    received.append(message.get("body", b""))
+    more_body = message.get("more_body", False)
+
+  await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+  await send({"type": "http.response.body", "body": b"".join(received)})
+
+
+def _chunked_receive(chunks: list[bytes]) -> Any:
+  messages = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1} for index, chunk in enumerate(chunks)]
+
+  async def receive() -> dict[str, Any]:
+    return messages.pop(0)
+
+  return receive
+
+
+def test_body_capture_is_opt_in_per_route_and_excludes_binary_routes() -> None:
+  """Only configured prefixes capture bodies, and media/tutor/OCR routes never do."""
+  settings = _settings(log_http_bodies=True, log_http_body_paths=("/v1/lessons",), log_http_body_sample_rate=1.0)
+  assert _should_capture_bodies("/v1/lessons/abc", settings)
+  assert not _should_capture_bodies("/v1/lessonsx", settings)
+  assert not _should_capture_bodies("/admin/users", settings)
+
+  broad = _settings(log_http_bodies=True, log_http_body_paths=("/",), log_http_body_sample_rate=1.0)
+  assert _should_capture_bodies("/admin/users", broad)
+  assert not _should_capture_bodies("/media/lessons/1/2.webp", broad)
+  assert not _should_capture_bodies("/v1/tutor/1/content", broad)
+  assert not _should_capture_bodies("/resource/image/extract-text", broad)
+
+  assert not _should_capture_bodies("/admin/users", _settings(log_http_bodies=False, log_http_body_paths=("/",)))
+  assert not _should_capture_bodies("/admin/users", _settings(log_http_bodies=True, log_http_body_paths=("/",), log_http_body_sample_rate=0.0))
+
+
+def test_body_capture_keeps_only_capped_prefix() -> None:
+  """The capture buffer never grows beyond the configured cap."""
+  capture = _BodyCapture(4)
+  capture.feed(b"ab")
+  capture.feed(b"cdef")
+  capture.feed(b"gh")
+  assert capture.body == b"abcd"
+  assert capture.size == 4
+  assert capture.truncated
+
+
+@pytest.mark.anyio
+async def test_disabled_capture_passes_receive_through(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Requests outside the opt-in set see the original receive callable."""
+  monkeypatch.setattr(middleware, "get_settings", lambda: _settings(log_http_bodies=True, log_http_body_paths=("/v1/lessons",)))
+  original_receive = _chunked_receive([b"{}"])
+  seen: dict[str, Any] = {}
+
+  async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    seen["receive"] = receive
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+
+  sent: list[dict[str, Any]] = []
+
+  async def send(message: dict[str, Any]) -> None:
+    sent.append(message)
+
+  await RequestLoggingMiddleware(app)(_scope("/admin/users", "application/json"), original_receive, send)
+  assert seen["receive"] is original_receive
+  assert dict(sent[0]["headers"]).get(b"x-request-id")
+
+
+@pytest.mark.anyio
+async def test_chunked_request_streams_through_and_logs_capped_body(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+  """Handlers receive every chunk unchanged while logs only hold the capped prefix."""
+  monkeypatch.setattr(middleware, "get_settings", lambda: _settings(log_http_bodies=True, log_http_body_paths=("/v1/lessons",), log_http_body_bytes=8, log_http_body_sample_rate=1.0))
+  chunks = [b'{"topic": ', b'"streams", ', b'"depth": 3}']
+  sent: list[dict[str, Any]] = []
+
+  async def send(message: dict[str, Any]) -> None:
+    sent.append(message)
+
+  with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+    await RequestLoggingMiddleware(_echo_app)(_scope("/v1/lessons/generate", "application/json"), _chunked_receive(chunks), send)
+
+  assert sent[1]["body"] == b"".join(chunks)
+  request_logs = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Request body")]
+  assert request_logs == [f'Request body request_id={dict(sent[0]["headers"])[b"x-request-id"].decode()} body={{"topic"...(truncated)']
+  response_logs = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Response body")]
+  assert len(response_logs) == 1
+  assert response_logs[0].endswith("...(truncated)")
+
+
+@pytest.mark.anyio
+async def test_multipart_uploads_are_not_captured(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+  """Binary uploads pass through without being teed into the log buffer."""
+  monkeypatch.setattr(middleware, "get_settings", lambda: _settings(log_http_bodies=True, log_http_body_paths=("/",), log_http_body_sample_rate=1.0))
+
+  async def send(message: dict[str, Any]) -> None:
+    return None
+
+  with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+    await RequestLoggingMiddleware(_echo_app)(_scope("/v1/writing/upload", "multipart/form-data; boundary=x"), _chunked_receive([b"\x00\x01", b"\x02"]), send)
+
+  assert not [record for record in caplog.records if record.getMessage().startswith("Request body")]
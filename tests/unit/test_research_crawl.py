@@ -0,0 +1,78 @@
+"""Unit tests for concurrent research crawling with stub DNS resolution and page fetching."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.ai.agents.research import ResearchAgent
+
+
+class StubResolver:
+  """Resolve hostnames from a fixed table, counting lookups per host."""
+
+  def __init__(self, table: dict[str, list[str]]) -> None:
+    self._table = table
+    self.lookups: dict[str, int] = {}
+
+  async def __call__(self, hostname: str) -> list[str]:
+    self.lookups[hostname] = self.lookups.get(hostname, 0) + 1
+    await asyncio.sleep(0)
+    if hostname not in self._table:
+      raise OSError(f"unknown host {hostname}")
+    return self._table[hostname]
+
+
+class StubFetcher:
+  """Return canned pages after a per-URL delay, tracking peak concurrency."""
+
+  def __init__(self, delays: dict[str, float], *, failing: frozenset[str] = frozenset()) -> None:
+    self._delays = delays
+    self._failing = failing
+    self.in_flight = 0
+    self.max_in_flight = 0
+
+  async def __call__(self, url: str) -> dict[str, Any] | None:
+    self.in_flight += 1
+    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    try:
+      await asyncio.sleep(self._delays.get(url, 0.01))
+      if url in self._failing:
+        raise RuntimeError("tavily unavailable")
+      return {"url": url, "markdown": f"content of {url}", "title": url}
+    finally:
+      self.in_flight -= 1
+
+
+def _agent(resolver: StubResolver, fetcher: StubFetcher, **kwargs: Any) -> ResearchAgent:
+  with patch("app.ai.agents.research.get_settings", return_value=MagicMock(gemini_api_key="k", research_search_max_results=5)), patch("app.ai.agents.research.GeminiProvider"), patch("app.ai.agents.research.TavilyProvider"):
+    return ResearchAgent(resolver=resolver, fetcher=fetcher, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_crawl_is_concurrent_bounded_and_ordered() -> None:
+  urls = [f"https://docs.example.com/page{index}" for index in range(8)]
+  resolver = StubResolver({"docs.example.com": ["93.184.216.34"]})
+  fetcher = StubFetcher({url: 0.05 for url in urls})
+
+  started = asyncio.get_running_loop().time()
+  results = await _agent(resolver, fetcher, crawl_concurrency=4)._crawl_urls(urls)
+  elapsed = asyncio.get_running_loop().time() - started
+
+  assert [result["url"] for result in results] == urls
+  assert fetcher.max_in_flight == 4
+  assert elapsed < 0.05 * len(urls) / 2
+  assert resolver.lookups == {"docs.example.com": 1}
+
+
+@pytest.mark.anyio
+async def test_unsafe_failed_and_slow_urls_are_dropped() -> None:
+  resolver = StubResolver({"public.example.com": ["93.184.216.34"], "internal.example.com": ["10.0.0.7"], "mixed.example.com": ["93.184.216.34", "127.0.0.1"]})
+  urls = ["https://public.example.com/ok", "https://internal.example.com/admin", "https://mixed.example.com/", "https://unresolvable.example.com/", "ftp://public.example.com/file", "https://public.example.com/broken", "https://public.example.com/slow"]
+  fetcher = StubFetcher({"https://public.example.com/slow": 5.0}, failing=frozenset({"https://public.example.com/broken"}))
+
+  results = await _agent(resolver, fetcher, crawl_timeout_seconds=0.1)._crawl_urls(urls)
+
+  assert [result["url"] for result in results] == ["https://public.example.com/ok"]
@@ -0,0 +1,79 @@
+"""Unit tests for cached section encryption."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+
+import pytest
+from app.services import section_crypto
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> None:
+  section_crypto.clear_section_crypto_caches()
+
+
+def _decrypt(token: str, firebase_uid: str) -> dict:
+  raw = base64.urlsafe_b64decode(token)
+  key = hashlib.sha256(firebase_uid.encode("utf-8")).digest()
+  return json.loads(AESGCM(key).decrypt(raw[:12], raw[12:], None))
+
+
+@pytest.mark.anyio
+async def test_encrypted_section_round_trips_with_uid_derived_key() -> None:
+  """The wire format stays nonce + AES-GCM ciphertext under the sha256(uid) key."""
+  plaintext = section_crypto.encode_section_plaintext(1, 10, {"title": "Résumé", "items": [1, 2]})
+  token = await section_crypto.encrypt_section_plaintext(plaintext, "uid-1")
+  assert _decrypt(token, "uid-1") == {"section": {"title": "Résumé", "items": [1, 2]}}
+
+
+@pytest.mark.anyio
+async def test_large_payloads_are_encrypted_off_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Payloads above the offload threshold go through the threadpool."""
+  calls: list[int] = []
+
+  async def fake_run_in_threadpool(func, *args):  # type: ignore[no-untyped-def]
+    calls.append(len(args[1]))
+    return func(*args)
+
+  monkeypatch.setattr(section_crypto, "run_in_threadpool", fake_run_in_threadpool)
+  small = section_crypto.encode_section_plaintext(1, 1, {"text": "x"})
+  large = section_crypto.encode_section_plaintext(2, 1, {"text": "x" * section_crypto.OFFLOAD_THRESHOLD_BYTES})
+  await section_crypto.encrypt_section_plaintext(small, "uid")
+  token = await section_crypto.encrypt_section_plaintext(large, "uid")
+  assert calls == [len(large)]
+  assert _decrypt(token, "uid")["section"]["text"].startswith("xxx")
+
+
+def test_plaintext_is_reused_until_row_version_changes() -> None:
+  """Unchanged sections return the cached encoding; a new row version re-encodes."""
+  first = section_crypto.encode_section_plaintext(5, 100, {"v": 1})
+  assert section_crypto.encode_section_plaintext(5, 100, {"v": 2}) is first
+  assert json.loads(section_crypto.encode_section_plaintext(5, 101, {"v": 2})) == {"section": {"v": 2}}
+
+
+def test_key_cache_reuses_cipher_within_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+  """Keys are derived once per uid and re-derived after the TTL lapses."""
+  cache = section_crypto._KeyCache(ttl_seconds=10, max_entries=2)
+  clock = [0.0]
+  monkeypatch.setattr(section_crypto.time, "monotonic", lambda: clock[0])
+  first = cache.get("uid")
+  assert cache.get("uid") is first
+  clock[0] = 11.0
+  assert cache.get("uid") is not first
+
+
+def test_plaintext_cache_is_bounded_by_total_bytes() -> None:
+  """Oldest encodings are evicted once the byte budget is exceeded."""
+  cache = section_crypto._PlaintextCache(max_bytes=10)
+  cache.put((1, 1), b"12345")
+  cache.put((2, 1), b"12345")
+  cache.put((3, 1), b"123")
+  assert cache.get((1, 1)) is None
+  assert cache.get((2, 1)) == b"12345"
+  assert cache.size_bytes == 8
+  cache.put((4, 1), b"x" * 11)
+  assert cache.get((4, 1)) is None
@@ -0,0 +1,102 @@
+"""Unit tests for persisting a section graph as one unit of work."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from itertools import count
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from app.storage.lessons_repo import SectionGraph, SectionGraphSubsection, SectionGraphWidget
+from app.storage.postgres_lessons_repo import PostgresLessonsRepository
+
+from tests.unit._fakes import FakeSession, compile_sql, make_repo
+
+
+def _insert_responder() -> Callable[[Any, Any], Any]:
+  """Answer each INSERT ... RETURNING with ids for the rows it was given."""
+  ids = count(100)
+
+  def respond(stmt: Any, params: Any) -> Any:
+    result = MagicMock()
+    table = getattr(stmt, "table", None)
+    name = getattr(table, "name", None)
+    if name == "subsections":
+      rows = stmt.compile().params
+      indexes = sorted({value for key, value in rows.items() if key.startswith("subsection_index")})
+      result.all.return_value = [SimpleNamespace(id=10 + index, section_id=7, subsection_index=index, subsection_title=f"Sub {index}", status="completed", is_archived=False) for index in indexes]
+    elif name == "subsection_widgets":
+      compiled = stmt.compile().params
+      links = sorted(key for key in compiled if key.startswith("widget_index"))
+      result.all.return_value = [
+        SimpleNamespace(
+          id=500 + position,
+          public_id=compiled[key.replace("widget_index", "public_id")],
+          subsection_id=compiled[key.replace("widget_index", "subsection_id")],
+          widget_id=compiled[key.replace("widget_index", "widget_id")],
+          widget_index=compiled[key],
+          widget_type=compiled[key.replace("widget_index", "widget_type")],
+          status="pending",
+          is_archived=False,
+        )
+        for position, key in enumerate(links)
+      ]
+    elif params is not None:
+      result.scalars.return_value.all.return_value = [next(ids) for _ in params]
+    elif stmt.is_insert:
+      result.scalar_one.return_value = next(ids)
+    return result
+
+  return respond
+
+
+def _widget(subsection_index: int, widget_index: int, widget_type: str, payload: dict[str, Any] | None = None) -> SectionGraphWidget:
+  return SectionGraphWidget(subsection_index=subsection_index, widget_index=widget_index, widget_type=widget_type, payload_json=payload or {"k": widget_index}, public_id=f"pub-{subsection_index}-{widget_index}")
+
+
+@pytest.mark.anyio
+async def test_section_graph_inserts_one_statement_per_table_and_commits_once() -> None:
+  graph = SectionGraph(
+    section_id=7,
+    creator_id="user-1",
+    markdown_payload={"md": "# Hi"},
+    subsections=[
+      SectionGraphSubsection(subsection_index=1, subsection_title="Sub 1", widgets=[_widget(1, 1, "flipcards"), _widget(1, 2, "mcqs"), _widget(1, 3, "inputLine", {"ai_prompt": "grade", "wordlist_csv": "a,b"})]),
+      SectionGraphSubsection(subsection_index=2, subsection_title="Sub 2", widgets=[_widget(2, 1, "flipcards"), _widget(2, 2, "mcqs")]),
+    ],
+  )
+  session = FakeSession(respond=_insert_responder())
+
+  result = await make_repo(PostgresLessonsRepository, session).persist_section_graph(graph)
+
+  assert session.commits == 1
+  tables = [stmt.table.name for stmt, _ in session.calls]
+  # markdown insert + section link, one insert per typed table, then subsections and links.
+  assert tables == ["markdowns", "sections", "flipcards", "mcqs", "input_lines", "subsections", "subsection_widgets"]
+  typed_params = {stmt.table.name: params for stmt, params in session.calls if params is not None}
+  assert len(typed_params["flipcards"]) == 2 and len(typed_params["mcqs"]) == 2
+  assert typed_params["input_lines"] == [{"creator_id": "user-1", "ai_prompt": "grade", "wordlist": "a,b", "is_archived": False}]
+  for stmt, _ in session.calls:
+    if stmt.table.name in ("subsections", "subsection_widgets"):
+      sql = compile_sql(stmt)
+      assert "ON CONFLICT ON CONSTRAINT" in sql and "RETURNING" in sql
+
+  assert result.markdown_id == 100
+  assert [row.subsection_index for row in result.subsections] == [1, 2]
+  by_position = {(link.subsection_id, link.widget_index): link for link in result.widgets}
+  assert by_position[(11, 3)].public_id == "pub-1-3"
+  assert by_position[(11, 3)].widget_type == "inputLine"
+  # flipcards ids are assigned in parameter order across both subsections.
+  assert by_position[(11, 1)].widget_id == "101" and by_position[(12, 1)].widget_id == "102"
+
+
+@pytest.mark.anyio
+async def test_unsupported_widget_type_fails_before_any_write() -> None:
+  graph = SectionGraph(section_id=7, creator_id="user-1", subsections=[SectionGraphSubsection(subsection_index=1, subsection_title="Sub 1", widgets=[_widget(1, 1, "hologram")])])
+  session = FakeSession(respond=_insert_responder())
+
+  with pytest.raises(RuntimeError, match="hologram"):
+    await make_repo(PostgresLessonsRepository, session).persist_section_graph(graph)
+  assert session.calls == [] and session.commits == 0
@@ -0,0 +1,114 @@
+"""Unit tests for concurrent tutor script/speech generation with per-subsection checkpoints."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from app.ai.agents.tutor import TutorAgent
+from app.ai.pipeline.contracts import GenerationRequest, JobContext
+from app.ai.providers.base import AIModel, SimpleModelResponse
+
+
+class _TimelineModel(AIModel):
+  """Fake model that records when each script and speech call starts and ends."""
+
+  def __init__(self, *, delay: float = 0.02, fail_speech_for: str | None = None, fail_script_for: str | None = None) -> None:
+    self.name = "fake-tutor"
+    self.supports_structured_output = False
+    self._delay = delay
+    self._fail_speech_for = fail_speech_for
+    self._fail_script_for = fail_script_for
+    self.events: list[tuple[str, str, str]] = []
+    self.in_flight = 0
+    self.max_in_flight = 0
+
+  async def _track(self, kind: str, label: str) -> None:
+    self.in_flight += 1
+    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    self.events.append(("start", kind, label))
+    await asyncio.sleep(self._delay)
+    self.events.append(("end", kind, label))
+    self.in_flight -= 1
+
+  async def generate(self, prompt: str) -> SimpleModelResponse:
+    label = next(line for line in prompt.splitlines() if line.startswith("Subsection"))
+    await self._track("script", label)
+    if label == self._fail_script_for:
+      raise RuntimeError("503 Service Unavailable")
+    return SimpleModelResponse(content=f"script for {label}")
+
+  async def generate_structured(self, prompt: str, schema: dict[str, Any]) -> Any:
+    raise NotImplementedError
+
+  async def generate_speech(self, text: str, voice: str | None = None) -> bytes:
+    label = text.removeprefix("script for ")
+    await self._track("speech", label)
+    if label == self._fail_speech_for:
+      raise RuntimeError("tts unavailable")
+    return label.encode()
+
+
+def _agent(model: _TimelineModel) -> TutorAgent:
+  agent = TutorAgent(model=model, prov="gemini", schema=MagicMock())
+  # Put the subsection title on its own line so the fake model can tell calls apart.
+  agent._build_script_prompt = lambda topic, points, title, subsection: f"{topic}\n{title}"  # type: ignore[method-assign]
+  return agent
+
+
+def _ctx() -> JobContext:
+  return JobContext(job_id="job-1", created_at=datetime.now(UTC), provider="gemini", model="fake", request=GenerationRequest(topic="Vectors", depth="highlights", section_count=1))
+
+
+def _subsections(count: int) -> list[dict[str, Any]]:
+  return [{"subsection": f"Subsection {index}"} for index in range(1, count + 1)]
+
+
+class _Store:
+  def __init__(self) -> None:
+    self.rows: dict[int, bytes] = {}
+
+  async def __call__(self, idx: int, script: str, audio_bytes: bytes) -> int:
+    self.rows[idx + 1] = audio_bytes
+    return 100 + idx + 1
+
+
+@pytest.mark.anyio
+async def test_speech_overlaps_next_script_and_concurrency_is_bounded() -> None:
+  model = _TimelineModel()
+  store = _Store()
+
+  ids = await _agent(model)._generate_segments(_subsections(6), topic="Vectors", learning_points=[], section_index=1, ctx=_ctx(), completed={}, concurrency=2, persist=store)
+
+  assert ids == [101, 102, 103, 104, 105, 106]
+  assert model.max_in_flight <= 4
+  first_speech_start = model.events.index(("start", "speech", "Subsection 1"))
+  third_script_end = model.events.index(("end", "script", "Subsection 3"))
+  assert first_speech_start < third_script_end
+
+
+@pytest.mark.anyio
+async def test_completed_subsections_are_not_regenerated() -> None:
+  model = _TimelineModel(delay=0.0)
+  store = _Store()
+
+  ids = await _agent(model)._generate_segments(_subsections(3), topic="Vectors", learning_points=[], section_index=1, ctx=_ctx(), completed={2: 55}, concurrency=3, persist=store)
+
+  assert ids == [101, 55, 103]
+  assert ("start", "script", "Subsection 2") not in model.events
+  assert sorted(store.rows) == [1, 3]
+
+
+@pytest.mark.anyio
+async def test_script_failure_keeps_finished_segments_and_raises() -> None:
+  model = _TimelineModel(delay=0.0, fail_script_for="Subsection 2", fail_speech_for="Subsection 3")
+  store = _Store()
+
+  with pytest.raises(RuntimeError, match="503"):
+    await _agent(model)._generate_segments(_subsections(4), topic="Vectors", learning_points=[], section_index=1, ctx=_ctx(), completed={}, concurrency=2, persist=store)
+
+  # Subsection 3 lost only its speech, which is logged and skipped as before; the others were checkpointed.
+  assert sorted(store.rows) == [1, 4]
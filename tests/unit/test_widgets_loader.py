@@ -1,8 +1,11 @@
 """Unit tests for WidgetRegistry."""
 
+import os
 from pathlib import Path
+from unittest.mock import MagicMock
 
-from app.schema.widgets_loader import load_widget_registry
+from app.schema.lesson_catalog import build_lesson_catalog
+from app.schema.widgets_loader import get_widget_registry, load_widget_registry, reload_widget_registry
 
 
 def test_load_widget_registry() -> None:
@@ -40,3 +43,30 @@ def test_widget_definition_fields() -> None:
   assert free_text_def is not None
   # freeText has numbered rules, so fields should be extracted
   assert len(free_text_def.fields) > 0 or len(free_text_def.shorthand_positions) > 0
+
+
+def test_get_widget_registry_parses_once_and_reload_tracks_mtime(tmp_path: Path) -> None:
+  """The cached registry is reused until the file's mtime changes and the reload hook runs."""
+  widgets_path = tmp_path / "widgets.md"
+  widgets_path.write_text("### `alpha`\nFirst widget.\n", encoding="utf-8")
+
+  registry = get_widget_registry(widgets_path)
+  assert get_widget_registry(widgets_path) is registry
+  assert reload_widget_registry(widgets_path) is registry
+
+  widgets_path.write_text("### `alpha`\nFirst widget.\n\n### `beta`\nSecond widget.\n", encoding="utf-8")
+  stat = widgets_path.stat()
+  os.utime(widgets_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+  reloaded = reload_widget_registry(widgets_path)
+  assert reloaded is not registry
+  assert reloaded.available_types() == ["alpha", "beta"]
+  assert get_widget_registry(widgets_path) is reloaded
+
+
+def test_lesson_catalog_reuses_payload_per_registry() -> None:
+  """Catalog builds are memoized on the shared registry instance."""
+  settings = MagicMock()
+  first = build_lesson_catalog(settings)
+  assert build_lesson_catalog(settings) is first
+  assert {"id": "fenster", "label": "Fenster Widget"}.items() <= next(option for option in first["widgets"] if option["id"] == "fenster").items()